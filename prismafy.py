@@ -28,41 +28,112 @@
 
 from base64 import b64encode
 import argparse
+import calendar
+import concurrent.futures
+import fnmatch
 import os
-import snowflake.connector
 from datetime import datetime, timedelta
 import shutil
 import getpass
+import hashlib
+import json
+import random
+import statistics
+import sys
+import time
 
 __version__="""Copyright (C) 2024 - prismafy
 version: 1.0 - version date: 08/2024 -
 visit the project: https://github.com/prismafy/prismafy"""
 
+def date_argument(value):
+    #-na: a date in YYYY-MM-DD, kept as text like the other arguments of the run manifest
+    try:
+        datetime.strptime(value,'%Y-%m-%d')
+    except ValueError:
+        raise argparse.ArgumentTypeError("'"+value+"' is not a date in YYYY-MM-DD format")
+    return value
+
+def inactive_months_argument(value):
+    #-im: comma separated numbers of months. 1, 3 and 6 months already have their pages of users or warehouses
+    months=[]
+    for month in str(value).split(','):
+        if month.strip()=='':
+            continue
+        if not month.strip().isdigit() or int(month)<1:
+            raise argparse.ArgumentTypeError("'"+month.strip()+"' is not a number of months")
+        if int(month) in (1,3,6):
+            raise argparse.ArgumentTypeError(month.strip()+" months already has its page in section G")
+        months.append(int(month))
+    return sorted(set(months))
+
 parser = argparse.ArgumentParser(add_help=False)
-parser.add_argument('-d',  '--databasetype' ,help="Type of database.", choices=['snowflake', 'databricks'],type=str )
+parser.add_argument('-d',  '--databasetype' ,help="Type of database.", choices=['snowflake', 'databricks', 'standin'],type=str )
 parser.add_argument('-t',  '--authenticator' ,help="How to authenticate in Snowflake. Password is not needed for externalbrowser authentication.",  choices=['externalbrowser', 'password','username_password_mfa'], type=str)
-parser.add_argument('-a',  '--account' ,help="Specify Snowflake account name.", type=str)
+parser.add_argument('-a',  '--account' ,help="Specify Snowflake account name. For the standin database type, the SQLite file built by prismafy_standin.py.", type=str)
 parser.add_argument('-w',  '--warehouse' ,help="Specify the warehouse name to use.", type=str)
 parser.add_argument('-u',  '--username' ,help="Username to Login", type=str)
 parser.add_argument('-p',  '--password' ,help="Username's password. Password is not needed for externalbrowser authentication.",action='store', type=str)
 parser.add_argument('-k',  '--token' ,help="Token for MFA provided by Duo App", type=str)
 parser.add_argument('-r',  '--role' ,help="Role to use in the session.", type=str)
 parser.add_argument('-m',  '--months' ,help="Months of data to scan in the history. Min=1 month, Max=24 months.", type=int, choices=range(1, 25), default=6 )
-parser.add_argument('-s',  '--reportsections' ,help="Build one specific report section: A=Computing, B=Storage, C=Credits, D=Performance, E=Security, F=DataTransfer, G=Maintenance, H=DBT, Z=All",  choices=['A', 'B','C','D','E','F','G','H','Z'], type=str , default="Z")
+parser.add_argument('-s',  '--reportsections' ,help="Comma separated report sections, globs allowed: A=Computing, B=Storage, C=Credits, D=Performance, E=Security, F=DataTransfer, G=Maintenance, H=DBT, Z=All. Example: A,C,E",  type=str , default="Z")
+parser.add_argument('-rp', '--reports' ,help="Comma separated report names, globs allowed, only these reports are built. Example: table_history_failed_login,table_*_new_login", type=str)
+parser.add_argument('-lr', '--listreports' ,help="List the name of every report per section and exit.", action='store_true')
 parser.add_argument('-aq', '--analyzequery' ,help="Run report for an specific Query", type=str)
 parser.add_argument('-aw', '--analyzewarehouse',help="Run report for an specific Warehouse", type=str)
+parser.add_argument('-dt', '--dbtthreshold',help="Percentage of growth of the recent elapsed time per run of a dbt model over its baseline to flag it as slowing. Default: 20.", type=int, default=20)
+parser.add_argument('-na', '--notaccessedsince',help="Date (YYYY-MM-DD) used by the report of objects not accessed since that date. Default: 3 months before the report date.", type=date_argument)
+parser.add_argument('-im', '--inactivemonths',help="Comma separated numbers of months other than 1, 3 and 6, each one adds a page of users without sessions and of warehouses without activity in that many months. Example: 2,12.", type=inactive_months_argument)
+parser.add_argument('-ns', '--nosubsets',help="Every report reads the ACCOUNT_USAGE views itself instead of the shared subsets of its section. More views are scanned in the first run of the hour or day, later runs answer every report from the result cache.", action='store_true')
+parser.add_argument('-o',  '--outputfolder',help="Folder where the report folders are created. Default: prismafy-reports.", type=str, default="prismafy-reports")
+parser.add_argument('-pf', '--profiles',help="JSON file with a list of account profiles (account, role, warehouse, username, authenticator, sections...) to run in parallel. Missing keys take the value of the other arguments.", type=str)
+parser.add_argument('-pc', '--parallel',help="Maximum number of accounts running at the same time with --profiles. Default: 4.", type=int, default=4)
+parser.add_argument('-sv', '--serve',help="Keep running and refresh every --interval only the sections whose ACCOUNT_USAGE views have new data, into prismafy-reports/prismafy-live.", action='store_true')
+parser.add_argument('-i',  '--interval',help="Time between refresh cycles with --serve, for example 30m, 1h, 3600. Default: 1h.", type=str, default="1h")
+parser.add_argument('-sc', '--cycles',help="Number of refresh cycles with --serve, 0 runs until interrupted. Default: 0.", type=int, default=0)
+parser.add_argument('-rs', '--resume',help="Report folder of an interrupted run (prismafy-reports/prismafy-{date}). Reports already completed are skipped and the index is rebuilt.", type=str)
+parser.add_argument('-rt', '--reporttimeout',help="Seconds a single report may run. Its statements are canceled by Snowflake after this time and the report is shown as skipped in the index. Default: 0 (no limit).", type=int, default=0)
+parser.add_argument('-gt', '--globaltimeout',help="Seconds the whole run may take. Reports that do not fit in the remaining time are skipped. Default: 0 (no limit).", type=int, default=0)
+parser.add_argument('-al', '--alignment',help="Truncate the end of every time window to the hour or the day, so runs in the same hour or day send the same SQL and are served from the Snowflake result cache. second keeps the exact report time. Default: hour.", choices=['second','hour','day'], type=str, default="hour")
+parser.add_argument('-rr', '--retries',help="Times a statement failing with a transient error (expired token, network reset, throttling) is retried with exponential backoff. Default: 3.", type=int, default=3)
 parser.add_argument('-v', '--version',help="Returns Prismafy version", action='version',version='%(prog)s {version}'.format(version=__version__))
 parser.add_argument('-h',  '--help' , action='help', default=argparse.SUPPRESS, help='Print all possible arguments.' )
 
-args = parser.parse_args()
+#Parsed again from the command line in main(), importing prismafy does not read sys.argv
+args = parser.parse_args([])
 
 snowflake_conn =None
+reports_folder = args.outputfolder
 months_history= "-"+str(args.months)
 report_time = datetime.now()
 report_root_folder = "prismafy-"+report_time.strftime('%Y-%m-%d-%H-%M-%S')
 report_formatted_time = "'"+report_time.strftime('%Y-%m-%d %H:%M:%S')+"'"
+query_tag = 'prismafy:'+report_root_folder
 report_sections = {"A - Computing":{},"B - Storage":{},"C - Credits":{},"D - Performance":{},"E - Security":{},"F - Data Transfer":{},"G - Maintenance":{},"H - DBT":{}}
 hash_plans ={}
+object_access_index=None
+dbt_models_rows=None
+dbt_models_columns=None
+dbt_node_series=None
+login_history_rows=None
+sessions_rows=None
+users_last_session_rows=None
+warehouses_last_activity_rows=None
+spec_batch_rows={}
+run_profile=[]
+run_manifest={"arguments":{},"reports":[]}
+report_files=[]
+run_deadline=None
+report_deadline=None
+report_timed_out=False
+session_statement_timeout=None
+current_report=None
+skipped_reports=[]
+failed_statements=[]
+report_runs=[]
+materialized_subsets={}
+result_registry={}
 
 
 html_table_header_index="""
@@ -307,6 +378,8 @@ sql_header="""
 --********************************************************
 """
 
+dbt_metadata_sql="""TRY_PARSE_JSON(REPLACE(REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'))"""
+
 html_header="""
 <html>
 <!-- ********************************************************-->
@@ -549,9 +622,425 @@ html_bar_month_tail="""
 </html>
 """
         
-def main():
+def reset_report_state():
+    #Every run gets its own report time, report folder and caches, also when many runs share one process
     global months_history
+    global reports_folder
+    global report_time
+    global report_root_folder
+    global report_formatted_time
+    global query_tag
+    global report_sections
+    global hash_plans
+    global object_access_index
+    global dbt_models_rows
+    global dbt_models_columns
+    global dbt_node_series
+    global login_history_rows
+    global sessions_rows
+    global users_last_session_rows
+    global warehouses_last_activity_rows
+    global spec_batch_rows
+    global run_profile
+    global run_manifest
+    global report_files
+    global run_deadline
+    global skipped_reports
+    global failed_statements
+    global report_runs
+    global session_statement_timeout
+    global materialized_subsets
+    global result_registry
+
     months_history="-"+str(args.months)
+    reports_folder = args.outputfolder
+    report_time = datetime.now()
+    #The folder is created, with its number when it is taken, by claim_report_folder once the run starts
+    report_root_folder = "prismafy-"+report_time.strftime('%Y-%m-%d-%H-%M-%S')
+    report_formatted_time = "'"+aligned_report_time(report_time).strftime('%Y-%m-%d %H:%M:%S')+"'"
+    query_tag = 'prismafy:'+report_root_folder
+    report_sections = {"A - Computing":{},"B - Storage":{},"C - Credits":{},"D - Performance":{},"E - Security":{},"F - Data Transfer":{},"G - Maintenance":{},"H - DBT":{}}
+    hash_plans ={}
+    object_access_index=None
+    dbt_models_rows=None
+    dbt_models_columns=None
+    dbt_node_series=None
+    login_history_rows=None
+    sessions_rows=None
+    users_last_session_rows=None
+    warehouses_last_activity_rows=None
+    spec_batch_rows={}
+    run_profile=[]
+    run_manifest={"arguments":{"months":args.months,"reportsections":args.reportsections,"reports":args.reports,"analyzequery":args.analyzequery,"analyzewarehouse":args.analyzewarehouse,
+                               "dbtthreshold":args.dbtthreshold,"notaccessedsince":args.notaccessedsince,"inactivemonths":args.inactivemonths,"nosubsets":args.nosubsets,"alignment":args.alignment},"reports":[]}
+    report_files=[]
+    run_deadline=time.time()+args.globaltimeout if args.globaltimeout>0 else None
+    #A connection kept between runs keeps the statement timeout of the last report of the previous run
+    if session_statement_timeout is not None and args.reporttimeout<=0 and run_deadline is None and snowflake_conn not in [None,-1]:
+        try:
+            snowflake_conn.connection.cursor().execute("ALTER SESSION UNSET STATEMENT_TIMEOUT_IN_SECONDS")
+        except Exception as error:
+            print("[reset_report_state]: An exception occurred:", error)
+    session_statement_timeout=None
+    skipped_reports=[]
+    failed_statements=[]
+    report_runs=[]
+    materialized_subsets={}
+    result_registry={}
+
+def claim_report_folder():
+    #Runs started in the same second, by this or another process, get their own folder (and query tag): prismafy-{date}-2, -3...
+    #The folder is claimed by creating it, a folder created by another run in the meantime is never shared
+    global report_root_folder
+    global query_tag
+
+    folder_number=1
+    while True:
+        try:
+            os.makedirs(reports_folder+'/'+report_root_folder, exist_ok=False)
+            break
+        except FileExistsError:
+            folder_number=folder_number+1
+            report_root_folder = "prismafy-"+report_time.strftime('%Y-%m-%d-%H-%M-%S')+"-"+str(folder_number)
+    query_tag = 'prismafy:'+report_root_folder
+
+def aligned_report_time(time_value):
+    #End of every time window. Truncated to the hour or the day, the SQL text does not change between runs of the same hour or day
+    #and Snowflake returns the persisted result (24 hours) without using the warehouse
+    if args.alignment=='day':
+        return time_value.replace(hour=0, minute=0, second=0, microsecond=0)
+    if args.alignment=='hour':
+        return time_value.replace(minute=0, second=0, microsecond=0)
+    return time_value.replace(microsecond=0)
+
+def since_bound(unit='MONTH', amount=None, inclusive=False, anchor='TO_TIMESTAMP'):
+    #First midnight after DATEADD(unit, amount, report time) (at or after it when inclusive): the rows kept by comparing TO_DATE(column) with the window start
+    window_start="DATEADD("+unit+","+str(months_history if amount is None else amount)+","+anchor+"("+report_formatted_time+"))"
+    if inclusive:
+        window_start="DATEADD(SECOND,-1,"+window_start+")"
+    return "DATEADD(DAY,1,DATE_TRUNC('DAY',"+window_start+"))"
+
+def since_predicate(column, unit='MONTH', amount=None, inclusive=False, anchor='TO_TIMESTAMP', date_column=False):
+    #Same rows as TO_DATE(column) > DATEADD(unit, amount, report time) (>= when inclusive), written as a range on the raw column
+    #so Snowflake prunes the micro-partitions of the view by their min/max time. amount defaults to months_history
+    bound=since_bound(unit, amount, inclusive, anchor)
+    if date_column:
+        bound="TO_DATE("+bound+")"
+    return column+" >= "+bound
+
+def before_predicate(column, unit, amount, anchor='TO_TIMESTAMP'):
+    #Same rows as TO_DATE(column) < DATEADD(unit, amount, report time)
+    return column+" < "+since_bound(unit, amount, True, anchor)
+
+class Prismafy:
+    #Programmatic API. The configuration uses the long names of the command line arguments:
+    #   reports = Prismafy({"databasetype":"snowflake", "authenticator":"externalbrowser", "account":"abc.us-east-2.aws", ...})
+    #   reports.run(sections=["A","C"])
+    #   reports.run(analyzewarehouse="WH_LOAD")
+    #   reports.close()
+    #The connection stays open between runs of the same object.
+    def __init__(self, config=None, **kwargs):
+        self.config=vars(parser.parse_args([]))
+        self.config.update(config or {})
+        self.config.update(kwargs)
+        self.connection=None
+
+    def connect(self):
+        global args
+        args=argparse.Namespace(**self.config)
+        if self.connection is None or self.connection==-1:
+            if args.databasetype=='standin':
+                self.connection=create_standin_db_connection()
+            else:
+                self.connection=create_snowflake_db_connection(args.authenticator)
+        return self.connection
+
+    def run(self, sections=None, analyzequery=None, analyzewarehouse=None, reports=None):
+        global args
+        global snowflake_conn
+
+        #connect() sets args from the configuration again, the arguments of the run are set after it and before reset_report_state,
+        #which records them in the manifest. Without sections or analysis arguments the run uses the ones of the configuration
+        snowflake_conn=self.connect()
+        if reports is not None:
+            args.reports=reports if isinstance(reports, str) else ",".join(reports)
+        if sections is not None or analyzequery is not None or analyzewarehouse is not None:
+            args.analyzequery=analyzequery
+            args.analyzewarehouse=analyzewarehouse
+        if sections is not None:
+            args.reportsections=sections if isinstance(sections, str) else ",".join(sections)
+        reset_report_state()
+        if snowflake_conn==-1:
+            return None
+        claim_report_folder()
+        set_query_tag(snowflake_conn)
+
+        build_sections(snowflake_conn)
+
+        create_run_profile(snowflake_conn)
+        report_builder()
+        return reports_folder+'/'+report_root_folder
+
+    def close(self):
+        if self.connection is not None and self.connection!=-1:
+            close_snowflake_db_connection(self.connection)
+        self.connection=None
+
+def set_query_tag(conn):
+    #A warm connection was opened with the query tag of an earlier run
+    try:
+        cur = conn.cursor()
+        cur.execute("ALTER SESSION SET QUERY_TAG='"+query_tag+"'")
+    except Exception as error:
+        print("[set_query_tag]: An exception occurred:", error)
+
+def run_account_profile(config):
+    #Runs in a worker process of run_profiles: one warm connection per account shared by all its sections
+    account_start_time = datetime.now()
+    summary={"account":config.get("account"),"profile":os.path.basename(config["outputfolder"]),"role":config.get("role"),"warehouse":config.get("warehouse"),"folder":None,"status":"FAILED",
+             "minutes":0.0,"statements":0,"estimated_credits":0.0}
+    reports=Prismafy(config)
+    try:
+        folder=reports.run(sections=config.get("sections") or [config.get("reportsections")])
+        if folder is not None:
+            summary["folder"]=folder
+            summary["status"]="COMPLETED"
+            summary["statements"]=len(run_profile)
+            summary["estimated_credits"]=sum([profile.get("estimated_credits",0.0) for profile in run_profile])
+        else:
+            summary["status"]="CONNECTION FAILED"
+    except Exception as error:
+        print("[run_account_profile]: An exception occurred:", error)
+    finally:
+        reports.close()
+    summary["minutes"]=round((datetime.now()-account_start_time).total_seconds()/60,2)
+    return summary
+
+def run_profiles():
+    #Every profile gets its own report tree under outputfolder/<account>/<name>, at most args.parallel profiles run at the same time
+    try:
+        with open(args.profiles) as profiles_file:
+            profiles=json.load(profiles_file)
+    except Exception as error:
+        print("[run_profiles]: An exception occurred while reading the profiles:", error)
+        return
+
+    defaults=vars(args).copy()
+    del defaults["profiles"]
+    configs=[]
+    for profile_number, profile in enumerate(profiles, 1):
+        config=dict(defaults)
+        config.update(profile)
+        if config.get("account") is None:
+            print ("account was not provided in profile "+str(profile))
+            return
+        #Profiles of the same account (other roles or sections) are told apart by their name
+        profile_name=str(config.pop("name", None) or "profile_"+str(profile_number))
+        config["outputfolder"]=args.outputfolder+'/'+os.path.basename(str(config["account"])).lower()+'/'+os.path.basename(profile_name).lower()
+        if config["outputfolder"] in [other_config["outputfolder"] for other_config in configs]:
+            print ("Profile name "+profile_name+" is used twice for account "+str(config["account"]))
+            return
+        if config.get("authenticator") in ('password','username_password_mfa') and config.get("password") is None:
+            config["password"]=getpass.getpass("Password for "+str(config.get("username"))+" in "+str(config["account"])+": ")
+        configs.append(config)
+
+    print ("Copyright (C) 2024 - prismafy\n ")
+    report_start_time = datetime.now()
+    summaries=[]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max(1,args.parallel)) as pool:
+        futures=[pool.submit(run_account_profile, config) for config in configs]
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                summary=future.result()
+            except Exception as error:
+                print("[run_profiles]: An exception occurred:", error)
+                continue
+            summaries.append(summary)
+            print ("Account "+str(summary["account"])+" ("+summary["profile"]+"): "+summary["status"]+" in "+str(summary["minutes"])+" minutes.")
+
+    create_accounts_index(summaries)
+    print ("\nCompleted. Open the accounts page: "+args.outputfolder+"/prismafy_accounts_index.html\n")
+    print ("Duration Prismafy report: "+ str(round(  (datetime.now()- report_start_time).total_seconds()/60 ,2) )+" minutes." )
+
+def create_accounts_index(summaries):
+    try:
+        html_file=html_table_header+"""
+        <h3>Accounts</h3>
+        <table class="tabla1">
+        <tr>
+        <th >ACCOUNT</th>
+        <th >PROFILE</th>
+        <th >ROLE</th>
+        <th >WAREHOUSE</th>
+        <th >STATUS</th>
+        <th >MINUTES</th>
+        <th >STATEMENTS</th>
+        <th >ESTIMATED_CREDITS</th>
+        <th >REPORT</th>
+        """
+        for summary in sorted(summaries, key=lambda summary: (str(summary["account"]), summary["profile"])):
+            if summary["folder"] is not None:
+                report_link='<a href="'+os.path.relpath(summary["folder"]+'/prismafy_index.html', args.outputfolder)+'">prismafy_index.html</a>'
+            else:
+                report_link=''
+            html_file=html_file+""" <tr>
+            <td>"""+str(summary["account"])+"""</td>
+            <td>"""+summary["profile"]+"""</td>
+            <td>"""+str(summary["role"])+"""</td>
+            <td>"""+str(summary["warehouse"])+"""</td>
+            <td>"""+summary["status"]+"""</td>
+            <td>"""+str(summary["minutes"])+"""</td>
+            <td>"""+str(summary["statements"])+"""</td>
+            <td>"""+str(round(summary["estimated_credits"],6))+"""</td>
+            <td class="cell_grow">"""+report_link+"""</td>
+            </tr> """
+        html_file=html_file+html_table_tail
+
+        #Written aside and renamed: a browser or a concurrent run never reads a half written page
+        os.makedirs(args.outputfolder, exist_ok=True)
+        fh = open(args.outputfolder+'/prismafy_accounts_index.html.tmp', 'w',encoding='utf-8')
+        fh.write(html_file)
+        fh.close()
+        os.replace(args.outputfolder+'/prismafy_accounts_index.html.tmp', args.outputfolder+'/prismafy_accounts_index.html')
+        shutil.copyfile('./prismafy.png', args.outputfolder+'/prismafy.png')
+        shutil.copyfile('./prismafy_font.png', args.outputfolder+'/prismafy_font.png')
+    except Exception as error:
+        print("[create_accounts_index]: An exception occurred:", error)
+
+#ACCOUNT_USAGE views, with their time column, read by each section. A section is refreshed by --serve when one of them has new rows
+section_views = {
+    "A":[("WAREHOUSE_METERING_HISTORY","START_TIME"),("WAREHOUSE_LOAD_HISTORY","START_TIME"),("WAREHOUSE_EVENTS_HISTORY","TIMESTAMP"),("QUERY_HISTORY","START_TIME")],
+    "B":[("DATABASE_STORAGE_USAGE_HISTORY","USAGE_DATE"),("STAGE_STORAGE_USAGE_HISTORY","USAGE_DATE")],
+    "C":[("WAREHOUSE_METERING_HISTORY","START_TIME"),("METERING_DAILY_HISTORY","USAGE_DATE"),("DATABASE_REPLICATION_USAGE_HISTORY","START_TIME")],
+    "D":[("QUERY_HISTORY","START_TIME"),("TABLE_PRUNING_HISTORY","START_TIME"),("AUTOMATIC_CLUSTERING_HISTORY","START_TIME")],
+    "E":[("LOGIN_HISTORY","EVENT_TIMESTAMP"),("SESSIONS","CREATED_ON")],
+    "F":[("DATA_TRANSFER_HISTORY","START_TIME"),("DATABASE_REPLICATION_USAGE_HISTORY","START_TIME")],
+    "G":[("ACCESS_HISTORY","QUERY_START_TIME"),("TASK_HISTORY","SCHEDULED_TIME"),("COPY_HISTORY","LAST_LOAD_TIME"),("QUERY_HISTORY","START_TIME")],
+    "H":[("QUERY_HISTORY","START_TIME")]}
+
+def parse_interval(interval):
+    units={"s":1,"m":60,"h":3600,"d":86400}
+    if interval[-1:].lower() in units:
+        return int(float(interval[:-1])*units[interval[-1:].lower()])
+    return int(interval)
+
+def find_refreshed_sections(conn, sections, view_watermarks):
+    #Only the rows newer than the last cycle are read, so the check is cheap even on large views
+    refreshed_sections=[]
+    try:
+        views=[]
+        for section in sections:
+            for view in section_views[section]:
+                if view not in views:
+                    views.append(view)
+
+        sql_query=sql_header
+        for view_name, time_column in views:
+            if sql_query!=sql_header:
+                sql_query=sql_query+" UNION ALL "
+            sql_query=sql_query+"""
+            SELECT '"""+view_name+"""' AS VIEW_NAME, MAX("""+time_column+""")::TIMESTAMP_NTZ AS LAST_TIME
+            FROM SNOWFLAKE.ACCOUNT_USAGE."""+view_name+"""
+            WHERE """+time_column+""" > """
+            if view_name in view_watermarks:
+                sql_query=sql_query+"TO_TIMESTAMP('"+view_watermarks[view_name]+"')"
+            else:
+                sql_query=sql_query+"DATEADD(MONTH,"+months_history+",TO_TIMESTAMP("+report_formatted_time+"))"
+
+        cur = conn.cursor()
+        cur.execute(sql_query)
+        new_views=[]
+        for (ROW_VIEW_NAME, ROW_LAST_TIME) in cur:
+            if ROW_LAST_TIME is not None:
+                new_views.append(ROW_VIEW_NAME)
+                view_watermarks[ROW_VIEW_NAME]=str(ROW_LAST_TIME)
+
+        for section in sections:
+            if len([view_name for view_name, time_column in section_views[section] if view_name in new_views])>0:
+                refreshed_sections.append(section)
+
+    except Exception as error:
+        print("[find_refreshed_sections]: An exception occurred:", error)
+        refreshed_sections=list(sections)
+
+    return refreshed_sections
+
+def serve():
+    #Keeps one warm connection and refreshes the pages of prismafy-live in place, the index is swapped only when a cycle is complete
+    global snowflake_conn
+    global report_root_folder
+    global report_sections
+
+    sections=[section for section in selected_sections(args.reportsections) if len(selected_reports(section))>0]
+    interval=parse_interval(args.interval)
+    reports=Prismafy(vars(args))
+    view_watermarks={}
+    served_sections={}
+    cycle=0
+    if args.authenticator in ('password','username_password_mfa') and args.password is None and args.databasetype!='standin':
+        args.password=getpass.getpass()
+        reports.config["password"]=args.password
+
+    print ("Copyright (C) 2024 - prismafy\n ")
+    try:
+        while args.cycles==0 or cycle<args.cycles:
+            cycle=cycle+1
+            cycle_start_time=datetime.now()
+            reset_report_state()
+            snowflake_conn=reports.connect()
+            if snowflake_conn==-1:
+                reports.connection=None
+            else:
+                set_query_tag(snowflake_conn)
+                report_root_folder='prismafy-live'
+
+                refreshed_sections=find_refreshed_sections(snowflake_conn, sections, view_watermarks)
+                #The first cycle builds every section, also those whose views have no rows in the window, later cycles only the refreshed ones
+                if len(served_sections)==0:
+                    refreshed_sections=list(sections)
+                print (datetime.now().strftime('%Y-%m-%d-%H:%M:%S')+"  Cycle "+str(cycle)+": refreshing sections "+(",".join(refreshed_sections) or "none"))
+                for section in refreshed_sections:
+                    args.reportsections=section
+                    build_sections(snowflake_conn)
+
+                for section_name in report_sections:
+                    if section_name[0] in refreshed_sections:
+                        served_sections[section_name]=report_sections[section_name]
+                report_sections=dict([(section_name, served_sections.get(section_name,{})) for section_name in report_sections])
+
+                if len(refreshed_sections)>0:
+                    create_run_profile(snowflake_conn)
+                    report_builder()
+                print ("Cycle "+str(cycle)+" duration: "+ str(round(  (datetime.now()- cycle_start_time).total_seconds()/60 ,2) )+" minutes. Main page: "+reports_folder+"/"+report_root_folder+"/prismafy_index.html")
+
+            if args.cycles==0 or cycle<args.cycles:
+                time.sleep(max(0, interval-(datetime.now()-cycle_start_time).total_seconds()))
+    except KeyboardInterrupt:
+        print ("\nServe mode stopped.")
+    finally:
+        reports.close()
+
+def main():
+    global args
+    args = parser.parse_args()
+    reset_report_state()
+    if args.resume is not None and not load_run_manifest(args.resume):
+        return
+
+    if args.listreports:
+        list_reports()
+        return
+    selection_error=check_report_selection()
+    if selection_error is not None:
+        print (selection_error)
+        return
+
+    if args.profiles is not None:
+        run_profiles()
+        return
+    if args.serve:
+        serve()
+        return
 
 
     if args.databasetype=='snowflake':
@@ -577,6 +1066,15 @@ def main():
                 print ("Token (-k) must be provided when using username_password_mfa authentication.")            
             else:
                 sections_builder()
+    elif args.databasetype=='standin':
+        if args.account is None:
+            print ("account was not provided. Use the SQLite file built by prismafy_standin.py.")
+            return
+        elif not os.path.isfile(args.account):
+            print ("Stand-in database "+args.account+" does not exist.")
+            return
+        else:
+            sections_builder()
     elif args.type=='databricks':
         print ("Feature under development.")
     else:
@@ -585,30 +1083,34 @@ def main():
 def create_snowflake_db_connection(authenticator):
     
     try:
+        #Imported only when a connection is opened, the connector takes most of the startup time of --help and --version
+        import snowflake.connector
         if authenticator=='password':
             conn = snowflake.connector.connect(
                 user=args.username,
                 account=args.account,
                 password=args.password,
                 warehouse=args.warehouse,
-                role=args.role
+                role=args.role,
+                session_parameters={'QUERY_TAG': query_tag}
             )
             cur = conn.cursor()
             cur.execute("USE WAREHOUSE "+args.warehouse) 
             print("Snowflake connection Opened. ")
-            return conn
+            return ProfiledConnection(conn, lambda: create_snowflake_db_connection(authenticator))
         elif authenticator=='externalbrowser':
             conn = snowflake.connector.connect(
                 user=args.username,
                 account=args.account,
                 warehouse=args.warehouse,
                 role=args.role,
-                authenticator="externalbrowser"
+                authenticator="externalbrowser",
+                session_parameters={'QUERY_TAG': query_tag}
             )
             cur = conn.cursor()
             cur.execute("USE WAREHOUSE "+args.warehouse) 
             print("Snowflake connection Opened. ")
-            return conn
+            return ProfiledConnection(conn, lambda: create_snowflake_db_connection(authenticator))
         elif authenticator=='username_password_mfa':
             conn = snowflake.connector.connect(
                 user=args.username,
@@ -617,18 +1119,270 @@ def create_snowflake_db_connection(authenticator):
                 warehouse=args.warehouse,
                 role=args.role,
                 passcode=args.token,
-                authenticator="username_password_mfa"
+                authenticator="username_password_mfa",
+                session_parameters={'QUERY_TAG': query_tag}
             )
             cur = conn.cursor()
             cur.execute("USE WAREHOUSE "+args.warehouse) 
             print("Snowflake connection Opened. ")
-            return conn
+            #The MFA passcode is valid once, a new session cannot be opened when the token expires
+            return ProfiledConnection(conn)
         else:
             return -1            
     except Exception as error:
         print("Error while opening connection to Snowflake:", error)
         return -1
 
+def create_standin_db_connection():
+    #Local SQLite emulation of ACCOUNT_USAGE, used to run and benchmark prismafy without an account
+    try:
+        if not os.path.isfile(str(args.account)):
+            print("Stand-in database "+str(args.account)+" does not exist.")
+            return -1
+        import prismafy_standin
+        conn = prismafy_standin.connect(args.account, session_parameters={'QUERY_TAG': query_tag})
+        print("Stand-in connection Opened. ")
+        return ProfiledConnection(conn, create_standin_db_connection)
+    except Exception as error:
+        print("Error while opening connection to the stand-in database:", error)
+        return -1
+
+#Snowflake error numbers worth retrying: expired session or master token, connection and request failures, service unavailable
+transient_error_numbers=[390112,390114,390111,250001,250002,250003,251006,251011,251012,253003,253004]
+transient_error_messages=['connection reset','connection aborted','connection refused','broken pipe','temporarily unavailable','service unavailable','too many requests','throttl','remote end closed']
+reauthentication_error_numbers=[390112,390114,390111]
+
+def classify_error(error):
+    error_number=getattr(error,'errno',None)
+    if error_number in transient_error_numbers:
+        return 'transient'
+    if error_number==630 or isinstance(error, TimeoutError):
+        return 'permanent'
+    message=str(error).lower()
+    if len([transient_message for transient_message in transient_error_messages if transient_message in message])>0:
+        return 'transient'
+    return 'permanent'
+
+class ProfiledCursor:
+    #Records execution and fetch time, query id and rows of every statement in run_profile
+    def __init__(self, cursor, profiled_connection=None):
+        self.cursor=cursor
+        self.profiled_connection=profiled_connection
+        self.profile=None
+        #Statements are attributed to the report run by run_report, report_name names the statements run outside of a report
+        self.report_name=None
+
+    def __getattr__(self, name):
+        return getattr(self.cursor, name)
+
+    def __iter__(self):
+        rows=iter(self.cursor)
+        while True:
+            fetch_start=time.perf_counter()
+            try:
+                row=next(rows)
+            except StopIteration:
+                self.add_fetch_time(fetch_start)
+                return
+            self.add_fetch_time(fetch_start)
+            yield row
+
+    def add_fetch_time(self, fetch_start):
+        if self.profile is not None:
+            self.profile["fetch_seconds"]=self.profile["fetch_seconds"]+time.perf_counter()-fetch_start
+
+    def execute(self, sql_query, *args, **kwargs):
+        global report_timed_out
+        if report_deadline is not None and time.time()>report_deadline:
+            report_timed_out=True
+            raise TimeoutError("Time budget of the report exhausted, statement not executed.")
+        report_name=current_report or self.report_name or 'prismafy'
+        attempt=0
+        while True:
+            attempt=attempt+1
+            self.profile={"report":report_name,"query_id":None,"start_time":datetime.now(),"execute_seconds":0.0,"fetch_seconds":0.0,"rows":0}
+            run_profile.append(self.profile)
+            execute_start=time.perf_counter()
+            try:
+                return self.cursor.execute(sql_query, *args, **kwargs)
+            except Exception as error:
+                #000630: Statement reached its statement or warehouse timeout, also raised by the stand-in. Network and login timeouts are not budget overruns
+                if getattr(error,'errno',None)==630:
+                    report_timed_out=True
+                error_class=classify_error(error)
+                expired_session=getattr(error,'errno',None) in reauthentication_error_numbers
+                if (error_class=='permanent' or attempt>globals()['args'].retries or self.profiled_connection is None
+                        or (expired_session and self.profiled_connection.reconnect_function is None)):
+                    failed_statements.append({"report":report_name,"error_class":error_class,"errno":getattr(error,'errno',None),
+                                              "error":str(error).split('\n')[0][:300],"attempts":attempt})
+                    raise
+                #Full jitter exponential backoff: 2, 4, 8... seconds at most, never more than 60
+                backoff=random.uniform(0, min(60, 2**attempt))
+                print (datetime.now().strftime('%Y-%m-%d-%H:%M:%S') + "  ["+report_name+"]: transient error, retry "+str(attempt)+" in "+str(round(backoff,1))+" seconds:", error)
+                time.sleep(backoff)
+                self.cursor=self.profiled_connection.reconnect()
+            finally:
+                self.profile["execute_seconds"]=time.perf_counter()-execute_start
+                self.profile["query_id"]=self.cursor.sfqid
+                self.profile["rows"]=self.cursor.rowcount if self.cursor.rowcount is not None else 0
+
+    def fetchone(self):
+        fetch_start=time.perf_counter()
+        row=self.cursor.fetchone()
+        self.add_fetch_time(fetch_start)
+        return row
+
+    def fetchall(self):
+        fetch_start=time.perf_counter()
+        rows=self.cursor.fetchall()
+        self.add_fetch_time(fetch_start)
+        return rows
+
+    def fetchmany(self, size):
+        fetch_start=time.perf_counter()
+        rows=self.cursor.fetchmany(size)
+        self.add_fetch_time(fetch_start)
+        return rows
+
+class ProfiledConnection:
+    def __init__(self, connection, reconnect_function=None):
+        self.connection=connection
+        self.reconnect_function=reconnect_function
+        #Every session of the connection, the run profile reads the query history of each one
+        self.session_ids=[getattr(connection,'session_id',None)]
+
+    def __getattr__(self, name):
+        return getattr(self.connection, name)
+
+    def cursor(self, *args, **kwargs):
+        return ProfiledCursor(self.connection.cursor(*args, **kwargs), self)
+
+    def reconnect(self):
+        #Opens a new session (authenticating again) shared by every cursor created afterwards, returns a cursor on it
+        if self.reconnect_function is not None:
+            owner=result_owner(self)
+            new_connection=self.reconnect_function()
+            if new_connection!=-1:
+                try:
+                    self.connection.close()
+                except Exception:
+                    pass
+                self.connection=new_connection.connection
+                self.session_ids.append(getattr(self.connection,'session_id',None))
+                #Results of the stand-in live in its connection, the reports read the views again. Snowflake results belong
+                #to the user and stay readable from the new session
+                if result_owner(self)!=owner:
+                    materialized_subsets.clear()
+                #The statement timeout of the report budget is a session parameter
+                if session_statement_timeout is not None:
+                    try:
+                        self.connection.cursor().execute("ALTER SESSION SET STATEMENT_TIMEOUT_IN_SECONDS="+str(session_statement_timeout))
+                    except Exception as error:
+                        print("[reconnect]: An exception occurred:", error)
+        return self.connection.cursor()
+
+def create_run_profile(conn):
+    #Statement costs come from the session query history, ACCOUNT_USAGE takes up to 45 minutes to show them
+    try:
+        credits_per_hour={"X-Small":1,"Small":2,"Medium":4,"Large":8,"X-Large":16,"2X-Large":32,"3X-Large":64,"4X-Large":128,"5X-Large":256,"6X-Large":512}
+        query_costs={}
+
+        #Sessions opened again after an expired token keep the statements of the run in their own history
+        session_ids=[session_id for session_id in getattr(conn,'session_ids',[None]) if session_id is not None] or [None]
+        cur = conn.connection.cursor()
+        cur.execute(sql_header+"""
+        UNION ALL""".join(["""
+        SELECT
+            QUERY_ID,
+            NVL(BYTES_SCANNED,0)                    AS BYTES_SCANNED,
+            NVL(EXECUTION_TIME,0)                   AS EXECUTION_TIME,
+            NVL(WAREHOUSE_SIZE,'')                  AS WAREHOUSE_SIZE,
+            NVL(CREDITS_USED_CLOUD_SERVICES,0)      AS CREDITS_USED_CLOUD_SERVICES,
+            NVL(QUERY_TYPE,'')                      AS QUERY_TYPE,
+            CONTAINS(UPPER(QUERY_TEXT),'ACCOUNT_USAGE.')  AS READS_VIEWS
+        FROM TABLE(SNOWFLAKE.INFORMATION_SCHEMA.QUERY_HISTORY_BY_SESSION("""+("SESSION_ID => "+str(session_id)+", " if session_id is not None else "")+"""RESULT_LIMIT => 10000))
+        WHERE QUERY_TAG='"""+query_tag+"""'""" for session_id in session_ids]))
+        for (ROW_QUERY_ID, ROW_BYTES_SCANNED, ROW_EXECUTION_TIME, ROW_WAREHOUSE_SIZE, ROW_CREDITS_USED_CLOUD_SERVICES, ROW_QUERY_TYPE, ROW_READS_VIEWS) in cur:
+            estimated_credits=float(ROW_EXECUTION_TIME)/3600000*credits_per_hour.get(ROW_WAREHOUSE_SIZE,0)+float(ROW_CREDITS_USED_CLOUD_SERVICES)
+            #The query history has no result reuse flag: a SELECT answered from the persisted result cache scans nothing and runs
+            #without a warehouse. Statements reading no view (RESULT_SCAN of a subset, constants) do the same and are not counted
+            result_cache_hit=ROW_QUERY_TYPE=='SELECT' and int(ROW_BYTES_SCANNED)==0 and ROW_WAREHOUSE_SIZE=='' and bool(ROW_READS_VIEWS)
+            query_costs[ROW_QUERY_ID]=(int(ROW_BYTES_SCANNED), estimated_credits, result_cache_hit)
+
+        reports={}
+        for profile in run_profile:
+            bytes_scanned, estimated_credits, result_cache_hit=query_costs.get(profile["query_id"],(0,0.0,False))
+            profile["gb_scanned"]=bytes_scanned/1024/1024/1024
+            profile["estimated_credits"]=estimated_credits
+            profile["result_cache_hit"]=result_cache_hit
+            if profile["report"] not in reports:
+                reports[profile["report"]]={"statements":0,"result_cache_hits":0,"rows":0,"execute_seconds":0.0,"fetch_seconds":0.0,"gb_scanned":0.0,"estimated_credits":0.0}
+            report=reports[profile["report"]]
+            report["statements"]=report["statements"]+1
+            report["result_cache_hits"]=report["result_cache_hits"]+(1 if result_cache_hit else 0)
+            for metric in ["rows","execute_seconds","fetch_seconds","gb_scanned","estimated_credits"]:
+                report[metric]=report[metric]+profile[metric]
+
+        html_file=html_table_header+"""
+        <h3>Cost of producing each report (credits estimated from execution time and warehouse size plus cloud services)</h3>
+        <h3>Result cache hits are estimated: SELECT statements reading an ACCOUNT_USAGE view that scanned no bytes and ran without a warehouse</h3>
+        <table class="tabla1">
+        <tr>
+        <th >REPORT</th>
+        <th >STATEMENTS</th>
+        <th >RESULT_CACHE_HITS</th>
+        <th >ROWS</th>
+        <th >EXECUTE_SECONDS</th>
+        <th >FETCH_SECONDS</th>
+        <th >GB_SCANNED</th>
+        <th >ESTIMATED_CREDITS</th>
+        """
+        for report_name, report in sorted(reports.items(), key=lambda item: (item[1]["estimated_credits"], item[1]["execute_seconds"]), reverse=True):
+            html_file=html_file+""" <tr>
+            <td>"""+report_name+"""</td>
+            <td>"""+str(report["statements"])+"""</td>
+            <td>"""+str(report["result_cache_hits"])+"""</td>
+            <td>"""+str(report["rows"])+"""</td>
+            <td>"""+str(round(report["execute_seconds"],2))+"""</td>
+            <td>"""+str(round(report["fetch_seconds"],2))+"""</td>
+            <td>"""+str(round(report["gb_scanned"],4))+"""</td>
+            <td class="cell_grow">"""+str(round(report["estimated_credits"],6))+"""</td>
+            </tr> """
+        html_file=html_file+"""</table>
+        <h3>Statements</h3>
+        <table class="tabla2">
+        <tr>
+        <th >START_TIME</th>
+        <th >REPORT</th>
+        <th >QUERY_ID</th>
+        <th >RESULT_CACHE</th>
+        <th >ROWS</th>
+        <th >EXECUTE_SECONDS</th>
+        <th >FETCH_SECONDS</th>
+        <th >GB_SCANNED</th>
+        <th >ESTIMATED_CREDITS</th>
+        """
+        for profile in run_profile:
+            html_file=html_file+""" <tr>
+            <td>"""+profile["start_time"].strftime('%Y-%m-%d %H:%M:%S')+"""</td>
+            <td>"""+profile["report"]+"""</td>
+            <td>"""+str(profile["query_id"])+"""</td>
+            <td>"""+("HIT" if profile["result_cache_hit"] else "")+"""</td>
+            <td>"""+str(profile["rows"])+"""</td>
+            <td>"""+str(round(profile["execute_seconds"],2))+"""</td>
+            <td>"""+str(round(profile["fetch_seconds"],2))+"""</td>
+            <td>"""+str(round(profile["gb_scanned"],4))+"""</td>
+            <td class="cell_grow">"""+str(round(profile["estimated_credits"],6))+"""</td>
+            </tr> """
+        html_file=html_file+html_table_tail
+
+        create_output_file('prismafy_run_profile.html',html_file)
+        create_output_file('prismafy_run_profile.json',json.dumps({"reports":reports,"statements":run_profile,"report_runs":report_runs},default=str,indent=2))
+        print ("Result cache hits: "+str(len([profile for profile in run_profile if profile["result_cache_hit"]]))+" of "+str(len(run_profile))+" statements.")
+
+    except Exception as error:
+        print("[create_run_profile]: An exception occurred:", error)
+
 def close_snowflake_db_connection(conn):
     try:
         conn.cursor().close()
@@ -645,19 +1399,197 @@ def create_output_file(file_name, file_content):
     global report_formatted_time
     
     try:
-        REPORTS_FOLDER = 'prismafy-reports'
+        REPORTS_FOLDER = reports_folder
         FILE_NAME = REPORTS_FOLDER+'/'+report_root_folder+'/'+file_name                
         print (datetime.now().strftime('%Y-%m-%d-%H:%M:%S') + "  Creating "+file_name)
         os.makedirs(os.path.dirname(FILE_NAME), exist_ok=True)
-        fh = open(FILE_NAME, 'w',encoding='utf-8')
+        #Written aside and renamed, a page being served is never seen half written
+        fh = open(FILE_NAME+'.tmp', 'w',encoding='utf-8')
         fh.write(file_content)
         fh.close()    
+        os.replace(FILE_NAME+'.tmp', FILE_NAME)
+        report_files.append((file_name, hashlib.sha256(file_content.encode('utf-8')).hexdigest()))
     except Exception as error:
         print(datetime.now().strftime('%Y-%m-%d-%H:%M:%S') + "     ["+file_name+"]: An exception occurred while creating the html file:", error)
 
+def save_run_manifest():
+    try:
+        MANIFEST_FILE = reports_folder+'/'+report_root_folder+'/prismafy_run_manifest.json'
+        os.makedirs(os.path.dirname(MANIFEST_FILE), exist_ok=True)
+        fh = open(MANIFEST_FILE+'.tmp', 'w',encoding='utf-8')
+        fh.write(json.dumps(run_manifest,indent=2))
+        fh.close()
+        os.replace(MANIFEST_FILE+'.tmp', MANIFEST_FILE)
+    except Exception as error:
+        print("[save_run_manifest]: An exception occurred:", error)
+
+def load_run_manifest(report_folder):
+    #Continues the run of report_folder: same folder, same report time and same arguments, only the connection arguments come from the command line
+    global reports_folder
+    global report_root_folder
+    global report_time
+    global report_formatted_time
+    global months_history
+    global run_manifest
+
+    try:
+        report_folder=os.path.normpath(report_folder)
+        fh = open(report_folder+'/prismafy_run_manifest.json', encoding='utf-8')
+        run_manifest=json.load(fh)
+        fh.close()
+
+        reports_folder=os.path.dirname(report_folder) or '.'
+        report_root_folder=os.path.basename(report_folder)
+        #The folder number added to runs started in the same second is not part of the report time
+        report_time=datetime.strptime(report_root_folder[:len("prismafy-YYYY-mm-dd-HH-MM-SS")], "prismafy-%Y-%m-%d-%H-%M-%S")
+        for argument, value in run_manifest["arguments"].items():
+            setattr(args, argument, value)
+        #Runs recorded before --alignment used the exact report time
+        if "alignment" not in run_manifest["arguments"]:
+            args.alignment='second'
+        report_formatted_time = "'"+aligned_report_time(report_time).strftime('%Y-%m-%d %H:%M:%S')+"'"
+        months_history="-"+str(args.months)
+        print ("Resuming "+report_folder+": "+str(len(run_manifest["reports"]))+" reports already completed.")
+        return True
+    except Exception as error:
+        print("[load_run_manifest]: An exception occurred:", error)
+        return False
+
+def result_owner(conn):
+    #RESULT_SCAN reads results of the same user, results of the stand-in only live in its connection
+    if args.databasetype=='standin':
+        return 'standin:'+str(id(conn.connection))
+    return str(args.account).lower()+':'+str(args.username).lower()
+
+def registered_result(conn, result_name, sql_query, refresh=False, report_name=None):
+    #Query ID of the result of sql_query and whether an earlier report of the run produced it. The statement runs once per run,
+    #the base SQL has no upper time bound so a result is not reused by later runs: they send the same SQL (see --alignment)
+    #and get the Snowflake result cache, which is invalidated when the views have new rows
+    owner=result_owner(conn)
+    key=hashlib.sha256((owner+"\n"+sql_query).encode('utf-8')).hexdigest()
+    if not refresh and key in result_registry:
+        return result_registry[key]["query_id"], True
+
+    cur = conn.cursor()
+    cur.report_name=report_name
+    cur.execute(sql_header+sql_query)
+    result_registry[key]={"result":result_name,"owner":owner,"query_id":cur.sfqid}
+    return cur.sfqid, False
+
+def result_scan(conn, report_name, result_name, sql_query, derived_query):
+    #Runs derived_query with {result} replaced by the registered result of sql_query. A result that Snowflake
+    #no longer has (the error names its query ID) is produced again once
+    query_id, reused = registered_result(conn, result_name, sql_query, report_name=report_name)
+    cur = conn.cursor()
+    cur.report_name=report_name
+    try:
+        cur.execute(sql_header+derived_query.replace("{result}", "TABLE(RESULT_SCAN('"+query_id+"'))"))
+    except Exception as error:
+        if not reused or query_id not in str(error):
+            raise
+        query_id, reused = registered_result(conn, result_name, sql_query, refresh=True, report_name=report_name)
+        cur = conn.cursor()
+        cur.report_name=report_name
+        cur.execute(sql_header+derived_query.replace("{result}", "TABLE(RESULT_SCAN('"+query_id+"'))"))
+    return cur
+
+def set_report_budget(conn):
+    #The session statement timeout makes Snowflake cancel an overrunning statement, the deadline stops the next statements of the report
+    global report_deadline
+    global report_timed_out
+    global session_statement_timeout
+
+    report_timed_out=False
+    report_deadline=None
+    budget=args.reporttimeout if args.reporttimeout>0 else None
+    if run_deadline is not None:
+        remaining=run_deadline-time.time()
+        if remaining<=0:
+            return False
+        budget=remaining if budget is None else min(budget, remaining)
+    if budget is not None:
+        report_deadline=time.time()+budget
+        budget=max(1,int(budget))
+        try:
+            cur = conn.connection.cursor()
+            cur.execute("ALTER SESSION SET STATEMENT_TIMEOUT_IN_SECONDS="+str(budget))
+            session_statement_timeout=budget
+        except Exception as error:
+            print("[set_report_budget]: An exception occurred:", error)
+    return True
+
+def standin_unsupported(report_function, report_key):
+    #True when the report uses SQL the stand-in cannot run: it is listed as skipped instead of failing
+    if args.databasetype!='standin':
+        return False
+    import prismafy_standin
+    reason=prismafy_standin.unsupported_reports.get(report_function.__name__)
+    if reason is None:
+        return False
+    skipped_reports.append({"report":report_key,"reason":"Not supported by the stand-in ("+reason+")","seconds":0.0})
+    print (datetime.now().strftime('%Y-%m-%d-%H:%M:%S') + "  Skipping "+report_key+", not supported by the stand-in ("+reason+")")
+    return True
+
+def run_report(report_function, conn, *report_arguments):
+    #A report is recorded in the manifest once it has written its files, and skipped by --resume while those files are intact
+    global report_files
+    global report_deadline
+    global current_report
+
+    report_key=report_function.__name__+"("+",".join([str(argument) for argument in report_arguments])+")"
+    for report in run_manifest["reports"]:
+        if report["report"]==report_key:
+            files_intact=True
+            for file_name, checksum in report["files"].items():
+                try:
+                    fh = open(reports_folder+'/'+report_root_folder+'/'+file_name, 'rb')
+                    files_intact=files_intact and hashlib.sha256(fh.read()).hexdigest()==checksum
+                    fh.close()
+                except OSError:
+                    files_intact=False
+            if files_intact:
+                for section_name, pages in report["sections"].items():
+                    report_sections[section_name].update(pages)
+                print (datetime.now().strftime('%Y-%m-%d-%H:%M:%S') + "  Skipping "+report_key+", completed in a previous run")
+                return
+
+    if standin_unsupported(report_function, report_key):
+        return
+
+    if not set_report_budget(conn):
+        skipped_reports.append({"report":report_key,"reason":"Global time budget exhausted","seconds":0.0})
+        print (datetime.now().strftime('%Y-%m-%d-%H:%M:%S') + "  Skipping "+report_key+", global time budget exhausted")
+        return
+
+    pages_before=dict([(section_name, dict(pages)) for section_name, pages in report_sections.items()])
+    report_files=[]
+    #Fan-out reports catch the error of each entity and go on, a failed statement means some pages are missing
+    failures_before=len(failed_statements)
+    report_start=time.time()
+    #Statements of the report and of the shared helpers it calls are profiled under its name
+    current_report=report_function.__name__
+    try:
+        report_function(conn, *report_arguments)
+    finally:
+        current_report=None
+    report_deadline=None
+    #Seconds of every report with its failed statements: a failing report is timed on its exception path
+    report_runs.append({"report":report_key,"seconds":round(time.time()-report_start,3),"failed_statements":len(failed_statements)-failures_before,"timed_out":report_timed_out})
+    if report_timed_out:
+        skipped_reports.append({"report":report_key,"reason":"Time budget exceeded","seconds":round(time.time()-report_start,1)})
+        print (datetime.now().strftime('%Y-%m-%d-%H:%M:%S') + "  Skipped "+report_key+", time budget exceeded")
+    elif len(report_files)>0 and len(failed_statements)==failures_before:
+        run_manifest["reports"]=[report for report in run_manifest["reports"] if report["report"]!=report_key]
+        run_manifest["reports"].append({"report":report_key,
+                                        "completed":datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                                        "files":dict(report_files),
+                                        "sections":dict([(section_name, dict([(page, page_type) for page, page_type in pages.items() if pages_before[section_name].get(page)!=page_type]))
+                                                         for section_name, pages in report_sections.items()])})
+        save_run_manifest()
+
 def move_icon():
     try:
-        REPORTS_FOLDER = 'prismafy-reports'        
+        REPORTS_FOLDER = reports_folder        
         shutil.copyfile('./prismafy.png', REPORTS_FOLDER+'/'+report_root_folder+'/prismafy.png')
         shutil.copyfile('./prismafy_font.png', REPORTS_FOLDER+'/'+report_root_folder+'/prismafy_font.png')
     except Exception as error:
@@ -674,8 +1606,8 @@ def generate_top_query_info(conn):
         SELECT 
             QUERY_PARAMETERIZED_HASH                            AS QUERY_PARAMETERIZED_HASH,
             ROUND(SUM(TOTAL_ELAPSED_TIME)/1000,2)               AS QUERY_EXECUTION_TIME_SECONDS
-        FROM SNOWFLAKE.ACCOUNT_USAGE.QUERY_HISTORY Q
-        WHERE  TO_DATE(Q.START_TIME) > DATEADD(MONTH,-1,TO_TIMESTAMP("""+report_formatted_time+"""))
+        FROM """+shared_subset("QUERY_HISTORY_LAST_MONTH")+""" Q
+        WHERE  """+since_predicate("Q.START_TIME","MONTH",-1)+"""
             AND TOTAL_ELAPSED_TIME > 0
             AND ERROR_CODE IS NULL
             AND QUERY_PARAMETERIZED_HASH IS NOT NULL
@@ -693,526 +1625,191 @@ def generate_top_query_info(conn):
         
         if int(cur.rowcount)!=0:
             for (QUERY_PARAMETERIZED_HASH, QUERY_EXECUTION_TIME_SECONDS) in cur:
-                line_history_bytes_details_by_query_parameterized_hash(conn,QUERY_PARAMETERIZED_HASH)
-                line_history_calls_details_by_query_parameterized_hash(conn,QUERY_PARAMETERIZED_HASH)
-                line_history_time_details_by_query_parameterized_hash(conn,QUERY_PARAMETERIZED_HASH)
-                line_history_rows_details_by_query_parameterized_hash(conn,QUERY_PARAMETERIZED_HASH)
-                table_last_executions_of_query(conn,QUERY_PARAMETERIZED_HASH)
-                line_history_wh_changes_by_query(conn,QUERY_PARAMETERIZED_HASH)
-                table_history_accessed_objects_by_query(conn,QUERY_PARAMETERIZED_HASH)
+                #The reports of -aq for each query
+                for report_function in report_registry["aq"]:
+                    if not standin_unsupported(report_function, report_function.__name__+"("+str(QUERY_PARAMETERIZED_HASH)+")"):
+                        report_function(conn,QUERY_PARAMETERIZED_HASH)
 
     except Exception as error:
         print("[generate_top_query_info]: An exception occurred:", error)
 
-def table_month_top_query(conn):
-
-    try:    
+def line_history_account_consumption_credits_by_warehouse(conn):
+    try:
         global snowflake_conn
-        global html_table_header
-        global html_table_tail
-        global months_history
         global report_sections
-        conn =snowflake_conn         
-
-        iterations = ["query_execution_time_seconds", "partitions_scanned","percentage_scanned_from_cache", "rows_produced","gb_spilled_to_local_storage","gb_spilled_to_remote_storage","gb_sent_over_the_network","compilation_time_seconds","queued_provisioning_time_seconds","queued_overload_time_seconds","query_load_percent"]
+        conn =snowflake_conn        
+        html_file=html_header
         
-        for iteration in iterations:
+        sql_query=sql_header+"""
+        WITH DATA AS (
+            SELECT 
+                DATE_TRUNC('DAY',START_TIME::TIMESTAMP_NTZ)  AS DATE, 
+                WAREHOUSE_NAME                               AS WAREHOUSE_NAME,
+                ROUND(SUM(CREDITS_USED),2)                   AS CREDITS_USED,
+            FROM  SNOWFLAKE.ACCOUNT_USAGE.WAREHOUSE_METERING_HISTORY 
+            WHERE
+                """+since_predicate("START_TIME")+"""
+            GROUP BY 1,2
+            ORDER BY 1 
+        )
+        , DATA_PIVOT AS (
+            SELECT *
+            FROM DATA
+                PIVOT(  MAX (CREDITS_USED)  FOR WAREHOUSE_NAME IN (any order by WAREHOUSE_NAME) DEFAULT ON NULL (0) )    
+            ORDER BY DATE 
+        )
+        SELECT *  FROM DATA_PIVOT;
+        """        
+        cur = conn.cursor()
+        cur.execute(sql_query)
+        column_count=len(cur.description)
+        headers =[i[0] for i in cur.description]
+        html_file=html_file+str(headers).replace('"','')+", \n"
+    
+        sql_query=sql_header+"""
+        WITH DATA AS (
+            SELECT 
+                DATE_TRUNC('DAY',START_TIME::TIMESTAMP_NTZ)  AS DATE, 
+                WAREHOUSE_NAME                               AS WAREHOUSE_NAME,
+                ROUND(SUM(CREDITS_USED),2)                   AS CREDITS_USED,
+            FROM  SNOWFLAKE.ACCOUNT_USAGE.WAREHOUSE_METERING_HISTORY 
+            WHERE
+                """+since_predicate("start_time")+"""
+            GROUP BY 1,2
+            ORDER BY 1 
+        )
+        , DATA_PIVOT AS (
+        SELECT *
+        FROM DATA
+            PIVOT(  MAX (CREDITS_USED)  FOR WAREHOUSE_NAME IN ( """+str(headers).replace('"','').replace("[","").replace("]","").replace("'DATE',","")+""") DEFAULT ON NULL (0) )    
+        ORDER BY DATE 
+        )
+        SELECT ARRAY_CONSTRUCT(*) AS DATA FROM DATA_PIVOT;
+        """
+        cur_details = conn.cursor()
+        cur_details.execute(sql_query)
+    
+        if int(cur_details.rowcount)!=0:
+            counter=0
+            for (row_data) in cur_details:
+                counter=counter+1
+                if counter==cur_details.rowcount:
+                    html_file=html_file+str(row_data[0])
+                else:
+                    html_file=html_file+str(row_data[0])+""","""
+    
+            html_file=html_file+html_body1
+    		
+            for i in range(1, column_count):
+                if i==column_count-1:
+                    html_file=html_file+"""row["""+str(i)+"""]"""
+                else:
+                    html_file=html_file+"""row["""+str(i)+"""],"""
+    		
+            html_file=html_file+html_body2+"""
+            title: `Prismafy v1.0 - https://github.com/prismafy/prismafy
+            Chart Creation Date: """+report_formatted_time+"""
+            Warehouse Credits Consumption`,"""+html_line_hour_tail
             
-            html_file=html_table_header
-
-            sql_query=sql_header+"""
-                WITH DATA AS (
-                SELECT DATE_TRUNC('HOUR',START_TIME)                        AS START_TIME , 
-                  QUERY_PARAMETERIZED_HASH                                  AS QUERY_PARAMETERIZED_HASH,
-                  REPLACE(REPLACE(QUERY_TEXT,'\n',' '),'<td>')              AS QUERY_TEXT,
-                  ROUND(TOTAL_ELAPSED_TIME/1000,2)                          AS QUERY_EXECUTION_TIME_SECONDS,
-                  ROUND(PARTITIONS_SCANNED,2)                               AS PARTITIONS_SCANNED,
-                  ROUND(PARTITIONS_TOTAL,2)                                 AS PARTITIONS_TOTAL,
-                  ROUND(TO_NUMBER(PERCENTAGE_SCANNED_FROM_CACHE,10,2),2)    AS PERCENTAGE_SCANNED_FROM_CACHE,
-                  ROUND(BYTES_READ_FROM_RESULT/1024/1024/1024,2)            AS GB_READ_FROM_RESULT,
-                  ROUND(ROWS_PRODUCED,2)                                    AS ROWS_PRODUCED,
-                  ROUND(BYTES_SPILLED_TO_LOCAL_STORAGE/1024/1024/1024,2)    AS GB_SPILLED_TO_LOCAL_STORAGE,
-                  ROUND(BYTES_SPILLED_TO_REMOTE_STORAGE/1024/1024/1024,2)   AS GB_SPILLED_TO_REMOTE_STORAGE,
-                  ROUND(BYTES_SENT_OVER_THE_NETWORK/1024/1024/1024  ,2)     AS GB_SENT_OVER_THE_NETWORK,
-                  ROUND(COMPILATION_TIME/1000,2)                            AS COMPILATION_TIME_SECONDS,
-                  ROUND(EXECUTION_TIME/1000 ,2)                             AS EXECUTION_TIME_SECONDS,
-                  ROUND(QUEUED_PROVISIONING_TIME/1000 ,2)                   AS QUEUED_PROVISIONING_TIME_SECONDS,
-                  ROUND(QUEUED_OVERLOAD_TIME/1000   ,2)                     AS QUEUED_OVERLOAD_TIME_SECONDS,
-                  ROUND(TRANSACTION_BLOCKED_TIME/1000  ,2)                  AS TRANSACTION_BLOCKED_TIME_SECONDS,
-                  ROUND(QUERY_LOAD_PERCENT,2)                               AS QUERY_LOAD_PERCENT
-                FROM SNOWFLAKE.ACCOUNT_USAGE.QUERY_HISTORY Q
-                WHERE  TO_DATE(Q.START_TIME) > DATEADD(MONTH,-1,TO_TIMESTAMP("""+report_formatted_time+"""))
-                  AND TOTAL_ELAPSED_TIME > 0
-                  AND ERROR_CODE IS NULL
-                  AND """+ iteration +""" IS NOT NULL
-                ORDER BY """+ iteration +""" DESC
-                LIMIT 50
-                )
-                SELECT 
-                    ROW_NUMBER() over (order by """+ iteration +"""  DESC)       AS TOP_N
-                    ,START_TIME
-                    ,QUERY_PARAMETERIZED_HASH
-                    ,QUERY_TEXT
-                    ,QUERY_EXECUTION_TIME_SECONDS
-                    ,PARTITIONS_SCANNED
-                    ,PARTITIONS_TOTAL
-                    ,PERCENTAGE_SCANNED_FROM_CACHE
-                    ,GB_READ_FROM_RESULT
-                    ,ROWS_PRODUCED
-                    ,GB_SPILLED_TO_LOCAL_STORAGE
-                    ,GB_SPILLED_TO_REMOTE_STORAGE
-                    ,GB_SENT_OVER_THE_NETWORK
-                    ,COMPILATION_TIME_SECONDS
-                    ,EXECUTION_TIME_SECONDS
-                    ,QUEUED_PROVISIONING_TIME_SECONDS
-                    ,QUEUED_OVERLOAD_TIME_SECONDS
-                    ,TRANSACTION_BLOCKED_TIME_SECONDS
-                    ,QUERY_LOAD_PERCENT
-                FROM DATA
-                ORDER BY TOP_N;
-            """
+            create_output_file('credits_consumption_by_warehouse.html',html_file)
+            report_sections["C - Credits"].update({'credits_consumption_by_warehouse.html':'line'})
             
-            cur = conn.cursor()
-            cur.execute(sql_query)
-        
-            html_file=html_file+"""
-            <h3>Top query for """+ iteration.lower() +""" for last month</h3>
-            <table class="tabla2">
-            <tr>
-            <th >TOP_N</th>
-            <th >DATE</th>
-            <th >QUERY_PARAMETERIZED_HASH</th>
-            <th >QUERY_EXECUTION_TIME_SECONDS</th>
-            <th >PARTITIONS_SCANNED</th>
-            <th >PARTITIONS_TOTAL</th>
-            <th >PERCENTAGE_SCANNED_FROM_CACHE</th>
-            <th >GB_READ_FROM_RESULT</th>
-            <th >ROWS_PRODUCED</th>
-            <th >GB_SPILLED_TO_LOCAL_STORAGE</th>
-            <th >GB_SPILLED_TO_REMOTE_STORAGE</th>
-            <th >GB_SENT_OVER_THE_NETWORK</th>
-            <th >COMPILATION_TIME_SECONDS</th>
-            <th >EXECUTION_TIME_SECONDS</th>
-            <th >QUEUED_PROVISIONING_TIME_SECONDS</th>
-            <th >QUEUED_OVERLOAD_TIME_SECONDS</th>
-            <th >TRANSACTION_BLOCKED_TIME_SECONDS</th>
-            <th >QUERY_LOAD_PERCENT</th>
-            <th >QUERY_TEXT</th>
-            """
-        
-            if int(cur.rowcount)!=0:
-                for (ROW_TOP_N, ROW_START_TIME, ROW_QUERY_PARAMETERIZED_HASH, ROW_QUERY_TEXT, ROW_QUERY_EXECUTION_TIME_SECONDS, ROW_PARTITIONS_SCANNED, ROW_PARTITIONS_TOTAL, ROW_PERCENTAGE_SCANNED_FROM_CACHE, ROW_GB_READ_FROM_RESULT, ROW_ROWS_PRODUCED, ROW_GB_SPILLED_TO_LOCAL_STORAGE, ROW_GB_SPILLED_TO_REMOTE_STORAGE, ROW_GB_SENT_OVER_THE_NETWORK, ROW_COMPILATION_TIME_SECONDS, ROW_EXECUTION_TIME_SECONS, ROW_QUEUED_PROVISIONING_TIME_SECONDS, ROW_QUEUED_OVERLOAD_TIME_SECONDS, ROW_TRANSACTION_BLOCKED_TIME_SECONDS, ROW_QUERY_LOAD_PERCENT) in cur:
-                    html_file=html_file+""" <tr> 
-                    <td>"""+str(ROW_TOP_N)+"""</td> 
-                    <td>"""+str(ROW_START_TIME)+"""</td> 
-                     <td>"""+str(ROW_QUERY_PARAMETERIZED_HASH)+"""</td> 
-                     <td>"""+str(ROW_QUERY_EXECUTION_TIME_SECONDS)+"""</td> 
-                     <td>"""+str(ROW_PARTITIONS_SCANNED)+"""</td> 
-                     <td>"""+str(ROW_PARTITIONS_TOTAL)+"""</td> 
-                     <td>"""+str(ROW_PERCENTAGE_SCANNED_FROM_CACHE)+"""</td> 
-                     <td>"""+str(ROW_GB_READ_FROM_RESULT)+"""</td> 
-                     <td>"""+str(ROW_ROWS_PRODUCED)+"""</td> 
-                     <td>"""+str(ROW_GB_SPILLED_TO_LOCAL_STORAGE)+"""</td> 
-                     <td>"""+str(ROW_GB_SPILLED_TO_REMOTE_STORAGE)+"""</td> 
-                     <td>"""+str(ROW_GB_SENT_OVER_THE_NETWORK)+"""</td> 
-                     <td>"""+str(ROW_COMPILATION_TIME_SECONDS)+"""</td>
-                     <td>"""+str(ROW_EXECUTION_TIME_SECONS)+"""</td> 
-                     <td>"""+str(ROW_QUEUED_PROVISIONING_TIME_SECONDS)+"""</td> 
-                     <td>"""+str(ROW_QUEUED_OVERLOAD_TIME_SECONDS)+"""</td> 
-                     <td>"""+str(ROW_TRANSACTION_BLOCKED_TIME_SECONDS)+"""</td> 
-                     <td>"""+str(ROW_QUERY_LOAD_PERCENT)+"""</td> 
-                     <td class="cell_grow">"""+str(ROW_QUERY_TEXT.replace("\\n"," "))+"""</td> 
-                    </tr> """
-                
-                html_file=html_file+html_table_tail
-        
-                create_output_file('last_month_top_query_for_'+ iteration.lower() +'.html',html_file)
-                report_sections["D - Performance"].update({'last_month_top_query_for_'+ iteration.lower() +'.html':'table'})
-    
     except Exception as error:
-        print("[table_month_top_query]: An exception occurred:", error)
+        print("[line_history_account_consumption_credits_by_warehouse]: An exception occurred:", error)
 
-def table_week_top_query(conn):
+def bar_month_consumption_credits_by_warehouse(conn):
     try:
         global snowflake_conn
-        global html_table_header
-        global html_table_tail
         global report_sections
         conn =snowflake_conn
         
-        iterations = ["query_execution_time_seconds", "partitions_scanned","percentage_scanned_from_cache", "rows_produced","gb_spilled_to_local_storage","gb_spilled_to_remote_storage","gb_sent_over_the_network","compilation_time_seconds","queued_provisioning_time_seconds","queued_overload_time_seconds","query_load_percent"]
-        
-        for iteration in iterations:
-            
-            html_file=html_table_header
-            
-            sql_query=sql_header+"""
-                WITH DATA AS (
-                SELECT DATE_TRUNC('HOUR',START_TIME)                        AS START_TIME , 
-                  QUERY_PARAMETERIZED_HASH                                  AS QUERY_PARAMETERIZED_HASH,
-                  REPLACE(REPLACE(query_text,'\n',' '),'<td>')              AS QUERY_TEXT,
-                  ROUND(TOTAL_ELAPSED_TIME/1000,2)                          AS QUERY_EXECUTION_TIME_SECONDS,
-                  ROUND(PARTITIONS_SCANNED,2)                               AS PARTITIONS_SCANNED,
-                  ROUND(PARTITIONS_TOTAL,2)                                 AS PARTITIONS_TOTAL,
-                  ROUND(TO_NUMBER(PERCENTAGE_SCANNED_FROM_CACHE,10,2),2)    AS PERCENTAGE_SCANNED_FROM_CACHE,
-                  ROUND(BYTES_READ_FROM_RESULT/1024/1024/1024,2)            AS GB_READ_FROM_RESULT,
-                  ROUND(ROWS_PRODUCED,2)                                    AS ROWS_PRODUCED,
-                  ROUND(BYTES_SPILLED_TO_LOCAL_STORAGE/1024/1024/1024,2)    AS GB_SPILLED_TO_LOCAL_STORAGE,
-                  ROUND(BYTES_SPILLED_TO_REMOTE_STORAGE/1024/1024/1024,2)   AS GB_SPILLED_TO_REMOTE_STORAGE,
-                  ROUND(BYTES_SENT_OVER_THE_NETWORK/1024/1024/1024  ,2)     AS GB_SENT_OVER_THE_NETWORK,
-                  ROUND(COMPILATION_TIME/1000,2)                            AS COMPILATION_TIME_SECONDS,
-                  ROUND(EXECUTION_TIME/1000 ,2)                             AS EXECUTION_TIME_SECONDS,
-                  ROUND(QUEUED_PROVISIONING_TIME/1000 ,2)                   AS QUEUED_PROVISIONING_TIME_SECONDS,
-                  ROUND(QUEUED_OVERLOAD_TIME/1000   ,2)                     AS QUEUED_OVERLOAD_TIME_SECONDS,
-                  ROUND(TRANSACTION_BLOCKED_TIME/1000  ,2)                  AS TRANSACTION_BLOCKED_TIME_SECONDS,
-                  ROUND(QUERY_LOAD_PERCENT,2)                               AS QUERY_LOAD_PERCENT
-                FROM SNOWFLAKE.ACCOUNT_USAGE.QUERY_HISTORY Q
-                WHERE  TO_DATE(Q.START_TIME) > DATEADD(DAY,-7,TO_TIMESTAMP("""+report_formatted_time+"""))
-                  AND TOTAL_ELAPSED_TIME > 0 
-                  AND ERROR_CODE IS NULL
-                  AND """+ iteration +""" IS NOT NULL
-                ORDER BY """+ iteration +""" DESC
-                LIMIT 50
-                )
-                SELECT 
-                    ROW_NUMBER() OVER (ORDER BY """+ iteration +"""  DESC)       AS TOP_N
-                    ,START_TIME
-                    ,QUERY_PARAMETERIZED_HASH
-                    ,QUERY_TEXT
-                    ,NVL(QUERY_EXECUTION_TIME_SECONDS,0)
-                    ,NVL(PARTITIONS_SCANNED,0)
-                    ,NVL(PARTITIONS_TOTAL,0)
-                    ,NVL(PERCENTAGE_SCANNED_FROM_CACHE,0)
-                    ,NVL(GB_READ_FROM_RESULT,0)
-                    ,NVL(ROWS_PRODUCED,0)
-                    ,NVL(GB_SPILLED_TO_LOCAL_STORAGE,0)
-                    ,NVL(GB_SPILLED_TO_REMOTE_STORAGE,0)
-                    ,NVL(GB_SENT_OVER_THE_NETWORK,0)
-                    ,NVL(COMPILATION_TIME_SECONDS,0)
-                    ,NVL(EXECUTION_TIME_SECONDS,0)
-                    ,NVL(QUEUED_PROVISIONING_TIME_SECONDS,0)
-                    ,NVL(QUEUED_OVERLOAD_TIME_SECONDS,0)
-                    ,NVL(TRANSACTION_BLOCKED_TIME_SECONDS,0)
-                    ,NVL(QUERY_LOAD_PERCENT,0)
-                FROM DATA
-                ORDER BY TOP_N;
-            """
-            
-            cur = conn.cursor()
-            cur.execute(sql_query)
-        
-            html_file=html_file+"""
-            <h3>Top query for """+ iteration.lower() +""" for last week</h3>
-            <table class="tabla2">
-            <tr>
-            <th >TOP_N</th>
-            <th >DATE</th>
-            <th >QUERY_PARAMETERIZED_HASH</th>
-            <th >QUERY_EXECUTION_TIME_SECONDS</th>
-            <th >PARTITIONS_SCANNED</th>
-            <th >PARTITIONS_TOTAL</th>
-            <th >PERCENTAGE_SCANNED_FROM_CACHE</th>
-            <th >GB_READ_FROM_RESULT</th>
-            <th >ROWS_PRODUCED</th>
-            <th >GB_SPILLED_TO_LOCAL_STORAGE</th>
-            <th >GB_SPILLED_TO_REMOTE_STORAGE</th>
-            <th >GB_SENT_OVER_THE_NETWORK</th>
-            <th >COMPILATION_TIME_SECONDS</th>
-            <th >EXECUTION_TIME_SECONDS</th>
-            <th >QUEUED_PROVISIONING_TIME_SECONDS</th>
-            <th >QUEUED_OVERLOAD_TIME_SECONDS</th>
-            <th >TRANSACTION_BLOCKED_TIME_SECONDS</th>
-            <th >QUERY_LOAD_PERCENT</th>
-            <th >QUERY_TEXT</th>
-            """
+        html_file=html_header
         
-            if int(cur.rowcount)!=0:
-                for (ROW_TOP_N, ROW_START_TIME, ROW_QUERY_PARAMETERIZED_HASH, ROW_QUERY_TEXT, ROW_QUERY_EXECUTION_TIME_SECONDS, ROW_PARTITIONS_SCANNED, ROW_PARTITIONS_TOTAL, ROW_PERCENTAGE_SCANNED_FROM_CACHE, ROW_GB_READ_FROM_RESULT, ROW_ROWS_PRODUCED, ROW_GB_SPILLED_TO_LOCAL_STORAGE, ROW_GB_SPILLED_TO_REMOTE_STORAGE, ROW_GB_SENT_OVER_THE_NETWORK, ROW_COMPILATION_TIME_SECONDS, ROW_EXECUTION_TIME_SECONS, ROW_QUEUED_PROVISIONING_TIME_SECONDS, ROW_QUEUED_OVERLOAD_TIME_SECONDS, ROW_TRANSACTION_BLOCKED_TIME_SECONDS, ROW_QUERY_LOAD_PERCENT) in cur:
-                    html_file=html_file+""" <tr> 
-                    <td>"""+str(ROW_TOP_N)+"""</td> 
-                    <td>"""+str(ROW_START_TIME)+"""</td> 
-                     <td>"""+str(ROW_QUERY_PARAMETERIZED_HASH)+"""</td> 
-                     <td>"""+str(ROW_QUERY_EXECUTION_TIME_SECONDS)+"""</td> 
-                     <td>"""+str(ROW_PARTITIONS_SCANNED)+"""</td> 
-                     <td>"""+str(ROW_PARTITIONS_TOTAL)+"""</td> 
-                     <td>"""+str(ROW_PERCENTAGE_SCANNED_FROM_CACHE)+"""</td> 
-                     <td>"""+str(ROW_GB_READ_FROM_RESULT)+"""</td> 
-                     <td>"""+str(ROW_ROWS_PRODUCED)+"""</td> 
-                     <td>"""+str(ROW_GB_SPILLED_TO_LOCAL_STORAGE)+"""</td> 
-                     <td>"""+str(ROW_GB_SPILLED_TO_REMOTE_STORAGE)+"""</td> 
-                     <td>"""+str(ROW_GB_SENT_OVER_THE_NETWORK)+"""</td> 
-                     <td>"""+str(ROW_COMPILATION_TIME_SECONDS)+"""</td>
-                     <td>"""+str(ROW_EXECUTION_TIME_SECONS)+"""</td> 
-                     <td>"""+str(ROW_QUEUED_PROVISIONING_TIME_SECONDS)+"""</td> 
-                     <td>"""+str(ROW_QUEUED_OVERLOAD_TIME_SECONDS)+"""</td> 
-                     <td>"""+str(ROW_TRANSACTION_BLOCKED_TIME_SECONDS)+"""</td> 
-                     <td>"""+str(ROW_QUERY_LOAD_PERCENT)+"""</td> 
-                     <td class="cell_grow">"""+str(ROW_QUERY_TEXT)+"""</td> 
-                    </tr> """
-                
-                html_file=html_file+html_table_tail
-
-                create_output_file('last_week_top_query_for_'+ iteration.lower() +'.html',html_file)
-                report_sections["D - Performance"].update({'last_week_top_query_for_'+ iteration.lower() +'.html':'table'})
+        sql_query=sql_header+"""
+            WITH DATA AS (
+            SELECT 
+                DATE_TRUNC('MONTH',START_TIME::TIMESTAMP_NTZ)   AS MONTH, 
+                WAREHOUSE_NAME                                  AS WAREHOUSE_NAME,
+                ROUND(SUM(CREDITS_USED),2)                      AS CREDITS_USED,
+            FROM  SNOWFLAKE.ACCOUNT_USAGE.WAREHOUSE_METERING_HISTORY 
+            WHERE
+                """+since_predicate("start_time")+"""
+            GROUP BY 1,2
+            ORDER BY 1 
+        )
+        , DATA_PIVOT AS (
+        SELECT *
+        FROM DATA
+            PIVOT(  MAX (CREDITS_USED)  FOR WAREHOUSE_NAME IN (any order by WAREHOUSE_NAME) DEFAULT ON NULL (0) )    
+        ORDER BY MONTH 
+        )
+        SELECT *  FROM DATA_PIVOT;
+        """
         
-    except Exception as error:
-        print("[table_week_top_query]: An exception occurred:", error)
-            
-def line_history_bytes_details_by_query_parameterized_hash(conn,sql_query_id):
-    try:    
-        global snowflake_conn
-        global html_body1
-        global html_line_hour_tail
-        global report_sections
-        conn =snowflake_conn
-                            
-        html_file=html_header+"""
-        [
-        'DATE',
-        'GB_READ_FROM_RESULT',
-        'GB_SPILLED_TO_LOCAL_STORAGE',
-        'GB_SPILLED_TO_REMOTE_STORAGE',
-        'GB_SENT_OVER_THE_NETWORK',
-        'GB_WRITTEN',
-        'GB_WRITTEN_TO_RESULT',
-        'GB_SCANNED',
-        'GB_DELETED',
-        'OUTBOUND_DATA_TRANSFER_GB',
-        'INBOUND_DATA_TRANSFER_GB',
-        'EXTERNAL_FUNCTION_TOTAL_SENT_GB',
-        'EXTERNAL_FUNCTION_TOTAL_RECEIVED_GB',
-        'QUERY_ACCELERATION_GB_SCANNED'
-        ],
-        """
-        
-        sql_query_details=sql_header+"""
+        cur = conn.cursor()
+        cur.execute(sql_query)
+        column_count=len(cur.description)
+        headers =[i[0] for i in cur.description]
+        html_file=html_file+str(headers).replace('"','')+", \n"
+    
+        sql_query=sql_header+"""
         WITH DATA AS (
-        SELECT DATE_TRUNC('HOUR',START_TIME::TIMESTAMP_NTZ)                          AS START_TIME , 
-        ROUND(MAX(NVL(BYTES_READ_FROM_RESULT,0)/1024/1024/1024),2)                   AS GB_READ_FROM_RESULT,
-        ROUND(MAX(NVL(BYTES_SPILLED_TO_LOCAL_STORAGE,0)/1024/1024/1024),2)           AS GB_SPILLED_TO_LOCAL_STORAGE,
-        ROUND(MAX(NVL(BYTES_SPILLED_TO_REMOTE_STORAGE,0)/1024/1024/1024),2)          AS GB_SPILLED_TO_REMOTE_STORAGE,
-        ROUND(MAX(NVL(BYTES_SENT_OVER_THE_NETWORK,0)/1024/1024/1024 ),2)             AS GB_SENT_OVER_THE_NETWORK,
-        ROUND(MAX(NVL(BYTES_WRITTEN,0)/1024/1024/1024),2)                            AS GB_WRITTEN,
-        ROUND(MAX(NVL(BYTES_WRITTEN_TO_RESULT,0)/1024/1024/1024),2)                  AS GB_WRITTEN_TO_RESULT,
-        ROUND(MAX(NVL(BYTES_SCANNED,0)/1024/1024/1024),2)                            AS GB_SCANNED   ,
-        ROUND(MAX(NVL(BYTES_DELETED,0)/1024/1024/1024),2)                            AS GB_DELETED,
-        ROUND(MAX(NVL(OUTBOUND_DATA_TRANSFER_BYTES,0)/1024/1024/1024),2)             AS OUTBOUND_DATA_TRANSFER_GB,
-        ROUND(MAX(NVL(INBOUND_DATA_TRANSFER_BYTES,0)/1024/1024/1024),2)              AS INBOUND_DATA_TRANSFER_GB,
-        ROUND(MAX(NVL(EXTERNAL_FUNCTION_TOTAL_SENT_BYTES,0)/1024/1024/1024),2)       AS EXTERNAL_FUNCTION_TOTAL_SENT_GB,
-        ROUND(MAX(NVL(EXTERNAL_FUNCTION_TOTAL_RECEIVED_BYTES,0)/1024/1024/1024),2)   AS EXTERNAL_FUNCTION_TOTAL_RECEIVED_GB,
-        ROUND(MAX(NVL(QUERY_ACCELERATION_BYTES_SCANNED,0)/1024/1024/1024),2)         AS QUERY_ACCELERATION_GB_SCANNED
-        FROM SNOWFLAKE.ACCOUNT_USAGE.QUERY_HISTORY Q
-        WHERE  TO_DATE(Q.START_TIME) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-        AND TOTAL_ELAPSED_TIME > 0 
-        AND QUERY_PARAMETERIZED_HASH='"""+str(sql_query_id)+"""'
-        GROUP BY 1
-        ORDER BY START_TIME  
+            SELECT 
+                DATE_TRUNC('MONTH',START_TIME::TIMESTAMP_NTZ)   AS MONTH, 
+                WAREHOUSE_NAME                                  AS WAREHOUSE_NAME,
+                ROUND(SUM(CREDITS_USED),2)                      AS CREDITS_USED,
+            FROM  SNOWFLAKE.ACCOUNT_USAGE.WAREHOUSE_METERING_HISTORY 
+            WHERE
+                """+since_predicate("START_TIME")+"""
+            GROUP BY 1,2
+            ORDER BY 1 
         )
-        SELECT ARRAY_CONSTRUCT(*) AS DATA FROM DATA;
-        """
-        cur_details = conn.cursor()
-        cur_details.execute(sql_query_details)
-        
-        if int(cur_details.rowcount)!=0:
-            for (row_data) in cur_details:
-                html_file=html_file+str(row_data[0])+""","""
-            
-            html_file=html_file+html_body1+"""
-            row[1],row[2],row[3],row[4],row[5],row[6],row[7],row[8],row[9],row[10],row[11],row[12],row[13]
-            """+html_body2+"""
-            trendlines: {6:{type: 'linear', color: '#16F529', labelInLegend: 'Trend for gb_scanned', visibleInLegend: true, opacity: 0.6, pointsVisible: false, lineWidth:2}},
-            title: `Prismafy v1.0 - https://github.com/prismafy/prismafy
-            Chart Creation Date: """+report_formatted_time+"""
-            Bytes Details for query """+str(sql_query_id)+""" in the last month`,
-            """+html_line_hour_tail
-        
-            create_output_file('history_bytes_details_for_'+  sql_query_id.lower()  +'.html',html_file)
-            report_sections["D - Performance"].update({'history_bytes_details_for_'+  sql_query_id.lower()  +'.html':'line'})
-            
-    except Exception as error:
-        print("[line_history_bytes_details_by_query_parameterized_hash]: An exception occurred:", error) 
-
-def line_history_calls_details_by_query_parameterized_hash(conn,sql_query_id):
-
-    try:        
-        global snowflake_conn
-        conn =snowflake_conn
-        global report_sections
-        
-        html_file=html_header+"""
-        [
-        'START_TIME',
-        'CALLS'
-        ],
-        """
-
-        sql_query_details=sql_header+"""
-        WITH DATA AS (
-            SELECT DATE_TRUNC('HOUR',INTERVAL_START_TIME::TIMESTAMP_NTZ)    AS START_TIME , 
-                SUM(NVL(CALLS,0))                                           AS CALLS
-            FROM SNOWFLAKE.ACCOUNT_USAGE.AGGREGATE_QUERY_HISTORY  Q
-            WHERE  TO_DATE(Q.INTERVAL_START_TIME) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-            AND QUERY_PARAMETERIZED_HASH='"""+str(sql_query_id)+"""'
-            GROUP BY 1
-            ORDER BY START_TIME  
+        , DATA_PIVOT AS (
+            SELECT *
+            FROM DATA
+                PIVOT(  MAX (CREDITS_USED)  FOR WAREHOUSE_NAME IN ( """+str(headers).replace('"','').replace("[","").replace("]","").replace("'MONTH',","")+""") DEFAULT ON NULL (0) )    
+            ORDER BY MONTH 
         )
-        SELECT ARRAY_CONSTRUCT(*) AS DATA FROM DATA;
+        SELECT ARRAY_CONSTRUCT(*) AS DATA FROM DATA_PIVOT;
         """
         cur_details = conn.cursor()
-        cur_details.execute(sql_query_details)
-        
+        cur_details.execute(sql_query)
+    
         if int(cur_details.rowcount)!=0:
+            counter=0
             for (row_data) in cur_details:
-                html_file=html_file+str(row_data[0])+""","""
-            
-            html_file=html_file+html_body1+"""
-            row[1]
-            """+html_body2+"""
-            trendlines: {0:{type: 'linear', color: '#16F529', labelInLegend: 'Trend for calls', visibleInLegend: true, opacity: 0.6, pointsVisible: false, lineWidth:2}},
+                counter=counter+1
+                if counter==cur_details.rowcount:
+                    html_file=html_file+str(row_data[0])
+                else:
+                    html_file=html_file+str(row_data[0])+""","""
+    
+            html_file=html_file+html_body1
+                
+            for i in range(1, column_count):
+                if i==column_count-1:
+                    html_file=html_file+"""row["""+str(i)+"""]"""
+                else:
+                    html_file=html_file+"""row["""+str(i)+"""],"""
+                
+            html_file=html_file+html_body2+"""
             title: `Prismafy v1.0 - https://github.com/prismafy/prismafy
             Chart Creation Date: """+report_formatted_time+"""
-            Calls Detail for query """+str(sql_query_id)+"""`,"""+html_line_hour_tail
-
-            create_output_file('calls_details_for_'+  sql_query_id.lower()  +'.html',html_file)
-            report_sections["D - Performance"].update({'calls_details_for_'+  sql_query_id.lower()  +'.html':'line'})
-        
-    except Exception as error:
-        print("[line_calls_details_by_query_parameterized_hash]: An exception occurred:", error)
-
-def line_history_time_details_by_query_parameterized_hash(conn,sql_query_id):
-
-    try:
-        global snowflake_conn
-        conn =snowflake_conn
-        global report_sections
-                        
-        html_file=html_header+"""
-        [
-        'DATE',
-        'QUERY_EXECUTION_TIME_SECONDS',
-        'COMPILATION_TIME_SECONDS',
-        'EXECUTION_TIME_SECONDS',
-        'QUEUED_PROVISIONING_TIME_SECONDS',
-        'QUEUED_OVERLOAD_TIME_SECONDS',
-        'TRANSACTION_BLOCKED_TIME_SECONDS',
-        'QUEUED_REPAIR_TIME_SECONDS',
-        'LIST_EXTERNAL_FILES_TIME_SECONDS',
-        'CHILD_QUERIES_WAIT_TIME_SECONDS',
-        'QUERY_RETRY_TIME_SECONDS',
-        'FAULT_HANDLING_TIME_SECONDS'
-        ],
-        """
-
-        sql_query_details=sql_header+"""
-        WITH DATA AS (
-        SELECT DATE_TRUNC('HOUR',START_TIME::TIMESTAMP_NTZ)            AS START_TIME , 
-            ROUND(MAX(NVL(total_elapsed_time,0))/1000,2)                 AS QUERY_EXECUTION_TIME_SECONDS,
-            ROUND(MAX(NVL(COMPILATION_TIME,0))/1000,2)                   AS COMPILATION_TIME_SECONDS,
-            ROUND(MAX(NVL(EXECUTION_TIME,0))/1000,2)                     AS EXECUTION_TIME_SECONDS,
-            ROUND(MAX(NVL(QUEUED_PROVISIONING_TIME,0) )/1000,2)          AS QUEUED_PROVISIONING_TIME_SECONDS,
-            ROUND(MAX(NVL(QUEUED_OVERLOAD_TIME,0))/1000,2)               AS QUEUED_OVERLOAD_TIME_SECONDS,
-            ROUND(MAX(NVL(TRANSACTION_BLOCKED_TIME,0))/1000,2)           AS TRANSACTION_BLOCKED_TIME_SECONDS,
-            ROUND(MAX(NVL(QUEUED_REPAIR_TIME,0))/1000,2)                 AS QUEUED_REPAIR_TIME_SECONDS   ,
-            ROUND(MAX(NVL(LIST_EXTERNAL_FILES_TIME,0))/1000,2)           AS LIST_EXTERNAL_FILES_TIME_SECONDS,
-            ROUND(MAX(NVL(CHILD_QUERIES_WAIT_TIME,0))/1000,2)            AS CHILD_QUERIES_WAIT_TIME_SECONDS,
-            ROUND(MAX(NVL(QUERY_RETRY_TIME,0))/1000,2)                   AS QUERY_RETRY_TIME_SECONDS,
-            ROUND(MAX(NVL(FAULT_HANDLING_TIME,0))/1000,2)                AS FAULT_HANDLING_TIME_SECONDS,
-        FROM snowflake.account_usage.query_history Q
-        WHERE  TO_DATE(Q.start_time) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-            AND total_elapsed_time > 0 
-            and query_parameterized_hash='"""+str(sql_query_id)+"""'
-        GROUP BY 1
-        ORDER BY START_TIME  
-        )
-        SELECT ARRAY_CONSTRUCT(*) AS DATA FROM DATA;
-        """
-        cur_details = conn.cursor()
-        cur_details.execute(sql_query_details)
+            Warehouse Credits Consumption per month`,
+            """+html_bar_month_tail
         
-        if int(cur_details.rowcount)!=0:
-            for (row_data) in cur_details:
-                html_file=html_file+str(row_data[0])+""","""
+            create_output_file('per_month_credits_consumption_by_warehouse.html',html_file)
+            report_sections["C - Credits"].update({'per_month_credits_consumption_by_warehouse.html':'bar'})
             
-            html_file=html_file+  html_body1 +"""
-            row[1],row[2],row[3],row[4],row[5],row[6],row[7],row[8],row[9],row[10],row[11]
-            """+ html_body2 +"""
-            trendlines: {0:{type: 'linear', color: '#16F529', labelInLegend: 'Trend for query_execution_time_seconds', visibleInLegend: true, opacity: 0.6, pointsVisible: false, lineWidth:2}},
-            title: `Prismafy v1.0 - https://github.com/prismafy/prismafy
-            Chart Creation Date: """+report_formatted_time+"""
-            Time Details for query """+str(sql_query_id)+"""`,"""+ html_line_hour_tail  
-
-            create_output_file('time_details_for_'+  sql_query_id.lower()  +'.html',html_file)
-            report_sections["D - Performance"].update({'time_details_for_'+ sql_query_id.lower()  +'.html':'line'})
-        
     except Exception as error:
-        print("[line_time_details_by_query_parameterized_hash]: An exception occurred:", error)
+        print("[bar_month_consumption_credits_by_warehouse]: An exception occurred:", error)
 
-def line_history_rows_details_by_query_parameterized_hash(conn,sql_query_id):
-    try:
-        
+def bar_week_consumption_credits_by_warehouse(conn):
+    try:  
         global snowflake_conn
         global report_sections
         conn =snowflake_conn
-                            
-        html_file=html_header+"""
-        [
-        'DATE',
-        'ROWS_PRODUCED',
-        'ROWS_INSERTED',
-        'ROWS_UPDATED',
-        'ROWS_DELETED',
-        'ROWS_UNLOADED',
-        'EXTERNAL_FUNCTION_TOTAL_SENT_ROWS',
-        'EXTERNAL_FUNCTION_TOTAL_RECEIVED_ROWS',
-        'ROWS_WRITTEN_TO_RESULT'
-        ],
-        """
-        sql_query_details=sql_header+"""
-        WITH DATA AS (
-        SELECT DATE_TRUNC('HOUR',START_TIME::TIMESTAMP_NTZ)            AS START_TIME , 
-            ROUND(MAX(NVL(ROWS_PRODUCED,0)),2)                           AS ROWS_PRODUCED,
-            ROUND(MAX(NVL(ROWS_INSERTED,0)),2)                           AS ROWS_INSERTED,
-            ROUND(MAX(NVL(ROWS_UPDATED,0)),2)                            AS ROWS_UPDATED,
-            ROUND(MAX(NVL(ROWS_DELETED,0) ),2)                           AS ROWS_DELETED,
-            ROUND(MAX(NVL(ROWS_UNLOADED,0)),2)                           AS ROWS_UNLOADED,
-            ROUND(MAX(NVL(EXTERNAL_FUNCTION_TOTAL_SENT_ROWS,0)),2)       AS EXTERNAL_FUNCTION_TOTAL_SENT_ROWS,
-            ROUND(MAX(NVL(EXTERNAL_FUNCTION_TOTAL_RECEIVED_ROWS,0)),2)   AS EXTERNAL_FUNCTION_TOTAL_RECEIVED_ROWS   ,
-            ROUND(MAX(NVL(ROWS_WRITTEN_TO_RESULT,0)),2)                  AS ROWS_WRITTEN_TO_RESULT,
-        FROM snowflake.account_usage.query_history Q
-        WHERE  TO_DATE(Q.start_time) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-            AND total_elapsed_time > 0 --only get queries that actually used compute
-            and query_parameterized_hash='"""+str(sql_query_id)+"""'
-        GROUP BY 1
-        ORDER BY START_TIME  
-        )
-        SELECT ARRAY_CONSTRUCT(*) AS DATA FROM DATA;
-        """
-        cur_details = conn.cursor()
-        cur_details.execute(sql_query_details)
-        
-        if int(cur_details.rowcount)!=0:
-            for (row_data) in cur_details:
-                html_file=html_file+str(row_data[0])+""","""            
-            
-            html_file=html_file+html_body1+"""
-            row[1],row[2],row[3],row[4],row[5],row[6],row[7],row[8]
-            """+html_body2+"""
-            trendlines: {0:{type: 'linear', color: '#16F529', labelInLegend: 'Trend for rows_produced', visibleInLegend: true, opacity: 0.6, pointsVisible: false, lineWidth:2}},
-            title: `Prismafy v1.0 - https://github.com/prismafy/prismafy
-            Chart Creation Date: """+report_formatted_time+"""
-            Rows Details for query """+str(sql_query_id)+"""`,"""+html_line_hour_tail
-
-            create_output_file('rows_details_for_'+  sql_query_id.lower()  +'.html',html_file)
-            report_sections["D - Performance"].update({'rows_details_for_'+  sql_query_id.lower()  +'.html':'line'})
         
-    except Exception as error:
-        print("[line_rows_details_by_query_parameterized_hash]: An exception occurred:", error)
-
-def line_history_account_consumption_credits_by_warehouse(conn):
-    try:
-        global snowflake_conn
-        global report_sections
-        conn =snowflake_conn        
         html_file=html_header
         
         sql_query=sql_header+"""
@@ -1223,18 +1820,19 @@ def line_history_account_consumption_credits_by_warehouse(conn):
                 ROUND(SUM(CREDITS_USED),2)                   AS CREDITS_USED,
             FROM  SNOWFLAKE.ACCOUNT_USAGE.WAREHOUSE_METERING_HISTORY 
             WHERE
-                TO_DATE(START_TIME) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
+                """+since_predicate("START_TIME","DAY",-7)+"""
             GROUP BY 1,2
             ORDER BY 1 
         )
         , DATA_PIVOT AS (
-            SELECT *
-            FROM DATA
-                PIVOT(  MAX (CREDITS_USED)  FOR WAREHOUSE_NAME IN (any order by WAREHOUSE_NAME) DEFAULT ON NULL (0) )    
-            ORDER BY DATE 
+        SELECT *
+        FROM DATA
+            PIVOT(  MAX (CREDITS_USED)  FOR WAREHOUSE_NAME IN (any order by WAREHOUSE_NAME) DEFAULT ON NULL (0) )    
+        ORDER BY DATE 
         )
         SELECT *  FROM DATA_PIVOT;
-        """        
+        """
+        
         cur = conn.cursor()
         cur.execute(sql_query)
         column_count=len(cur.description)
@@ -1244,12 +1842,12 @@ def line_history_account_consumption_credits_by_warehouse(conn):
         sql_query=sql_header+"""
         WITH DATA AS (
             SELECT 
-                DATE_TRUNC('DAY',START_TIME::TIMESTAMP_NTZ)  AS DATE, 
-                WAREHOUSE_NAME                               AS WAREHOUSE_NAME,
-                ROUND(SUM(CREDITS_USED),2)                   AS CREDITS_USED,
-            FROM  SNOWFLAKE.ACCOUNT_USAGE.WAREHOUSE_METERING_HISTORY 
+                DATE_TRUNC('DAY',START_TIME::TIMESTAMP_NTZ)     AS DATE, 
+                WAREHOUSE_NAME                                  AS WAREHOUSE_NAME,
+                ROUND(SUM(CREDITS_USED),2)                      AS CREDITS_USED,
+            FROM  snowflake.account_usage.WAREHOUSE_METERING_HISTORY 
             WHERE
-                TO_DATE(start_time) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
+                """+since_predicate("START_TIME","DAY",-7)+"""
             GROUP BY 1,2
             ORDER BY 1 
         )
@@ -1274,324 +1872,70 @@ def line_history_account_consumption_credits_by_warehouse(conn):
                     html_file=html_file+str(row_data[0])+""","""
     
             html_file=html_file+html_body1
-    		
+            
             for i in range(1, column_count):
                 if i==column_count-1:
                     html_file=html_file+"""row["""+str(i)+"""]"""
                 else:
                     html_file=html_file+"""row["""+str(i)+"""],"""
-    		
+            
             html_file=html_file+html_body2+"""
             title: `Prismafy v1.0 - https://github.com/prismafy/prismafy
             Chart Creation Date: """+report_formatted_time+"""
-            Warehouse Credits Consumption`,"""+html_line_hour_tail
-            
-            create_output_file('credits_consumption_by_warehouse.html',html_file)
-            report_sections["C - Credits"].update({'credits_consumption_by_warehouse.html':'line'})
+            Warehouse credits consumption for last week`,
+            """+html_bar_day_tail
+        
+            create_output_file('last_week_credits_consumption_by_warehouse.html',html_file)
+            report_sections["C - Credits"].update({'last_week_credits_consumption_by_warehouse.html':'bar'})
             
     except Exception as error:
-        print("[line_history_account_consumption_credits_by_warehouse]: An exception occurred:", error)
+        print("[bar_week_consumption_credits_by_warehouse]: An exception occurred:", error)
+
+def warehouse_names_sql():
+    #Base result of the warehouse lists: warehouses metered in the history (per-warehouse reports) and warehouses with events (parameters)
+    return """
+        SELECT 
+            WAREHOUSE_NAME,
+            MAX(METERED)                AS METERED,
+            MAX(WITH_EVENTS)            AS WITH_EVENTS
+        FROM (
+            SELECT DISTINCT WAREHOUSE_NAME, 1 AS METERED, 0 AS WITH_EVENTS
+            FROM  SNOWFLAKE.ACCOUNT_USAGE.WAREHOUSE_METERING_HISTORY 
+            WHERE
+                """+since_predicate("Start_time")+"""
+                AND WAREHOUSE_NAME IS NOT NULL
+            UNION ALL
+            SELECT DISTINCT WAREHOUSE_NAME, 0 AS METERED, 1 AS WITH_EVENTS
+            FROM SNOWFLAKE.ACCOUNT_USAGE.WAREHOUSE_EVENTS_HISTORY
+        )
+        GROUP BY 1
+        """
 
-def line_history_account_consumption_credits(conn):
+def generate_warehouse_info(conn):
     try:
         global snowflake_conn
         global report_sections
         conn =snowflake_conn
         
-        html_file=html_header+"""
-            ['DATE','CREDITS_USED'],
+        sql_query="""
+        SELECT 
+            WAREHOUSE_NAME
+        FROM {result}
+        WHERE METERED=1;
         """
         
-        sql_query=sql_header+"""
-        WITH DATA AS (
-            SELECT 
-                DATE_TRUNC('DAY',START_TIME::TIMESTAMP_NTZ)  AS DATE, 
-                ROUND(SUM(CREDITS_USED),2)                   AS CREDITS_USED,
-            FROM  snowflake.account_usage.WAREHOUSE_METERING_HISTORY 
-            WHERE
-                TO_DATE(START_TIME) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-            GROUP BY 1
-            ORDER BY 1 
-        )
-        SELECT ARRAY_CONSTRUCT(*) AS DATA FROM DATA;
-        """
-        cur_details = conn.cursor()
-        cur_details.execute(sql_query)
-    
-        if int(cur_details.rowcount)!=0:
-            counter=0
-            for (row_data) in cur_details:
-                counter=counter+1
-                if counter==cur_details.rowcount:
-                    html_file=html_file+str(row_data[0])
-                else:
-                    html_file=html_file+str(row_data[0])+""","""
-    
-            html_file=html_file+html_body1+"""
-            row[1]
-            """+html_body2+"""
-            title: `Prismafy v1.0 - https://github.com/prismafy/prismafy
-            Chart Creation Date: """+report_formatted_time+"""
-            Credits Consumption for all warehouses`,"""+html_line_hour_tail
-                
-            create_output_file('warehouse_consumption.html',html_file)
-            report_sections["C - Credits"].update({'warehouse_consumption.html':'line'})
-            
-    except Exception as error:
-        print("[line_history_account_consumption_credits]: An exception occurred:", error)
-
-def bar_month_consumption_credits_by_warehouse(conn):
-    try:
-        global snowflake_conn
-        global report_sections
-        conn =snowflake_conn
-        
-        html_file=html_header
-        
-        sql_query=sql_header+"""
-            WITH DATA AS (
-            SELECT 
-                DATE_TRUNC('MONTH',START_TIME::TIMESTAMP_NTZ)   AS MONTH, 
-                WAREHOUSE_NAME                                  AS WAREHOUSE_NAME,
-                ROUND(SUM(CREDITS_USED),2)                      AS CREDITS_USED,
-            FROM  SNOWFLAKE.ACCOUNT_USAGE.WAREHOUSE_METERING_HISTORY 
-            WHERE
-                TO_DATE(start_time) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-            GROUP BY 1,2
-            ORDER BY 1 
-        )
-        , DATA_PIVOT AS (
-        SELECT *
-        FROM DATA
-            PIVOT(  MAX (CREDITS_USED)  FOR WAREHOUSE_NAME IN (any order by WAREHOUSE_NAME) DEFAULT ON NULL (0) )    
-        ORDER BY MONTH 
-        )
-        SELECT *  FROM DATA_PIVOT;
-        """
-        
-        cur = conn.cursor()
-        cur.execute(sql_query)
-        column_count=len(cur.description)
-        headers =[i[0] for i in cur.description]
-        html_file=html_file+str(headers).replace('"','')+", \n"
-    
-        sql_query=sql_header+"""
-        WITH DATA AS (
-            SELECT 
-                DATE_TRUNC('MONTH',START_TIME::TIMESTAMP_NTZ)   AS MONTH, 
-                WAREHOUSE_NAME                                  AS WAREHOUSE_NAME,
-                ROUND(SUM(CREDITS_USED),2)                      AS CREDITS_USED,
-            FROM  SNOWFLAKE.ACCOUNT_USAGE.WAREHOUSE_METERING_HISTORY 
-            WHERE
-                TO_DATE(START_TIME) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-            GROUP BY 1,2
-            ORDER BY 1 
-        )
-        , DATA_PIVOT AS (
-            SELECT *
-            FROM DATA
-                PIVOT(  MAX (CREDITS_USED)  FOR WAREHOUSE_NAME IN ( """+str(headers).replace('"','').replace("[","").replace("]","").replace("'MONTH',","")+""") DEFAULT ON NULL (0) )    
-            ORDER BY MONTH 
-        )
-        SELECT ARRAY_CONSTRUCT(*) AS DATA FROM DATA_PIVOT;
-        """
-        cur_details = conn.cursor()
-        cur_details.execute(sql_query)
-    
-        if int(cur_details.rowcount)!=0:
-            counter=0
-            for (row_data) in cur_details:
-                counter=counter+1
-                if counter==cur_details.rowcount:
-                    html_file=html_file+str(row_data[0])
-                else:
-                    html_file=html_file+str(row_data[0])+""","""
-    
-            html_file=html_file+html_body1
-                
-            for i in range(1, column_count):
-                if i==column_count-1:
-                    html_file=html_file+"""row["""+str(i)+"""]"""
-                else:
-                    html_file=html_file+"""row["""+str(i)+"""],"""
-                
-            html_file=html_file+html_body2+"""
-            title: `Prismafy v1.0 - https://github.com/prismafy/prismafy
-            Chart Creation Date: """+report_formatted_time+"""
-            Warehouse Credits Consumption per month`,
-            """+html_bar_month_tail
-        
-            create_output_file('per_month_credits_consumption_by_warehouse.html',html_file)
-            report_sections["C - Credits"].update({'per_month_credits_consumption_by_warehouse.html':'bar'})
-            
-    except Exception as error:
-        print("[bar_month_consumption_credits_by_warehouse]: An exception occurred:", error)
-
-def bar_week_consumption_credits_by_warehouse(conn):
-    try:  
-        global snowflake_conn
-        global report_sections
-        conn =snowflake_conn
-        
-        html_file=html_header
-        
-        sql_query=sql_header+"""
-        WITH DATA AS (
-            SELECT 
-                DATE_TRUNC('DAY',START_TIME::TIMESTAMP_NTZ)  AS DATE, 
-                WAREHOUSE_NAME                               AS WAREHOUSE_NAME,
-                ROUND(SUM(CREDITS_USED),2)                   AS CREDITS_USED,
-            FROM  SNOWFLAKE.ACCOUNT_USAGE.WAREHOUSE_METERING_HISTORY 
-            WHERE
-                TO_DATE(START_TIME) > DATEADD(DAY,-7,TO_TIMESTAMP("""+report_formatted_time+"""))
-            GROUP BY 1,2
-            ORDER BY 1 
-        )
-        , DATA_PIVOT AS (
-        SELECT *
-        FROM DATA
-            PIVOT(  MAX (CREDITS_USED)  FOR WAREHOUSE_NAME IN (any order by WAREHOUSE_NAME) DEFAULT ON NULL (0) )    
-        ORDER BY DATE 
-        )
-        SELECT *  FROM DATA_PIVOT;
-        """
-        
-        cur = conn.cursor()
-        cur.execute(sql_query)
-        column_count=len(cur.description)
-        headers =[i[0] for i in cur.description]
-        html_file=html_file+str(headers).replace('"','')+", \n"
-    
-        sql_query=sql_header+"""
-        WITH DATA AS (
-            SELECT 
-                DATE_TRUNC('DAY',START_TIME::TIMESTAMP_NTZ)     AS DATE, 
-                WAREHOUSE_NAME                                  AS WAREHOUSE_NAME,
-                ROUND(SUM(CREDITS_USED),2)                      AS CREDITS_USED,
-            FROM  snowflake.account_usage.WAREHOUSE_METERING_HISTORY 
-            WHERE
-                TO_DATE(START_TIME) > DATEADD(DAY,-7,TO_TIMESTAMP("""+report_formatted_time+"""))
-            GROUP BY 1,2
-            ORDER BY 1 
-        )
-        , DATA_PIVOT AS (
-        SELECT *
-        FROM DATA
-            PIVOT(  MAX (CREDITS_USED)  FOR WAREHOUSE_NAME IN ( """+str(headers).replace('"','').replace("[","").replace("]","").replace("'DATE',","")+""") DEFAULT ON NULL (0) )    
-        ORDER BY DATE 
-        )
-        SELECT ARRAY_CONSTRUCT(*) AS DATA FROM DATA_PIVOT;
-        """
-        cur_details = conn.cursor()
-        cur_details.execute(sql_query)
-    
-        if int(cur_details.rowcount)!=0:
-            counter=0
-            for (row_data) in cur_details:
-                counter=counter+1
-                if counter==cur_details.rowcount:
-                    html_file=html_file+str(row_data[0])
-                else:
-                    html_file=html_file+str(row_data[0])+""","""
-    
-            html_file=html_file+html_body1
-            
-            for i in range(1, column_count):
-                if i==column_count-1:
-                    html_file=html_file+"""row["""+str(i)+"""]"""
-                else:
-                    html_file=html_file+"""row["""+str(i)+"""],"""
-            
-            html_file=html_file+html_body2+"""
-            title: `Prismafy v1.0 - https://github.com/prismafy/prismafy
-            Chart Creation Date: """+report_formatted_time+"""
-            Warehouse credits consumption for last week`,
-            """+html_bar_day_tail
-        
-            create_output_file('last_week_credits_consumption_by_warehouse.html',html_file)
-            report_sections["C - Credits"].update({'last_week_credits_consumption_by_warehouse.html':'bar'})
-            
-    except Exception as error:
-        print("[bar_week_consumption_credits_by_warehouse]: An exception occurred:", error)
-
-def generate_warehouse_info(conn):
-    try:
-        global snowflake_conn
-        global report_sections
-        conn =snowflake_conn
-        
-        sql_query=sql_header+"""
-        SELECT DISTINCT 
-            WAREHOUSE_NAME
-        FROM  SNOWFLAKE.ACCOUNT_USAGE.WAREHOUSE_METERING_HISTORY 
-        WHERE
-            TO_DATE(Start_time) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-            AND WAREHOUSE_NAME IS NOT NULL;
-        """
-        
-        cur = conn.cursor()
-        cur.execute(sql_query)
+        cur = result_scan(conn, "generate_warehouse_info", "WAREHOUSE_NAMES", warehouse_names_sql(), sql_query)
 
         if int(cur.rowcount)!=0:
             for (warehouse_name) in cur:
-                line_history_load_details_by_warehouse(conn, warehouse_name[0])
-                bar_month_load_details_by_warehouse(snowflake_conn,warehouse_name[0] )
-                bar_week_load_details_by_warehouse(snowflake_conn,warehouse_name[0] )
-                table_history_warehouse_events(snowflake_conn,warehouse_name[0] )
-                line_history_warehouse_enable_vs_querycount(snowflake_conn,warehouse_name[0] )
-                line_history_size_changes_by_warehouse(snowflake_conn,warehouse_name[0] )
+                #The reports of -aw for each warehouse
+                for report_function in report_registry["aw"]:
+                    if not standin_unsupported(report_function, report_function.__name__+"("+str(warehouse_name[0])+")"):
+                        report_function(snowflake_conn,warehouse_name[0])
             
     except Exception as error:
         print("[generate_warehouse_info]: An exception occurred:", error)
       
-def line_history_load_details_by_warehouse(conn, warehouse_name):
-    try:
-        global snowflake_conn
-        global report_sections
-        conn =snowflake_conn
-             
-        sql_query_details=sql_header+"""
-        WITH DATA AS (
-            SELECT DATE_TRUNC('HOUR',start_time::TIMESTAMP_NTZ) AS START_TIME 
-                ,ROUND(AVG(NVL(AVG_RUNNING,0)),2)                 AS RUNNING_LOAD
-                ,ROUND(MAX(NVL(AVG_QUEUED_LOAD,0)),2)             AS QUEUED_LOAD
-                ,ROUND(MAX(NVL(AVG_QUEUED_PROVISIONING,0)),2)     AS QUEUED_PROVISIONING_LOAD
-                ,ROUND(MAX(NVL(AVG_BLOCKED,0)),2)                 AS BLOCKED_LOAD
-            FROM SNOWFLAKE.ACCOUNT_USAGE.WAREHOUSE_LOAD_HISTORY
-            WHERE TO_DATE(START_TIME) >= DATEADD(month,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))    
-            AND WAREHOUSE_NAME='"""+str(warehouse_name)+"""'
-            GROUP BY 1
-            ORDER BY 1
-        )
-        SELECT ARRAY_CONSTRUCT(*) AS DATA  FROM DATA;
-        """
-        cur_details = conn.cursor()
-        cur_details.execute(sql_query_details)
-        html_file=html_header
-        if int(cur_details.rowcount)!=0:
-            html_file=html_file+"""
-            ['DATE','RUNNING_LOAD','QUEUED_LOAD','QUEUED_PROVISIONING_LOAD','BLOCKED_LOAD'] ,
-            """
-            counter=0
-            for (row_data) in cur_details:
-                counter=counter+1
-                if counter==cur_details.rowcount:
-                    html_file=html_file+str(row_data[0])
-                else:
-                    html_file=html_file+str(row_data[0])+""","""
-
-            html_file=html_file+html_body1+"""
-            row[1],row[2],row[3],row[4]"""+html_body2+"""
-            title: `Prismafy v1.0 - https://github.com/prismafy/prismafy
-            Chart Creation Date: """+report_formatted_time+"""
-            Load Details for warehouse """+warehouse_name+"""`,"""+html_line_hour_tail
-
-            create_output_file('history_load_details_for_warehouse_'+warehouse_name.lower()+'.html',html_file)
-            report_sections["A - Computing"].update({'history_load_details_for_warehouse_'+warehouse_name.lower()+'.html':'line'})
-            
-    except Exception as error:
-        print("[line_history_load_details_by_warehouse]: An exception occurred:", error)
-        
 def bar_month_load_details_by_warehouse(conn,warehouse_name):
     try:
         global snowflake_conn
@@ -1604,7 +1948,7 @@ def bar_month_load_details_by_warehouse(conn,warehouse_name):
                     QUERY_PARAMETERIZED_HASH ,
                     SUM(QUERY_LOAD_PERCENT) QUERY_LOAD_PERCENT
             FROM SNOWFLAKE.ACCOUNT_USAGE.QUERY_HISTORY                    
-            WHERE TO_DATE(START_TIME) >= DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))    
+            WHERE """+since_predicate("START_TIME","MONTH",months_history,inclusive=True)+"""    
                 AND WAREHOUSE_NAME='"""+warehouse_name+"""'
                 AND QUERY_PARAMETERIZED_HASH IS NOT NULL
                 AND QUERY_LOAD_PERCENT IS NOT NULL
@@ -1632,7 +1976,7 @@ def bar_month_load_details_by_warehouse(conn,warehouse_name):
                     ,QUERY_PARAMETERIZED_HASH                                   AS QUERY_PARAMETERIZED_HASH
                     ,ROUND(SUM(NVL(QUERY_LOAD_PERCENT,0)),2)                    AS QUERY_LOAD_PERCENT
                 FROM SNOWFLAKE.ACCOUNT_USAGE.QUERY_HISTORY                    
-                WHERE TO_DATE(START_TIME) >= DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))    
+                WHERE """+since_predicate("START_TIME","MONTH",months_history,inclusive=True)+"""    
                     AND WAREHOUSE_NAME='"""+warehouse_name+"""'
                     AND QUERY_PARAMETERIZED_HASH IN ( """+str(headers).replace('"','').replace("[","").replace("]","").replace("'MONTH',","")+""") 
                 GROUP BY 1,2
@@ -1692,7 +2036,7 @@ def bar_week_load_details_by_warehouse(conn,warehouse_name):
                     QUERY_PARAMETERIZED_HASH ,
                     SUM(QUERY_LOAD_PERCENT) QUERY_LOAD_PERCENT
             FROM SNOWFLAKE.ACCOUNT_USAGE.QUERY_HISTORY                    
-            WHERE TO_DATE(START_TIME) >= DATEADD(DAY,-7,TO_TIMESTAMP("""+report_formatted_time+"""))    
+            WHERE """+since_predicate("START_TIME","DAY",-7,inclusive=True)+"""    
                 AND WAREHOUSE_NAME='"""+warehouse_name+"""'
                 AND QUERY_PARAMETERIZED_HASH IS NOT NULL
                 AND QUERY_LOAD_PERCENT IS NOT NULL
@@ -1719,7 +2063,7 @@ def bar_week_load_details_by_warehouse(conn,warehouse_name):
                     ,QUERY_PARAMETERIZED_HASH                       AS QUERY_PARAMETERIZED_HASH
                     ,ROUND(SUM(NVL(QUERY_LOAD_PERCENT,0)),2)        AS QUERY_LOAD_PERCENT
                 FROM SNOWFLAKE.ACCOUNT_USAGE.QUERY_HISTORY                    
-                WHERE TO_DATE(START_TIME) >= DATEADD(DAY,-7,TO_TIMESTAMP("""+report_formatted_time+"""))    
+                WHERE """+since_predicate("START_TIME","DAY",-7,inclusive=True)+"""    
                 AND WAREHOUSE_NAME='"""+warehouse_name+"""'
                 AND QUERY_PARAMETERIZED_HASH IN ( """+str(headers).replace('"','').replace("[","").replace("]","").replace("'DATE',","")+""")
                 GROUP BY 1,2
@@ -1787,7 +2131,7 @@ def line_history_daily_credits_used_by_service(conn):
                   ,SERVICE_TYPE                                                 AS SERVICE_TYPE
                   ,ROUND(SUM(NVL("""+iteration+""",0)),2)                       AS """+iteration+"""
                 FROM SNOWFLAKE.ACCOUNT_USAGE.METERING_DAILY_HISTORY                     
-                WHERE TO_DATE(USAGE_DATE) >= DATEADD(month,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))    
+                WHERE """+since_predicate("USAGE_DATE","MONTH",months_history,inclusive=True,date_column=True)+"""    
                 GROUP BY 1,2
                 ORDER BY 1
             )
@@ -1852,7 +2196,7 @@ def bar_month_credits_used_by_service(conn):
                   ,SERVICE_TYPE                                                 AS SERVICE_TYPE
                   ,ROUND(SUM(NVL("""+iteration+""",0)),2)                       AS """+iteration+"""
                 FROM snowflake.account_usage.METERING_DAILY_HISTORY                     
-                WHERE TO_DATE(USAGE_DATE) >= DATEADD(month,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))    
+                WHERE """+since_predicate("USAGE_DATE","MONTH",months_history,inclusive=True,date_column=True)+"""    
                 GROUP BY 1,2
                 ORDER BY 1
             )
@@ -1917,7 +2261,7 @@ def bar_week_credits_used_by_service(conn):
                   ,SERVICE_TYPE                                                 AS SERVICE_TYPE
                   ,ROUND(SUM(NVL("""+iteration+""",0)),2)                       AS """+iteration+"""
                 FROM snowflake.account_usage.METERING_DAILY_HISTORY                     
-                WHERE TO_DATE(USAGE_DATE) >= DATEADD(DAY,-7,TO_TIMESTAMP("""+report_formatted_time+"""))    
+                WHERE """+since_predicate("USAGE_DATE","DAY",-7,inclusive=True,date_column=True)+"""    
                 GROUP BY 1,2
                 ORDER BY 1
             )
@@ -1976,7 +2320,7 @@ def line_history_login_history(conn):
             SELECT DATE_TRUNC('HOUR',EVENT_TIMESTAMP::TIMESTAMP_NTZ)         AS DATE, 
             COUNT(*)                                                         AS COUNT_LOGINS
         FROM SNOWFLAKE.ACCOUNT_USAGE.LOGIN_HISTORY   Q
-        WHERE  TO_DATE(Q.EVENT_TIMESTAMP) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
+        WHERE  """+since_predicate("Q.EVENT_TIMESTAMP")+"""
         GROUP BY 1
         ORDER BY DATE  
         )
@@ -2001,76 +2345,147 @@ def line_history_login_history(conn):
     except Exception as error:
         print("[line_history_login_history]: An exception occurred:", error)
  
-def line_month_top_logins_by_users(conn):
+def generate_login_history_info(conn):
+    #LOGIN_HISTORY of the login reports read once, one row per hour, user, client and result with its number of logins.
+    #The flags mark the time windows of the reports, the pages are built from these rows
     try:
         global snowflake_conn
-        global report_sections
+        global login_history_rows
         conn =snowflake_conn
-        html_file=html_header
-        
+
         sql_query=sql_header+"""
-        WITH DATA AS ( 
-            SELECT DATE_TRUNC('DAY',EVENT_TIMESTAMP::TIMESTAMP_NTZ)              AS DATE, 
-                USER_NAME                                                        AS USER_NAME,
-                COUNT(*)                                                         AS COUNT_LOGINS
-            FROM snowflake.account_usage.LOGIN_HISTORY   Q
-            WHERE  TO_DATE(Q.EVENT_TIMESTAMP) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-            GROUP BY 1,2
-            ORDER BY 3 DESC 
-            LIMIT 25
-        )
-        SELECT DISTINCT USER_NAME
-        FROM  DATA
+        SELECT 
+            DATE_TRUNC('HOUR',EVENT_TIMESTAMP::TIMESTAMP_NTZ)   AS DATE, 
+            USER_NAME                                           AS USER_NAME,
+            CLIENT_IP                                           AS CLIENT_IP,
+            REPORTED_CLIENT_TYPE                                AS REPORTED_CLIENT_TYPE,
+            REPORTED_CLIENT_VERSION                             AS REPORTED_CLIENT_VERSION,
+            FIRST_AUTHENTICATION_FACTOR                         AS FIRST_AUTHENTICATION_FACTOR,
+            SECOND_AUTHENTICATION_FACTOR                        AS SECOND_AUTHENTICATION_FACTOR,
+            ERROR_CODE                                          AS ERROR_CODE,
+            ERROR_MESSAGE                                       AS ERROR_MESSAGE,
+            DATE_TRUNC('MONTH',Q.EVENT_TIMESTAMP)               AS MONTH,
+            DATE_TRUNC('DAY',EVENT_TIMESTAMP::TIMESTAMP_NTZ)    AS DAY,
+            IS_SUCCESS                                          AS IS_SUCCESS,
+            CASE WHEN """+since_predicate("Q.EVENT_TIMESTAMP")+""" THEN 1 ELSE 0 END                  AS IN_HISTORY,
+            CASE WHEN """+since_predicate("Q.EVENT_TIMESTAMP","MONTH",-1)+""" THEN 1 ELSE 0 END       AS IN_LAST_MONTH,
+            CASE WHEN """+before_predicate("Q.EVENT_TIMESTAMP","MONTH",-1)+""" THEN 1 ELSE 0 END      AS BEFORE_LAST_MONTH,
+            CASE WHEN """+since_predicate("Q.EVENT_TIMESTAMP","DAY",-7)+""" THEN 1 ELSE 0 END         AS IN_LAST_WEEK,
+            CASE WHEN """+before_predicate("Q.EVENT_TIMESTAMP","DAY",-7)+""" THEN 1 ELSE 0 END        AS BEFORE_LAST_WEEK,
+            CASE WHEN """+since_predicate("Q.EVENT_TIMESTAMP","DAY",-1)+""" THEN 1 ELSE 0 END         AS IN_LAST_DAY,
+            CASE WHEN """+before_predicate("Q.EVENT_TIMESTAMP","DAY",-1)+""" THEN 1 ELSE 0 END        AS BEFORE_LAST_DAY,
+            COUNT(*)                                            AS COUNT_LOGINS
+        FROM """+shared_subset("LOGIN_HISTORY_WINDOW")+"""   Q
+        WHERE  """+since_predicate("Q.EVENT_TIMESTAMP","MONTH",min(int(months_history),-2))+"""
+        GROUP BY 1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19
+        ORDER BY 1
         """
-    
+
         cur = conn.cursor()
         cur.execute(sql_query)
-        
-        column_count=cur.rowcount
-        if int(cur.rowcount)!=0:
-            headers =[i[0] for i in cur]  
-            headers.insert(0,'DATE')  					
-            html_file=html_file+str(headers).replace('"','')+", \n"   
-        
-            sql_query=sql_header+"""
-            WITH DATA AS (
-                SELECT DATE_TRUNC('DAY',EVENT_TIMESTAMP::TIMESTAMP_NTZ)              AS DATE, 
-                    USER_NAME                                                        AS USER_NAME,
-                    COUNT(*)                                                         AS COUNT_LOGINS
-                FROM snowflake.account_usage.LOGIN_HISTORY   Q
-                WHERE  TO_DATE(Q.EVENT_TIMESTAMP) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-                GROUP BY 1,2
-                ORDER BY 3 DESC  
-                LIMIT 50
-            )
-            , DATA_PIVOT AS (
-            SELECT *
-            FROM  DATA
-                PIVOT(  SUM (COUNT_LOGINS)  FOR USER_NAME IN ("""+str(headers).replace('"','').replace("[","").replace("]","").replace("'DATE',","")+""") DEFAULT ON NULL (0) )    
-            ORDER BY DATE
-            )
-            SELECT ARRAY_CONSTRUCT(*) AS DATA FROM DATA_PIVOT
-            """
+        login_history_rows=cur.fetchall()
 
-            html_file=html_header
-                
-            html_file=html_file+str(headers)+","
-            
-            cur = conn.cursor()
-            cur.execute(sql_query)
+    except Exception as error:
+        print("[generate_login_history_info]: An exception occurred:", error)
+
+login_history_columns=["DATE","USER_NAME","CLIENT_IP","REPORTED_CLIENT_TYPE","REPORTED_CLIENT_VERSION","FIRST_AUTHENTICATION_FACTOR","SECOND_AUTHENTICATION_FACTOR",
+                       "ERROR_CODE","ERROR_MESSAGE","MONTH","DAY","IS_SUCCESS","IN_HISTORY","IN_LAST_MONTH","BEFORE_LAST_MONTH","IN_LAST_WEEK","BEFORE_LAST_WEEK",
+                       "IN_LAST_DAY","BEFORE_LAST_DAY","COUNT_LOGINS"]
+
+def login_history_events(rows, limit=None):
+    #One row per login, like the rows of LOGIN_HISTORY, ordered by hour
+    events=[]
+    for row in sorted(rows, key=lambda row: row[0]):
+        for _ in range(int(row[-1])):
+            if limit is not None and len(events)>=limit:
+                return events
+            events.append(row[:9])
+    return events
+
+def new_login_events(since_flag, before_flag):
+    #Successful logins in the window of since_flag of users without successful logins before it, none when nobody logged in before
+    is_success=login_history_columns.index("IS_SUCCESS")
+    since_position=login_history_columns.index(since_flag)
+    before_position=login_history_columns.index(before_flag)
+    known_users=set([row[1] for row in login_history_rows if row[is_success]=='YES' and row[before_position]==1])
+    if len(known_users)==0:
+        return []
+    return login_history_events([row for row in login_history_rows if row[is_success]=='YES' and row[since_position]==1 and row[1] not in known_users])
+
+def create_login_history_file(title, events, file_name):
+    global html_table_header
+    global html_table_tail
+    global report_sections
 
-            if int(cur.rowcount)!=0:
-                for (row_data) in cur:
-                    
+    html_file=html_table_header
+    html_file=html_file+"""
+        <h3>"""+title+"""</h3>
+        <table class="tabla1">
+        <tr>
+        <th >DATE</th>
+        <th >USER_NAME</th>
+        <th >CLIENT_IP</th>
+        <th >REPORTED_CLIENT_TYPE</th>
+        <th >REPORTED_CLIENT_VERSION</th>
+        <th >FIRST_AUTHENTICATION_FACTOR</th>
+        <th >SECOND_AUTHENTICATION_FACTOR</th>
+        <th >ERROR_CODE</th>
+        <th >ERROR_MESSAGE</th>
+        """
+
+    if len(events)!=0:
+        for (ROW_DATE, ROW_USER_NAME, ROW_CLIENT_IP, ROW_REPORTED_CLIENT_TYPE, ROW_REPORTED_CLIENT_VERSION, ROW_FIRST_AUTHENTICATION_FACTOR, ROW_SECOND_AUTHENTICATION_FACTOR, ROW_ERROR_CODE, ROW_ERROR_MESSAGE) in events:
+            html_file=html_file+""" <tr> 
+                <td>"""+str(ROW_DATE)+"""</td> 
+                <td>"""+str(ROW_USER_NAME)+"""</td> 
+                 <td>"""+str(ROW_CLIENT_IP)+"""</td> 
+                 <td>"""+str(ROW_REPORTED_CLIENT_TYPE)+"""</td> 
+                 <td>"""+str(ROW_REPORTED_CLIENT_VERSION)+"""</td> 
+                 <td>"""+str(ROW_FIRST_AUTHENTICATION_FACTOR)+"""</td> 
+                 <td>"""+str(ROW_SECOND_AUTHENTICATION_FACTOR)+"""</td> 
+                 <td>"""+str(ROW_ERROR_CODE)+"""</td> 
+                 <td class="cell_grow">"""+str(ROW_ERROR_MESSAGE)+"""</td> 
+                </tr> """
 
-                    if int(cur.rowcount)!=0:
-                        counter=0
-                        for (row_data) in cur:
-                            counter=counter+1
-                            if counter==cur.rowcount:
-                                html_file=html_file+str(row_data[0])
-                            else:
-                                html_file=html_file+str(row_data[0])+""","""
+        html_file=html_file+html_table_tail
+
+    create_output_file(file_name,html_file)
+    report_sections["E - Security"].update({file_name:'table'})
+
+def line_month_top_logins_by_users(conn):
+    try:
+        global report_sections
+        global login_history_rows
+        html_file=html_header
+
+        if login_history_rows is None:
+            generate_login_history_info(conn)
+
+        in_history=login_history_columns.index("IN_HISTORY")
+        day=login_history_columns.index("DAY")
+        daily_logins={}
+        for row in login_history_rows:
+            if row[in_history]==1:
+                daily_logins[(row[day], row[1])]=daily_logins.get((row[day], row[1]),0)+int(row[-1])
+        top_days=sorted(daily_logins.items(), key=lambda item: item[1], reverse=True)
+
+        #Users of the 25 busiest user days, charted over the 50 busiest user days
+        user_names=[]
+        for (day_value, user_name), count_logins in top_days[:25]:
+            if user_name not in user_names:
+                user_names.append(user_name)
+
+        column_count=len(user_names)
+        if column_count!=0:
+            headers=['DATE']+user_names
+            days={}
+            for (day_value, user_name), count_logins in top_days[:50]:
+                days.setdefault(day_value, dict([(name, 0) for name in user_names]))
+                if user_name in days[day_value]:
+                    days[day_value][user_name]=days[day_value][user_name]+count_logins
+
+            html_file=html_file+str(headers)+","
+            html_file=html_file+",".join([json.dumps([str(day_value)]+[days[day_value][name] for name in user_names]) for day_value in sorted(days)])
 
             html_file=html_file+html_body1
             for i in range(1, column_count+1):
@@ -2111,7 +2526,7 @@ def line_history_login_by_status(conn):
             'FAILED'                                            AS STATUS,
             COUNT(*)                                            AS COUNT_LOGINS
         FROM SNOWFLAKE.ACCOUNT_USAGE.LOGIN_HISTORY   Q
-        WHERE  TO_DATE(Q.EVENT_TIMESTAMP) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
+        WHERE  """+since_predicate("Q.EVENT_TIMESTAMP")+"""
         AND IS_SUCCESS='NO'
         GROUP BY 1
         ORDER BY DATE  
@@ -2122,7 +2537,7 @@ def line_history_login_by_status(conn):
                 'SUCCEDED'                                              AS STATUS,
                 COUNT(*)                                                AS COUNT_LOGINS
             FROM SNOWFLAKE.ACCOUNT_USAGE.LOGIN_HISTORY   Q
-            WHERE  TO_DATE(Q.EVENT_TIMESTAMP) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
+            WHERE  """+since_predicate("Q.EVENT_TIMESTAMP")+"""
             AND IS_SUCCESS='YES'
             GROUP BY 1
             ORDER BY DATE 
@@ -2168,68 +2583,15 @@ def line_history_login_by_status(conn):
 def table_history_failed_login(conn):
 
     try:    
-        global snowflake_conn
-        global html_table_header
-        global html_table_tail
-        global report_sections
-        conn =snowflake_conn        
-        html_file=html_table_header
-        
-        sql_query=sql_header+"""
-        SELECT 
-            DATE_TRUNC('HOUR',EVENT_TIMESTAMP::TIMESTAMP_NTZ)   AS DATE, 
-            USER_NAME                                           AS USER_NAME,
-            CLIENT_IP                                           AS CLIENT_IP,
-            REPORTED_CLIENT_TYPE                                AS REPORTED_CLIENT_TYPE,
-            REPORTED_CLIENT_VERSION                             AS REPORTED_CLIENT_VERSION,
-            FIRST_AUTHENTICATION_FACTOR                         AS FIRST_AUTHENTICATION_FACTOR,
-            SECOND_AUTHENTICATION_FACTOR                        AS SECOND_AUTHENTICATION_FACTOR,
-            ERROR_CODE                                          AS ERROR_CODE,
-            ERROR_MESSAGE                                       AS ERROR_MESSAGE
-            FROM SNOWFLAKE.ACCOUNT_USAGE.LOGIN_HISTORY   Q
-            WHERE  TO_DATE(Q.EVENT_TIMESTAMP) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-            AND IS_SUCCESS='NO'
-            ORDER BY DATE 
-            LIMIT 500
-        """
-        
-        cur = conn.cursor()
-        cur.execute(sql_query)
-    
-        html_file=html_file+"""
-        <h3>History of Failed Logins</h3>
-        <table class="tabla1">
-        <tr>
-        <th >DATE</th>
-        <th >USER_NAME</th>
-        <th >CLIENT_IP</th>
-        <th >REPORTED_CLIENT_TYPE</th>
-        <th >REPORTED_CLIENT_VERSION</th>
-        <th >FIRST_AUTHENTICATION_FACTOR</th>
-        <th >SECOND_AUTHENTICATION_FACTOR</th>
-        <th >ERROR_CODE</th>
-        <th >ERROR_MESSAGE</th>
-        """
-    
-        if int(cur.rowcount)!=0:
-            for (ROW_DATE, ROW_COUNT_LOGINS, ROW_CLIENT_IP, ROW_REPORTED_CLIENT_TYPE, ROW_REPORTED_CLIENT_VERSION, ROW_FIRST_AUTHENTICATION_FACTOR, ROW_SECOND_AUTHENTICATION_FACTOR, ROW_ERROR_CODE, ROW_ERROR_MESSAGE) in cur:
-                html_file=html_file+""" <tr> 
-                <td>"""+str(ROW_DATE)+"""</td> 
-                <td>"""+str(ROW_COUNT_LOGINS)+"""</td> 
-                 <td>"""+str(ROW_CLIENT_IP)+"""</td> 
-                 <td>"""+str(ROW_REPORTED_CLIENT_TYPE)+"""</td> 
-                 <td>"""+str(ROW_REPORTED_CLIENT_VERSION)+"""</td> 
-                 <td>"""+str(ROW_FIRST_AUTHENTICATION_FACTOR)+"""</td> 
-                 <td>"""+str(ROW_SECOND_AUTHENTICATION_FACTOR)+"""</td> 
-                 <td>"""+str(ROW_ERROR_CODE)+"""</td> 
-                 <td class="cell_grow">"""+str(ROW_ERROR_MESSAGE)+"""</td> 
-                </tr> """
-            
-            html_file=html_file+html_table_tail
-        
-        create_output_file('history_failed_logins.html',html_file)
-        report_sections["E - Security"].update({'history_failed_logins.html':'table'})
+        global login_history_rows
 
+        if login_history_rows is None:
+            generate_login_history_info(conn)
+
+        is_success=login_history_columns.index("IS_SUCCESS")
+        in_history=login_history_columns.index("IN_HISTORY")
+        failed_rows=[row for row in login_history_rows if row[is_success]=='NO' and row[in_history]==1]
+        create_login_history_file('History of Failed Logins', login_history_events(failed_rows, 500), 'history_failed_logins.html')
     
     except Exception as error:
         print("[table_history_failed_login]: An exception occurred:", error)
@@ -2237,82 +2599,12 @@ def table_history_failed_login(conn):
 def table_month_new_login(conn):
 
     try:    
-        global snowflake_conn
-        global html_table_header
-        global html_table_tail
-        global report_sections
-        conn =snowflake_conn        
-        html_file=html_table_header
-        
-        sql_query=sql_header+"""
-        WITH HIST AS (
-            SELECT 
-                DISTINCT USER_NAME
-            FROM SNOWFLAKE.ACCOUNT_USAGE.LOGIN_HISTORY   Q"""
-        if int(months_history)<-2:
-            sql_query=sql_query+""" WHERE  TO_DATE(Q.EVENT_TIMESTAMP) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))"""
-        else:
-            sql_query=sql_query+""" WHERE  TO_DATE(Q.EVENT_TIMESTAMP) > DATEADD(MONTH,-2,TO_TIMESTAMP("""+report_formatted_time+"""))"""
+        global login_history_rows
 
-        sql_query=sql_query+""" AND TO_DATE(Q.EVENT_TIMESTAMP) < DATEADD(MONTH,-1,TO_TIMESTAMP("""+report_formatted_time+"""))
-                AND IS_SUCCESS='YES'
-            
-        )
-        , MONTH AS (
-            SELECT 
-                DATE_TRUNC('HOUR',EVENT_TIMESTAMP::TIMESTAMP_NTZ)   AS DATE, 
-                USER_NAME                                           AS USER_NAME,
-                CLIENT_IP                                           AS CLIENT_IP,
-                REPORTED_CLIENT_TYPE                                AS REPORTED_CLIENT_TYPE,
-                REPORTED_CLIENT_VERSION                             AS REPORTED_CLIENT_VERSION,
-                FIRST_AUTHENTICATION_FACTOR                         AS FIRST_AUTHENTICATION_FACTOR,
-                SECOND_AUTHENTICATION_FACTOR                        AS SECOND_AUTHENTICATION_FACTOR,
-                ERROR_CODE                                          AS ERROR_CODE,
-                ERROR_MESSAGE                                       AS ERROR_MESSAGE
-            FROM SNOWFLAKE.ACCOUNT_USAGE.LOGIN_HISTORY   Q
-            WHERE  TO_DATE(Q.EVENT_TIMESTAMP) > DATEADD(MONTH,-1,TO_TIMESTAMP("""+report_formatted_time+"""))
-                AND IS_SUCCESS='YES'
-            ORDER BY 1 
-        )
-        SELECT * FROM MONTH WHERE USER_NAME NOT IN (SELECT  USER_NAME FROM HIST) AND (SELECT  COUNT(*) FROM HIST)>0
-        """
-        cur = conn.cursor()
-        cur.execute(sql_query)
-    
-        html_file=html_file+"""
-        <h3>New Users with logins in the last month</h3>
-        <table class="tabla1">
-        <tr>
-        <th >DATE</th>
-        <th >USER_NAME</th>
-        <th >CLIENT_IP</th>
-        <th >REPORTED_CLIENT_TYPE</th>
-        <th >REPORTED_CLIENT_VERSION</th>
-        <th >FIRST_AUTHENTICATION_FACTOR</th>
-        <th >SECOND_AUTHENTICATION_FACTOR</th>
-        <th >ERROR_CODE</th>
-        <th >ERROR_MESSAGE</th>
-        """
-    
-        if int(cur.rowcount)!=0:
-            for (ROW_DATE, ROW_COUNT_LOGINS, ROW_CLIENT_IP, ROW_REPORTED_CLIENT_TYPE, ROW_REPORTED_CLIENT_VERSION, ROW_FIRST_AUTHENTICATION_FACTOR, ROW_SECOND_AUTHENTICATION_FACTOR, ROW_ERROR_CODE, ROW_ERROR_MESSAGE) in cur:
-                html_file=html_file+""" <tr> 
-                <td>"""+str(ROW_DATE)+"""</td> 
-                <td>"""+str(ROW_COUNT_LOGINS)+"""</td> 
-                 <td>"""+str(ROW_CLIENT_IP)+"""</td> 
-                 <td>"""+str(ROW_REPORTED_CLIENT_TYPE)+"""</td> 
-                 <td>"""+str(ROW_REPORTED_CLIENT_VERSION)+"""</td> 
-                 <td>"""+str(ROW_FIRST_AUTHENTICATION_FACTOR)+"""</td> 
-                 <td>"""+str(ROW_SECOND_AUTHENTICATION_FACTOR)+"""</td> 
-                 <td>"""+str(ROW_ERROR_CODE)+"""</td> 
-                 <td class="cell_grow">"""+str(ROW_ERROR_MESSAGE)+"""</td> 
-                </tr> """
-            
-            html_file=html_file+html_table_tail
-        
-        create_output_file('last_month_new_logins.html',html_file)
-        report_sections["E - Security"].update({'last_month_new_logins.html':'table'})
+        if login_history_rows is None:
+            generate_login_history_info(conn)
 
+        create_login_history_file('New Users with logins in the last month', new_login_events("IN_LAST_MONTH", "BEFORE_LAST_MONTH"), 'last_month_new_logins.html')
     
     except Exception as error:
         print("[table_month_new_login]: An exception occurred:", error)
@@ -2320,37 +2612,28 @@ def table_month_new_login(conn):
 def table_less_frequent_logins(conn):
 
     try:    
-        global snowflake_conn
         global html_table_header
         global html_table_tail
         global report_sections
-        conn =snowflake_conn        
+        global login_history_rows
         html_file=html_table_header
-        
-        sql_query=sql_header+"""
-        WITH HIST AS (
-            SELECT 
-                ROW_NUMBER() OVER (PARTITION BY  DATE_TRUNC('MONTH',Q.EVENT_TIMESTAMP) ORDER BY COUNT(*)  ASC)       AS TOP_N,
-                DATE_TRUNC('MONTH',Q.EVENT_TIMESTAMP)   AS MONTH,
-                USER_NAME                               AS USER_NAME,
-                COUNT(*)                                AS COUNT_LOGINS
-            FROM SNOWFLAKE.ACCOUNT_USAGE.LOGIN_HISTORY   Q
-        """
-        if int(months_history)<-2:
-            sql_query=sql_query+""" WHERE  TO_DATE(Q.EVENT_TIMESTAMP) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))"""
-        else:
-            sql_query=sql_query+""" WHERE  TO_DATE(Q.EVENT_TIMESTAMP) > DATEADD(MONTH,-2,TO_TIMESTAMP("""+report_formatted_time+"""))"""
-        sql_query=sql_query+"""
-                AND IS_SUCCESS='YES'            
-        GROUP BY 2,3
-        ORDER BY 1,2
-        )
-        SELECT * FROM HIST 
-        WHERE TOP_N<=10
-        ORDER BY MONTH,TOP_N
-        """
-        cur = conn.cursor()
-        cur.execute(sql_query)
+
+        if login_history_rows is None:
+            generate_login_history_info(conn)
+
+        is_success=login_history_columns.index("IS_SUCCESS")
+        month=login_history_columns.index("MONTH")
+        monthly_logins={}
+        for row in login_history_rows:
+            if row[is_success]=='YES':
+                monthly_logins[(row[month], row[1])]=monthly_logins.get((row[month], row[1]),0)+int(row[-1])
+
+        #The 10 users with the fewest successful logins of every month
+        less_frequent=[]
+        for month_value in sorted(set([month_value for month_value, user_name in monthly_logins])):
+            users=sorted([(count_logins, user_name) for (row_month, user_name), count_logins in monthly_logins.items() if row_month==month_value], key=lambda item: (item[0], str(item[1])))
+            for top_n, (count_logins, user_name) in enumerate(users[:10]):
+                less_frequent.append((top_n+1, month_value, user_name, count_logins))
     
         html_file=html_file+"""
         <h3>Users with less frequent logins</h3>
@@ -2362,8 +2645,8 @@ def table_less_frequent_logins(conn):
         <th >COUNT_LOGINS</th>
         """
     
-        if int(cur.rowcount)!=0:
-            for (ROW_TOP_N, ROW_MONTH, ROW_CLIENT_IP, ROW_COUNT_LOGINS) in cur:
+        if len(less_frequent)!=0:
+            for (ROW_TOP_N, ROW_MONTH, ROW_CLIENT_IP, ROW_COUNT_LOGINS) in less_frequent:
                 html_file=html_file+""" <tr> 
                 <td>"""+str(ROW_TOP_N)+"""</td> 
                 <td>"""+str(ROW_MONTH)+"""</td> 
@@ -2383,320 +2666,29 @@ def table_less_frequent_logins(conn):
 def table_week_new_login(conn):
 
     try:    
-        global snowflake_conn
-        global html_table_header
-        global html_table_tail
-        global report_sections
-        conn =snowflake_conn        
-        html_file=html_table_header
-        
-        sql_query=sql_header+"""
-        WITH HIST AS (
-            SELECT 
-                DISTINCT USER_NAME
-            FROM SNOWFLAKE.ACCOUNT_USAGE.LOGIN_HISTORY   Q"""
-        if int(months_history)<-2:
-            sql_query=sql_query+""" WHERE  TO_DATE(Q.EVENT_TIMESTAMP) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))"""
-        else:
-            sql_query=sql_query+""" WHERE  TO_DATE(Q.EVENT_TIMESTAMP) > DATEADD(MONTH,-2,TO_TIMESTAMP("""+report_formatted_time+"""))"""
+        global login_history_rows
 
-        sql_query=sql_query+""" AND TO_DATE(Q.EVENT_TIMESTAMP) < DATEADD(DAY,-7,TO_TIMESTAMP("""+report_formatted_time+"""))
-                AND IS_SUCCESS='YES'
-            
-        )
-        , MONTH AS (
-            SELECT 
-                DATE_TRUNC('HOUR',EVENT_TIMESTAMP::TIMESTAMP_NTZ)   AS DATE, 
-                USER_NAME                                           AS USER_NAME,
-                CLIENT_IP                                           AS CLIENT_IP,
-                REPORTED_CLIENT_TYPE                                AS REPORTED_CLIENT_TYPE,
-                REPORTED_CLIENT_VERSION                             AS REPORTED_CLIENT_VERSION,
-                FIRST_AUTHENTICATION_FACTOR                         AS FIRST_AUTHENTICATION_FACTOR,
-                SECOND_AUTHENTICATION_FACTOR                        AS SECOND_AUTHENTICATION_FACTOR,
-                ERROR_CODE                                          AS ERROR_CODE,
-                ERROR_MESSAGE                                       AS ERROR_MESSAGE
-            FROM snowflake.account_usage.LOGIN_HISTORY   Q
-            WHERE  TO_DATE(Q.EVENT_TIMESTAMP) > DATEADD(DAY,-7,TO_TIMESTAMP("""+report_formatted_time+"""))
-                AND IS_SUCCESS='YES'
-            ORDER BY DATE 
-        )
-        SELECT * FROM MONTH WHERE USER_NAME NOT IN (SELECT  USER_NAME FROM HIST) AND (SELECT  COUNT(*) FROM HIST)>0
-        """
-        
-        cur = conn.cursor()
-        cur.execute(sql_query)
+        if login_history_rows is None:
+            generate_login_history_info(conn)
+
+        create_login_history_file('Users with new logins in the last week', new_login_events("IN_LAST_WEEK", "BEFORE_LAST_WEEK"), 'last_week_new_logins.html')
     
-        html_file=html_file+"""
-        <h3>Users with new logins in the last week</h3>
-        <table class="tabla1">
-        <tr>
-        <th >DATE</th>
-        <th >USER_NAME</th>
-        <th >CLIENT_IP</th>
-        <th >REPORTED_CLIENT_TYPE</th>
-        <th >REPORTED_CLIENT_VERSION</th>
-        <th >FIRST_AUTHENTICATION_FACTOR</th>
-        <th >SECOND_AUTHENTICATION_FACTOR</th>
-        <th >ERROR_CODE</th>
-        <th >ERROR_MESSAGE</th>
-        """
-    
-        if int(cur.rowcount)!=0:
-            for (ROW_DATE, ROW_COUNT_LOGINS, ROW_CLIENT_IP, ROW_REPORTED_CLIENT_TYPE, ROW_REPORTED_CLIENT_VERSION, ROW_FIRST_AUTHENTICATION_FACTOR, ROW_SECOND_AUTHENTICATION_FACTOR, ROW_ERROR_CODE, ROW_ERROR_MESSAGE) in cur:
-                html_file=html_file+""" <tr> 
-                <td>"""+str(ROW_DATE)+"""</td> 
-                <td>"""+str(ROW_COUNT_LOGINS)+"""</td> 
-                 <td>"""+str(ROW_CLIENT_IP)+"""</td> 
-                 <td>"""+str(ROW_REPORTED_CLIENT_TYPE)+"""</td> 
-                 <td>"""+str(ROW_REPORTED_CLIENT_VERSION)+"""</td> 
-                 <td>"""+str(ROW_FIRST_AUTHENTICATION_FACTOR)+"""</td> 
-                 <td>"""+str(ROW_SECOND_AUTHENTICATION_FACTOR)+"""</td> 
-                 <td>"""+str(ROW_ERROR_CODE)+"""</td> 
-                 <td class="cell_grow">"""+str(ROW_ERROR_MESSAGE)+"""</td> 
-                </tr> """
-            
-            html_file=html_file+html_table_tail
-        
-        create_output_file('last_week_new_logins.html',html_file)
-        report_sections["E - Security"].update({'last_week_new_logins.html':'table'})
-
-    
-    except Exception as error:
-        print("[table_week_new_login]: An exception occurred:", error)
-
-def table_day_new_login(conn):
-
-    try:    
-        global snowflake_conn
-        global html_table_header
-        global html_table_tail
-        global report_sections
-        conn =snowflake_conn        
-        html_file=html_table_header
-        
-        sql_query=sql_header+"""
-        WITH HIST AS (
-            SELECT 
-                DISTINCT USER_NAME
-            FROM SNOWFLAKE.ACCOUNT_USAGE.LOGIN_HISTORY   Q"""
-        if int(months_history)<-2:
-            sql_query=sql_query+""" WHERE  TO_DATE(Q.EVENT_TIMESTAMP) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))"""
-        else:
-            sql_query=sql_query+""" WHERE  TO_DATE(Q.EVENT_TIMESTAMP) > DATEADD(MONTH,-2,TO_TIMESTAMP("""+report_formatted_time+"""))"""
-
-        sql_query=sql_query+""" AND TO_DATE(Q.EVENT_TIMESTAMP) < DATEADD(DAY,-1,TO_TIMESTAMP("""+report_formatted_time+"""))
-                AND IS_SUCCESS='YES'
-            
-        )
-        , MONTH AS (
-            SELECT 
-                DATE_TRUNC('HOUR',EVENT_TIMESTAMP::TIMESTAMP_NTZ)   AS DATE, 
-                USER_NAME                                           AS USER_NAME,
-                CLIENT_IP                                           AS CLIENT_IP,
-                REPORTED_CLIENT_TYPE                                AS REPORTED_CLIENT_TYPE,
-                REPORTED_CLIENT_VERSION                             AS REPORTED_CLIENT_VERSION,
-                FIRST_AUTHENTICATION_FACTOR                         AS FIRST_AUTHENTICATION_FACTOR,
-                SECOND_AUTHENTICATION_FACTOR                        AS SECOND_AUTHENTICATION_FACTOR,
-                ERROR_CODE                                          AS ERROR_CODE,
-                ERROR_MESSAGE                                       AS ERROR_MESSAGE
-            FROM snowflake.account_usage.LOGIN_HISTORY   Q
-            WHERE  TO_DATE(Q.EVENT_TIMESTAMP) > DATEADD(DAY,-1,TO_TIMESTAMP("""+report_formatted_time+"""))
-                AND IS_SUCCESS='YES'
-            ORDER BY DATE 
-        )
-        SELECT * FROM MONTH WHERE USER_NAME NOT IN (SELECT USER_NAME FROM HIST) AND (SELECT  COUNT(*) FROM HIST)>0
-        """
-        
-        cur = conn.cursor()
-        cur.execute(sql_query)
-    
-        html_file=html_file+"""
-        <h3>Users with new logins in the last day</h3>
-        <table class="tabla1">
-        <tr>
-        <th >DATE</th>
-        <th >USER_NAME</th>
-        <th >CLIENT_IP</th>
-        <th >REPORTED_CLIENT_TYPE</th>
-        <th >REPORTED_CLIENT_VERSION</th>
-        <th >FIRST_AUTHENTICATION_FACTOR</th>
-        <th >SECOND_AUTHENTICATION_FACTOR</th>
-        <th >ERROR_CODE</th>
-        <th >ERROR_MESSAGE</th>
-        """
-    
-        if int(cur.rowcount)!=0:
-            for (ROW_DATE, ROW_COUNT_LOGINS, ROW_CLIENT_IP, ROW_REPORTED_CLIENT_TYPE, ROW_REPORTED_CLIENT_VERSION, ROW_FIRST_AUTHENTICATION_FACTOR, ROW_SECOND_AUTHENTICATION_FACTOR, ROW_ERROR_CODE, ROW_ERROR_MESSAGE) in cur:
-                html_file=html_file+""" <tr> 
-                <td>"""+str(ROW_DATE)+"""</td> 
-                <td>"""+str(ROW_COUNT_LOGINS)+"""</td> 
-                 <td>"""+str(ROW_CLIENT_IP)+"""</td> 
-                 <td>"""+str(ROW_REPORTED_CLIENT_TYPE)+"""</td> 
-                 <td>"""+str(ROW_REPORTED_CLIENT_VERSION)+"""</td> 
-                 <td>"""+str(ROW_FIRST_AUTHENTICATION_FACTOR)+"""</td> 
-                 <td>"""+str(ROW_SECOND_AUTHENTICATION_FACTOR)+"""</td> 
-                 <td>"""+str(ROW_ERROR_CODE)+"""</td> 
-                 <td class="cell_grow">"""+str(ROW_ERROR_MESSAGE)+"""</td> 
-                </tr> """
-            
-            html_file=html_file+html_table_tail
-        
-        create_output_file('last_day_new_logins.html',html_file)
-        report_sections["E - Security"].update({'last_day_new_logins.html':'table'})
-
+    except Exception as error:
+        print("[table_week_new_login]: An exception occurred:", error)
+
+def table_day_new_login(conn):
+
+    try:    
+        global login_history_rows
+
+        if login_history_rows is None:
+            generate_login_history_info(conn)
+
+        create_login_history_file('Users with new logins in the last day', new_login_events("IN_LAST_DAY", "BEFORE_LAST_DAY"), 'last_day_new_logins.html')
     
     except Exception as error:
         print("[table_day_new_login]: An exception occurred:", error)
 
-def table_history_top_tables_by_storage(conn):
-
-    try:    
-        global snowflake_conn
-        global html_table_header
-        global html_table_tail
-        global report_sections
-        conn =snowflake_conn        
-        iterations = ["ACTIVE_BYTES", "TIME_TRAVEL_BYTES","FAILSAFE_BYTES", "RETAINED_FOR_CLONE_BYTES"]
-        
-        for iteration in iterations:
-            
-            html_file=html_table_header
-            
-            sql_query=sql_header+"""
-            SELECT 
-                ROW_NUMBER() over (order by """+ iteration +"""  DESC)  AS TOP_N,
-                TABLE_CATALOG                                           AS TABLE_CATALOG,
-                TABLE_SCHEMA                                            AS TABLE_SCHEMA,
-                TABLE_NAME                                              AS TABLE_NAME,
-                IS_TRANSIENT                                            AS IS_TRANSIENT,
-                ROUND(NVL(ACTIVE_BYTES,0)/1024/1024/1024,2)             AS ACTIVE_GB,
-                ROUND(NVL(TIME_TRAVEL_BYTES,0)/1024/1024/1024,2)        AS TIME_TRAVEL_GB,
-                ROUND(NVL(FAILSAFE_BYTES,0)/1024/1024/1024,2)           AS FAILSAFE_GB,
-                ROUND(NVL(RETAINED_FOR_CLONE_BYTES,0)/1024/1024/1024,2) AS RETAINED_FOR_CLONE_GB,
-                TABLE_CREATED::TIMESTAMP_NTZ                            AS TABLE_CREATED
-            FROM SNOWFLAKE.ACCOUNT_USAGE.TABLE_STORAGE_METRICS    T
-            WHERE DELETED=FALSE
-            ORDER BY TOP_N
-            LIMIT 100
-            """
-            
-            cur = conn.cursor()
-            cur.execute(sql_query)
-        
-            html_file=html_file+"""
-            <h3>Top tables by """+iteration.lower()+"""</h3>
-            <table class="tabla1">
-            <tr>
-            <th >TOP_N</th>
-            <th >TABLE_CATALOG</th>
-            <th >TABLE_SCHEMA</th>
-            <th >TABLE_NAME</th>
-            <th >IS_TRANSIENT</th>
-            <th >ACTIVE_GB</th>
-            <th >TIME_TRAVEL_GB</th>
-            <th >FAILSAFE_GB</th>
-            <th >RETAINED_FOR_CLONE_GB</th>
-            <th >TABLE_CREATED</th>
-            """
-        
-            if int(cur.rowcount)!=0:
-                for (ROW_TOP_N, ROW_TABLE_CATALOG, ROW_TABLE_SCHEMA, ROW_TABLE_NAME, ROW_IS_TRANSIENT, ROW_ACTIVE_GB, ROW_TIME_TRAVEL_GB, ROW_FAILSAFE_GB, ROW_RETAINED_FOR_CLONE_GB, ROW_TABLE_CREATED) in cur:
-                    html_file=html_file+""" <tr> 
-                    <td>"""+str(ROW_TOP_N)+"""</td> 
-                    <td>"""+str(ROW_TABLE_CATALOG)+"""</td> 
-                    <td>"""+str(ROW_TABLE_SCHEMA)+"""</td> 
-                     <td>"""+str(ROW_TABLE_NAME)+"""</td> 
-                     <td>"""+str(ROW_IS_TRANSIENT)+"""</td> 
-                     <td>"""+str(ROW_ACTIVE_GB)+"""</td> 
-                     <td>"""+str(ROW_TIME_TRAVEL_GB)+"""</td> 
-                     <td>"""+str(ROW_FAILSAFE_GB)+"""</td> 
-                     <td>"""+str(ROW_RETAINED_FOR_CLONE_GB)+"""</td> 
-                     <td class="cell_grow">"""+str(ROW_TABLE_CREATED)+"""</td> 
-                    </tr> """
-                
-                html_file=html_file+html_table_tail
-        
-            create_output_file('history_top_tables_by_'+iteration.lower()+'.html',html_file)
-            report_sections["B - Storage"].update({'history_top_tables_by_'+iteration.lower()+'.html':'table'})
-    
-    except Exception as error:
-        print("[table_history_top_tables_storage]: An exception occurred:", error)
-        
-def table_history_top_table_by_pruning_efficiency(conn):
-
-    try:    
-        global snowflake_conn
-        global html_table_header
-        global html_table_tail
-        global report_sections
-        conn =snowflake_conn
-        html_file=html_table_header
-        
-        sql_query=sql_header+"""
-        SELECT 
-            ROW_NUMBER() over (order by ((PARTITIONS_PRUNED/(PARTITIONS_SCANNED+PARTITIONS_PRUNED))*100)  ASC, (ROWS_SCANNED+ROWS_PRUNED) DESC ) AS TOP_N,
-            START_TIME::TIMESTAMP_NTZ                               AS DATE,
-            DATABASE_NAME                                           AS DATABASE_NAME,
-            SCHEMA_NAME                                             AS SCHEMA_NAME,
-            TABLE_NAME                                              AS TABLE_NAME,
-            NUM_SCANS                                               AS NUM_SCANS,
-            ROUND(NVL(PARTITIONS_SCANNED,0),2)                      AS PARTITIONS_SCANNED,
-            ROUND(NVL(PARTITIONS_PRUNED,0),2)                       AS PARTITIONS_PRUNED,
-            ROUND(NVL(ROWS_SCANNED,0),2)                            AS ROWS_SCANNED,
-            ROUND(NVL(ROWS_PRUNED,0),2)                             AS ROWS_PRUNED,
-            ROUND(((PARTITIONS_PRUNED/(PARTITIONS_SCANNED+PARTITIONS_PRUNED))*100),2)     AS PRUNING_EFFICIENCY_PERCENTAGE
-        FROM SNOWFLAKE.ACCOUNT_USAGE.TABLE_PRUNING_HISTORY     T
-        WHERE  TO_DATE(T.start_time) > DATEADD(MONTH,-1,TO_TIMESTAMP("""+report_formatted_time+"""))
-        AND PARTITIONS_SCANNED>0
-        AND ROWS_SCANNED>5000
-        ORDER BY TOP_N
-        LIMIT 200
-        """
-        
-        cur = conn.cursor()
-        cur.execute(sql_query)
-    
-        html_file=html_file+"""
-        <h3>Top tables by pruning efficiency</h3>
-        <table class="tabla2">
-        <tr>
-        <th >TOP_N</th>
-        <th >DATE</th>
-        <th >DATABASE_NAME</th>
-        <th >SCHEMA_NAME</th>
-        <th >TABLE_NAME</th>
-        <th >NUM_SCANS</th>
-        <th >PARTITIONS_SCANNED</th>
-        <th >PARTITIONS_PRUNED</th>
-        <th >ROWS_SCANNED</th>
-        <th >ROWS_PRUNED</th>
-        <th >PRUNING_EFFICIENCY_PERCENTAGE</th>
-        """
-    
-        if int(cur.rowcount)!=0:
-            for (ROW_TOP_N, ROW_DATE,ROW_DATABASE_NAME, ROW_SCHEMA_NAME, ROW_TABLE_NAME, ROW_NUM_SCANS, ROW_PARTITIONS_SCANNED, ROW_PARTITIONS_PRUNED, ROW_ROWS_SCANNED, ROW_ROWS_PRUNED, ROW_PRUNING_EFFICIENCY_PERCENTAGE) in cur:
-                html_file=html_file+""" <tr> 
-                <td>"""+str(ROW_TOP_N)+"""</td> 
-                <td>"""+str(ROW_DATE)+"""</td> 
-                <td>"""+str(ROW_DATABASE_NAME)+"""</td> 
-                <td>"""+str(ROW_SCHEMA_NAME)+"""</td> 
-                 <td>"""+str(ROW_TABLE_NAME)+"""</td> 
-                 <td>"""+str(ROW_NUM_SCANS)+"""</td> 
-                 <td>"""+str(ROW_PARTITIONS_SCANNED)+"""</td> 
-                 <td>"""+str(ROW_PARTITIONS_PRUNED)+"""</td> 
-                 <td>"""+str(ROW_ROWS_SCANNED)+"""</td> 
-                 <td>"""+str(ROW_ROWS_PRUNED)+"""</td> 
-                 <td class="cell_grow">"""+str(ROW_PRUNING_EFFICIENCY_PERCENTAGE)+"""</td> 
-                </tr> """
-            
-            html_file=html_file+html_table_tail
-    
-        create_output_file('top_tables_by_pruning_efficiency.html',html_file)
-        report_sections["D - Performance"].update({'top_tables_by_pruning_efficiency.html':'table'})
-    
-    except Exception as error:
-        print("[table_history_table_pruning_efficiency]: An exception occurred:", error)
-        
 def line_history_pruning_efficiency_by_table(conn,database_name,schema_name,table_name):
     try:    
         global snowflake_conn
@@ -2723,7 +2715,7 @@ def line_history_pruning_efficiency_by_table(conn,database_name,schema_name,tabl
                     ROUND(NVL(SUM(PARTITIONS_PRUNED),0),2)                                      AS PARTITIONS_PRUNED,
                     ROUND(NVL(SUM(PARTITIONS_SCANNED+PARTITIONS_PRUNED),0),2)                   AS PARTITIONS_TOTAL,
                 FROM snowflake.account_usage.TABLE_PRUNING_HISTORY     T
-                WHERE  TO_DATE(T.start_time) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
+                WHERE  """+since_predicate("T.start_time")+"""
                     AND DATABASE_NAME='"""+str(database_name).upper()+"""'
                     and SCHEMA_NAME='"""+str(schema_name).upper()+"""'
                     and TABLE_NAME='"""+str(table_name).upper()+"""'
@@ -2752,228 +2744,275 @@ def line_history_pruning_efficiency_by_table(conn,database_name,schema_name,tabl
     except Exception as error:
         print("[line_history_pruning_efficiency_by_table]: An exception occurred:", error)  
 
-def table_history_top_table_by_reclustering(conn):
+def accessed_objects_sql():
+    #Base result of the accessed object reports, read with RESULT_SCAN
+    return """
+        SELECT DISTINCT
+            T.QUERY_ID                          AS QUERY_ID,
+            T.QUERY_START_TIME                  AS QUERY_START_TIME,
+            O.VALUE:"objectName"::STRING        AS OBJECT_NAME,
+            O.VALUE:"objectDomain"::STRING      AS OBJECT_TYPE
+        FROM SNOWFLAKE.ACCOUNT_USAGE.ACCESS_HISTORY T,
+            LATERAL FLATTEN(INPUT => ARRAY_CAT(ARRAY_CAT(
+                NVL(T.BASE_OBJECTS_ACCESSED,ARRAY_CONSTRUCT()),
+                NVL(T.OBJECTS_MODIFIED,ARRAY_CONSTRUCT())),
+                NVL(T.DIRECT_OBJECTS_ACCESSED,ARRAY_CONSTRUCT()))) O
+        WHERE """+since_predicate("T.QUERY_START_TIME")+"""
+        """
+
+def table_history_less_accessed_objects(conn):
 
     try:    
         global snowflake_conn
         global html_table_header
-        global html_table_tail
+        global html_table_tail     
+        global report_sections   
         conn =snowflake_conn
-        global report_sections
         html_file=html_table_header
         
-        sql_query=sql_header+"""
+        sql_query="""
+        WITH HIST_DATA AS (
+            SELECT
+                QUERY_START_TIME AS DATE,
+                OBJECT_NAME,
+                OBJECT_TYPE
+            FROM {result}
+        )
+        , DATA AS (
         SELECT 
-            ROW_NUMBER() over (order by NUM_ROWS_RECLUSTERED DESC ) AS TOP_N,
-            START_TIME::TIMESTAMP_NTZ                               AS DATE,
-            DATABASE_NAME                                           AS DATABASE_NAME,
-            SCHEMA_NAME                                             AS SCHEMA_NAME,
-            TABLE_NAME                                              AS TABLE_NAME,
-            ROUND(NVL(CREDITS_USED,0),2)                            AS CREDITS_USED,
-            ROUND(NVL(NUM_BYTES_RECLUSTERED,0),2)                   AS NUM_BYTES_RECLUSTERED,
-            ROUND(NVL(NUM_ROWS_RECLUSTERED,0),2)                    AS NUM_ROWS_RECLUSTERED,
-        FROM SNOWFLAKE.ACCOUNT_USAGE.AUTOMATIC_CLUSTERING_HISTORY T
-        WHERE  TO_DATE(T.START_TIME) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-        AND NUM_ROWS_RECLUSTERED>0
-        ORDER BY TOP_N
+            STRTOK(OBJECT_NAME, '.', 1)     AS DATABASE_NAME, 
+            STRTOK(OBJECT_NAME, '.', 2)     AS SCHEMA_NAME, 
+            STRTOK(OBJECT_NAME, '.', 3)     AS OBJECT_NAME, 
+            REPLACE(OBJECT_TYPE,'"')        AS OBJECT_TYPE, 
+            MAX(DATE)                       AS DATE
+        FROM HIST_DATA
+        GROUP BY 1,2 ,3,4
+        )
+        SELECT 
+            ROW_NUMBER() over (order by DATE ASC ) AS TOP_N,
+            NVL(DATABASE_NAME,'')           AS DATABASE_NAME, 
+            NVL(SCHEMA_NAME,'')             AS SCHEMA_NAME, 
+            NVL(OBJECT_NAME,'')             AS OBJECT_NAME, 
+            NVL(OBJECT_TYPE,'')             AS OBJECT_TYPE, 
+            DATE                            AS DATE
+        FROM DATA
+        ORDER BY TOP_N ASC
         LIMIT 100
+        ;
         """
         
-        cur = conn.cursor()
-        cur.execute(sql_query)
+        cur = result_scan(conn, "table_history_less_accessed_objects", "ACCESSED_OBJECTS", accessed_objects_sql(), sql_query)
     
         html_file=html_file+"""
-        <h3>Top table by reclustering</h3>
+        <h3>Less accessed objects</h3>
         <table class="tabla2">
         <tr>
         <th >TOP_N</th>
-        <th >DATE</th>
         <th >DATABASE_NAME</th>
         <th >SCHEMA_NAME</th>
-        <th >TABLE_NAME</th>
-        <th >CREDITS_USED</th>
-        <th >NUM_BYTES_RECLUSTERED</th>
-        <th >NUM_ROWS_RECLUSTERED</th>
+        <th >OBJECT_NAME</th>
+        <th >OBJECT_TYPE</th>
+        <th >LAST_USED_DATE</th>
         """
     
         if int(cur.rowcount)!=0:
-            for (ROW_TOP_N, ROW_DATE,ROW_DATABASE_NAME, ROW_SCHEMA_NAME, ROW_TABLE_NAME, ROW_CREDITS_USED, ROW_NUM_BYTES_RECLUSTERED, ROW_NUM_ROWS_RECLUSTERED) in cur:
+            for (ROW_TOP_N, ROW_DATABASE_NAME,ROW_SCHEMA_NAME, ROW_OBJECT_NAME, ROW_OBJECT_TYPE, ROW_DATE) in cur:
                 html_file=html_file+""" <tr> 
                 <td>"""+str(ROW_TOP_N)+"""</td> 
-                <td>"""+str(ROW_DATE)+"""</td> 
                 <td>"""+str(ROW_DATABASE_NAME)+"""</td> 
                 <td>"""+str(ROW_SCHEMA_NAME)+"""</td> 
-                 <td>"""+str(ROW_TABLE_NAME)+"""</td> 
-                 <td>"""+str(ROW_CREDITS_USED)+"""</td> 
-                 <td>"""+str(ROW_NUM_BYTES_RECLUSTERED)+"""</td> 
-                 <td class="cell_grow">"""+str(ROW_NUM_ROWS_RECLUSTERED)+"""</td> 
+                <td>"""+str(ROW_OBJECT_NAME)+"""</td> 
+                 <td>"""+str(ROW_OBJECT_TYPE)+"""</td> 
+                 <td class="cell_grow">"""+str(ROW_DATE)+"""</td> 
                 </tr> """
             
             html_file=html_file+html_table_tail
     
-            create_output_file('history_top_table_by_reclustering.html',html_file)
-            report_sections["D - Performance"].update({'history_top_table_by_reclustering.html':'table'})
+        create_output_file('history_less_accessed_objects.html',html_file)
+        report_sections["G - Maintenance"].update({'history_less_accessed_objects.html':'table'})
     
     except Exception as error:
-        print("[table_history_top_table_by_reclustering]: An exception occurred:", error)
-        
-def table_history_top_cloud_data_transfer(conn):
+        print("[table_history_less_accessed_objects]: An exception occurred:", error)
 
-    try:    
+def update_object_access_index(conn):
+
+    try:
         global snowflake_conn
+        global object_access_index
+        conn =snowflake_conn
+
+        REPORTS_FOLDER = reports_folder
+        INDEX_FILE = REPORTS_FOLDER+'/object_access_index_'+os.path.basename(str(args.account)).lower()+'.json'
+
+        #ACCESS_HISTORY can take up to 3 hours to show a query, rows newer than that are left for the next run
+        upper_time=aligned_report_time(report_time)-timedelta(hours=3)
+        #Accesses are counted per day and ACCESS_COUNT only sums the days of the -m window
+        window_start=months_before_report(-int(months_history))
+
+        object_access_index=None
+        if os.path.exists(INDEX_FILE):
+            fh = open(INDEX_FILE, 'r',encoding='utf-8')
+            object_access_index = json.load(fh)
+            fh.close()
+
+        #An index without daily counts holds lifetime totals, it is built again from the start of the window
+        if object_access_index is None or "daily_counts" not in object_access_index:
+            object_access_index = {"watermark":None,"objects":{},"daily_counts":{}}
+            lower_time=window_start
+        else:
+            lower_time=max(datetime.strptime(object_access_index["watermark"], '%Y-%m-%d %H:%M:%S'), window_start)
+
+        objects=object_access_index["objects"]
+        daily_counts=object_access_index["daily_counts"]
+
+        #A coarser --alignment or the resume of an older run folder ends before the watermark: those rows are already counted
+        if upper_time>lower_time:
+            sql_query=sql_header+"""
+            SELECT
+                O.VALUE:"objectName"::STRING                                AS OBJECT_NAME,
+                O.VALUE:"objectDomain"::STRING                              AS OBJECT_TYPE,
+                TO_DATE(T.QUERY_START_TIME)                                 AS ACCESS_DATE,
+                MAX(T.QUERY_START_TIME)::TIMESTAMP_NTZ                      AS LAST_ACCESS_TIME,
+                COUNT(DISTINCT T.QUERY_ID)                                  AS ACCESS_COUNT,
+                MAX_BY(T.USER_NAME,T.QUERY_START_TIME)                      AS LAST_USER_NAME
+            FROM SNOWFLAKE.ACCOUNT_USAGE.ACCESS_HISTORY T,
+                LATERAL FLATTEN(INPUT => ARRAY_CAT(ARRAY_CAT(
+                    NVL(T.BASE_OBJECTS_ACCESSED,ARRAY_CONSTRUCT()),
+                    NVL(T.OBJECTS_MODIFIED,ARRAY_CONSTRUCT())),
+                    NVL(T.DIRECT_OBJECTS_ACCESSED,ARRAY_CONSTRUCT()))) O
+            WHERE T.QUERY_START_TIME > TO_TIMESTAMP('"""+lower_time.strftime('%Y-%m-%d %H:%M:%S')+"""')
+                AND T.QUERY_START_TIME <= TO_TIMESTAMP('"""+upper_time.strftime('%Y-%m-%d %H:%M:%S')+"""')
+            GROUP BY 1,2,3
+            ;
+            """
+
+            cur = conn.cursor()
+            cur.execute(sql_query)
+
+            for (ROW_OBJECT_NAME, ROW_OBJECT_TYPE, ROW_ACCESS_DATE, ROW_LAST_ACCESS_TIME, ROW_ACCESS_COUNT, ROW_LAST_USER_NAME) in cur:
+                object_key=str(ROW_OBJECT_NAME)
+                access_date=str(ROW_ACCESS_DATE)[:10]
+                last_access_time=ROW_LAST_ACCESS_TIME.strftime('%Y-%m-%d %H:%M:%S')
+                if object_key in objects:
+                    entry=objects[object_key]
+                    if last_access_time>entry[1]:
+                        entry[1]=last_access_time
+                        entry[3]=ROW_LAST_USER_NAME
+                else:
+                    objects[object_key]=[ROW_OBJECT_TYPE,last_access_time,0,ROW_LAST_USER_NAME]
+                object_days=daily_counts.setdefault(object_key,{})
+                object_days[access_date]=object_days.get(access_date,0)+int(ROW_ACCESS_COUNT)
+
+            object_access_index["watermark"]=upper_time.strftime('%Y-%m-%d %H:%M:%S')
+
+        #Days before the window are dropped, an object without accesses in the window keeps its last access with a count of 0
+        first_day=window_start.strftime('%Y-%m-%d')
+        for object_key in objects:
+            object_days=dict([(access_date, access_count) for access_date, access_count in daily_counts.get(object_key,{}).items() if access_date>=first_day])
+            daily_counts[object_key]=object_days
+            objects[object_key][2]=sum(object_days.values())
+
+        #Written aside and renamed, an interrupted run never leaves a truncated index
+        os.makedirs(REPORTS_FOLDER, exist_ok=True)
+        fh = open(INDEX_FILE+'.tmp', 'w',encoding='utf-8')
+        json.dump(object_access_index,fh)
+        fh.close()
+        os.replace(INDEX_FILE+'.tmp', INDEX_FILE)
+        print (datetime.now().strftime('%Y-%m-%d-%H:%M:%S') + "  Object access index updated up to "+str(object_access_index["watermark"])+" ("+str(len(objects))+" objects)")
+
+    except Exception as error:
+        print("[update_object_access_index]: An exception occurred:", error)
+
+def table_history_least_accessed_objects_from_index(conn):
+
+    try:
         global html_table_header
-        global html_table_tail     
-        global report_sections   
-        conn =snowflake_conn        
+        global html_table_tail
+        global report_sections
+        global object_access_index
+
+        if object_access_index is None:
+            update_object_access_index(conn)
+
         html_file=html_table_header
-        
-        sql_query=sql_header+"""
-        SELECT 
-            ROW_NUMBER() over (order by BYTES_TRANSFERRED DESC )    AS TOP_N,
-            START_TIME::TIMESTAMP_NTZ                               AS DATE,
-            SOURCE_CLOUD                                            AS SOURCE_CLOUD,
-            SOURCE_REGION                                           AS SOURCE_REGION,
-            TARGET_CLOUD                                            AS TARGET_CLOUD,
-            TARGET_REGION                                           AS TARGET_REGION,
-            ROUND(BYTES_TRANSFERRED/1024/1024/1024,2)               AS GB_TRANSFERRED,
-            TRANSFER_TYPE                                           AS TRANSFER_TYPE,
-        FROM SNOWFLAKE.ACCOUNT_USAGE.DATA_TRANSFER_HISTORY T
-        WHERE TO_DATE(T.START_TIME) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-        ORDER BY TOP_N ASC
-        LIMIT 100
-        ;
-        """
-        
-        cur = conn.cursor()
-        cur.execute(sql_query)
-    
         html_file=html_file+"""
-        <h3>Top clouds by data transfer</h3>
-        <table class="tabla1">
+        <h3>Least accessed objects as of """+str(object_access_index["watermark"])+"""</h3>
+        <table class="tabla2">
         <tr>
         <th >TOP_N</th>
-        <th >DATE</th>
-        <th >SOURCE_CLOUD</th>
-        <th >SOURCE_REGION</th>
-        <th >TARGET_CLOUD</th>
-        <th >TARGET_REGION</th>
-        <th >GB_TRANSFERRED</th>
-        <th >TRANSFER_TYPE</th>
+        <th >OBJECT_NAME</th>
+        <th >OBJECT_TYPE</th>
+        <th >ACCESS_COUNT</th>
+        <th >LAST_USER_NAME</th>
+        <th >LAST_ACCESS_TIME</th>
         """
-    
-        if int(cur.rowcount)!=0:
-            for (ROW_TOP_N, ROW_DATE, ROW_SOURCE_CLOUD, ROW_SOURCE_REGION, ROW_TARGET_CLOUD, ROW_TARGET_REGION, ROW_GB_TRANSFERRED, ROW_TRANSFER_TYPE) in cur:
-                html_file=html_file+""" <tr> 
-                <td>"""+str(ROW_TOP_N)+"""</td> 
-                <td>"""+str(ROW_DATE)+"""</td> 
-                <td>"""+str(ROW_SOURCE_CLOUD)+"""</td> 
-                <td>"""+str(ROW_SOURCE_REGION)+"""</td> 
-                 <td>"""+str(ROW_TARGET_CLOUD)+"""</td> 
-                 <td>"""+str(ROW_TARGET_REGION)+"""</td> 
-                 <td>"""+str(ROW_GB_TRANSFERRED)+"""</td> 
-                 <td>"""+str(ROW_TRANSFER_TYPE)+"""</td> 
-                </tr> """
-            
-            html_file=html_file+html_table_tail
-    
-        create_output_file('history_top_clouds_by_data_transfer.html',html_file)
-        report_sections["F - Data Transfer"].update({'history_top_clouds_by_data_transfer.html':'table'})
-    
+
+        top_n=0
+        for object_name, (object_type, last_access_time, access_count, last_user_name) in sorted(object_access_index["objects"].items(), key=lambda item: (item[1][2], item[1][1]))[:100]:
+            top_n=top_n+1
+            html_file=html_file+""" <tr> 
+            <td>"""+str(top_n)+"""</td> 
+            <td>"""+str(object_name)+"""</td> 
+            <td>"""+str(object_type)+"""</td> 
+            <td>"""+str(access_count)+"""</td> 
+            <td>"""+str(last_user_name)+"""</td> 
+            <td class="cell_grow">"""+str(last_access_time)+"""</td> 
+            </tr> """
+
+        html_file=html_file+html_table_tail
+
+        create_output_file('history_least_accessed_objects_by_count.html',html_file)
+        report_sections["G - Maintenance"].update({'history_least_accessed_objects_by_count.html':'table'})
+
     except Exception as error:
-        print("[table_history_top_cloud_data_transfer]: An exception occurred:", error)
-        
-def table_history_less_accessed_objects(conn):
+        print("[table_history_least_accessed_objects_from_index]: An exception occurred:", error)
 
-    try:    
-        global snowflake_conn
+def table_history_objects_not_accessed_since(conn):
+
+    try:
         global html_table_header
-        global html_table_tail     
-        global report_sections   
-        conn =snowflake_conn
+        global html_table_tail
+        global report_sections
+        global object_access_index
+
+        if object_access_index is None:
+            update_object_access_index(conn)
+
+        if args.notaccessedsince is not None:
+            not_accessed_since=datetime.strptime(args.notaccessedsince,'%Y-%m-%d').strftime('%Y-%m-%d %H:%M:%S')
+        else:
+            not_accessed_since=(aligned_report_time(report_time)-timedelta(days=90)).strftime('%Y-%m-%d %H:%M:%S')
+
         html_file=html_table_header
-        
-        sql_query=sql_header+"""
-        WITH HIST_DATA AS (
-            SELECT
-                T.QUERY_START_TIME AS DATE,
-                R.VALUE:"objectName" AS OBJECT_NAME,
-                R.VALUE:"objectDomain" AS OBJECT_TYPE
-            FROM
-                (SELECT * FROM SNOWFLAKE.ACCOUNT_USAGE.ACCESS_HISTORY) T,
-                LATERAL FLATTEN(INPUT => T.BASE_OBJECTS_ACCESSED) R
-            UNION ALL
-            SELECT
-                T.QUERY_START_TIME AS DATE,
-                W.VALUE:"objectName" AS OBJECT_NAME,
-                W.VALUE:"objectDomain" AS OBJECT_TYPE
-            FROM
-                (SELECT * FROM SNOWFLAKE.ACCOUNT_USAGE.ACCESS_HISTORY) T,
-                LATERAL FLATTEN(INPUT => T.OBJECTS_MODIFIED) W
-            UNION ALL
-            SELECT
-                T.QUERY_START_TIME AS DATE,
-                D.VALUE:"objectName" AS OBJECT_NAME,
-                D.VALUE:"objectDomain" AS OBJECT_TYPE
-            FROM
-                (SELECT * FROM SNOWFLAKE.ACCOUNT_USAGE.ACCESS_HISTORY) T,
-                LATERAL FLATTEN(INPUT => T.direct_objects_accessed) D
-        )
-        , DATA AS (
-        SELECT 
-            STRTOK(OBJECT_NAME, '.', 1)     AS DATABASE_NAME, 
-            STRTOK(OBJECT_NAME, '.', 2)     AS SCHEMA_NAME, 
-            STRTOK(OBJECT_NAME, '.', 3)     AS OBJECT_NAME, 
-            REPLACE(OBJECT_TYPE,'"')        AS OBJECT_TYPE, 
-            MAX(DATE)                       AS DATE
-        FROM HIST_DATA
-        GROUP BY 1,2 ,3,4
-        )
-        SELECT 
-            ROW_NUMBER() over (order by DATE ASC ) AS TOP_N,
-            NVL(DATABASE_NAME,'')           AS DATABASE_NAME, 
-            NVL(SCHEMA_NAME,'')             AS SCHEMA_NAME, 
-            NVL(OBJECT_NAME,'')             AS OBJECT_NAME, 
-            NVL(OBJECT_TYPE,'')             AS OBJECT_TYPE, 
-            DATE                            AS DATE
-        FROM DATA
-        ORDER BY TOP_N ASC
-        LIMIT 100
-        ;
-        """
-        
-        cur = conn.cursor()
-        cur.execute(sql_query)
-    
         html_file=html_file+"""
-        <h3>Less accessed objects</h3>
+        <h3>Objects not accessed since """+not_accessed_since+"""</h3>
         <table class="tabla2">
         <tr>
-        <th >TOP_N</th>
-        <th >DATABASE_NAME</th>
-        <th >SCHEMA_NAME</th>
         <th >OBJECT_NAME</th>
         <th >OBJECT_TYPE</th>
-        <th >LAST_USED_DATE</th>
+        <th >ACCESS_COUNT</th>
+        <th >LAST_USER_NAME</th>
+        <th >LAST_ACCESS_TIME</th>
         """
-    
-        if int(cur.rowcount)!=0:
-            for (ROW_TOP_N, ROW_DATABASE_NAME,ROW_SCHEMA_NAME, ROW_OBJECT_NAME, ROW_OBJECT_TYPE, ROW_DATE) in cur:
-                html_file=html_file+""" <tr> 
-                <td>"""+str(ROW_TOP_N)+"""</td> 
-                <td>"""+str(ROW_DATABASE_NAME)+"""</td> 
-                <td>"""+str(ROW_SCHEMA_NAME)+"""</td> 
-                <td>"""+str(ROW_OBJECT_NAME)+"""</td> 
-                 <td>"""+str(ROW_OBJECT_TYPE)+"""</td> 
-                 <td class="cell_grow">"""+str(ROW_DATE)+"""</td> 
-                </tr> """
-            
-            html_file=html_file+html_table_tail
-    
-        create_output_file('history_less_accessed_objects.html',html_file)
-        report_sections["G - Maintenance"].update({'history_less_accessed_objects.html':'table'})
-    
+
+        for object_name, (object_type, last_access_time, access_count, last_user_name) in sorted(object_access_index["objects"].items(), key=lambda item: item[1][1]):
+            if last_access_time>=not_accessed_since:
+                break
+            html_file=html_file+""" <tr> 
+            <td>"""+str(object_name)+"""</td> 
+            <td>"""+str(object_type)+"""</td> 
+            <td>"""+str(access_count)+"""</td> 
+            <td>"""+str(last_user_name)+"""</td> 
+            <td class="cell_grow">"""+str(last_access_time)+"""</td> 
+            </tr> """
+
+        html_file=html_file+html_table_tail
+
+        create_output_file('objects_not_accessed_since.html',html_file)
+        report_sections["G - Maintenance"].update({'objects_not_accessed_since.html':'table'})
+
     except Exception as error:
-        print("[table_history_less_accessed_objects]: An exception occurred:", error)
+        print("[table_history_objects_not_accessed_since]: An exception occurred:", error)
         
 def line_history_data_transfer_by_cloud(conn):
 
@@ -2994,7 +3033,7 @@ def line_history_data_transfer_by_cloud(conn):
                 ROUND(BYTES_TRANSFERRED/1024/1024/1024,2)               AS GB_TRANSFERRED,
                 TRANSFER_TYPE                                           AS TRANSFER_TYPE,
             FROM SNOWFLAKE.ACCOUNT_USAGE.DATA_TRANSFER_HISTORY T
-            WHERE TO_DATE(T.START_TIME) > DATEADD(MONTH,-1,TO_TIMESTAMP("""+report_formatted_time+"""))
+            WHERE """+since_predicate("T.START_TIME","MONTH",-1)+"""
             ORDER BY TOP_N ASC
             LIMIT 100
         )
@@ -3023,7 +3062,7 @@ def line_history_data_transfer_by_cloud(conn):
                     DATE_TRUNC('HOUR',START_TIME::TIMESTAMP_NTZ)            AS DATE,
                     ROUND(SUM(BYTES_TRANSFERRED)/1024/1024/1024,2)          AS GB_TRANSFERRED
                 FROM SNOWFLAKE.ACCOUNT_USAGE.DATA_TRANSFER_HISTORY T
-                WHERE TO_DATE(T.START_TIME) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
+                WHERE """+since_predicate("T.START_TIME")+"""
                   and SOURCE_CLOUD='"""+str(ROW_SOURCE_CLOUD)+"""'
                   and SOURCE_REGION='"""+str(ROW_SOURCE_REGION)+"""'
                   and TARGET_CLOUD='"""+str(ROW_TARGET_CLOUD)+"""'
@@ -3122,81 +3161,6 @@ def table_history_users_with_highest_privileges(conn):
     except Exception as error:
         print("[table_history_users_with_highest_privileges]: An exception occurred:", error)
         
-def table_history_top_database_by_storage(conn):
-
-    try:    
-        global snowflake_conn
-        global html_table_header
-        global html_table_tail  
-        global report_sections     
-        conn =snowflake_conn            
-        html_file=html_table_header
-        
-        sql_query=sql_header+"""
-            WITH MAX_DATE AS (
-                SELECT MAX (USAGE_DATE) USAGE_DATE, DATABASE_NAME 
-                FROM snowflake.account_usage.DATABASE_STORAGE_USAGE_HISTORY
-                WHERE USAGE_DATE > DATEADD(MONTH,-1,TO_TIMESTAMP("""+report_formatted_time+"""))
-                GROUP BY 2
-            )
-            ,DATA AS (
-              SELECT 
-              Q.DATABASE_NAME                                              AS DATABASE_NAME,
-              ROUND(AVERAGE_DATABASE_BYTES/1024/1024/1024,2)               AS AVERAGE_DATABASE_GB,
-              ROUND(AVERAGE_FAILSAFE_BYTES/1024/1024/1024,2)               AS AVERAGE_FAILSAFE_GB,
-              ROUND(AVERAGE_HYBRID_TABLE_STORAGE_BYTES/1024/1024/1024  ,2) AS AVERAGE_HYBRID_TABLE_STORAGE_GB
-            FROM snowflake.account_usage.DATABASE_STORAGE_USAGE_HISTORY  Q
-            INNER JOIN MAX_DATE
-                ON (
-                    MAX_DATE.DATABASE_NAME=Q.DATABASE_NAME 
-                    AND Q.USAGE_DATE=MAX_DATE.USAGE_DATE
-                    )
-            ORDER BY AVERAGE_DATABASE_GB desc
-            LIMIT 25
-            )
-            SELECT 
-                ROW_NUMBER() over (order by AVERAGE_DATABASE_GB  DESC)       AS TOP_N
-                ,DATABASE_NAME
-                ,AVERAGE_DATABASE_GB
-                ,AVERAGE_FAILSAFE_GB
-                ,AVERAGE_HYBRID_TABLE_STORAGE_GB
-            FROM DATA
-            ORDER BY TOP_N;
-        """
-        
-        cur = conn.cursor()
-        cur.execute(sql_query)
-    
-        html_file=html_file+"""
-        <h3>Top database by storage</h3>
-        <table class="tabla1">
-        <tr>
-        <th >TOP_N</th>
-        <th >DATABASE_NAME</th>
-        <th >AVERAGE_DATABASE_GB</th>
-        <th >AVERAGE_FAILSAFE_GB</th>
-        <th >AVERAGE_HYBRID_TABLE_STORAGE_GB</th>
-        """
-    
-        if int(cur.rowcount)!=0:
-            for (ROW_TOP_N, ROW_DATABASE_NAME, ROW_AVERAGE_DATABASE_GB, ROW_AVERAGE_FAILSAFE_GB, ROW_AVERAGE_HYBRID_TABLE_STORAGE_GB) in cur:
-                html_file=html_file+""" <tr> 
-                <td>"""+str(ROW_TOP_N)+"""</td> 
-                <td>"""+str(ROW_DATABASE_NAME)+"""</td> 
-                 <td>"""+str(ROW_AVERAGE_DATABASE_GB)+"""</td> 
-                 <td>"""+str(ROW_AVERAGE_FAILSAFE_GB)+"""</td> 
-                 <td class="cell_grow">"""+str(ROW_AVERAGE_HYBRID_TABLE_STORAGE_GB)+"""</td> 
-                </tr> """
-            
-            html_file=html_file+html_table_tail
-    
-        create_output_file('top_database_by_storage.html',html_file)
-        report_sections["B - Storage"].update({'top_database_by_storage.html':'table'})
-
-    
-    except Exception as error:
-        print("[table_history_top_database_by_storage]: An exception occurred:", error)
-
 def line_history_top_storage_by_database(conn):
 
     try:
@@ -3256,7 +3220,7 @@ def line_history_top_storage_by_database(conn):
                         ROUND(AVERAGE_FAILSAFE_BYTES/1024/1024/1024,2)               AS AVERAGE_FAILSAFE_GB,
                         ROUND(AVERAGE_HYBRID_TABLE_STORAGE_BYTES/1024/1024/1024  ,2) AS AVERAGE_HYBRID_TABLE_STORAGE_GB
                     FROM snowflake.account_usage.DATABASE_STORAGE_USAGE_HISTORY
-                    WHERE  TO_DATE(USAGE_DATE) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
+                    WHERE  """+since_predicate("USAGE_DATE","MONTH",months_history,date_column=True)+"""
                     AND DATABASE_NAME='"""+str(database_name[0])+"""'
                 ORDER BY USAGE_DATE  
                 )
@@ -3282,167 +3246,204 @@ def line_history_top_storage_by_database(conn):
     except Exception as error:
         print("[line_history_top_storage_by_database]: An exception occurred:", error)
 
-def table_history_recent_changed_network_policies(conn):
-
-    try:    
+def generate_sessions_info(conn):
+    #SESSIONS of the authentication method reports read once, sessions per day and authentication method.
+    #The month and last week charts are summed from these days. The scan starts at the midnight of its first day,
+    #IN_HISTORY and IN_LAST_WEEK keep the exact CREATED_ON > DATEADD(...) bounds of the charts
+    try:
         global snowflake_conn
-        global html_table_header
-        global html_table_tail  
-        global report_sections     
-        conn =snowflake_conn            
-        html_file=html_table_header
-        
+        global sessions_rows
+        conn =snowflake_conn
+
         sql_query=sql_header+"""
-        WITH DATA AS (
-              SELECT 
-                ROW_NUMBER() OVER (ORDER BY LAST_ALTERED  DESC)       AS TOP_N,
-                LAST_ALTERED              AS LAST_ALTERED,
-                ID                        AS ID,
-                NAME                      AS NAME,
-                OWNER                     AS OWNER,
-                OWNER_ROLE_TYPE           AS OWNER_ROLE_TYPE,
-                CREATED                   AS CREATED,
-                COMMENT                   AS COMMENT
-              FROM SNOWFLAKE.ACCOUNT_USAGE.NETWORK_POLICIES 
-              WHERE LAST_ALTERED > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-                OR CREATED > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-              ORDER BY LAST_ALTERED DESC
-              
-        )
-        SELECT 
-            *
-        FROM DATA
-        WHERE TOP_N<=100
-        ORDER BY TOP_N;
+        SELECT DATE_TRUNC('DAY',CREATED_ON::TIMESTAMP_NTZ)      AS DATE 
+            ,DATE_TRUNC('MONTH',CREATED_ON::TIMESTAMP_NTZ)      AS MONTH
+            ,CASE WHEN CREATED_ON > DATEADD(DAY,-7,TO_TIMESTAMP("""+report_formatted_time+""")) THEN 1 ELSE 0 END     AS IN_LAST_WEEK
+            ,AUTHENTICATION_METHOD                              AS AUTHENTICATION_METHOD
+            ,count(*)                                           AS SESSION_COUNT
+            ,CASE WHEN CREATED_ON > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+""")) THEN 1 ELSE 0 END     AS IN_HISTORY
+        FROM snowflake.account_usage.SESSIONS
+        WHERE CREATED_ON >= DATE_TRUNC('DAY',DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+""")))
+        GROUP BY 1,2,3,4,6
+        ORDER BY 1
         """
-        
+
         cur = conn.cursor()
         cur.execute(sql_query)
-    
-        html_file=html_file+"""
-        <h3>Recent changes on network policies</h3>
-        <table class="tabla1">
+        sessions_rows=cur.fetchall()
+
+    except Exception as error:
+        print("[generate_sessions_info]: An exception occurred:", error)
+
+def create_sessions_file(rows, date_position, title, html_tail, file_name, chart_type):
+    #Pivot of the session counts by authentication method, one column per method in alphabetical order
+    global report_sections
+
+    if len(rows)==0:
+        return
+    authentication_methods=sorted(set([row[3] for row in rows]), key=str)
+    dates={}
+    for row in rows:
+        dates.setdefault(row[date_position], dict([(authentication_method, 0) for authentication_method in authentication_methods]))
+        dates[row[date_position]][row[3]]=dates[row[date_position]][row[3]]+int(row[4])
+
+    headers=['DATE']+[str(authentication_method) for authentication_method in authentication_methods]
+    column_count=len(headers)
+    html_file=html_header+str(headers)+", \n"
+    html_file=html_file+",".join([json.dumps([str(date)]+[dates[date][authentication_method] for authentication_method in authentication_methods]) for date in sorted(dates)])
+
+    html_file=html_file+html_body1
+    
+    for i in range(1, column_count):
+        if i==column_count-1:
+            html_file=html_file+"""row["""+str(i)+"""]"""
+        else:
+            html_file=html_file+"""row["""+str(i)+"""],"""
+
+    html_file=html_file+html_body2+"""
+    title:  `Prismafy v1.0 - https://github.com/prismafy/prismafy
+    Chart Creation Date: """+report_formatted_time+"""
+    """+title+"""`,"""+html_tail
+        
+    create_output_file(file_name,html_file)
+    report_sections["E - Security"].update({file_name:chart_type})
+
+def bar_month_sessions_by_authentication_method(conn):
+    try:
+        global sessions_rows
+
+        if sessions_rows is None:
+            generate_sessions_info(conn)
+
+        create_sessions_file([row for row in sessions_rows if row[5]==1], 1, 'Sessions by authentication method per month', html_bar_month_tail, 'sessions_by_authentication_method_per_month.html', 'bar')
+            
+    except Exception as error:
+        print("[bar_month_sessions_by_authentication_method]: An exception occurred:", error)
+ 
+def bar_week_sessions_by_authentication_method(conn):
+    try:
+        global sessions_rows
+
+        if sessions_rows is None:
+            generate_sessions_info(conn)
+
+        create_sessions_file([row for row in sessions_rows if row[2]==1], 0, 'Sessions by authentication method for the last week', html_bar_day_tail,
+                             'sessions_by_authentication_method_for_last_week.html', 'bar')
+            
+    except Exception as error:
+        print("[bar_week_sessions_by_authentication_method]: An exception occurred:", error)
+          
+def line_history_sessions_by_authentication_method(conn):
+    try:
+        global sessions_rows
+
+        if sessions_rows is None:
+            generate_sessions_info(conn)
+
+        create_sessions_file([row for row in sessions_rows if row[5]==1], 0, 'Sessions by authentication method', html_line_day_tail, 'sessions_by_authentication_method.html', 'line')
+            
+    except Exception as error:
+        print("[line_history_sessions_by_authentication_method]: An exception occurred:", error)
+
+def generate_users_last_session_info(conn):
+    #Last session of every user, the pages of users without sessions are built from these rows for any number of months
+    global users_last_session_rows
+
+    sql_query=sql_header+"""
+    SELECT 
+        USER_NAME , MAX(CREATED_ON) AS LAST_SESSION_DATE
+    FROM SNOWFLAKE.ACCOUNT_USAGE.SESSIONS     
+    GROUP BY 1 
+    ORDER BY LAST_SESSION_DATE, USER_NAME;
+    """
+
+    cur = conn.cursor()
+    cur.execute(sql_query)
+    users_last_session_rows=cur.fetchall()
+    return users_last_session_rows
+
+def inactive_months():
+    #Numbers of months of --inactivemonths, parsed by argparse or given as text in the configuration of the Prismafy API
+    if args.inactivemonths is None:
+        return []
+    if isinstance(args.inactivemonths, str):
+        return inactive_months_argument(args.inactivemonths)
+    return args.inactivemonths
+
+def months_before_report(months):
+    #DATEADD(MONTH,-months,TO_TIMESTAMP(report_formatted_time)): the day is clamped to the last day of a shorter month
+    end_time=aligned_report_time(report_time)
+    month_index=end_time.year*12+end_time.month-1-months
+    year, month=divmod(month_index, 12)
+    return end_time.replace(year=year, month=month+1, day=min(end_time.day, calendar.monthrange(year, month+1)[1]))
+
+def activity_time(value):
+    #Timestamps of Snowflake come in the session time zone and are compared by wall clock time, like TIMESTAMP_LTZ against TO_TIMESTAMP,
+    #the stand-in returns text
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value.replace(tzinfo=None)
+
+def create_inactive_entities_file(rows, title, columns, file_name):
+    html_file=html_table_header+"""
+        <h3>"""+title+"""</h3>
+        <table class="tabla2">
         <tr>
-        <th >TOP_N</th>
-        <th >LAST_ALTERED</th>
-        <th >ID</th>
-        <th >NAME</th>
-        <th >OWNER</th>
-        <th >OWNER_ROLE_TYPE</th>
-        <th >CREATED</th>
-        <th >COMMENT</th>
+        <th >"""+columns[0]+"""</th>
+        <th >"""+columns[1]+"""</th>
         """
-    
-        if int(cur.rowcount)!=0:
-            for (ROW_TOP_N, ROW_LAST_ALTERED, ROW_ID, ROW_NAME, ROW_OWNER, ROW_OWNER_ROLE_TYPE, ROW_CREATED, ROW_COMMENT) in cur:
-                html_file=html_file+""" <tr> 
-                <td>"""+str(ROW_TOP_N)+"""</td> 
-                <td>"""+str(ROW_LAST_ALTERED)+"""</td> 
-                 <td>"""+str(ROW_ID)+"""</td> 
+
+    if len(rows)!=0:
+        for (ROW_NAME, ROW_LAST_DATE) in rows:
+            html_file=html_file+""" <tr> 
                  <td>"""+str(ROW_NAME)+"""</td> 
-                 <td>"""+str(ROW_OWNER)+"""</td> 
-                 <td>"""+str(ROW_OWNER_ROLE_TYPE)+"""</td> 
-                 <td>"""+str(ROW_CREATED)+"""</td> 
-                 <td>"""+str(ROW_COMMENT)+"""</td> 
+                 <td class="cell_grow">"""+str(ROW_LAST_DATE)+"""</td> 
                 </tr> """
-            
-            html_file=html_file+html_table_tail
-    
-            create_output_file('recent_changes_on_network_policies.html',html_file)
-            report_sections["E - Security"].update({'recent_changes_on_network_policies.html':'table'})
 
-    
-    except Exception as error:
-        print("[table_history_recent_changed_network_policies]: An exception occurred:", error)
+        html_file=html_file+html_table_tail
 
-def table_history_recent_changed_network_rules(conn):
+    create_output_file(file_name,html_file)
+    report_sections["G - Maintenance"].update({file_name:'table'})
 
-    try:    
-        global snowflake_conn
-        global html_table_header
-        global html_table_tail  
-        global report_sections     
-        conn =snowflake_conn            
-        html_file=html_table_header
-        
-        sql_query=sql_header+"""
-        WITH DATA AS (
-              SELECT 
-                ROW_NUMBER() OVER (ORDER BY LAST_ALTERED  DESC)       AS TOP_N,
-                LAST_ALTERED        AS LAST_ALTERED,
-                ID                  AS ID,
-                NAME                AS NAME,
-                SCHEMA_ID           AS SCHEMA_ID,
-                SCHEMA              AS SCHEMA_NAME,
-                DATABASE_ID         AS DATABASE_ID,
-                DATABASE            AS DATABASE_NAME,
-                OWNER               AS OWNER,
-                OWNER_ROLE_TYPE     AS OWNER_ROLE_TYPE,            
-                CREATED             AS CREATED,           
-                DELETED             AS DELETED,
-                COMMENT             AS COMMENT
-              FROM SNOWFLAKE.ACCOUNT_USAGE.NETWORK_RULES    
-              WHERE LAST_ALTERED > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-                OR CREATED > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-              ORDER BY LAST_ALTERED DESC
-        )
-        SELECT 
-            *
-        FROM DATA
-        WHERE TOP_N<=100
-        ORDER BY TOP_N;
-        """
-        
-        cur = conn.cursor()
-        cur.execute(sql_query)
-    
-        html_file=html_file+"""
-        <h3>Recent changes on network rules</h3>
-        <table class="tabla1">
-        <tr>
-        <th >TOP_N</th>
-        <th >LAST_ALTERED</th>
-        <th >ID</th>
-        <th >NAME</th>
-        <th >SCHEMA_ID</th>
-        <th >SCHEMA_NAME</th>
-        <th >DATABASE_ID</th>
-        <th >DATABASE_NAME</th>
-        <th >OWNER</th>
-        <th >OWNER_ROLE_TYPE</th>
-        <th >CREATED</th>
-        <th >DELETED</th>
-        <th >COMMENT</th>
-        """
-    
-        if int(cur.rowcount)!=0:
-            for (ROW_TOP_N, ROW_LAST_ALTERED, ROW_ID, ROW_NAME, ROW_SCHEMA_ID, ROW_SCHEMA_NAME, ROW_DATABASE_ID, ROW_DATABASE_NAME, ROW_OWNER, ROW_OWNER_ROLE_TYPE, ROW_CREATED, ROW_DELETED, ROW_COMMENT) in cur:
-                html_file=html_file+""" <tr> 
-                <td>"""+str(ROW_TOP_N)+"""</td> 
-                <td>"""+str(ROW_LAST_ALTERED)+"""</td> 
-                 <td>"""+str(ROW_ID)+"""</td> 
-                 <td>"""+str(ROW_NAME)+"""</td> 
-                 <td>"""+str(ROW_SCHEMA_ID)+"""</td> 
-                 <td>"""+str(ROW_SCHEMA_NAME)+"""</td> 
-                 <td>"""+str(ROW_DATABASE_ID)+"""</td> 
-                 <td>"""+str(ROW_DATABASE_NAME)+"""</td> 
-                 <td>"""+str(ROW_OWNER)+"""</td> 
-                 <td>"""+str(ROW_OWNER_ROLE_TYPE)+"""</td> 
-                 <td>"""+str(ROW_CREATED)+"""</td> 
-                 <td>"""+str(ROW_DELETED)+"""</td> 
-                 <td class="cell_grow">"""+str(ROW_COMMENT)+"""</td> 
-                </tr> """
-            
-            html_file=html_file+html_table_tail
-    
-        create_output_file('recent_changes_on_network_rules.html',html_file)
-        report_sections["E - Security"].update({'recent_changes_on_network_rules.html':'table'})
+def table_users_without_sessions(conn, months):
+    global users_last_session_rows
+
+    if users_last_session_rows is None:
+        generate_users_last_session_info(conn)
+
+    #Users with no session after the start of the window, oldest last session first
+    since_time=months_before_report(months)
+    rows=[row for row in users_last_session_rows if row[1] is not None and activity_time(row[1])<=since_time]
+    create_inactive_entities_file(rows, 'Users without sessions in last '+str(months)+' months', ['USER_NAME','LAST_SESSION_DATE'],
+                                  'users_without_sessions_in_last_'+str(months)+'_months.html')
+
+def table_history_users_without_sessions_last_6_months(conn):
+
+    try:
+        table_users_without_sessions(conn, 6)
+
+    except Exception as error:
+        print("[table_history_users_without_sessions_last_6_months]: An exception occurred:", error)
+
+def table_history_users_without_sessions_last_3_months(conn):
+
+    try:
+        table_users_without_sessions(conn, 3)
+
+    except Exception as error:
+        print("[table_history_users_without_sessions_last_3_months]: An exception occurred:", error)
+
+def table_history_users_without_sessions_by_months(conn):
+    #One page per number of months of --inactivemonths, from the same rows
+
+    try:
+        for months in inactive_months():
+            table_users_without_sessions(conn, months)
 
-    
     except Exception as error:
-        print("[table_history_recent_changed_network_rules]: An exception occurred:", error)
+        print("[table_history_users_without_sessions_by_months]: An exception occurred:", error)
 
-def table_history_recent_changed_password_policies(conn):
+def table_account_non_default_parameters(conn):
 
     try:    
         global snowflake_conn
@@ -3453,116 +3454,44 @@ def table_history_recent_changed_password_policies(conn):
         html_file=html_table_header
         
         sql_query=sql_header+"""
-        WITH DATA AS (
-              SELECT 
-                ROW_NUMBER() OVER (ORDER BY LAST_ALTERED  DESC)       AS TOP_N,
-                LAST_ALTERED                    AS LAST_ALTERED,
-                NAME                            AS NAME,
-                ID                              AS ID,
-                SCHEMA_ID                       AS SCHEMA_ID,
-                SCHEMA                          AS SCHEMA,
-                DATABASE_ID                     AS DATABASE_ID,
-                DATABASE                        AS DATABASE,
-                OWNER                           AS OWNER,
-                OWNER_ROLE_TYPE                 AS OWNER_ROLE_TYPE,
-                PASSWORD_MIN_LENGTH             AS PASSWORD_MIN_LENGTH,
-                PASSWORD_MAX_LENGTH             AS PASSWORD_MAX_LENGTH,
-                PASSWORD_MIN_UPPER_CASE_CHARS   AS PASSWORD_MIN_UPPER_CASE_CHARS,
-                PASSWORD_MIN_LOWER_CASE_CHARS   AS PASSWORD_MIN_LOWER_CASE_CHARS,
-                PASSWORD_MIN_NUMERIC_CHARS      AS PASSWORD_MIN_NUMERIC_CHARS,
-                PASSWORD_MIN_SPECIAL_CHARS      AS PASSWORD_MIN_SPECIAL_CHARS,
-                PASSWORD_MIN_AGE_DAYS           AS PASSWORD_MIN_AGE_DAYS,
-                PASSWORD_MAX_AGE_DAYS           AS PASSWORD_MAX_AGE_DAYS,
-                PASSWORD_MAX_RETRIES            AS PASSWORD_MAX_RETRIES,
-                PASSWORD_LOCKOUT_TIME_MINS      AS PASSWORD_LOCKOUT_TIME_MINS,
-                CREATED                         AS CREATED,
-                DELETED                         AS DELETED,
-                PASSWORD_HISTORY                AS PASSWORD_HISTORY,
-                COMMENT                         AS COMMENT
-              FROM SNOWFLAKE.ACCOUNT_USAGE.PASSWORD_POLICIES   
-              WHERE LAST_ALTERED > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-                OR CREATED > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-              ORDER BY LAST_ALTERED DESC
-        )
-        SELECT 
-            *
-        FROM DATA
-        WHERE TOP_N<=100
-        ORDER BY TOP_N;
-        """
-        
-        cur = conn.cursor()
-        cur.execute(sql_query)
-    
+        SHOW PARAMETERS IN ACCOUNT;
+        """        
+
         html_file=html_file+"""
-        <h3>Recent changes on password policies</h3>
-        <table class="tabla1">
+        <h3>non default parameters for the account</h3>
+        <table class="tabla2">
         <tr>
-        <th >TOP_N</th>
-        <th >LAST_ALTERED</th>
-        <th >NAME</th>
-        <th >ID</th>
-        <th >SCHEMA_ID</th>
-        <th >SCHEMA</th>
-        <th >DATABASE_ID</th>
-        <th >DATABASE</th>
-        <th >OWNER</th>
-        <th >OWNER_ROLE_TYPE</th>
-        <th >PASSWORD_MIN_LENGTH</th>
-        <th >PASSWORD_MAX_LENGTH</th>
-        <th >PASSWORD_MIN_UPPER_CASE_CHARS</th>
-        <th >PASSWORD_MIN_LOWER_CASE_CHARS</th>
-        <th >PASSWORD_MIN_NUMERIC_CHARS</th>
-        <th >PASSWORD_MIN_SPECIAL_CHARS</th>
-        <th >PASSWORD_MIN_AGE_DAYS</th>
-        <th >PASSWORD_MAX_AGE_DAYS</th>
-        <th >PASSWORD_MAX_RETRIES</th>
-        <th >PASSWORD_LOCKOUT_TIME_MINS</th>
-        <th >CREATED</th>
-        <th >DELETED</th>
-        <th >PASSWORD_HISTORY</th>
-        <th >COMMENT</th>
+        <th >PARAMETER_NAME</th>
+        <th >CURRENT_VALUE</th>
+        <th >DEFAULT_VALUE</th>
+        <th >LEVEL</th>
+        <th >DESCRIPTION</th>
         """
+
+        cur = conn.cursor()
+        cur.execute(sql_query)
     
         if int(cur.rowcount)!=0:
-            for ( ROW_TOP_N, ROW_LAST_ALTERED, ROW_NAME, ROW_ID,  ROW_SCHEMA_ID, ROW_SCHEMA, ROW_DATABASE_ID, ROW_DATABASE, ROW_OWNER, ROW_OWNER_ROLE_TYPE, ROW_PASSWORD_MIN_LENGTH,  ROW_PASSWORD_MAX_LENGTH, ROW_PASSWORD_MIN_UPPER_CASE_CHARS, ROW_PASSWORD_MIN_LOWER_CASE_CHARS, ROW_PASSWORD_MIN_NUMERIC_CHARS, ROW_PASSWORD_MIN_SPECIAL_CHARS, ROW_PASSWORD_MIN_AGE_DAYS,  ROW_PASSWORD_MAX_AGE_DAYS, ROW_PASSWORD_MAX_RETRIES, ROW_PASSWORD_LOCKOUT_TIME_MINS, ROW_CREATED, ROW_DELETED, ROW_PASSWORD_HISTORY, ROW_COMMENT) in cur:
-                html_file=html_file+""" <tr> 
-                <td>"""+str(ROW_TOP_N)+"""</td> 
-                <td>"""+str(ROW_LAST_ALTERED)+"""</td> 
-                 <td>"""+str(ROW_NAME)+"""</td> 
-                 <td>"""+str(ROW_ID)+"""</td> 
-                 <td>"""+str(ROW_SCHEMA_ID)+"""</td> 
-                 <td>"""+str(ROW_SCHEMA)+"""</td> 
-                 <td>"""+str(ROW_DATABASE_ID)+"""</td> 
-                 <td>"""+str(ROW_DATABASE)+"""</td> 
-                 <td>"""+str(ROW_OWNER)+"""</td> 
-                 <td>"""+str(ROW_OWNER_ROLE_TYPE)+"""</td> 
-                 <td>"""+str(ROW_PASSWORD_MIN_LENGTH)+"""</td> 
-                 <td>"""+str(ROW_PASSWORD_MAX_LENGTH)+"""</td> 
-                 <td>"""+str(ROW_PASSWORD_MIN_UPPER_CASE_CHARS)+"""</td> 
-                 <td>"""+str(ROW_PASSWORD_MIN_LOWER_CASE_CHARS)+"""</td> 
-                 <td>"""+str(ROW_PASSWORD_MIN_NUMERIC_CHARS)+"""</td> 
-                 <td>"""+str(ROW_PASSWORD_MIN_SPECIAL_CHARS)+"""</td> 
-                 <td>"""+str(ROW_PASSWORD_MIN_AGE_DAYS)+"""</td> 
-                 <td>"""+str(ROW_PASSWORD_MAX_AGE_DAYS)+"""</td> 
-                 <td>"""+str(ROW_PASSWORD_MAX_RETRIES)+"""</td> 
-                 <td>"""+str(ROW_PASSWORD_LOCKOUT_TIME_MINS)+"""</td> 
-                 <td>"""+str(ROW_CREATED)+"""</td> 
-                 <td>"""+str(ROW_DELETED)+"""</td> 
-                 <td>"""+str(ROW_PASSWORD_HISTORY)+"""</td> 
-                 <td class="cell_grow">"""+str(ROW_COMMENT)+"""</td> 
-                </tr> """
+            for ( PARAMETER_NAME, CURRENT_VALUE, DEFAULT_VALUE, LEVEL, DESCRIPTION,TYPE) in cur:
+                if str(CURRENT_VALUE)!=str(DEFAULT_VALUE):
+                    html_file=html_file+""" <tr> 
+                    <td>"""+str(PARAMETER_NAME)+"""</td> 
+                    <td>"""+str(CURRENT_VALUE)+"""</td> 
+                    <td>"""+str(DEFAULT_VALUE)+"""</td> 
+                    <td>"""+str(LEVEL)+"""</td> 
+                    <td class="cell_grow">"""+str(DESCRIPTION)+"""</td> 
+                    </tr> """
             
             html_file=html_file+html_table_tail
     
-        create_output_file('recent_changes_on_password_policies.html',html_file)
-        report_sections["E - Security"].update({'recent_changes_on_password_policies.html':'table'})
+        create_output_file('account_non_default_parameters.html',html_file)
+        report_sections["G - Maintenance"].update({'account_non_default_parameters.html':'table'})
 
-    
     except Exception as error:
-        print("[table_history_recent_changed_password_policies]: An exception occurred:", error)
+        #print("[table_non_default_parameters]: An exception occurred:", error)
+        return
 
-def table_history_recent_changed_masking_policies(conn):
+def table_warehouse_non_default_parameters(conn):
 
     try:    
         global snowflake_conn
@@ -3571,97 +3500,55 @@ def table_history_recent_changed_masking_policies(conn):
         global report_sections     
         conn =snowflake_conn            
         html_file=html_table_header
-        
-        sql_query=sql_header+"""
-        WITH DATA AS (
-              SELECT 
-                ROW_NUMBER() OVER (ORDER BY LAST_ALTERED  DESC)       AS TOP_N,
-                LAST_ALTERED        AS LAST_ALTERED,
-                POLICY_NAME         AS POLICY_NAME,
-                POLICY_ID           AS POLICY_ID,
-                POLICY_SCHEMA_ID    AS POLICY_SCHEMA_ID,
-                POLICY_SCHEMA       AS POLICY_SCHEMA,
-                POLICY_CATALOG_ID   AS POLICY_CATALOG_ID,
-                POLICY_CATALOG      AS POLICY_CATALOG,
-                POLICY_OWNER        AS POLICY_OWNER,
-                POLICY_SIGNATURE    AS POLICY_SIGNATURE,
-                POLICY_RETURN_TYPE  AS POLICY_RETURN_TYPE,
-                POLICY_BODY         AS POLICY_BODY,
-                CREATED             AS CREATED,
-                DELETED             AS DELETED,
-                OWNER_ROLE_TYPE     AS OWNER_ROLE_TYPE,
-                OPTIONS             AS OPTIONS,
-                POLICY_COMMENT      AS POLICY_COMMENT
-              FROM SNOWFLAKE.ACCOUNT_USAGE.MASKING_POLICIES   
-              WHERE LAST_ALTERED > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-                OR CREATED > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-              ORDER BY LAST_ALTERED DESC
-        )
-        SELECT 
-            *
-        FROM DATA
-        WHERE TOP_N<=100
-        ORDER BY TOP_N;
+
+        sql_query="""
+        SELECT WAREHOUSE_NAME FROM {result} WHERE WITH_EVENTS=1
         """
-        
-        cur = conn.cursor()
-        cur.execute(sql_query)
-    
+        cur = result_scan(conn, "table_warehouse_non_default_parameters", "WAREHOUSE_NAMES", warehouse_names_sql(), sql_query)
+
         html_file=html_file+"""
-        <h3>Recent changes on masking policies</h3>
-        <table class="tabla1">
+        <h3>non default parameters for warehouses</h3>
+        <table class="tabla2">
         <tr>
-        <th > TOP_N</th>
-        <th > LAST_ALTERED</th>
-        <th > POLICY_NAME</th>
-        <th > POLICY_ID</th>
-        <th > POLICY_SCHEMA_ID</th>
-        <th > POLICY_SCHEMA</th>
-        <th > POLICY_CATALOG_ID</th>
-        <th > POLICY_CATALOG</th>
-        <th > POLICY_OWNER</th>
-        <th > POLICY_SIGNATURE</th>
-        <th > POLICY_RETURN_TYPE</th>
-        <th > POLICY_BODY</th>
-        <th > CREATED</th>
-        <th > DELETED</th>
-        <th > OWNER_ROLE_TYPE</th>
-        <th > OPTIONS</th>
-        <th > POLICY_COMMENT</th>
+        <th >WAREHOUSE_NAME</th>
+        <th >PARAMETER_NAME</th>
+        <th >CURRENT_VALUE</th>
+        <th >DEFAULT_VALUE</th>
+        <th >LEVEL</th>
+        <th >DESCRIPTION</th>
         """
-    
+
         if int(cur.rowcount)!=0:
-            for ( ROW_TOP_N, ROW_LAST_ALTERED, ROW_POLICY_NAME, ROW_POLICY_ID, ROW_POLICY_SCHEMA_ID, ROW_POLICY_SCHEMA, ROW_POLICY_CATALOG_ID, ROW_POLICY_CATALOG, ROW_POLICY_OWNER, ROW_POLICY_SIGNATURE, ROW_POLICY_RETURN_TYPE, ROW_POLICY_BODY, ROW_CREATED, ROW_DELETED, ROW_OWNER_ROLE_TYPE, ROW_OPTIONS, ROW_POLICY_COMMENT ) in cur:
-                html_file=html_file+""" <tr> 
-                 <td>"""+str(ROW_TOP_N)+"""</td> 
-                 <td>"""+str(ROW_LAST_ALTERED)+"""</td> 
-                 <td>"""+str(ROW_POLICY_NAME)+"""</td> 
-                 <td>"""+str(ROW_POLICY_ID)+"""</td> 
-                 <td>"""+str(ROW_POLICY_SCHEMA_ID)+"""</td> 
-                 <td>"""+str(ROW_POLICY_SCHEMA)+"""</td> 
-                 <td>"""+str(ROW_POLICY_CATALOG_ID)+"""</td> 
-                 <td>"""+str(ROW_POLICY_CATALOG)+"""</td> 
-                 <td>"""+str(ROW_POLICY_OWNER)+"""</td> 
-                 <td>"""+str(ROW_POLICY_SIGNATURE)+"""</td> 
-                 <td>"""+str(ROW_POLICY_RETURN_TYPE)+"""</td> 
-                 <td>"""+str(ROW_POLICY_BODY)+"""</td> 
-                 <td>"""+str(ROW_CREATED )+"""</td> 
-                 <td>"""+str(ROW_DELETED )+"""</td> 
-                 <td>"""+str(ROW_OWNER_ROLE_TYPE)+"""</td> 
-                 <td>"""+str(ROW_OPTIONS )+"""</td> 
-                 <td class="cell_grow">"""+str(ROW_POLICY_COMMENT )+"""</td> 
-                </tr> """
+            for ( ROW_WAREHOUSE_NAME) in cur:              
+                sql_query_details=sql_header+"""
+                SHOW PARAMETERS IN WAREHOUSE """+str(ROW_WAREHOUSE_NAME[0])+""";
+                """
+                
+                cur_details = conn.cursor()
+                cur_details.execute(sql_query_details)
             
-            html_file=html_file+html_table_tail
+                if int(cur_details.rowcount)!=0:
+                    for ( PARAMETER_NAME, CURRENT_VALUE, DEFAULT_VALUE, LEVEL, DESCRIPTION,TYPE) in cur_details:
+                        if str(CURRENT_VALUE)!=str(DEFAULT_VALUE):
+                            html_file=html_file+""" <tr> 
+                            <td>"""+str(ROW_WAREHOUSE_NAME[0])+"""</td> 
+                            <td>"""+str(PARAMETER_NAME)+"""</td> 
+                            <td>"""+str(CURRENT_VALUE)+"""</td> 
+                            <td>"""+str(DEFAULT_VALUE)+"""</td> 
+                            <td>"""+str(LEVEL)+"""</td> 
+                            <td class="cell_grow">"""+str(DESCRIPTION)+"""</td> 
+                            </tr> """
+            
+        html_file=html_file+html_table_tail
     
-        create_output_file('recent_changes_on_masking_policies.html',html_file)
-        report_sections["E - Security"].update({'recent_changes_on_masking_policies.html':'table'})
+        create_output_file('warehouse_non_default_parameters.html',html_file)
+        report_sections["G - Maintenance"].update({'warehouse_non_default_parameters.html':'table'})
 
-    
     except Exception as error:
-        print("[table_history_recent_changed_masking_policies]: An exception occurred:", error)
+        #print("[table_warehouse_non_default_parameters]: An exception occurred:", error)
+        return
 
-def table_history_recent_changed_row_access_policies(conn):
+def table_database_non_default_parameters(conn):
 
     try:    
         global snowflake_conn
@@ -3670,958 +3557,904 @@ def table_history_recent_changed_row_access_policies(conn):
         global report_sections     
         conn =snowflake_conn            
         html_file=html_table_header
-        
+
         sql_query=sql_header+"""
-        WITH DATA AS (
-              SELECT 
-                ROW_NUMBER() OVER (ORDER BY LAST_ALTERED  DESC)       AS TOP_N,
-                LAST_ALTERED,
-                POLICY_NAME,
-                POLICY_ID,
-                POLICY_SCHEMA_ID,
-                POLICY_SCHEMA,
-                POLICY_CATALOG_ID,
-                POLICY_CATALOG,
-                POLICY_OWNER,
-                POLICY_SIGNATURE,
-                POLICY_RETURN_TYPE,
-                POLICY_BODY,
-                CREATED,
-                DELETED,
-                OWNER_ROLE_TYPE,
-                OPTIONS,
-                POLICY_COMMENT
-              FROM SNOWFLAKE.ACCOUNT_USAGE.ROW_ACCESS_POLICIES   
-              WHERE LAST_ALTERED > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-                OR CREATED > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+""")) 
-              ORDER BY LAST_ALTERED DESC
-        )
-        SELECT 
-            *
-        FROM DATA
-        WHERE TOP_N<=100
-        ORDER BY TOP_N;
+        SELECT DISTINCT DATABASE_NAME FROM SNOWFLAKE.ACCOUNT_USAGE.DATABASES 
+        WHERE DELETED IS NULL 
         """
-        
         cur = conn.cursor()
         cur.execute(sql_query)
-    
+
         html_file=html_file+"""
-        <h3>Recent changes on row access policies</h3>
-        <table class="tabla1">
+        <h3>non default parameters for databases</h3>
+        <table class="tabla2">
         <tr>
-        <th >TOP_N</th>
-        <th >LAST_ALTERED</th>
-        <th >POLICY_NAME</th>
-        <th >POLICY_ID</th>
-        <th >POLICY_SCHEMA_ID</th>
-        <th >POLICY_SCHEMA</th>
-        <th >POLICY_CATALOG_ID</th>
-        <th >POLICY_CATALOG</th>
-        <th >POLICY_OWNER</th>
-        <th >POLICY_SIGNATURE</th>
-        <th >POLICY_RETURN_TYPE</th>
-        <th >POLICY_BODY</th>
-        <th >CREATED</th>
-        <th >DELETED</th>
-        <th >OWNER_ROLE_TYPE</th>
-        <th >OPTIONS</th>
-        <th >POLICY_COMMENT</th>
+        <th >DATABASE_NAME</th>
+        <th >PARAMETER_NAME</th>
+        <th >CURRENT_VALUE</th>
+        <th >DEFAULT_VALUE</th>
+        <th >LEVEL</th>
+        <th >DESCRIPTION</th>
         """
-    
+
         if int(cur.rowcount)!=0:
-            for ( ROW_TOP_N, ROW_LAST_ALTERED, ROW_POLICY_NAME, ROW_POLICY_ID, ROW_POLICY_SCHEMA_ID, ROW_POLICY_SCHEMA, ROW_POLICY_CATALOG_ID, ROW_POLICY_CATALOG, ROW_POLICY_OWNER, ROW_POLICY_SIGNATURE, ROW_POLICY_RETURN_TYPE, ROW_POLICY_BODY, ROW_CREATED, ROW_DELETED, ROW_OWNER_ROLE_TYPE, ROW_OPTIONS, ROW_POLICY_COMMENT ) in cur:
-                html_file=html_file+""" <tr> 
-                 <td>"""+str(ROW_TOP_N)+"""</td> 
-                 <td>"""+str(ROW_LAST_ALTERED)+"""</td> 
-                 <td>"""+str(ROW_POLICY_NAME)+"""</td> 
-                 <td>"""+str(ROW_POLICY_ID)+"""</td> 
-                 <td>"""+str(ROW_POLICY_SCHEMA_ID)+"""</td> 
-                 <td>"""+str(ROW_POLICY_SCHEMA)+"""</td> 
-                 <td>"""+str(ROW_POLICY_CATALOG_ID)+"""</td> 
-                 <td>"""+str(ROW_POLICY_CATALOG)+"""</td> 
-                 <td>"""+str(ROW_POLICY_OWNER)+"""</td> 
-                 <td>"""+str(ROW_POLICY_SIGNATURE)+"""</td> 
-                 <td>"""+str(ROW_POLICY_RETURN_TYPE)+"""</td> 
-                 <td>"""+str(ROW_POLICY_BODY)+"""</td> 
-                 <td>"""+str(ROW_CREATED )+"""</td> 
-                 <td>"""+str(ROW_DELETED )+"""</td> 
-                 <td>"""+str(ROW_OWNER_ROLE_TYPE)+"""</td> 
-                 <td>"""+str(ROW_OPTIONS )+"""</td> 
-                 <td>"""+str(ROW_POLICY_COMMENT )+"""</td> 
-                </tr> """
+            for ( ROW_DATABASE) in cur:              
+                sql_query_details=sql_header+"""
+                SHOW PARAMETERS IN DATABASE """+str(ROW_DATABASE[0])+""";
+                """
+                
+                cur_details = conn.cursor()
+                cur_details.execute(sql_query_details)
             
-            html_file=html_file+html_table_tail
+                if int(cur_details.rowcount)!=0:
+                    for ( PARAMETER_NAME, CURRENT_VALUE, DEFAULT_VALUE, LEVEL, DESCRIPTION,TYPE) in cur_details:
+                        if str(CURRENT_VALUE)!=str(DEFAULT_VALUE):
+                            html_file=html_file+""" <tr> 
+                            <td>"""+str(ROW_DATABASE[0])+"""</td> 
+                            <td>"""+str(PARAMETER_NAME)+"""</td> 
+                            <td>"""+str(CURRENT_VALUE)+"""</td> 
+                            <td>"""+str(DEFAULT_VALUE)+"""</td> 
+                            <td>"""+str(LEVEL)+"""</td> 
+                            <td class="cell_grow">"""+str(DESCRIPTION)+"""</td> 
+                            </tr> """
+            
+        html_file=html_file+html_table_tail
     
-        create_output_file('recent_changes_on_row_access_policies.html',html_file)
-        report_sections["E - Security"].update({'recent_changes_on_row_access_policies.html':'table'})
+        create_output_file('database_non_default_parameters.html',html_file)
+        report_sections["G - Maintenance"].update({'database_non_default_parameters.html':'table'})
 
-    
     except Exception as error:
-        print("[table_history_recent_changed_row_access_policies]: An exception occurred:", error)
+        #print("[table_database_non_default_parameters]: An exception occurred:", error)
+        return
 
-def table_history_users_with_recent_password_changes(conn):
+def generate_warehouses_last_activity_info(conn):
+    #Last activity of every warehouse, the pages of warehouses without activity are built from these rows for any number of months
+    global warehouses_last_activity_rows
 
-    try:    
-        global snowflake_conn
-        global html_table_header
-        global html_table_tail  
-        global report_sections     
-        conn =snowflake_conn            
-        html_file=html_table_header
-        
-        sql_query=sql_header+"""
-        WITH DATA AS (
-              SELECT 
-                ROW_NUMBER() OVER (ORDER BY PASSWORD_LAST_SET_TIME  DESC)       AS TOP_N,
-                PASSWORD_LAST_SET_TIME      AS PASSWORD_LAST_SET_TIME,
-                USER_ID                     AS USER_ID,
-                NAME                        AS NAME,
-                CREATED_ON                  AS CREATED_ON,
-                DELETED_ON                  AS DELETED_ON,
-                LOGIN_NAME                  AS LOGIN_NAME,
-                DISPLAY_NAME                AS DISPLAY_NAME,
-                FIRST_NAME                  AS FIRST_NAME,
-                LAST_NAME                   AS LAST_NAME,
-                EMAIL                       AS EMAIL,
-                MUST_CHANGE_PASSWORD        AS MUST_CHANGE_PASSWORD,
-                HAS_PASSWORD                AS HAS_PASSWORD,
-                COMMENT                     AS COMMENT,
-                DISABLED                    AS DISABLED,
-                SNOWFLAKE_LOCK              AS SNOWFLAKE_LOCK,
-                DEFAULT_WAREHOUSE           AS DEFAULT_WAREHOUSE,
-                DEFAULT_NAMESPACE           AS DEFAULT_NAMESPACE,
-                DEFAULT_ROLE                AS DEFAULT_ROLE,
-                EXT_AUTHN_DUO               AS EXT_AUTHN_DUO,
-                EXT_AUTHN_UID               AS EXT_AUTHN_UID,
-                BYPASS_MFA_UNTIL            AS BYPASS_MFA_UNTIL,
-                LAST_SUCCESS_LOGIN          AS LAST_SUCCESS_LOGIN,
-                EXPIRES_AT                  AS EXPIRES_AT,
-                LOCKED_UNTIL_TIME           AS LOCKED_UNTIL_TIME,
-                HAS_RSA_PUBLIC_KEY          AS HAS_RSA_PUBLIC_KEY,
-                OWNER                       AS OWNER,
-                DEFAULT_SECONDARY_ROLE      AS DEFAULT_SECONDARY_ROLE,
-              FROM SNOWFLAKE.ACCOUNT_USAGE.USERS    
-              WHERE PASSWORD_LAST_SET_TIME > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-              ORDER BY PASSWORD_LAST_SET_TIME DESC
-        )
-        SELECT 
-            *
-        FROM DATA
-        WHERE TOP_N<=100
-        ORDER BY TOP_N;
-        """
-        
-        cur = conn.cursor()
-        cur.execute(sql_query)
-    
-        html_file=html_file+"""
-        <h3>Users with recent password changes</h3>
-        <table class="tabla1">
-        <tr>
-        <th >TOP_N</th>
-        <th >PASSWORD_LAST_SET_TIME</th>
-        <th >USER_ID</th>
-        <th >NAME</th>
-        <th >CREATED_ON</th>
-        <th >DELETED_ON</th>
-        <th >LOGIN_NAME</th>
-        <th >DISPLAY_NAME</th>
-        <th >FIRST_NAME</th>
-        <th >LAST_NAME</th>
-        <th >EMAIL</th>
-        <th >MUST_CHANGE_PASSWORD</th>
-        <th >HAS_PASSWORD</th>
-        <th >COMMENT</th>
-        <th >DISABLED</th>
-        <th >SNOWFLAKE_LOCK</th>
-        <th >DEFAULT_WAREHOUSE</th>
-        <th >DEFAULT_NAMESPACE</th>
-        <th >DEFAULT_ROLE</th>
-        <th >EXT_AUTHN_DUO</th>
-        <th >EXT_AUTHN_UID</th>
-        <th >BYPASS_MFA_UNTIL</th>
-        <th >LAST_SUCCESS_LOGIN</th>
-        <th >EXPIRES_AT</th>
-        <th >LOCKED_UNTIL_TIME</th>
-        <th >HAS_RSA_PUBLIC_KEY</th>
-        <th >OWNER</th>
-        <th >DEFAULT_SECONDARY_ROLE</th>
-        """
-    
-        if int(cur.rowcount)!=0:
-            for (ROW_TOP_N, ROW_PASSWORD_LAST_SET_TIME, ROW_USER_ID, ROW_NAME, ROW_CREATED_ON, ROW_DELETED_ON, ROW_LOGIN_NAME, ROW_DISPLAY_NAME, ROW_FIRST_NAME, ROW_LAST_NAME, ROW_EMAIL, ROW_MUST_CHANGE_PASSWORD, ROW_HAS_PASSWORD, ROW_COMMENT, ROW_DISABLED, ROW_SNOWFLAKE_LOCK, ROW_DEFAULT_WAREHOUSE, ROW_DEFAULT_NAMESPACE, ROW_DEFAULT_ROLE, ROW_EXT_AUTHN_DUO, ROW_EXT_AUTHN_UID, ROW_BYPASS_MFA_UNTIL,  ROW_LAST_SUCCESS_LOGIN,  ROW_EXPIRES_AT, ROW_LOCKED_UNTIL_TIME, ROW_HAS_RSA_PUBLIC_KEY, ROW_OWNER,  ROW_DEFAULT_SECONDARY_ROLE) in cur:
-                html_file=html_file+""" <tr> 
-                 <td>"""+str(ROW_TOP_N)+"""</td> 
-                 <td>"""+str(ROW_PASSWORD_LAST_SET_TIME)+"""</td> 
-                 <td>"""+str(ROW_USER_ID)+"""</td> 
-                 <td>"""+str(ROW_NAME)+"""</td> 
-                 <td>"""+str(ROW_CREATED_ON)+"""</td> 
-                 <td>"""+str(ROW_DELETED_ON)+"""</td> 
-                 <td>"""+str(ROW_LOGIN_NAME)+"""</td> 
-                 <td>"""+str(ROW_DISPLAY_NAME)+"""</td> 
-                 <td>"""+str(ROW_FIRST_NAME)+"""</td> 
-                 <td>"""+str(ROW_LAST_NAME)+"""</td> 
-                 <td>"""+str(ROW_EMAIL)+"""</td> 
-                 <td>"""+str(ROW_MUST_CHANGE_PASSWORD)+"""</td> 
-                 <td>"""+str(ROW_HAS_PASSWORD)+"""</td> 
-                 <td>"""+str(ROW_COMMENT)+"""</td> 
-                 <td>"""+str(ROW_DISABLED)+"""</td> 
-                 <td>"""+str(ROW_SNOWFLAKE_LOCK)+"""</td> 
-                 <td>"""+str(ROW_DEFAULT_WAREHOUSE)+"""</td> 
-                 <td>"""+str(ROW_DEFAULT_NAMESPACE)+"""</td> 
-                 <td>"""+str(ROW_DEFAULT_ROLE)+"""</td> 
-                 <td>"""+str(ROW_EXT_AUTHN_DUO)+"""</td> 
-                 <td>"""+str(ROW_EXT_AUTHN_UID)+"""</td> 
-                 <td>"""+str(ROW_BYPASS_MFA_UNTIL )+"""</td> 
-                 <td>"""+str(ROW_LAST_SUCCESS_LOGIN )+"""</td> 
-                 <td>"""+str(ROW_EXPIRES_AT )+"""</td> 
-                 <td>"""+str(ROW_LOCKED_UNTIL_TIME )+"""</td> 
-                 <td>"""+str(ROW_HAS_RSA_PUBLIC_KEY )+"""</td> 
-                 <td>"""+str(ROW_OWNER )+"""</td> 
-                 <td class="cell_grow">"""+str(ROW_DEFAULT_SECONDARY_ROLE )+"""</td> 
-                </tr> """
-            
-            html_file=html_file+html_table_tail
-    
-        create_output_file('users_with_recent_password_changes.html',html_file)
-        report_sections["E - Security"].update({'users_with_recent_password_changes.html':'table'})
+    sql_query=sql_header+"""
+    SELECT 
+        WAREHOUSE_NAME, 
+        MAX(END_TIME) AS LAST_USED_DATE 
+    FROM SNOWFLAKE.ACCOUNT_USAGE.WAREHOUSE_LOAD_HISTORY  
+    GROUP BY 1 
+    ORDER BY LAST_USED_DATE DESC, WAREHOUSE_NAME;
+    """
+
+    cur = conn.cursor()
+    cur.execute(sql_query)
+    warehouses_last_activity_rows=cur.fetchall()
+    return warehouses_last_activity_rows
+
+def table_warehouses_without_activity(conn, months, title):
+    global warehouses_last_activity_rows
+
+    if warehouses_last_activity_rows is None:
+        generate_warehouses_last_activity_info(conn)
+
+    #Warehouses last used before the start of the window, most recent first
+    since_time=months_before_report(months)
+    rows=[row for row in warehouses_last_activity_rows if row[1] is not None and activity_time(row[1])<since_time]
+    file_name='warehouse_without_activity_in_last_month.html' if months==1 else 'warehouse_without_activity_in_last_'+str(months)+'_months.html'
+    create_inactive_entities_file(rows, title, ['WAREHOUSE_NAME','LAST_USED_DATE'], file_name)
+
+def table_warehouse_without_activity_in_last_3_months(conn):
+
+    try:
+        table_warehouses_without_activity(conn, 3, 'Warehouses without activity in last 3_months')
 
-    
     except Exception as error:
-        print("[table_history_users_with_recent_password_changes]: An exception occurred:", error)
+        print("[table_warehouse_without_activity_in_last_3_months]: An exception occurred:", error)
+
+def table_warehouse_without_activity_in_last_month(conn):
 
-def bar_month_sessions_by_authentication_method(conn):
     try:
-        global snowflake_conn
-        global report_sections
-        conn =snowflake_conn
-            
-        html_file=html_header
-                
-        sql_query=sql_header+"""
-        WITH DATA AS (
-            SELECT DATE_TRUNC('MONTH',CREATED_ON::TIMESTAMP_NTZ)    AS DATE 
-                ,AUTHENTICATION_METHOD                              AS AUTHENTICATION_METHOD
-                ,count(*)                                           AS SESSION_COUNT
-            FROM snowflake.account_usage.SESSIONS                      
-            WHERE CREATED_ON > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+""")) 
-            GROUP BY 1,2
-            ORDER BY 1
-        )
-        SELECT *
-        FROM DATA
-            PIVOT(  sum (SESSION_COUNT) FOR AUTHENTICATION_METHOD IN (ANY ORDER BY AUTHENTICATION_METHOD ) DEFAULT ON NULL (0) ) 
-        ORDER BY DATE
-        """
-        cur= conn.cursor()
-        cur.execute(sql_query)
-        
-        column_count=len(cur.description)
-        headers =[i[0] for i in cur.description]  
-        html_file=html_file+str(headers).replace('"','')+", \n"      
-            
-        sql_query=sql_header+"""
-        WITH DATA AS (
-            SELECT DATE_TRUNC('MONTH',CREATED_ON::TIMESTAMP_NTZ)    AS DATE 
-                ,AUTHENTICATION_METHOD                              AS AUTHENTICATION_METHOD
-                ,count(*)                                           AS SESSION_COUNT
-            FROM snowflake.account_usage.SESSIONS                      
-            WHERE CREATED_ON > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+""")) 
-            GROUP BY 1,2
-            ORDER BY 1
+        table_warehouses_without_activity(conn, 1, 'Warehouses without activity in last month')
+
+    except Exception as error:
+        print("[table_warehouse_without_activity_in_last_month]: An exception occurred:", error)
+
+def table_warehouse_without_activity_by_months(conn):
+    #One page per number of months of --inactivemonths, from the same rows
+
+    try:
+        for months in inactive_months():
+            table_warehouses_without_activity(conn, months, 'Warehouses without activity in last '+str(months)+' months')
+
+    except Exception as error:
+        print("[table_warehouse_without_activity_by_months]: An exception occurred:", error)
+
+def dbt_queries_sql():
+    #Base result of the dbt reports: every dbt query of the history with its metadata parsed once and the compute credits
+    #attributed to it. The top model tables and the per node trend read their own rows from it
+    return """
+        WITH DBT AS (
+            SELECT
+                """+dbt_metadata_sql+"""                                AS DBT_METADATA,
+                START_TIME,
+                query_parameterized_hash,
+                total_elapsed_time,
+                query_id,
+                database_id,
+                database_name,
+                schema_id,
+                schema_name,
+                query_type,
+                session_id,
+                user_name,
+                role_name,
+                warehouse_id,
+                warehouse_name,
+                warehouse_size,
+                warehouse_type,
+                cluster_number,
+                query_tag,
+                execution_status,
+                error_code,
+                error_message,
+                bytes_scanned,
+                percentage_scanned_from_cache,
+                bytes_written,
+                bytes_written_to_result,
+                bytes_read_from_result,
+                rows_produced,
+                rows_inserted,
+                rows_updated,
+                rows_deleted,
+                rows_unloaded,
+                bytes_deleted,
+                partitions_scanned,
+                partitions_total,
+                bytes_spilled_to_local_storage,
+                bytes_spilled_to_remote_storage,
+                bytes_sent_over_the_network,
+                compilation_time,
+                execution_time,
+                queued_provisioning_time,
+                queued_repair_time,
+                queued_overload_time,
+                transaction_blocked_time,
+                outbound_data_transfer_cloud,
+                outbound_data_transfer_region,
+                outbound_data_transfer_bytes,
+                inbound_data_transfer_cloud,
+                inbound_data_transfer_region,
+                inbound_data_transfer_bytes,
+                list_external_files_time,
+                credits_used_cloud_services,
+                external_function_total_invocations,
+                external_function_total_sent_rows,
+                external_function_total_received_rows,
+                external_function_total_sent_bytes,
+                external_function_total_received_bytes,
+                query_load_percent,
+                is_client_generated_statement,
+                query_acceleration_bytes_scanned,
+                query_acceleration_partitions_scanned,
+                query_acceleration_upper_limit_scale_factor,
+                transaction_id,
+                child_queries_wait_time,
+                role_type,
+                query_hash,
+                query_hash_version,
+                secondary_role_stats,
+                rows_written_to_result,
+                query_retry_time,
+                query_retry_cause,
+                fault_handling_time
+            FROM snowflake.account_usage.query_history
+            WHERE """+since_predicate("START_TIME","MONTH",months_history,anchor="TO_DATE")+"""
+            AND  NOT CONTAINS (QUERY_TEXT,'*** Project:   https://github.com/prismafy/prismafy  ***')
+            AND CONTAINS (QUERY_TEXT,'/* {"app": "dbt"')
         )
-        , DATA_PIVOT AS (
-        SELECT *
-        FROM DATA
-            PIVOT(  sum (SESSION_COUNT) FOR AUTHENTICATION_METHOD IN ( """+str(headers).replace('"','').replace("[","").replace("]","").replace("'DATE',","")+""") DEFAULT ON NULL (0) ) 
-        ORDER BY DATE
+        , CREDITS AS (
+            SELECT
+                QUERY_ID,
+                SUM(CREDITS_ATTRIBUTED_COMPUTE)         AS CREDITS_ATTRIBUTED_COMPUTE
+            FROM SNOWFLAKE.ACCOUNT_USAGE.QUERY_ATTRIBUTION_HISTORY
+            WHERE """+since_predicate("START_TIME","MONTH",months_history,anchor="TO_DATE")+"""
+            GROUP BY 1
         )
-        SELECT ARRAY_CONSTRUCT(*) AS DATA  FROM DATA_PIVOT;
+        SELECT
+            D.START_TIME,
+            D.query_parameterized_hash,
+            D.total_elapsed_time,
+            D.DBT_METADATA:"dbt_cloud_run_id"::STRING                            AS dbt_cloud_run_id,
+            D.DBT_METADATA:"dbt_version"::STRING                                 AS dbt_version,
+            D.DBT_METADATA:"project_name"::STRING                                AS dbt_project_name,
+            D.DBT_METADATA:"dbt_cloud_project_id"::STRING                        AS dbt_cloud_project_id,
+            D.DBT_METADATA:"target_name"::STRING                                 AS dbt_target_name,
+            D.DBT_METADATA:"target_database"::STRING                             AS dbt_target_database,
+            D.DBT_METADATA:"target_schema"::STRING                               AS dbt_target_schema,
+            D.DBT_METADATA:"node_name"::STRING                                   AS dbt_node_name,
+            D.DBT_METADATA:"node_id"::STRING                                     AS dbt_node_id,
+            D.DBT_METADATA:"materialized"::STRING                                AS dbt_materialized,
+            D.DBT_METADATA:"node_original_file_path"::STRING                     AS dbt_node_original_file_path,
+            D.query_id,
+            D.database_id,
+            D.database_name,
+            D.schema_id,
+            D.schema_name,
+            D.query_type,
+            D.session_id,
+            D.user_name,
+            D.role_name,
+            D.warehouse_id,
+            D.warehouse_name,
+            D.warehouse_size,
+            D.warehouse_type,
+            D.cluster_number,
+            D.query_tag,
+            D.execution_status,
+            D.error_code,
+            D.error_message,
+            D.bytes_scanned,
+            D.percentage_scanned_from_cache,
+            D.bytes_written,
+            D.bytes_written_to_result,
+            D.bytes_read_from_result,
+            D.rows_produced,
+            D.rows_inserted,
+            D.rows_updated,
+            D.rows_deleted,
+            D.rows_unloaded,
+            D.bytes_deleted,
+            D.partitions_scanned,
+            D.partitions_total,
+            D.bytes_spilled_to_local_storage,
+            D.bytes_spilled_to_remote_storage,
+            D.bytes_sent_over_the_network,
+            D.compilation_time,
+            D.execution_time,
+            D.queued_provisioning_time,
+            D.queued_repair_time,
+            D.queued_overload_time,
+            D.transaction_blocked_time,
+            D.outbound_data_transfer_cloud,
+            D.outbound_data_transfer_region,
+            D.outbound_data_transfer_bytes,
+            D.inbound_data_transfer_cloud,
+            D.inbound_data_transfer_region,
+            D.inbound_data_transfer_bytes,
+            D.list_external_files_time,
+            D.credits_used_cloud_services,
+            D.external_function_total_invocations,
+            D.external_function_total_sent_rows,
+            D.external_function_total_received_rows,
+            D.external_function_total_sent_bytes,
+            D.external_function_total_received_bytes,
+            D.query_load_percent,
+            D.is_client_generated_statement,
+            D.query_acceleration_bytes_scanned,
+            D.query_acceleration_partitions_scanned,
+            D.query_acceleration_upper_limit_scale_factor,
+            D.transaction_id,
+            D.child_queries_wait_time,
+            D.role_type,
+            D.query_hash,
+            D.query_hash_version,
+            D.secondary_role_stats,
+            D.rows_written_to_result,
+            D.query_retry_time,
+            D.query_retry_cause,
+            D.fault_handling_time,
+            C.CREDITS_ATTRIBUTED_COMPUTE                                         AS credits_attributed_compute
+        FROM DBT D LEFT JOIN CREDITS C ON (D.QUERY_ID=C.QUERY_ID)
         """
-        cur = conn.cursor()
-        cur.execute(sql_query)
-    
-        if int(cur.rowcount)!=0:
-            counter=0
-            for (row_data) in cur:
-                counter=counter+1
-                if counter==cur.rowcount:
-                    html_file=html_file+str(row_data[0])
-                else:
-                    html_file=html_file+str(row_data[0])+""","""
 
-            html_file=html_file+html_body1
-            
-            for i in range(1, column_count):
-                if i==column_count-1:
-                    html_file=html_file+"""row["""+str(i)+"""]"""
-                else:
-                    html_file=html_file+"""row["""+str(i)+"""],"""
+def generate_dbt_models_info(conn):
 
-            html_file=html_file+html_body2+"""
-            title:  `Prismafy v1.0 - https://github.com/prismafy/prismafy
-            Chart Creation Date: """+report_formatted_time+"""
-            Sessions by authentication method per month`,"""+html_bar_month_tail
-                
-            create_output_file('sessions_by_authentication_method_per_month.html',html_file)
-            report_sections["E - Security"].update({'sessions_by_authentication_method_per_month.html':'bar'})
-            
-    except Exception as error:
-        print("[bar_month_sessions_by_authentication_method]: An exception occurred:", error)
- 
-def bar_week_sessions_by_authentication_method(conn):
     try:
         global snowflake_conn
-        global report_sections
+        global dbt_models_rows
+        global dbt_models_columns
         conn =snowflake_conn
-            
-        html_file=html_header
-                
-        sql_query=sql_header+"""
-        WITH DATA AS (
-            SELECT DATE_TRUNC('DAY',CREATED_ON::TIMESTAMP_NTZ)  AS DATE 
-                ,AUTHENTICATION_METHOD                          AS AUTHENTICATION_METHOD
-                ,count(*)                                       AS SESSION_COUNT
-            FROM snowflake.account_usage.SESSIONS                      
-            WHERE CREATED_ON > DATEADD(DAY,-7,TO_TIMESTAMP("""+report_formatted_time+""")) 
-            GROUP BY 1,2
-            ORDER BY 1
-        )
-        SELECT *
-        FROM DATA
-            PIVOT(  sum (SESSION_COUNT) FOR AUTHENTICATION_METHOD IN ( ANY ORDER BY AUTHENTICATION_METHOD) DEFAULT ON NULL (0) ) 
-        ORDER BY DATE
-        LIMIT 1
-        """
-        cur= conn.cursor()
-        cur.execute(sql_query)
-        
-        column_count=len(cur.description)
-        headers =[i[0] for i in cur.description]  
-        html_file=html_file+str(headers).replace('"','')+", \n"                    
-    
-        sql_query=sql_header+"""
-        WITH DATA AS (
-            SELECT DATE_TRUNC('DAY',CREATED_ON::TIMESTAMP_NTZ)  AS DATE 
-                ,AUTHENTICATION_METHOD                          AS AUTHENTICATION_METHOD
-                ,count(*)                                       AS SESSION_COUNT
-            FROM snowflake.account_usage.SESSIONS                      
-            WHERE CREATED_ON > DATEADD(DAY,-7,TO_TIMESTAMP("""+report_formatted_time+""")) 
-            GROUP BY 1,2
-            ORDER BY 1
+
+        sql_query="""
+        WITH DBT AS (
+            SELECT
+                query_parameterized_hash NOT IN ('e66e976d84c0546733a0d35b5f33a84d')                                                AS IN_HISTORY,
+                TO_DATE(START_TIME) > DATEADD(MONTH,-1,TO_DATE("""+report_formatted_time+"""))                                   AS IN_MONTH,
+                TO_DATE(START_TIME) > DATEADD(DAY,-7,TO_DATE("""+report_formatted_time+""")) AND query_parameterized_hash NOT IN ('e66e976d84c0546733a0d35b5f33a84d') AS IN_WEEK,
+                *
+            FROM {result}
+            WHERE query_parameterized_hash IS NOT NULL
         )
-        , DATA_PIVOT AS (
-        SELECT *
-        FROM DATA
-            PIVOT(  sum (SESSION_COUNT) FOR AUTHENTICATION_METHOD IN ( """+str(headers).replace('"','').replace("[","").replace("]","").replace("'DATE',","")+""") DEFAULT ON NULL (0) ) 
-        ORDER BY DATE
+        , DATA AS (
+            SELECT
+                CASE WHEN IN_HISTORY THEN ROW_NUMBER() OVER (PARTITION BY IN_HISTORY ORDER BY total_elapsed_time DESC) END     AS HISTORY_TOP_N,
+                CASE WHEN IN_MONTH THEN ROW_NUMBER() OVER (PARTITION BY IN_MONTH ORDER BY total_elapsed_time DESC) END         AS MONTH_TOP_N,
+                CASE WHEN IN_WEEK THEN ROW_NUMBER() OVER (PARTITION BY IN_WEEK ORDER BY total_elapsed_time DESC) END           AS WEEK_TOP_N,
+                START_TIME        AS DATE, 
+                query_parameterized_hash, 
+                dbt_cloud_run_id,
+                dbt_version,
+                dbt_project_name,
+                dbt_cloud_project_id,
+                dbt_target_name,
+                dbt_target_database,
+                dbt_target_schema,
+                dbt_node_name,
+                dbt_node_id,
+                dbt_materialized,
+                dbt_node_original_file_path,
+                ROUND(total_elapsed_time/1000,2)                AS total_elapsed_time_seg,
+                query_id,
+                database_id,
+                database_name,
+                schema_id,
+                schema_name,
+                query_type,
+                session_id,
+                user_name,
+                role_name,
+                warehouse_id,
+                warehouse_name,
+                warehouse_size,
+                warehouse_type,
+                cluster_number,
+                query_tag,
+                execution_status,
+                error_code,
+                error_message,
+                bytes_scanned,
+                percentage_scanned_from_cache,
+                bytes_written,
+                bytes_written_to_result,
+                bytes_read_from_result,
+                rows_produced,
+                rows_inserted,
+                rows_updated,
+                rows_deleted,
+                rows_unloaded,
+                bytes_deleted,
+                partitions_scanned,
+                partitions_total,
+                bytes_spilled_to_local_storage,
+                bytes_spilled_to_remote_storage,
+                bytes_sent_over_the_network,
+                compilation_time,
+                execution_time,
+                queued_provisioning_time,
+                queued_repair_time,
+                queued_overload_time,
+                transaction_blocked_time,
+                outbound_data_transfer_cloud,
+                outbound_data_transfer_region,
+                outbound_data_transfer_bytes,
+                inbound_data_transfer_cloud,
+                inbound_data_transfer_region,
+                inbound_data_transfer_bytes,
+                list_external_files_time,
+                credits_used_cloud_services,
+                external_function_total_invocations,
+                external_function_total_sent_rows,
+                external_function_total_received_rows,
+                external_function_total_sent_bytes,
+                external_function_total_received_bytes,
+                query_load_percent,
+                is_client_generated_statement,
+                query_acceleration_bytes_scanned,
+                query_acceleration_partitions_scanned,
+                query_acceleration_upper_limit_scale_factor,
+                transaction_id,
+                child_queries_wait_time,
+                role_type,
+                query_hash,
+                query_hash_version,
+                secondary_role_stats,
+                rows_written_to_result,
+                query_retry_time,
+                query_retry_cause,
+                fault_handling_time,
+                credits_attributed_compute
+            FROM DBT
         )
-        SELECT ARRAY_CONSTRUCT(*) AS DATA  FROM DATA_PIVOT;
+        SELECT * 
+        FROM DATA        
+        WHERE HISTORY_TOP_N<=100 OR MONTH_TOP_N<=25 OR WEEK_TOP_N<=25
+        ORDER BY total_elapsed_time_seg DESC        
+        ;
         """
-        cur = conn.cursor()
-        cur.execute(sql_query)
-    
-        if int(cur.rowcount)!=0:
-            counter=0
-            for (row_data) in cur:
-                counter=counter+1
-                if counter==cur.rowcount:
-                    html_file=html_file+str(row_data[0])
-                else:
-                    html_file=html_file+str(row_data[0])+""","""
 
-            html_file=html_file+html_body1
-            
-            for i in range(1, column_count):
-                if i==column_count-1:
-                    html_file=html_file+"""row["""+str(i)+"""]"""
-                else:
-                    html_file=html_file+"""row["""+str(i)+"""],"""
+        cur = result_scan(conn, "generate_dbt_models_info", "DBT_QUERIES", dbt_queries_sql(), sql_query)
+        dbt_models_columns=[i[0].lower() for i in cur.description[3:]]
+        dbt_models_rows=cur.fetchall()
 
-            html_file=html_file+html_body2+"""
-            title:  `Prismafy v1.0 - https://github.com/prismafy/prismafy
-            Chart Creation Date: """+report_formatted_time+"""
-            Sessions by authentication method for the last week`,"""+html_bar_day_tail
-                
-            create_output_file('sessions_by_authentication_method_for_last_week.html',html_file)
-            report_sections["E - Security"].update({'sessions_by_authentication_method_for_last_week.html':'bar'})
-            
     except Exception as error:
-        print("[bar_week_sessions_by_authentication_method]: An exception occurred:", error)
-          
-def line_history_sessions_by_authentication_method(conn):
+        print("[generate_dbt_models_info]: An exception occurred:", error)
+
+def create_top_dbt_models_file(top_n_position, top_n_limit, title, file_name):
+    global html_table_header
+    global html_table_tail
+    global report_sections
+
+    html_file=html_table_header
+    html_file=html_file+"""
+        <h3>"""+title+"""</h3>
+        <table class="tabla2">
+        <tr>
+        <th>top_n</th>
+        """
+    for column_name in dbt_models_columns:
+        html_file=html_file+"""<th>"""+column_name+"""</th>
+        """
+    html_file=html_file+"""</tr>  
+        """
+
+    rows=[row for row in dbt_models_rows if row[top_n_position] is not None and row[top_n_position]<=top_n_limit]
+    if len(rows)!=0:
+        rows.sort(key=lambda row: row[top_n_position])
+        for row in rows:
+            html_file=html_file+""" <tr> 
+                 <td>"""+str(row[top_n_position])+"""</td> 
+                 """
+            for value in row[3:-1]:
+                html_file=html_file+"""<td>"""+str(value)+"""</td> 
+                 """
+            html_file=html_file+"""<td class="cell_grow">"""+str(row[-1])+"""</td> 
+                </tr> """
+
+        html_file=html_file+html_table_tail
+
+    create_output_file(file_name,html_file)
+    report_sections["H - DBT"].update({file_name:'table'})
+
+def table_month_top_dbt_models(conn):
+
+    try:    
+        global dbt_models_rows
+
+        if dbt_models_rows is None:
+            generate_dbt_models_info(conn)
+
+        create_top_dbt_models_file(1, 25, 'Top dbt models for last month by total_elapsed_time_seg', 'last_month_top_dbt_models.html')
+
+    except Exception as error:
+        print("[table_month_top_dbt_models]: An exception occurred:", error)
+
+def table_week_top_dbt_models(conn):
+
+    try:    
+        global dbt_models_rows
+
+        if dbt_models_rows is None:
+            generate_dbt_models_info(conn)
+
+        create_top_dbt_models_file(2, 25, 'Top dbt models for last week by total_elapsed_time_seg', 'last_week_top_dbt_models.html')
+
+    except Exception as error:
+        print("[table_week_top_dbt_models]: An exception occurred:", error)
+
+def table_history_top_dbt_models(conn):
+
+    try:    
+        global dbt_models_rows
+
+        if dbt_models_rows is None:
+            generate_dbt_models_info(conn)
+
+        create_top_dbt_models_file(0, 100, 'Top dbt models by total_elapsed_time_seg', 'history_top_dbt_models.html')
+
+    except Exception as error:
+        print("[table_history_top_dbt_models]: An exception occurred:", error)
+
+def generate_dbt_trend_info(conn):
+    #Daily series of every dbt node from the dbt queries read by the top model reports, no new scan of the views
+
     try:
         global snowflake_conn
-        global report_sections
+        global dbt_node_series
         conn =snowflake_conn
-        
-        sql_query=sql_header+"""
-        WITH DATA AS (
-            SELECT DATE_TRUNC('HOUR',CREATED_ON::TIMESTAMP_NTZ)     AS DATE 
-                ,AUTHENTICATION_METHOD                              AS AUTHENTICATION_METHOD
-                ,count(*)                                           AS SESSION_COUNT
-            FROM snowflake.account_usage.SESSIONS                      
-            WHERE CREATED_ON > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+""")) 
-            GROUP BY 1,2
-            ORDER BY 1
-        )
-        SELECT *
-        FROM DATA
-            PIVOT(  sum (SESSION_COUNT) FOR AUTHENTICATION_METHOD IN ( ANY ORDER BY AUTHENTICATION_METHOD) DEFAULT ON NULL (0) ) 
-        ORDER BY DATE
+
+        sql_query="""
+        SELECT
+            dbt_node_id                                                                             AS NODE_ID,
+            MAX(dbt_node_name)                                                                      AS NODE_NAME,
+            TO_DATE(START_TIME)                                                                     AS DATE,
+            COUNT(*)                                                                                AS RUNS,
+            ROUND(SUM(NVL(total_elapsed_time,0))/1000,2)                                            AS ELAPSED_TIME_SECONDS,
+            ROUND(SUM(NVL(bytes_scanned,0))/1024/1024/1024,4)                                       AS GB_SCANNED,
+            ROUND(SUM(NVL(credits_attributed_compute,0)+NVL(credits_used_cloud_services,0)),4)      AS CREDITS
+        FROM {result}
+        WHERE dbt_node_id IS NOT NULL
+        GROUP BY 1,3
+        ORDER BY 1,3
+        ;
         """
-        cur= conn.cursor()
-        cur.execute(sql_query)
-        
-        column_count=len(cur.description)
-        headers =[i[0] for i in cur.description]    
-        html_file=html_header+str(headers).replace('"','')+", \n"   
-        
-        sql_query=sql_header+"""
-        WITH DATA AS (
-            SELECT DATE_TRUNC('HOUR',CREATED_ON::TIMESTAMP_NTZ)     AS DATE 
-                ,AUTHENTICATION_METHOD                              AS AUTHENTICATION_METHOD
-                ,count(*)                                           AS SESSION_COUNT
-            FROM snowflake.account_usage.SESSIONS                      
-            WHERE CREATED_ON > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+""")) 
-            GROUP BY 1,2
-            ORDER BY 1
-        )
-        , DATA_PIVOT AS (
-        SELECT *
-        FROM DATA
-            PIVOT(  sum (SESSION_COUNT) FOR AUTHENTICATION_METHOD IN ( """+str(headers).replace('"','').replace("[","").replace("]","").replace("'DATE',","")+""") DEFAULT ON NULL (0) ) 
-        ORDER BY DATE
-        )
-        SELECT ARRAY_CONSTRUCT(*) AS DATA  FROM DATA_PIVOT;
+
+        cur = result_scan(conn, "generate_dbt_trend_info", "DBT_QUERIES", dbt_queries_sql(), sql_query)
+
+        dbt_node_series={}
+        for (ROW_NODE_ID, ROW_NODE_NAME, ROW_DATE, ROW_RUNS, ROW_ELAPSED_TIME_SECONDS, ROW_GB_SCANNED, ROW_CREDITS) in cur:
+            if ROW_NODE_ID not in dbt_node_series:
+                dbt_node_series[ROW_NODE_ID]={"node_name":ROW_NODE_NAME,"days":[]}
+            dbt_node_series[ROW_NODE_ID]["days"].append((ROW_DATE, int(ROW_RUNS), float(ROW_ELAPSED_TIME_SECONDS), float(ROW_GB_SCANNED), float(ROW_CREDITS)))
+
+    except Exception as error:
+        print("[generate_dbt_trend_info]: An exception occurred:", error)
+
+def find_slowing_dbt_models():
+    #Per run averages of the last 7 days are compared with the median of the previous days of each node
+    recent_start=(aligned_report_time(report_time)-timedelta(days=7)).date()
+    slowing_models=[]
+
+    for node_id, series in dbt_node_series.items():
+        baseline=[day for day in series["days"] if day[0]<=recent_start]
+        recent=[day for day in series["days"] if day[0]>recent_start]
+        if len(baseline)<3 or len(recent)==0:
+            continue
+
+        baseline_elapsed=statistics.median([day[2]/day[1] for day in baseline])
+        baseline_gb=statistics.median([day[3]/day[1] for day in baseline])
+        baseline_credits=statistics.median([day[4]/day[1] for day in baseline])
+        recent_runs=sum([day[1] for day in recent])
+        recent_elapsed=sum([day[2] for day in recent])/recent_runs
+        recent_gb=sum([day[3] for day in recent])/recent_runs
+        recent_credits=sum([day[4] for day in recent])/recent_runs
+
+        if baseline_elapsed<=0:
+            continue
+        elapsed_growth=round((recent_elapsed-baseline_elapsed)*100/baseline_elapsed,2)
+        if elapsed_growth<args.dbtthreshold:
+            continue
+
+        gb_growth=round((recent_gb-baseline_gb)*100/baseline_gb,2) if baseline_gb>0 else None
+        credits_growth=round((recent_credits-baseline_credits)*100/baseline_credits,2) if baseline_credits>0 else None
+        extra_seconds=round((recent_elapsed-baseline_elapsed)*recent_runs,2)
+        slowing_models.append((node_id, series["node_name"], recent_runs, round(baseline_elapsed,2), round(recent_elapsed,2), elapsed_growth, extra_seconds, gb_growth, credits_growth))
+
+    slowing_models.sort(key=lambda model: model[6], reverse=True)
+    return slowing_models
+
+def line_history_dbt_model_trend(node_id):
+    try:
+        global report_sections
+
+        series=dbt_node_series[node_id]
+        html_file=html_header+"""
+        [
+        'DATE',
+        'ELAPSED_TIME_SECONDS_PER_RUN',
+        'GB_SCANNED_PER_RUN',
+        'CREDITS_PER_RUN'
+        ],
         """
-        cur = conn.cursor()
-        cur.execute(sql_query)
-    
-        if int(cur.rowcount)!=0:
-            counter=0
-            for (row_data) in cur:
-                counter=counter+1
-                if counter==cur.rowcount:
-                    html_file=html_file+str(row_data[0])
-                else:
-                    html_file=html_file+str(row_data[0])+""","""
+        for (ROW_DATE, ROW_RUNS, ROW_ELAPSED_TIME_SECONDS, ROW_GB_SCANNED, ROW_CREDITS) in series["days"]:
+            html_file=html_file+'["'+ROW_DATE.strftime('%Y-%m-%d')+' 00:00:00", '+str(round(ROW_ELAPSED_TIME_SECONDS/ROW_RUNS,2))+', '+str(round(ROW_GB_SCANNED/ROW_RUNS,4))+', '+str(round(ROW_CREDITS/ROW_RUNS,4))+'],'
 
-            html_file=html_file+html_body1   
+        html_file=html_file+html_body1+"""
+        row[1],row[2],row[3]
+        """+html_body2+"""
+        trendlines: {0:{type: 'linear', color: '#16F529', labelInLegend: 'Trend for elapsed_time_seconds_per_run', visibleInLegend: true, opacity: 0.6, pointsVisible: false, lineWidth:2}},
+        title: `Prismafy v1.0 - https://github.com/prismafy/prismafy
+        Chart Creation Date: """+report_formatted_time+"""
+        Daily run time trend for dbt model """+str(series["node_name"])+"""`,"""+html_line_day_tail
 
-            for i in range(1, column_count):
-                if i==column_count-1:
-                    html_file=html_file+"""row["""+str(i)+"""]"""
-                else:
-                    html_file=html_file+"""row["""+str(i)+"""],"""
+        file_name='dbt_model_trend_for_'+str(node_id).lower().replace('/','_').replace(' ','_')+'.html'
+        create_output_file(file_name,html_file)
+        report_sections["H - DBT"].update({file_name:'line'})
 
-            html_file=html_file+html_body2+"""
-            title: `Prismafy v1.0 - https://github.com/prismafy/prismafy
-            Chart Creation Date: """+report_formatted_time+"""
-            Sessions by authentication method`,
-            """+html_line_hour_tail
-            
-            create_output_file('sessions_by_authentication_method.html',html_file)
-            report_sections["E - Security"].update({'sessions_by_authentication_method.html':'line'})
-            
     except Exception as error:
-        print("[line_history_sessions_by_authentication_method]: An exception occurred:", error)
+        print("[line_history_dbt_model_trend]: An exception occurred:", error)
 
-def table_history_users_without_sessions_last_6_months(conn):
+def table_history_slowing_dbt_models(conn):
 
-    try:    
-        global snowflake_conn
+    try:
         global html_table_header
-        global html_table_tail  
-        global report_sections     
-        conn =snowflake_conn            
+        global html_table_tail
+        global report_sections
+        global dbt_node_series
+
+        if dbt_node_series is None:
+            generate_dbt_trend_info(conn)
+
+        slowing_models=find_slowing_dbt_models()
+
         html_file=html_table_header
-        
-        sql_query=sql_header+"""
-        WITH HIST AS (
-              SELECT 
-                USER_NAME , MAX(CREATED_ON) AS LAST_SESSION_DATE
-              FROM SNOWFLAKE.ACCOUNT_USAGE.SESSIONS     
-              GROUP BY 1 
-        ), LAST_6_MONTHS AS (
-              SELECT 
-                DISTINCT USER_NAME
-              FROM SNOWFLAKE.ACCOUNT_USAGE.SESSIONS      
-              WHERE CREATED_ON > DATEADD(MONTH,-6,TO_TIMESTAMP("""+report_formatted_time+"""))
-        )
-        SELECT 
-            *
-        FROM HIST
-        WHERE USER_NAME NOT IN (SELECT USER_NAME FROM LAST_6_MONTHS) AND (SELECT COUNT(*) FROM HIST)>0
-        ORDER BY LAST_SESSION_DATE;
-        """
-        
-        cur = conn.cursor()
-        cur.execute(sql_query)
-    
         html_file=html_file+"""
-        <h3>Users without sessions in last 6 months</h3>
+        <h3>Slowing dbt models: elapsed time per run in the last week at least """+str(args.dbtthreshold)+"""% above their baseline</h3>
         <table class="tabla2">
         <tr>
-        <th >USER_NAME</th>
-        <th >LAST_SESSION_DATE</th>
+        <th >TOP_N</th>
+        <th >NODE_ID</th>
+        <th >NODE_NAME</th>
+        <th >RECENT_RUNS</th>
+        <th >BASELINE_SECONDS_PER_RUN</th>
+        <th >RECENT_SECONDS_PER_RUN</th>
+        <th >ELAPSED_TIME_GROWTH_PERCENT</th>
+        <th >EXTRA_SECONDS_LAST_WEEK</th>
+        <th >GB_SCANNED_GROWTH_PERCENT</th>
+        <th >CREDITS_GROWTH_PERCENT</th>
         """
-    
-        if int(cur.rowcount)!=0:
-            for (ROW_USER_NAME, ROW_LAST_SESSION_DATE) in cur:
-                html_file=html_file+""" <tr> 
-                 <td>"""+str(ROW_USER_NAME)+"""</td> 
-                 <td class="cell_grow">"""+str(ROW_LAST_SESSION_DATE)+"""</td> 
-                </tr> """
-            
-            html_file=html_file+html_table_tail
-    
-        create_output_file('users_without_sessions_in_last_6_months.html',html_file)
-        report_sections["G - Maintenance"].update({'users_without_sessions_in_last_6_months.html':'table'})
 
-    
-    except Exception as error:
-        print("[table_history_users_without_sessions_last_6_months]: An exception occurred:", error)
+        top_n=0
+        for (node_id, node_name, recent_runs, baseline_elapsed, recent_elapsed, elapsed_growth, extra_seconds, gb_growth, credits_growth) in slowing_models:
+            top_n=top_n+1
+            html_file=html_file+""" <tr>
+            <td>"""+str(top_n)+"""</td>
+            <td>"""+str(node_id)+"""</td>
+            <td>"""+str(node_name)+"""</td>
+            <td>"""+str(recent_runs)+"""</td>
+            <td>"""+str(baseline_elapsed)+"""</td>
+            <td>"""+str(recent_elapsed)+"""</td>
+            <td>"""+str(elapsed_growth)+"""</td>
+            <td>"""+str(extra_seconds)+"""</td>
+            <td>"""+str(gb_growth)+"""</td>
+            <td class="cell_grow">"""+str(credits_growth)+"""</td>
+            </tr> """
 
-def table_history_users_without_sessions_last_3_months(conn):
+        html_file=html_file+html_table_tail
 
-    try:    
-        global snowflake_conn
-        global html_table_header
-        global html_table_tail  
-        global report_sections     
-        conn =snowflake_conn            
-        html_file=html_table_header
-        
-        sql_query=sql_header+"""
-        WITH HIST AS (
-              SELECT 
-                USER_NAME , MAX(CREATED_ON) AS LAST_SESSION_DATE
-              FROM SNOWFLAKE.ACCOUNT_USAGE.SESSIONS   
-              GROUP BY 1   
-        ), LAST_6_MONTHS AS (
-              SELECT 
-                DISTINCT USER_NAME
-              FROM SNOWFLAKE.ACCOUNT_USAGE.SESSIONS      
-              WHERE CREATED_ON > DATEADD(MONTH,-3,TO_TIMESTAMP("""+report_formatted_time+"""))
-        )
-        SELECT 
-            *
-        FROM HIST
-        WHERE USER_NAME NOT IN (SELECT USER_NAME FROM LAST_6_MONTHS) AND (SELECT COUNT(*) FROM HIST)>0
-        ORDER BY LAST_SESSION_DATE;
+        create_output_file('history_slowing_dbt_models.html',html_file)
+        report_sections["H - DBT"].update({'history_slowing_dbt_models.html':'table'})
+
+        for slowing_model in slowing_models[:10]:
+            line_history_dbt_model_trend(slowing_model[0])
+
+    except Exception as error:
+        print("[table_history_slowing_dbt_models]: An exception occurred:", error)
+
+def sql_operations_sql():
+    #Base result of the SQL operation reports: executions per hour, database and query type
+    return """
+        SELECT DATE_TRUNC('HOUR',START_TIME::TIMESTAMP_NTZ)         AS DATE , 
+        DATABASE_NAME                                               AS DATABASE_NAME,
+        query_type                                                  AS QUERY_TYPE,
+        COUNT(*)                                                    AS EXECUTIONS
+        FROM snowflake.account_usage.query_history Q
+        WHERE  """+since_predicate("Q.start_time")+"""
+        AND DATABASE_NAME !='SNOWFLAKE'
+        AND DATABASE_NAME IS NOT NULL
+        GROUP BY 1,2,3
         """
+
+def line_history_sql_operations(conn):
+    try:
         
-        cur = conn.cursor()
-        cur.execute(sql_query)
-    
-        html_file=html_file+"""
-        <h3>Users without sessions in last 3 months</h3>
-        <table class="tabla2">
-        <tr>
-        <th >USER_NAME</th>
-        <th >LAST_SESSION_DATE</th>
-        """
-    
-        if int(cur.rowcount)!=0:
-            for (ROW_USER_NAME, ROW_LAST_SESSION_DATE) in cur:
-                html_file=html_file+""" <tr> 
-                 <td>"""+str(ROW_USER_NAME)+"""</td> 
-                 <td class="cell_grow">"""+str(ROW_LAST_SESSION_DATE)+"""</td> 
-                </tr> """
+        global snowflake_conn
+        global report_sections
+        conn =snowflake_conn
             
-            html_file=html_file+html_table_tail
-    
-        create_output_file('users_without_sessions_in_last_3_months.html',html_file)
-        report_sections["G - Maintenance"].update({'users_without_sessions_in_last_3_months.html':'table'})
+        html_file=html_header
 
-    
-    except Exception as error:
-        print("[table_history_users_without_sessions_last_6_months]: An exception occurred:", error)
+        sql_query="""
+        SELECT DISTINCT QUERY_TYPE
+        FROM {result}  
+        """
+        cur = result_scan(conn, "line_history_sql_operations", "SQL_OPERATIONS", sql_operations_sql(), sql_query)
 
-def table_history_need_attention_tasks(conn):
+        column_count=cur.rowcount        
+        headers =[i[0] for i in cur]  
+        headers.insert(0,'DATE')  
+        html_file=html_file+str(headers).replace('"','')+", \n"      
 
-    try:    
-        global snowflake_conn
-        global html_table_header
-        global html_table_tail  
-        global report_sections     
-        conn =snowflake_conn            
-        html_file=html_table_header
-        
-        sql_query=sql_header+"""
-        WITH HIST AS (
-              SELECT 
-                ROW_NUMBER() OVER (PARTITION  BY DATABASE_NAME, SCHEMA_NAME, NAME ORDER BY SCHEDULED_TIME  DESC)       AS TOP_N,
-                NAME,
-                CONDITION_TEXT,
-                SCHEMA_NAME,
-                TASK_SCHEMA_ID,
-                DATABASE_NAME,
-                TASK_DATABASE_ID,
-                SCHEDULED_TIME,
-                COMPLETED_TIME,
-                STATE,
-                RETURN_VALUE,
-                QUERY_ID,
-                QUERY_START_TIME,
-                ERROR_CODE,
-                ERROR_MESSAGE,
-                GRAPH_VERSION,
-                RUN_ID,
-                ROOT_TASK_ID,
-                SCHEDULED_FROM,
-                ATTEMPT_NUMBER,
-                INSTANCE_ID,
-                CONFIG,
-                QUERY_HASH,
-                QUERY_HASH_VERSION,
-                QUERY_PARAMETERIZED_HASH,
-                QUERY_PARAMETERIZED_HASH_VERSION,
-                GRAPH_RUN_GROUP_ID,     
-                QUERY_TEXT 
-              FROM SNOWFLAKE.ACCOUNT_USAGE.TASK_HISTORY       
-              WHERE SCHEDULED_TIME > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+""")) 
-        )
-        , DATA AS (
-              SELECT 
-                *
-              FROM HIST     
-              WHERE TOP_N<=5
+
+        sql_query="""
+        WITH DATA AS (
+            SELECT DATE                                                 AS DATE , 
+            QUERY_TYPE                                                  AS QUERY_TYPE,
+            SUM(EXECUTIONS)                                             AS EXECUTIONS
+            FROM {result}
+            GROUP BY 1,2
+            ORDER BY 1  
         )
-        , WARNING_TASKS AS (
-            SELECT 
-                DATABASE_NAME, SCHEMA_NAME, NAME
+        , PIVOT_DATA AS (
+            SELECT *
             FROM DATA
-            WHERE    STATE!='SUCCEEDED'
+                PIVOT(  sum (EXECUTIONS) FOR query_type IN ( """+str(headers).replace('"','').replace("[","").replace("]","").replace("'DATE',","")+""") DEFAULT ON NULL (0) ) 
         )
-        SELECT * 
-        FROM DATA 
-        WHERE (DATABASE_NAME, SCHEMA_NAME, NAME) IN (SELECT DATABASE_NAME, SCHEMA_NAME, NAME FROM WARNING_TASKS)
-        ORDER BY DATABASE_NAME, SCHEMA_NAME, NAME, TOP_N
-        ;
+        SELECT ARRAY_CONSTRUCT(*) FROM PIVOT_DATA ORDER BY DATE
         """
+
+        cur = result_scan(conn, "line_history_sql_operations", "SQL_OPERATIONS", sql_operations_sql(), sql_query)
         
-        cur = conn.cursor()
-        cur.execute(sql_query)
-    
-        html_file=html_file+"""
-        <h3>Tasks that need attention</h3>
-        <table class="tabla2">
-        <tr>
-        <th >TOP_N</th>
-        <th >TASK_NAME</th>
-        <th >CONDITION_TEXT</th>
-        <th >SCHEMA_NAME</th>
-        <th >TASK_SCHEMA_ID</th>
-        <th >DATABASE_NAME</th>
-        <th >TASK_DATABASE_ID</th>
-        <th >SCHEDULED_TIME</th>
-        <th >COMPLETED_TIME</th>
-        <th >STATE</th>
-        <th >RETURN_VALUE</th>
-        <th >QUERY_ID</th>
-        <th >QUERY_START_TIME</th>
-        <th >ERROR_CODE</th>
-        <th >ERROR_MESSAGE</th>
-        <th >GRAPH_VERSION</th>
-        <th >RUN_ID</th>
-        <th >ROOT_TASK_ID</th>
-        <th >SCHEDULED_FROM</th>
-        <th >ATTEMPT_NUMBER</th>
-        <th >INSTANCE_ID</th>
-        <th >CONFIG</th>
-        <th >QUERY_HASH</th>
-        <th >QUERY_HASH_VERSION</th>
-        <th >QUERY_PARAMETERIZED_HASH</th>
-        <th >QUERY_PARAMETERIZED_HASH_VERSION</th>
-        <th >GRAPH_RUN_GROUP_ID</th>
-        <th >QUERY_TEXT</th>
-        """
-    
         if int(cur.rowcount)!=0:
-            for (ROW_TOP_N, ROW_NAME, ROW_CONDITION_TEXT, ROW_SCHEMA_NAME, ROW_TASK_SCHEMA_ID, ROW_DATABASE_NAME, ROW_TASK_DATABASE_ID, ROW_SCHEDULED_TIME, ROW_COMPLETED_TIME, ROW_STATE, ROW_RETURN_VALUE, ROW_QUERY_ID, ROW_QUERY_START_TIME, ROW_ERROR_CODE, ROW_ERROR_MESSAGE, ROW_GRAPH_VERSION, ROW_RUN_ID,  ROW_ROOT_TASK_ID, ROW_SCHEDULED_FROM, ROW_ATTEMPT_NUMBER, ROW_INSTANCE_ID, ROW_CONFIG, ROW_QUERY_HASH, ROW_QUERY_HASH_VERSION, ROW_QUERY_PARAMETERIZED_HASH, ROW_QUERY_PARAMETERIZED_HASH_VERSION,  ROW_GRAPH_RUN_GROUP_ID,  ROW_QUERY_TEXT) in cur:
-                html_file=html_file+""" <tr> 
-                 <td>"""+str(ROW_TOP_N)+"""</td> 
-                 <td>"""+str(ROW_NAME)+"""</td> 
-                 <td>"""+str(ROW_CONDITION_TEXT)+"""</td> 
-                 <td>"""+str(ROW_SCHEMA_NAME)+"""</td> 
-                 <td>"""+str(ROW_TASK_SCHEMA_ID)+"""</td> 
-                 <td>"""+str(ROW_DATABASE_NAME)+"""</td> 
-                 <td>"""+str(ROW_TASK_DATABASE_ID)+"""</td> 
-                 <td>"""+str(ROW_SCHEDULED_TIME)+"""</td> 
-                 <td>"""+str(ROW_COMPLETED_TIME)+"""</td> 
-                 <td>"""+str(ROW_STATE)+"""</td> 
-                 <td>"""+str(ROW_RETURN_VALUE)+"""</td> 
-                 <td>"""+str(ROW_QUERY_ID)+"""</td> 
-                 <td>"""+str(ROW_QUERY_START_TIME)+"""</td> 
-                 <td>"""+str(ROW_ERROR_CODE)+"""</td> 
-                 <td>"""+str(ROW_ERROR_MESSAGE)+"""</td> 
-                 <td>"""+str(ROW_GRAPH_VERSION)+"""</td> 
-                 <td>"""+str(ROW_RUN_ID)+"""</td> 
-                 <td>"""+str(ROW_ROOT_TASK_ID)+"""</td> 
-                 <td>"""+str(ROW_SCHEDULED_FROM)+"""</td> 
-                 <td>"""+str(ROW_ATTEMPT_NUMBER)+"""</td> 
-                 <td>"""+str(ROW_INSTANCE_ID)+"""</td> 
-                 <td>"""+str(ROW_CONFIG)+"""</td> 
-                 <td>"""+str(ROW_QUERY_HASH)+"""</td> 
-                 <td>"""+str(ROW_QUERY_HASH_VERSION)+"""</td> 
-                 <td>"""+str(ROW_QUERY_PARAMETERIZED_HASH)+"""</td> 
-                 <td>"""+str(ROW_QUERY_PARAMETERIZED_HASH_VERSION)+"""</td> 
-                 <td>"""+str(ROW_GRAPH_RUN_GROUP_ID)+"""</td> 
-                 <td class="cell_grow">"""+str(ROW_QUERY_TEXT)+"""</td> 
-                </tr> """
+            for row  in cur:
+                html_file=html_file+str(row[0])+""","""
             
-            html_file=html_file+html_table_tail
-    
-        create_output_file('need_attention_tasks.html',html_file)
-        report_sections["G - Maintenance"].update({'need_attention_tasks.html':'table'})
+            
+            html_file=html_file+html_body1
+                
+            for i in range(1, column_count):
+                if i==column_count-1:
+                    html_file=html_file+"""row["""+str(i)+"""]"""
+                else:
+                    html_file=html_file+"""row["""+str(i)+"""],"""
+            
+            html_file=html_file+html_body2+"""
+            title: `Prismafy v1.0 - https://github.com/prismafy/prismafy
+            Chart Creation Date: """+report_formatted_time+"""
+            SQL Operations in the history`,"""+html_line_hour_tail
 
-    
+            create_output_file('history_sql_operations.html',html_file)
+            report_sections["G - Maintenance"].update({'history_sql_operations.html':'line'})
+        
     except Exception as error:
-        print("[table_history_need_attention_tasks]: An exception occurred:", error)
-
-def table_history_need_attention_snowpipes(conn):
+        print("[line_history_sql_operations]: An exception occurred:", error)
 
-    try:    
+def line_history_sql_operations_by_database(conn):
+    try:            
         global snowflake_conn
-        global html_table_header
-        global html_table_tail  
-        global report_sections     
-        conn =snowflake_conn            
-        html_file=html_table_header
-        
-        sql_query=sql_header+"""
-        WITH HIST AS (
-              SELECT 
-                ROW_NUMBER() OVER (PARTITION BY PIPE_CATALOG_NAME, PIPE_SCHEMA_NAME, PIPE_NAME ORDER BY LAST_LOAD_TIME  DESC)       AS TOP_N,
-                FILE_NAME,
-                STAGE_LOCATION,
-                LAST_LOAD_TIME,
-                ROW_COUNT,
-                ROW_PARSED,
-                FILE_SIZE,
-                FIRST_ERROR_MESSAGE,
-                FIRST_ERROR_LINE_NUMBER,
-                FIRST_ERROR_CHARACTER_POS,
-                FIRST_ERROR_COLUMN_NAME,
-                ERROR_COUNT,
-                ERROR_LIMIT,
-                STATUS,
-                TABLE_ID,
-                TABLE_NAME,
-                TABLE_SCHEMA_ID,
-                TABLE_SCHEMA_NAME,
-                TABLE_CATALOG_ID,
-                TABLE_CATALOG_NAME,
-                PIPE_CATALOG_NAME,
-                PIPE_SCHEMA_NAME,
-                PIPE_NAME,
-                PIPE_RECEIVED_TIME,
-                FIRST_COMMIT_TIME
-              FROM SNOWFLAKE.ACCOUNT_USAGE.COPY_HISTORY        
-              WHERE LAST_LOAD_TIME > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+""")) 
-              AND PIPE_NAME IS NOT NULL
-        )
-        , DATA AS (
-              SELECT 
-                *
-              FROM HIST     
-              WHERE TOP_N<=5
-        )
-        , WARNING_SNOWPIPES AS (
-            SELECT 
-                PIPE_CATALOG_NAME, PIPE_SCHEMA_NAME, PIPE_NAME 
-            FROM DATA
-            WHERE    STATUS!='Loaded'
-        )
-        SELECT * 
-        FROM DATA 
-        WHERE (PIPE_CATALOG_NAME, PIPE_SCHEMA_NAME, PIPE_NAME ) IN (SELECT PIPE_CATALOG_NAME, PIPE_SCHEMA_NAME, PIPE_NAME  FROM WARNING_SNOWPIPES)
-        ORDER BY PIPE_CATALOG_NAME, PIPE_SCHEMA_NAME, PIPE_NAME, TOP_N
-        ;
-        """
-        
-        cur = conn.cursor()
-        cur.execute(sql_query)
-    
-        html_file=html_file+"""
-        <h3>Snowpipes that need attention</h3>
-        <table class="tabla2">
-        <tr>
-        <th >TOP_N</th>
-        <th >FILE_NAME</th>
-        <th >STAGE_LOCATION</th>
-        <th >LAST_LOAD_TIME</th>
-        <th >ROW_COUNT</th>
-        <th >ROW_PARSED</th>
-        <th >FILE_SIZE</th>
-        <th >FIRST_ERROR_MESSAGE</th>
-        <th >FIRST_ERROR_LINE_NUMBER</th>
-        <th >FIRST_ERROR_CHARACTER_POS</th>
-        <th >FIRST_ERROR_COLUMN_NAME</th>
-        <th >ERROR_COUNT</th>
-        <th >ERROR_LIMIT</th>
-        <th >STATUS</th>
-        <th >TABLE_ID</th>
-        <th >TABLE_NAME</th>
-        <th >TABLE_SCHEMA_ID</th>
-        <th >TABLE_SCHEMA_NAME</th>
-        <th >TABLE_CATALOG_ID</th>
-        <th >TABLE_CATALOG_NAME</th>
-        <th >PIPE_CATALOG_NAME</th>
-        <th >PIPE_SCHEMA_NAME</th>
-        <th >PIPE_NAME</th>
-        <th >PIPE_RECEIVED_TIME</th>
-        <th >FIRST_COMMIT_TIME</th>
+        global report_sections
+        conn =snowflake_conn
+
+        sql_query_dbs="""
+        SELECT DISTINCT DATABASE_NAME
+        FROM {result}  
         """
-    
-        if int(cur.rowcount)!=0:
-            for ( TOP_N, FILE_NAME, STAGE_LOCATION, LAST_LOAD_TIME, ROW_COUNT, ROW_PARSED, FILE_SIZE ,FIRST_ERROR_MESSAGE,FIRST_ERROR_LINE_NUMBER, FIRST_ERROR_CHARACTER_POS, FIRST_ERROR_COLUMN_NAME, ERROR_COUNT, ERROR_LIMIT, STATUS, TABLE_ID, TABLE_NAME, TABLE_SCHEMA_ID, TABLE_SCHEMA_NAME, TABLE_CATALOG_ID, TABLE_CATALOG_NAME,  PIPE_CATALOG_NAME, PIPE_SCHEMA_NAME, PIPE_NAME, PIPE_RECEIVED_TIME, FIRST_COMMIT_TIME) in cur:
-                html_file=html_file+""" <tr> 
-                 <td>"""+str(TOP_N)+"""</td> 
-                 <td>"""+str(FILE_NAME)+"""</td> 
-                 <td>"""+str(STAGE_LOCATION)+"""</td> 
-                 <td>"""+str(LAST_LOAD_TIME)+"""</td> 
-                 <td>"""+str(ROW_COUNT)+"""</td> 
-                 <td>"""+str(ROW_PARSED)+"""</td> 
-                 <td>"""+str(FILE_SIZE)+"""</td> 
-                 <td>"""+str(FIRST_ERROR_MESSAGE)+"""</td> 
-                 <td>"""+str(FIRST_ERROR_LINE_NUMBER)+"""</td> 
-                 <td>"""+str(FIRST_ERROR_CHARACTER_POS)+"""</td> 
-                 <td>"""+str(FIRST_ERROR_COLUMN_NAME)+"""</td> 
-                 <td>"""+str(ERROR_COUNT)+"""</td> 
-                 <td>"""+str(ERROR_LIMIT)+"""</td> 
-                 <td>"""+str(STATUS)+"""</td> 
-                 <td>"""+str(TABLE_ID)+"""</td> 
-                 <td>"""+str(TABLE_NAME)+"""</td> 
-                 <td>"""+str(TABLE_SCHEMA_ID)+"""</td> 
-                 <td>"""+str(TABLE_SCHEMA_NAME)+"""</td> 
-                 <td>"""+str(TABLE_CATALOG_ID)+"""</td> 
-                 <td>"""+str(TABLE_CATALOG_NAME)+"""</td> 
-                 <td>"""+str(PIPE_CATALOG_NAME)+"""</td> 
-                 <td>"""+str(PIPE_SCHEMA_NAME)+"""</td> 
-                 <td>"""+str(PIPE_NAME)+"""</td> 
-                 <td>"""+str(PIPE_RECEIVED_TIME)+"""</td> 
-                 <td class="cell_grow">"""+str(FIRST_COMMIT_TIME)+"""</td> 
-                </tr> """
-            
-            html_file=html_file+html_table_tail
-    
-        create_output_file('need_attention_snowpipes.html',html_file)
-        report_sections["G - Maintenance"].update({'need_attention_snowpipes.html':'table'})
+        cur_db = result_scan(conn, "line_history_sql_operations_by_database", "SQL_OPERATIONS", sql_operations_sql(), sql_query_dbs)
 
-    except Exception as error:
-        print("[table_history_need_attention_snowpipes]: An exception occurred:", error)
+        if int(cur_db.rowcount)!=0:
+            for database_name  in cur_db:
 
-def table_account_non_default_parameters(conn):
+                html_file=html_header
 
-    try:    
-        global snowflake_conn
-        global html_table_header
-        global html_table_tail  
-        global report_sections     
-        conn =snowflake_conn            
-        html_file=html_table_header
-        
-        sql_query=sql_header+"""
-        SHOW PARAMETERS IN ACCOUNT;
-        """        
+                sql_query="""
+                SELECT DISTINCT QUERY_TYPE
+                FROM {result}  
+                WHERE DATABASE_NAME='"""+database_name[0]+"""'
+                """
+                cur = result_scan(conn, "line_history_sql_operations_by_database", "SQL_OPERATIONS", sql_operations_sql(), sql_query)
 
-        html_file=html_file+"""
-        <h3>non default parameters for the account</h3>
-        <table class="tabla2">
-        <tr>
-        <th >PARAMETER_NAME</th>
-        <th >CURRENT_VALUE</th>
-        <th >DEFAULT_VALUE</th>
-        <th >LEVEL</th>
-        <th >DESCRIPTION</th>
-        """
+                column_count=cur.rowcount        
+                headers =[i[0] for i in cur]  
+                headers.insert(0,'DATE')  
+                html_file=html_file+str(headers).replace('"','')+", \n"      
 
-        cur = conn.cursor()
-        cur.execute(sql_query)
-    
-        if int(cur.rowcount)!=0:
-            for ( PARAMETER_NAME, CURRENT_VALUE, DEFAULT_VALUE, LEVEL, DESCRIPTION,TYPE) in cur:
-                if str(CURRENT_VALUE)!=str(DEFAULT_VALUE):
-                    html_file=html_file+""" <tr> 
-                    <td>"""+str(PARAMETER_NAME)+"""</td> 
-                    <td>"""+str(CURRENT_VALUE)+"""</td> 
-                    <td>"""+str(DEFAULT_VALUE)+"""</td> 
-                    <td>"""+str(LEVEL)+"""</td> 
-                    <td class="cell_grow">"""+str(DESCRIPTION)+"""</td> 
-                    </tr> """
-            
-            html_file=html_file+html_table_tail
-    
-        create_output_file('account_non_default_parameters.html',html_file)
-        report_sections["G - Maintenance"].update({'account_non_default_parameters.html':'table'})
 
-    except Exception as error:
-        #print("[table_non_default_parameters]: An exception occurred:", error)
-        return
+                sql_query="""
+                WITH DATA AS (
+                    SELECT DATE                                                 AS DATE , 
+                    QUERY_TYPE                                                  AS QUERY_TYPE,
+                    EXECUTIONS                                                  AS EXECUTIONS
+                    FROM {result}
+                    WHERE DATABASE_NAME='"""+database_name[0]+"""'
+                    ORDER BY 1  
+                )
+                , PIVOT_DATA AS (
+                    SELECT *
+                    FROM DATA
+                        PIVOT(  sum (EXECUTIONS) FOR query_type IN ( """+str(headers).replace('"','').replace("[","").replace("]","").replace("'DATE',","")+""") DEFAULT ON NULL (0) ) 
+                )
+                SELECT ARRAY_CONSTRUCT(*) FROM PIVOT_DATA ORDER BY DATE
+                """
 
-def table_warehouse_non_default_parameters(conn):
+                cur = result_scan(conn, "line_history_sql_operations_by_database", "SQL_OPERATIONS", sql_operations_sql(), sql_query)
+                
+                if int(cur.rowcount)!=0:
+                    for row  in cur:
+                        html_file=html_file+str(row[0])+""","""
+                    
+                    
+                html_file=html_file+html_body1
+                    
+                for i in range(1, column_count):
+                    if i==column_count-1:
+                        html_file=html_file+"""row["""+str(i)+"""]"""
+                    else:
+                        html_file=html_file+"""row["""+str(i)+"""],"""
+                
+                html_file=html_file+html_body2+"""
+                title: `Prismafy v1.0 - https://github.com/prismafy/prismafy
+                Chart Creation Date: """+report_formatted_time+"""
+                SQL Operations for database """+database_name[0]+"""`,"""+html_line_hour_tail
 
-    try:    
+                create_output_file('history_sql_operations_for_db_'+database_name[0].lower()+'.html',html_file)
+                report_sections["G - Maintenance"].update({'history_sql_operations_for_db_'+database_name[0].lower()+'.html':'line'})
+                
+    except Exception as error:
+        print("[line_history_sql_operations_by_database]: An exception occurred:", error)
+
+def line_history_warehouse_enable_vs_querycount(conn,warehouse_name):
+    try:            
         global snowflake_conn
-        global html_table_header
-        global html_table_tail  
-        global report_sections     
-        conn =snowflake_conn            
-        html_file=html_table_header
+        global report_sections
+        conn =snowflake_conn
+        html_file=html_header
 
-        sql_query=sql_header+"""
-        SELECT DISTINCT WAREHOUSE_NAME FROM SNOWFLAKE.ACCOUNT_USAGE.WAREHOUSE_EVENTS_HISTORY 
-        """
+        sql_query="""
+        WITH RECURSIVE CALENDAR_MINUTES AS (
+        SELECT DATE_TRUNC('MINUTE',DATEADD (MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))) AS calendar_date
+        UNION ALL
+        SELECT DATE_TRUNC('MINUTE', DATEADD(HOUR, 3, calendar_date))
+        FROM CALENDAR_MINUTES
+        WHERE calendar_date < TO_TIMESTAMP("""+report_formatted_time+""")
+        )
+        ,QUERY_HIST AS (
+            SELECT
+            DATE_TRUNC('MINUTE',INTERVAL_START_TIME::TIMESTAMP_NTZ)  AS DATE,
+            COUNT(*)                                        AS QUERY_COUNT
+            FROM SNOWFLAKE.ACCOUNT_USAGE.AGGREGATE_QUERY_HISTORY 
+            WHERE  """+since_predicate("INTERVAL_START_TIME")+"""
+            AND WAREHOUSE_NAME='"""+warehouse_name+"""'
+            GROUP BY 1
+        )    
+        , MAX_QUERY_COUNT AS (
+            SELECT 
+                MAX(QUERY_COUNT) MAX_QUERY_COUNT 
+            FROM QUERY_HIST
+        )
+        , WAREHOUSE_EVENTS AS (
+            SELECT 
+            DATE_TRUNC('MINUTE',TIMESTAMP::TIMESTAMP_NTZ)   AS DATE,                                                    
+            CASE WHEN E.EVENT_NAME='RESUME_WAREHOUSE' THEN 
+                MAX_QUERY_COUNT.MAX_QUERY_COUNT 
+            ELSE 0 
+            END     ACTIVE_WAREHOUSE
+            FROM SNOWFLAKE.ACCOUNT_USAGE.WAREHOUSE_EVENTS_HISTORY  E, MAX_QUERY_COUNT
+            WHERE E.EVENT_NAME IN ('RESUME_WAREHOUSE','SUSPEND_WAREHOUSE')
+            AND  """+since_predicate("TIMESTAMP")+"""
+            AND WAREHOUSE_NAME='"""+warehouse_name+"""'                                                                           
+        )    
+        , DATA_JOIN AS (
+            SELECT 
+                COALESCE (E.DATE,H.DATE,CM.calendar_date) AS DATE, 
+                E.ACTIVE_WAREHOUSE,
+                H.QUERY_COUNT
+            FROM WAREHOUSE_EVENTS E FULL OUTER  JOIN QUERY_HIST H
+            ON (E.DATE=H.DATE)
+            FULL OUTER  JOIN CALENDAR_MINUTES CM
+            ON (CM.calendar_date=COALESCE (E.DATE,H.DATE))
+        )   
+       , WH_NO_GAPS AS (
+            SELECT 
+                DATE, 
+                NVL(ACTIVE_WAREHOUSE , LAG (ACTIVE_WAREHOUSE,1,NULL)  IGNORE NULLS OVER (ORDER BY DATE) )  ACTIVE_WAREHOUSE,
+                QUERY_COUNT 
+            FROM DATA_JOIN 
+        )
+        , DATA_NO_GAPS AS (
+            SELECT 
+                DATE, 
+               ACTIVE_WAREHOUSE, 
+               CASE WHEN ACTIVE_WAREHOUSE>0 AND ACTIVE_WAREHOUSE IS NOT NULL THEN 
+                   NVL(QUERY_COUNT , LAG (QUERY_COUNT,1,NULL)  IGNORE NULLS OVER (ORDER BY DATE) )  
+               ELSE 0
+               END QUERY_COUNT, 
+            FROM WH_NO_GAPS
+        )
+        , SUMMARY_DATA AS (
+        SELECT
+            DATE,
+            NVL(ACTIVE_WAREHOUSE,0) ACTIVE_WAREHOUSE,
+            NVL(QUERY_COUNT,0) QUERY_COUNT,
+            CASE WHEN ACTIVE_WAREHOUSE>0 AND QUERY_COUNT=0 THEN 
+                ACTIVE_WAREHOUSE
+            ELSE 0
+            END ACTIVE_WH_WITHOUT_LOAD
+        FROM 
+            DATA_NO_GAPS
+        )
+        SELECT ARRAY_CONSTRUCT(*) AS DATA 
+        FROM SUMMARY_DATA
+        ORDER BY DATE;
+        """        
         cur = conn.cursor()
         cur.execute(sql_query)
 
-        html_file=html_file+"""
-        <h3>non default parameters for warehouses</h3>
-        <table class="tabla2">
-        <tr>
-        <th >WAREHOUSE_NAME</th>
-        <th >PARAMETER_NAME</th>
-        <th >CURRENT_VALUE</th>
-        <th >DEFAULT_VALUE</th>
-        <th >LEVEL</th>
-        <th >DESCRIPTION</th>
-        """
-
+        headers ="['DATE', 'ACTIVE_WAREHOUSE', 'QUERY_COUNT','ACTIVE_WH_WITHOUT_LOAD']"+", \n"      
+        html_file=html_file+headers
+        
         if int(cur.rowcount)!=0:
-            for ( ROW_WAREHOUSE_NAME) in cur:              
-                sql_query_details=sql_header+"""
-                SHOW PARAMETERS IN WAREHOUSE """+str(ROW_WAREHOUSE_NAME[0])+""";
-                """
-                
-                cur_details = conn.cursor()
-                cur_details.execute(sql_query_details)
+            for row  in cur:
+                html_file=html_file+str(row[0]).replace("undefined","null")+""","""
             
-                if int(cur_details.rowcount)!=0:
-                    for ( PARAMETER_NAME, CURRENT_VALUE, DEFAULT_VALUE, LEVEL, DESCRIPTION,TYPE) in cur_details:
-                        if str(CURRENT_VALUE)!=str(DEFAULT_VALUE):
-                            html_file=html_file+""" <tr> 
-                            <td>"""+str(ROW_WAREHOUSE_NAME[0])+"""</td> 
-                            <td>"""+str(PARAMETER_NAME)+"""</td> 
-                            <td>"""+str(CURRENT_VALUE)+"""</td> 
-                            <td>"""+str(DEFAULT_VALUE)+"""</td> 
-                            <td>"""+str(LEVEL)+"""</td> 
-                            <td class="cell_grow">"""+str(DESCRIPTION)+"""</td> 
-                            </tr> """
             
-        html_file=html_file+html_table_tail
-    
-        create_output_file('warehouse_non_default_parameters.html',html_file)
-        report_sections["G - Maintenance"].update({'warehouse_non_default_parameters.html':'table'})
+            html_file=html_file+html_body1+"""
+                    row[1],row[2],row[3]
+                    """+html_body2+"""
+            title: `Prismafy v1.0 - https://github.com/prismafy/prismafy
+            Chart Creation Date: """+report_formatted_time+"""
+            Warehouse Active vs Query Count for """+warehouse_name+"""
+            Detect those periods when your warehouse is active and it does not have load`,"""+html_stepped_area_minute_tail
 
+            create_output_file('enable_vs_querycount_for_warehouse_'+warehouse_name.lower()+'.html',html_file)
+            report_sections["A - Computing"].update({'enable_vs_querycount_for_warehouse_'+warehouse_name.lower()+'.html':'line'})
+                
     except Exception as error:
-        #print("[table_warehouse_non_default_parameters]: An exception occurred:", error)
-        return
+        print("[line_history_warehouse_enable_vs_querycount]: An exception occurred:", error)
 
-def table_database_non_default_parameters(conn):
+def table_last_executions_of_query(conn,sql_query_id):
 
     try:    
         global snowflake_conn
@@ -4629,207 +4462,16 @@ def table_database_non_default_parameters(conn):
         global html_table_tail  
         global report_sections     
         conn =snowflake_conn            
-        html_file=html_table_header
+        html_file=html_table_header    
+        table_explain_by_query(conn,sql_query_id)
 
-        sql_query=sql_header+"""
-        SELECT DISTINCT DATABASE_NAME FROM SNOWFLAKE.ACCOUNT_USAGE.DATABASES 
-        WHERE DELETED IS NULL 
-        """
-        cur = conn.cursor()
-        cur.execute(sql_query)
-
-        html_file=html_file+"""
-        <h3>non default parameters for databases</h3>
-        <table class="tabla2">
-        <tr>
-        <th >DATABASE_NAME</th>
-        <th >PARAMETER_NAME</th>
-        <th >CURRENT_VALUE</th>
-        <th >DEFAULT_VALUE</th>
-        <th >LEVEL</th>
-        <th >DESCRIPTION</th>
-        """
-
-        if int(cur.rowcount)!=0:
-            for ( ROW_DATABASE) in cur:              
-                sql_query_details=sql_header+"""
-                SHOW PARAMETERS IN DATABASE """+str(ROW_DATABASE[0])+""";
-                """
-                
-                cur_details = conn.cursor()
-                cur_details.execute(sql_query_details)
-            
-                if int(cur_details.rowcount)!=0:
-                    for ( PARAMETER_NAME, CURRENT_VALUE, DEFAULT_VALUE, LEVEL, DESCRIPTION,TYPE) in cur_details:
-                        if str(CURRENT_VALUE)!=str(DEFAULT_VALUE):
-                            html_file=html_file+""" <tr> 
-                            <td>"""+str(ROW_DATABASE[0])+"""</td> 
-                            <td>"""+str(PARAMETER_NAME)+"""</td> 
-                            <td>"""+str(CURRENT_VALUE)+"""</td> 
-                            <td>"""+str(DEFAULT_VALUE)+"""</td> 
-                            <td>"""+str(LEVEL)+"""</td> 
-                            <td class="cell_grow">"""+str(DESCRIPTION)+"""</td> 
-                            </tr> """
-            
-        html_file=html_file+html_table_tail
-    
-        create_output_file('database_non_default_parameters.html',html_file)
-        report_sections["G - Maintenance"].update({'database_non_default_parameters.html':'table'})
-
-    except Exception as error:
-        #print("[table_database_non_default_parameters]: An exception occurred:", error)
-        return
-
-def table_warehouse_without_activity_in_last_3_months(conn):
-
-    try:    
-        global snowflake_conn
-        global html_table_header
-        global html_table_tail  
-        global report_sections     
-        conn =snowflake_conn            
-        html_file=html_table_header
-        
-        sql_query=sql_header+"""
-        WITH DATA AS (
-           SELECT 
-                WAREHOUSE_NAME, 
-                MAX(END_TIME) AS LAST_USED_DATE 
-           FROM SNOWFLAKE.ACCOUNT_USAGE.WAREHOUSE_LOAD_HISTORY  
-           GROUP BY 1 
-        )
-        SELECT * FROM DATA
-        WHERE LAST_USED_DATE  < DATEADD(MONTH,-3,TO_TIMESTAMP("""+report_formatted_time+""")) 
-        ORDER BY LAST_USED_DATE DESC
-        ;
-        """
-        
-        cur = conn.cursor()
-        cur.execute(sql_query)
-    
-        html_file=html_file+"""
-        <h3>Warehouses without activity in last 3_months</h3>
-        <table class="tabla2">
-        <tr>
-        <th >WAREHOUSE_NAME</th>
-        <th >LAST_USED_DATE</th>
-        """
-    
-        if int(cur.rowcount)!=0:
-            for ( WAREHOUSE_NAME, LAST_USED_DATE) in cur:
-                html_file=html_file+""" <tr> 
-                 <td>"""+str(WAREHOUSE_NAME)+"""</td> 
-                 <td class="cell_grow">"""+str(LAST_USED_DATE)+"""</td> 
-                </tr> """
-            
-            html_file=html_file+html_table_tail
-    
-        create_output_file('warehouse_without_activity_in_last_3_months.html',html_file)
-        report_sections["G - Maintenance"].update({'warehouse_without_activity_in_last_3_months.html':'table'})
-
-    except Exception as error:
-        print("[table_warehouse_without_activity_in_last_3_months]: An exception occurred:", error)
-
-def table_warehouse_without_activity_in_last_month(conn):
-
-    try:    
-        global snowflake_conn
-        global html_table_header
-        global html_table_tail  
-        global report_sections     
-        conn =snowflake_conn            
-        html_file=html_table_header
-        
-        sql_query=sql_header+"""
-        WITH DATA AS (
-           SELECT 
-                WAREHOUSE_NAME, 
-                MAX(END_TIME) AS LAST_USED_DATE 
-           FROM SNOWFLAKE.ACCOUNT_USAGE.WAREHOUSE_LOAD_HISTORY  
-           GROUP BY 1 
-        )
-        SELECT * FROM DATA
-        WHERE LAST_USED_DATE  < DATEADD(MONTH,-1,TO_TIMESTAMP("""+report_formatted_time+""")) 
-        ORDER BY LAST_USED_DATE DESC
-        ;
-        """
-        
-        cur = conn.cursor()
-        cur.execute(sql_query)
-    
-        html_file=html_file+"""
-        <h3>Warehouses without activity in last month</h3>
-        <table class="tabla2">
-        <tr>
-        <th >WAREHOUSE_NAME</th>
-        <th >LAST_USED_DATE</th>
-        """
-    
-        if int(cur.rowcount)!=0:
-            for ( WAREHOUSE_NAME, LAST_USED_DATE) in cur:
-                html_file=html_file+""" <tr> 
-                 <td>"""+str(WAREHOUSE_NAME)+"""</td> 
-                 <td class="cell_grow">"""+str(LAST_USED_DATE)+"""</td> 
-                </tr> """
-            
-            html_file=html_file+html_table_tail
-    
-        create_output_file('warehouse_without_activity_in_last_month.html',html_file)
-        report_sections["G - Maintenance"].update({'warehouse_without_activity_in_last_month.html':'table'})
-
-    except Exception as error:
-        print("[table_warehouse_without_activity_in_last_month]: An exception occurred:", error)
-
-def table_month_top_dbt_models(conn):
-
-    try:    
-        global snowflake_conn
-        global html_table_header
-        global html_table_tail  
-        global report_sections     
-        conn =snowflake_conn            
-        html_file=html_table_header
-        
         sql_query=sql_header+"""
         WITH DATA AS (                
                SELECT 
-                ROW_NUMBER() over (order by total_elapsed_time  DESC)  AS TOP_N,
-                START_TIME        AS DATE, 
-                query_parameterized_hash, 
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE (REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'dbt_cloud_run_id')     
-                ELSE NULL  END AS dbt_cloud_run_id,
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE (REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'dbt_version')     
-                ELSE NULL  END AS dbt_version,
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE (REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'project_name')     
-                ELSE NULL  END AS dbt_project_name,
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE (REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'dbt_cloud_project_id')     
-                ELSE NULL  END AS dbt_cloud_project_id,
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE (REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'target_name')     
-                ELSE NULL  END AS dbt_target_name,
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE (REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'target_database')     
-                ELSE NULL  END AS dbt_target_database,
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE (REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'target_schema')     
-                ELSE NULL  END AS dbt_target_schema,
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE (REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'node_name')     
-                ELSE NULL  END AS dbt_node_name,
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE (REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'node_id')     
-                ELSE NULL  END AS dbt_node_id,
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE (REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'materialized')     
-                ELSE NULL  END AS dbt_materialized,
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE(REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'node_original_file_path')  
-                ELSE NULL  END AS dbt_node_original_file_path,
+                START_TIME::TIMESTAMP_NTZ         AS DATE, 
+                query_parameterized_hash,                 
                 ROUND(total_elapsed_time/1000,2)                AS total_elapsed_time_seg,
+                nvl( round( 100 * ( total_elapsed_time - lag(total_elapsed_time, 1) over ( partition by query_parameterized_hash ORDER BY START_TIME ) )/ lag(total_elapsed_time, 1) over ( partition by query_parameterized_hash ORDER BY START_TIME ), 2), 0 ) as growth,
                 query_id,
                 database_id,
                 database_name,
@@ -4897,17 +4539,16 @@ def table_month_top_dbt_models(conn):
                 rows_written_to_result,
                 query_retry_time,
                 query_retry_cause,
-                fault_handling_time    
+                fault_handling_time ,
+                REPLACE(REPLACE(QUERY_TEXT,'\n',' '),'<td>')  QUERY_TEXT,
                 FROM snowflake.account_usage.query_history
-                WHERE TO_DATE(START_TIME) > DATEADD(MONTH,-1,TO_DATE("""+report_formatted_time+"""))
-                AND  NOT CONTAINS (QUERY_TEXT,'*** Project:   https://github.com/prismafy/prismafy  ***')
-                AND CONTAINS (QUERY_TEXT,'/* {"app": "dbt"')
-                AND query_parameterized_hash IS NOT NULL
+                WHERE """+since_predicate("START_TIME","MONTH",months_history,anchor="TO_DATE")+"""
+                AND query_parameterized_hash='"""+sql_query_id+"""'
         )
         SELECT * 
         FROM DATA        
-        WHERE TOP_N<=25
-        ORDER BY total_elapsed_time_seg DESC        
+        ORDER BY DATE DESC        
+        LIMIT 100
         ;
         """
         
@@ -4915,25 +4556,15 @@ def table_month_top_dbt_models(conn):
         cur.execute(sql_query)
     
         html_file=html_file+"""
-        <h3>Top dbt models for last month by total_elapsed_time_seg</h3>
+        <h3>Last executions for query """+sql_query_id+"""</h3>
         <table class="tabla2">
         <tr>
-        <th>top_n</th>
         <th>date</th>
         <th>query_parameterized_hash</th>
-        <th>dbt_cloud_run_id</th>
-        <th>dbt_version</th>
-        <th>dbt_project_name</th>
-        <th>dbt_cloud_project_id</th>
-        <th>dbt_target_name</th>
-        <th>dbt_target_database</th>
-        <th>dbt_target_schema</th>
-        <th>dbt_node_name</th>
-        <th>dbt_node_id</th>
-        <th>dbt_materialized</th>
-        <th>dbt_node_original_file_path</th>
         <th>total_elapsed_time_seg</th>
+        <th>growth%</th>        
         <th>query_id</th>
+        <th>execution_plan_hash</th>
         <th>database_id</th>
         <th>database_name</th>
         <th>schema_id</th>
@@ -5001,29 +4632,27 @@ def table_month_top_dbt_models(conn):
         <th>query_retry_time</th>
         <th>query_retry_cause</th>
         <th>fault_handling_time</th>  
+        <th>query_text</th>  
         </tr>  
         """
-    
+        
         if int(cur.rowcount)!=0:
-            for ( TOP_N, RDATE, QUERY_PARAMETERIZED_HASH, DBT_CLOUD_RUN_ID, DBT_VERSION, DBT_PROJECT_NAME, DBT_CLOUD_PROJECT_ID, DBT_TARGET_NAME, DBT_TARGET_DATABASE, DBT_TARGET_SCHEMA, DBT_NODE_NAME, DBT_NODE_ID, DBT_MATERIALIZED, DBT_NODE_ORIGINAL_FILE_PATH, TOTAL_ELAPSED_TIME_SEG, QUERY_ID, DATABASE_ID, DATABASE_NAME, SCHEMA_ID, SCHEMA_NAME, QUERY_TYPE, SESSION_ID, USER_NAME, ROLE_NAME, WAREHOUSE_ID, WAREHOUSE_NAME, WAREHOUSE_SIZE, WAREHOUSE_TYPE, CLUSTER_NUMBER, QUERY_TAG, EXECUTION_STATUS, ERROR_CODE, ERROR_MESSAGE, BYTES_SCANNED, PERCENTAGE_SCANNED_FROM_CACHE, BYTES_WRITTEN, BYTES_WRITTEN_TO_RESULT, BYTES_READ_FROM_RESULT, ROWS_PRODUCED, ROWS_INSERTED, ROWS_UPDATED, ROWS_DELETED, ROWS_UNLOADED, BYTES_DELETED, PARTITIONS_SCANNED, PARTITIONS_TOTAL, BYTES_SPILLED_TO_LOCAL_STORAGE, BYTES_SPILLED_TO_REMOTE_STORAGE, BYTES_SENT_OVER_THE_NETWORK, COMPILATION_TIME, EXECUTION_TIME, QUEUED_PROVISIONING_TIME, QUEUED_REPAIR_TIME, QUEUED_OVERLOAD_TIME, TRANSACTION_BLOCKED_TIME, OUTBOUND_DATA_TRANSFER_CLOUD, OUTBOUND_DATA_TRANSFER_REGION, OUTBOUND_DATA_TRANSFER_BYTES, INBOUND_DATA_TRANSFER_CLOUD, INBOUND_DATA_TRANSFER_REGION, INBOUND_DATA_TRANSFER_BYTES, LIST_EXTERNAL_FILES_TIME, CREDITS_USED_CLOUD_SERVICES, EXTERNAL_FUNCTION_TOTAL_INVOCATIONS, EXTERNAL_FUNCTION_TOTAL_SENT_ROWS, EXTERNAL_FUNCTION_TOTAL_RECEIVED_ROWS, EXTERNAL_FUNCTION_TOTAL_SENT_BYTES, EXTERNAL_FUNCTION_TOTAL_RECEIVED_BYTES, QUERY_LOAD_PERCENT, IS_CLIENT_GENERATED_STATEMENT, QUERY_ACCELERATION_BYTES_SCANNED, QUERY_ACCELERATION_PARTITIONS_SCANNED, QUERY_ACCELERATION_UPPER_LIMIT_SCALE_FACTOR, TRANSACTION_ID, CHILD_QUERIES_WAIT_TIME, ROLE_TYPE, QUERY_HASH, QUERY_HASH_VERSION, SECONDARY_ROLE_STATS, ROWS_WRITTEN_TO_RESULT, QUERY_RETRY_TIME, QUERY_RETRY_CAUSE, FAULT_HANDLING_TIME ) in cur:
+            for (  RDATE, QUERY_PARAMETERIZED_HASH, TOTAL_ELAPSED_TIME_SEG, GROWTH, QUERY_ID, DATABASE_ID, DATABASE_NAME, SCHEMA_ID, SCHEMA_NAME, QUERY_TYPE, SESSION_ID, USER_NAME, ROLE_NAME, WAREHOUSE_ID, WAREHOUSE_NAME, WAREHOUSE_SIZE, WAREHOUSE_TYPE, CLUSTER_NUMBER, QUERY_TAG, EXECUTION_STATUS, ERROR_CODE, ERROR_MESSAGE, BYTES_SCANNED, PERCENTAGE_SCANNED_FROM_CACHE, BYTES_WRITTEN, BYTES_WRITTEN_TO_RESULT, BYTES_READ_FROM_RESULT, ROWS_PRODUCED, ROWS_INSERTED, ROWS_UPDATED, ROWS_DELETED, ROWS_UNLOADED, BYTES_DELETED, PARTITIONS_SCANNED, PARTITIONS_TOTAL, BYTES_SPILLED_TO_LOCAL_STORAGE, BYTES_SPILLED_TO_REMOTE_STORAGE, BYTES_SENT_OVER_THE_NETWORK, COMPILATION_TIME, EXECUTION_TIME, QUEUED_PROVISIONING_TIME, QUEUED_REPAIR_TIME, QUEUED_OVERLOAD_TIME, TRANSACTION_BLOCKED_TIME, OUTBOUND_DATA_TRANSFER_CLOUD, OUTBOUND_DATA_TRANSFER_REGION, OUTBOUND_DATA_TRANSFER_BYTES, INBOUND_DATA_TRANSFER_CLOUD, INBOUND_DATA_TRANSFER_REGION, INBOUND_DATA_TRANSFER_BYTES, LIST_EXTERNAL_FILES_TIME, CREDITS_USED_CLOUD_SERVICES, EXTERNAL_FUNCTION_TOTAL_INVOCATIONS, EXTERNAL_FUNCTION_TOTAL_SENT_ROWS, EXTERNAL_FUNCTION_TOTAL_RECEIVED_ROWS, EXTERNAL_FUNCTION_TOTAL_SENT_BYTES, EXTERNAL_FUNCTION_TOTAL_RECEIVED_BYTES, QUERY_LOAD_PERCENT, IS_CLIENT_GENERATED_STATEMENT, QUERY_ACCELERATION_BYTES_SCANNED, QUERY_ACCELERATION_PARTITIONS_SCANNED, QUERY_ACCELERATION_UPPER_LIMIT_SCALE_FACTOR, TRANSACTION_ID, CHILD_QUERIES_WAIT_TIME, ROLE_TYPE, QUERY_HASH, QUERY_HASH_VERSION, SECONDARY_ROLE_STATS, ROWS_WRITTEN_TO_RESULT, QUERY_RETRY_TIME, QUERY_RETRY_CAUSE, FAULT_HANDLING_TIME, QUERY_TEXT ) in cur:
+                
                 html_file=html_file+""" <tr> 
-                 <td>"""+str(TOP_N)+"""</td> 
                  <td>"""+str(RDATE)+"""</td> 
                  <td>"""+str(QUERY_PARAMETERIZED_HASH)+"""</td> 
-                 <td>"""+str(DBT_CLOUD_RUN_ID)+"""</td> 
-                 <td>"""+str(DBT_VERSION)+"""</td> 
-                 <td>"""+str(DBT_PROJECT_NAME)+"""</td> 
-                 <td>"""+str(DBT_CLOUD_PROJECT_ID)+"""</td> 
-                 <td>"""+str(DBT_TARGET_NAME)+"""</td> 
-                 <td>"""+str(DBT_TARGET_DATABASE)+"""</td> 
-                 <td>"""+str(DBT_TARGET_SCHEMA)+"""</td> 
-                 <td>"""+str(DBT_NODE_NAME)+"""</td> 
-                 <td>"""+str(DBT_NODE_ID)+"""</td> 
-                 <td>"""+str(DBT_MATERIALIZED)+"""</td> 
-                 <td>"""+str(DBT_NODE_ORIGINAL_FILE_PATH)+"""</td> 
                  <td>"""+str(TOTAL_ELAPSED_TIME_SEG)+"""</td> 
-                 <td>"""+str(QUERY_ID)+"""</td> 
-                 <td>"""+str(DATABASE_ID)+"""</td> 
+                 <td>"""+str(GROWTH)+"""</td> 
+                 <td>"""+str(QUERY_ID)+"""</td> """
+
+                hash_plan=hash_plans.get(str(QUERY_ID),'Execution plan expired')
+                if hash_plan=='Execution plan expired':
+                    html_file=html_file+"""<td>Execution plan expired</td> """
+                else:
+                    html_file=html_file+"""<td><a href="./execution_plan_"""+str(QUERY_ID)+"""_"""+str(hash_plan)+""".html">"""+str(hash_plan)+"""</td> """
+
+                html_file=html_file+"""<td>"""+str(DATABASE_ID)+"""</td> 
                  <td>"""+str(DATABASE_NAME)+"""</td> 
                  <td>"""+str(SCHEMA_ID)+"""</td> 
                  <td>"""+str(SCHEMA_NAME)+"""</td> 
@@ -5089,1297 +4718,30 @@ def table_month_top_dbt_models(conn):
                  <td>"""+str(ROWS_WRITTEN_TO_RESULT)+"""</td> 
                  <td>"""+str(QUERY_RETRY_TIME)+"""</td> 
                  <td>"""+str(QUERY_RETRY_CAUSE)+"""</td> 
-                 <td class="cell_grow">"""+str(FAULT_HANDLING_TIME)+"""</td> 
+                 <td>"""+str(FAULT_HANDLING_TIME)+"""</td> 
+                 <td class="cell_grow">"""+str(QUERY_TEXT)+"""</td> 
                 </tr> """
             
             html_file=html_file+html_table_tail
     
-        create_output_file('last_month_top_dbt_models.html',html_file)
-        report_sections["H - DBT"].update({'last_month_top_dbt_models.html':'table'})
+        create_output_file('last_executions_for_query_'+sql_query_id+'.html',html_file)
+        report_sections["D - Performance"].update({'last_executions_for_query_'+sql_query_id+'.html':'table'})
 
     except Exception as error:
-        print("[table_month_top_dbt_models]: An exception occurred:", error)
-
-def table_week_top_dbt_models(conn):
+        print("[table_last_executions_of_query]: An exception occurred:", error)
 
-    try:    
+def line_history_wh_changes_by_query(conn,sql_query_id):
+    try:            
         global snowflake_conn
-        global html_table_header
-        global html_table_tail  
-        global report_sections     
-        conn =snowflake_conn            
-        html_file=html_table_header
-        
+        global report_sections
+        conn =snowflake_conn
+
         sql_query=sql_header+"""
-        WITH DATA AS (                
-               SELECT 
-                ROW_NUMBER() over (order by total_elapsed_time  DESC)  AS TOP_N,
-                START_TIME        AS DATE, 
-                query_parameterized_hash, 
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE (REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'dbt_cloud_run_id')     
-                ELSE NULL  END AS dbt_cloud_run_id,
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE (REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'dbt_version')     
-                ELSE NULL  END AS dbt_version,
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE (REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'project_name')     
-                ELSE NULL  END AS dbt_project_name,
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE (REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'dbt_cloud_project_id')     
-                ELSE NULL  END AS dbt_cloud_project_id,
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE (REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'target_name')     
-                ELSE NULL  END AS dbt_target_name,
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE (REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'target_database')     
-                ELSE NULL  END AS dbt_target_database,
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE (REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'target_schema')     
-                ELSE NULL  END AS dbt_target_schema,
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE (REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'node_name')     
-                ELSE NULL  END AS dbt_node_name,
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE (REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'node_id')     
-                ELSE NULL  END AS dbt_node_id,
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE (REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'materialized')     
-                ELSE NULL  END AS dbt_materialized,
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE(REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'node_original_file_path')  
-                ELSE NULL  END AS dbt_node_original_file_path,
-                ROUND(total_elapsed_time/1000,2)                AS total_elapsed_time_seg,
-                query_id,
-                database_id,
-                database_name,
-                schema_id,
-                schema_name,
-                query_type,
-                session_id,
-                user_name,
-                role_name,
-                warehouse_id,
-                warehouse_name,
-                warehouse_size,
-                warehouse_type,
-                cluster_number,
-                query_tag,
-                execution_status,
-                error_code,
-                error_message,
-                bytes_scanned,
-                percentage_scanned_from_cache,
-                bytes_written,
-                bytes_written_to_result,
-                bytes_read_from_result,
-                rows_produced,
-                rows_inserted,
-                rows_updated,
-                rows_deleted,
-                rows_unloaded,
-                bytes_deleted,
-                partitions_scanned,
-                partitions_total,
-                bytes_spilled_to_local_storage,
-                bytes_spilled_to_remote_storage,
-                bytes_sent_over_the_network,
-                compilation_time,
-                execution_time,
-                queued_provisioning_time,
-                queued_repair_time,
-                queued_overload_time,
-                transaction_blocked_time,
-                outbound_data_transfer_cloud,
-                outbound_data_transfer_region,
-                outbound_data_transfer_bytes,
-                inbound_data_transfer_cloud,
-                inbound_data_transfer_region,
-                inbound_data_transfer_bytes,
-                list_external_files_time,
-                credits_used_cloud_services,
-                external_function_total_invocations,
-                external_function_total_sent_rows,
-                external_function_total_received_rows,
-                external_function_total_sent_bytes,
-                external_function_total_received_bytes,
-                query_load_percent,
-                is_client_generated_statement,
-                query_acceleration_bytes_scanned,
-                query_acceleration_partitions_scanned,
-                query_acceleration_upper_limit_scale_factor,
-                transaction_id,
-                child_queries_wait_time,
-                role_type,
-                query_hash,
-                query_hash_version,
-                secondary_role_stats,
-                rows_written_to_result,
-                query_retry_time,
-                query_retry_cause,
-                fault_handling_time    
-                FROM snowflake.account_usage.query_history
-                WHERE TO_DATE(START_TIME) > DATEADD(DAY,-7,TO_DATE("""+report_formatted_time+"""))
-                AND  NOT CONTAINS (QUERY_TEXT,'*** Project:   https://github.com/prismafy/prismafy  ***')
-                AND CONTAINS (QUERY_TEXT,'/* {"app": "dbt"')
-                AND query_parameterized_hash NOT IN ('e66e976d84c0546733a0d35b5f33a84d','e66e976d84c0546733a0d35b5f33a84d','e66e976d84c0546733a0d35b5f33a84d') AND query_parameterized_hash IS NOT NULL
-        )
-        SELECT * 
-        FROM DATA        
-        WHERE TOP_N<=25
-        ORDER BY total_elapsed_time_seg DESC        
-        ;
-        """
-        
-        cur = conn.cursor()
-        cur.execute(sql_query)
-    
-        html_file=html_file+"""
-        <h3>Top dbt models for last week by total_elapsed_time_seg</h3>
-        <table class="tabla2">
-        <tr>
-        <th>top_n</th>
-        <th>date</th>
-        <th>query_parameterized_hash</th>
-        <th>dbt_cloud_run_id</th>
-        <th>dbt_version</th>
-        <th>dbt_project_name</th>
-        <th>dbt_cloud_project_id</th>
-        <th>dbt_target_name</th>
-        <th>dbt_target_database</th>
-        <th>dbt_target_schema</th>
-        <th>dbt_node_name</th>
-        <th>dbt_node_id</th>
-        <th>dbt_materialized</th>
-        <th>dbt_node_original_file_path</th>
-        <th>total_elapsed_time_seg</th>
-        <th>query_id</th>
-        <th>database_id</th>
-        <th>database_name</th>
-        <th>schema_id</th>
-        <th>schema_name</th>
-        <th>query_type</th>
-        <th>session_id</th>
-        <th>user_name</th>
-        <th>role_name</th>
-        <th>warehouse_id</th>
-        <th>warehouse_name</th>
-        <th>warehouse_size</th>
-        <th>warehouse_type</th>
-        <th>cluster_number</th>
-        <th>query_tag</th>
-        <th>execution_status</th>
-        <th>error_code</th>
-        <th>error_message</th>
-        <th>bytes_scanned</th>
-        <th>percentage_scanned_from_cache</th>
-        <th>bytes_written</th>
-        <th>bytes_written_to_result</th>
-        <th>bytes_read_from_result</th>
-        <th>rows_produced</th>
-        <th>rows_inserted</th>
-        <th>rows_updated</th>
-        <th>rows_deleted</th>
-        <th>rows_unloaded</th>
-        <th>bytes_deleted</th>
-        <th>partitions_scanned</th>
-        <th>partitions_total</th>
-        <th>bytes_spilled_to_local_storage</th>
-        <th>bytes_spilled_to_remote_storage</th>
-        <th>bytes_sent_over_the_network</th>
-        <th>compilation_time</th>
-        <th>execution_time</th>
-        <th>queued_provisioning_time</th>
-        <th>queued_repair_time</th>
-        <th>queued_overload_time</th>
-        <th>transaction_blocked_time</th>
-        <th>outbound_data_transfer_cloud</th>
-        <th>outbound_data_transfer_region</th>
-        <th>outbound_data_transfer_bytes</th>
-        <th>inbound_data_transfer_cloud</th>
-        <th>inbound_data_transfer_region</th>
-        <th>inbound_data_transfer_bytes</th>
-        <th>list_external_files_time</th>
-        <th>credits_used_cloud_services</th>
-        <th>external_function_total_invocations</th>
-        <th>external_function_total_sent_rows</th>
-        <th>external_function_total_received_rows</th>
-        <th>external_function_total_sent_bytes</th>
-        <th>external_function_total_received_bytes</th>
-        <th>query_load_percent</th>
-        <th>is_client_generated_statement</th>
-        <th>query_acceleration_bytes_scanned</th>
-        <th>query_acceleration_partitions_scanned</th>
-        <th>query_acceleration_upper_limit_scale_factor</th>
-        <th>transaction_id</th>
-        <th>child_queries_wait_time</th>
-        <th>role_type</th>
-        <th>query_hash</th>
-        <th>query_hash_version</th>
-        <th>secondary_role_stats</th>
-        <th>rows_written_to_result</th>
-        <th>query_retry_time</th>
-        <th>query_retry_cause</th>
-        <th>fault_handling_time</th>  
-        </tr>  
-        """
-    
-        if int(cur.rowcount)!=0:
-            for ( TOP_N, RDATE, QUERY_PARAMETERIZED_HASH, DBT_CLOUD_RUN_ID, DBT_VERSION, DBT_PROJECT_NAME, DBT_CLOUD_PROJECT_ID, DBT_TARGET_NAME, DBT_TARGET_DATABASE, DBT_TARGET_SCHEMA, DBT_NODE_NAME, DBT_NODE_ID, DBT_MATERIALIZED, DBT_NODE_ORIGINAL_FILE_PATH, TOTAL_ELAPSED_TIME_SEG, QUERY_ID, DATABASE_ID, DATABASE_NAME, SCHEMA_ID, SCHEMA_NAME, QUERY_TYPE, SESSION_ID, USER_NAME, ROLE_NAME, WAREHOUSE_ID, WAREHOUSE_NAME, WAREHOUSE_SIZE, WAREHOUSE_TYPE, CLUSTER_NUMBER, QUERY_TAG, EXECUTION_STATUS, ERROR_CODE, ERROR_MESSAGE, BYTES_SCANNED, PERCENTAGE_SCANNED_FROM_CACHE, BYTES_WRITTEN, BYTES_WRITTEN_TO_RESULT, BYTES_READ_FROM_RESULT, ROWS_PRODUCED, ROWS_INSERTED, ROWS_UPDATED, ROWS_DELETED, ROWS_UNLOADED, BYTES_DELETED, PARTITIONS_SCANNED, PARTITIONS_TOTAL, BYTES_SPILLED_TO_LOCAL_STORAGE, BYTES_SPILLED_TO_REMOTE_STORAGE, BYTES_SENT_OVER_THE_NETWORK, COMPILATION_TIME, EXECUTION_TIME, QUEUED_PROVISIONING_TIME, QUEUED_REPAIR_TIME, QUEUED_OVERLOAD_TIME, TRANSACTION_BLOCKED_TIME, OUTBOUND_DATA_TRANSFER_CLOUD, OUTBOUND_DATA_TRANSFER_REGION, OUTBOUND_DATA_TRANSFER_BYTES, INBOUND_DATA_TRANSFER_CLOUD, INBOUND_DATA_TRANSFER_REGION, INBOUND_DATA_TRANSFER_BYTES, LIST_EXTERNAL_FILES_TIME, CREDITS_USED_CLOUD_SERVICES, EXTERNAL_FUNCTION_TOTAL_INVOCATIONS, EXTERNAL_FUNCTION_TOTAL_SENT_ROWS, EXTERNAL_FUNCTION_TOTAL_RECEIVED_ROWS, EXTERNAL_FUNCTION_TOTAL_SENT_BYTES, EXTERNAL_FUNCTION_TOTAL_RECEIVED_BYTES, QUERY_LOAD_PERCENT, IS_CLIENT_GENERATED_STATEMENT, QUERY_ACCELERATION_BYTES_SCANNED, QUERY_ACCELERATION_PARTITIONS_SCANNED, QUERY_ACCELERATION_UPPER_LIMIT_SCALE_FACTOR, TRANSACTION_ID, CHILD_QUERIES_WAIT_TIME, ROLE_TYPE, QUERY_HASH, QUERY_HASH_VERSION, SECONDARY_ROLE_STATS, ROWS_WRITTEN_TO_RESULT, QUERY_RETRY_TIME, QUERY_RETRY_CAUSE, FAULT_HANDLING_TIME ) in cur:
-                html_file=html_file+""" <tr> 
-                 <td>"""+str(TOP_N)+"""</td> 
-                 <td>"""+str(RDATE)+"""</td> 
-                 <td>"""+str(QUERY_PARAMETERIZED_HASH)+"""</td> 
-                 <td>"""+str(DBT_CLOUD_RUN_ID)+"""</td> 
-                 <td>"""+str(DBT_VERSION)+"""</td> 
-                 <td>"""+str(DBT_PROJECT_NAME)+"""</td> 
-                 <td>"""+str(DBT_CLOUD_PROJECT_ID)+"""</td> 
-                 <td>"""+str(DBT_TARGET_NAME)+"""</td> 
-                 <td>"""+str(DBT_TARGET_DATABASE)+"""</td> 
-                 <td>"""+str(DBT_TARGET_SCHEMA)+"""</td> 
-                 <td>"""+str(DBT_NODE_NAME)+"""</td> 
-                 <td>"""+str(DBT_NODE_ID)+"""</td> 
-                 <td>"""+str(DBT_MATERIALIZED)+"""</td> 
-                 <td>"""+str(DBT_NODE_ORIGINAL_FILE_PATH)+"""</td> 
-                 <td>"""+str(TOTAL_ELAPSED_TIME_SEG)+"""</td> 
-                 <td>"""+str(QUERY_ID)+"""</td> 
-                 <td>"""+str(DATABASE_ID)+"""</td> 
-                 <td>"""+str(DATABASE_NAME)+"""</td> 
-                 <td>"""+str(SCHEMA_ID)+"""</td> 
-                 <td>"""+str(SCHEMA_NAME)+"""</td> 
-                 <td>"""+str(QUERY_TYPE)+"""</td> 
-                 <td>"""+str(SESSION_ID)+"""</td> 
-                 <td>"""+str(USER_NAME)+"""</td> 
-                 <td>"""+str(ROLE_NAME)+"""</td> 
-                 <td>"""+str(WAREHOUSE_ID)+"""</td> 
-                 <td>"""+str(WAREHOUSE_NAME)+"""</td> 
-                 <td>"""+str(WAREHOUSE_SIZE)+"""</td> 
-                 <td>"""+str(WAREHOUSE_TYPE)+"""</td> 
-                 <td>"""+str(CLUSTER_NUMBER)+"""</td> 
-                 <td>"""+str(QUERY_TAG)+"""</td> 
-                 <td>"""+str(EXECUTION_STATUS)+"""</td> 
-                 <td>"""+str(ERROR_CODE)+"""</td> 
-                 <td>"""+str(ERROR_MESSAGE)+"""</td> 
-                 <td>"""+str(BYTES_SCANNED)+"""</td> 
-                 <td>"""+str(PERCENTAGE_SCANNED_FROM_CACHE)+"""</td> 
-                 <td>"""+str(BYTES_WRITTEN)+"""</td> 
-                 <td>"""+str(BYTES_WRITTEN_TO_RESULT)+"""</td>  
-                 <td>"""+str(BYTES_READ_FROM_RESULT)+"""</td> 
-                 <td>"""+str(ROWS_PRODUCED)+"""</td> 
-                 <td>"""+str(ROWS_INSERTED)+"""</td> 
-                 <td>"""+str(ROWS_UPDATED)+"""</td> 
-                 <td>"""+str(ROWS_DELETED)+"""</td> 
-                 <td>"""+str(ROWS_UNLOADED)+"""</td> 
-                 <td>"""+str(BYTES_DELETED)+"""</td> 
-                 <td>"""+str(PARTITIONS_SCANNED)+"""</td> 
-                 <td>"""+str(PARTITIONS_TOTAL)+"""</td> 
-                 <td>"""+str(BYTES_SPILLED_TO_LOCAL_STORAGE)+"""</td> 
-                 <td>"""+str(BYTES_SPILLED_TO_REMOTE_STORAGE)+"""</td> 
-                 <td>"""+str(BYTES_SENT_OVER_THE_NETWORK)+"""</td> 
-                 <td>"""+str(COMPILATION_TIME)+"""</td> 
-                 <td>"""+str(EXECUTION_TIME)+"""</td> 
-                 <td>"""+str(QUEUED_PROVISIONING_TIME)+"""</td> 
-                 <td>"""+str(QUEUED_REPAIR_TIME)+"""</td> 
-                 <td>"""+str(QUEUED_OVERLOAD_TIME)+"""</td> 
-                 <td>"""+str(TRANSACTION_BLOCKED_TIME)+"""</td> 
-                 <td>"""+str(OUTBOUND_DATA_TRANSFER_CLOUD)+"""</td> 
-                 <td>"""+str(OUTBOUND_DATA_TRANSFER_REGION)+"""</td> 
-                 <td>"""+str(OUTBOUND_DATA_TRANSFER_BYTES)+"""</td> 
-                 <td>"""+str(INBOUND_DATA_TRANSFER_CLOUD)+"""</td> 
-                 <td>"""+str(INBOUND_DATA_TRANSFER_REGION)+"""</td> 
-                 <td>"""+str(INBOUND_DATA_TRANSFER_BYTES)+"""</td> 
-                 <td>"""+str(LIST_EXTERNAL_FILES_TIME)+"""</td> 
-                 <td>"""+str(CREDITS_USED_CLOUD_SERVICES)+"""</td> 
-                 <td>"""+str(EXTERNAL_FUNCTION_TOTAL_INVOCATIONS)+"""</td> 
-                 <td>"""+str(EXTERNAL_FUNCTION_TOTAL_SENT_ROWS)+"""</td> 
-                 <td>"""+str(EXTERNAL_FUNCTION_TOTAL_RECEIVED_ROWS)+"""</td> 
-                 <td>"""+str(EXTERNAL_FUNCTION_TOTAL_SENT_BYTES)+"""</td> 
-                 <td>"""+str(EXTERNAL_FUNCTION_TOTAL_RECEIVED_BYTES)+"""</td> 
-                 <td>"""+str(QUERY_LOAD_PERCENT)+"""</td> 
-                 <td>"""+str(IS_CLIENT_GENERATED_STATEMENT)+"""</td> 
-                 <td>"""+str(QUERY_ACCELERATION_BYTES_SCANNED)+"""</td> 
-                 <td>"""+str(QUERY_ACCELERATION_PARTITIONS_SCANNED)+"""</td> 
-                 <td>"""+str(QUERY_ACCELERATION_UPPER_LIMIT_SCALE_FACTOR)+"""</td> 
-                 <td>"""+str(TRANSACTION_ID)+"""</td> 
-                 <td>"""+str(CHILD_QUERIES_WAIT_TIME)+"""</td> 
-                 <td>"""+str(ROLE_TYPE)+"""</td> 
-                 <td>"""+str(QUERY_HASH)+"""</td> 
-                 <td>"""+str(QUERY_HASH_VERSION)+"""</td> 
-                 <td>"""+str(SECONDARY_ROLE_STATS)+"""</td>  
-                 <td>"""+str(ROWS_WRITTEN_TO_RESULT)+"""</td> 
-                 <td>"""+str(QUERY_RETRY_TIME)+"""</td> 
-                 <td>"""+str(QUERY_RETRY_CAUSE)+"""</td> 
-                 <td class="cell_grow">"""+str(FAULT_HANDLING_TIME)+"""</td> 
-                </tr> """
-            
-            html_file=html_file+html_table_tail
-    
-        create_output_file('last_week_top_dbt_models.html',html_file)
-        report_sections["H - DBT"].update({'last_week_top_dbt_models.html':'table'})
-
-    except Exception as error:
-        print("[table_week_top_dbt_models]: An exception occurred:", error)
-
-def table_history_top_dbt_models(conn):
-
-    try:    
-        global snowflake_conn
-        global html_table_header
-        global html_table_tail  
-        global report_sections     
-        conn =snowflake_conn            
-        html_file=html_table_header
-        
-        sql_query=sql_header+"""
-        WITH DATA AS (                
-               SELECT 
-                ROW_NUMBER() over (order by total_elapsed_time  DESC)  AS TOP_N,
-                START_TIME        AS DATE, 
-                query_parameterized_hash, 
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE (REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'dbt_cloud_run_id')     
-                ELSE NULL  END AS dbt_cloud_run_id,
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE (REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'dbt_version')     
-                ELSE NULL  END AS dbt_version,
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE (REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'project_name')     
-                ELSE NULL  END AS dbt_project_name,
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE (REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'dbt_cloud_project_id')     
-                ELSE NULL  END AS dbt_cloud_project_id,
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE (REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'target_name')     
-                ELSE NULL  END AS dbt_target_name,
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE (REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'target_database')     
-                ELSE NULL  END AS dbt_target_database,
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE (REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'target_schema')     
-                ELSE NULL  END AS dbt_target_schema,
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE (REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'node_name')     
-                ELSE NULL  END AS dbt_node_name,
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE (REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'node_id')     
-                ELSE NULL  END AS dbt_node_id,
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE (REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'materialized')     
-                ELSE NULL  END AS dbt_materialized,
-                CASE WHEN position('/* {"app": "dbt"', query_text, 1)>0 THEN 
-                JSON_EXTRACT_PATH_TEXT(REPLACE(REPLACE(SUBSTR(query_text, position('/* {"app": "dbt"', query_text,1)+3),'*/;'),'*/'), 'node_original_file_path')  
-                ELSE NULL  END AS dbt_node_original_file_path,
-                ROUND(total_elapsed_time/1000,2)                AS total_elapsed_time_seg,
-                query_id,
-                database_id,
-                database_name,
-                schema_id,
-                schema_name,
-                query_type,
-                session_id,
-                user_name,
-                role_name,
-                warehouse_id,
-                warehouse_name,
-                warehouse_size,
-                warehouse_type,
-                cluster_number,
-                query_tag,
-                execution_status,
-                error_code,
-                error_message,
-                bytes_scanned,
-                percentage_scanned_from_cache,
-                bytes_written,
-                bytes_written_to_result,
-                bytes_read_from_result,
-                rows_produced,
-                rows_inserted,
-                rows_updated,
-                rows_deleted,
-                rows_unloaded,
-                bytes_deleted,
-                partitions_scanned,
-                partitions_total,
-                bytes_spilled_to_local_storage,
-                bytes_spilled_to_remote_storage,
-                bytes_sent_over_the_network,
-                compilation_time,
-                execution_time,
-                queued_provisioning_time,
-                queued_repair_time,
-                queued_overload_time,
-                transaction_blocked_time,
-                outbound_data_transfer_cloud,
-                outbound_data_transfer_region,
-                outbound_data_transfer_bytes,
-                inbound_data_transfer_cloud,
-                inbound_data_transfer_region,
-                inbound_data_transfer_bytes,
-                list_external_files_time,
-                credits_used_cloud_services,
-                external_function_total_invocations,
-                external_function_total_sent_rows,
-                external_function_total_received_rows,
-                external_function_total_sent_bytes,
-                external_function_total_received_bytes,
-                query_load_percent,
-                is_client_generated_statement,
-                query_acceleration_bytes_scanned,
-                query_acceleration_partitions_scanned,
-                query_acceleration_upper_limit_scale_factor,
-                transaction_id,
-                child_queries_wait_time,
-                role_type,
-                query_hash,
-                query_hash_version,
-                secondary_role_stats,
-                rows_written_to_result,
-                query_retry_time,
-                query_retry_cause,
-                fault_handling_time    
-                FROM snowflake.account_usage.query_history
-                WHERE TO_DATE(START_TIME) > DATEADD(MONTH,"""+months_history+""",TO_DATE("""+report_formatted_time+"""))
-                AND  NOT CONTAINS (QUERY_TEXT,'*** Project:   https://github.com/prismafy/prismafy  ***')
-                AND CONTAINS (QUERY_TEXT,'/* {"app": "dbt"')
-                AND query_parameterized_hash NOT IN ('e66e976d84c0546733a0d35b5f33a84d','e66e976d84c0546733a0d35b5f33a84d','e66e976d84c0546733a0d35b5f33a84d') AND query_parameterized_hash IS NOT NULL
-        )
-        SELECT * 
-        FROM DATA        
-        WHERE TOP_N<=100
-        ORDER BY total_elapsed_time_seg DESC        
-        ;
-        """
-        
-        cur = conn.cursor()
-        cur.execute(sql_query)
-    
-        html_file=html_file+"""
-        <h3>Top dbt models by total_elapsed_time_seg</h3>
-        <table class="tabla2">
-        <tr>
-        <th>top_n</th>
-        <th>date</th>
-        <th>query_parameterized_hash</th>
-        <th>dbt_cloud_run_id</th>
-        <th>dbt_version</th>
-        <th>dbt_project_name</th>
-        <th>dbt_cloud_project_id</th>
-        <th>dbt_target_name</th>
-        <th>dbt_target_database</th>
-        <th>dbt_target_schema</th>
-        <th>dbt_node_name</th>
-        <th>dbt_node_id</th>
-        <th>dbt_materialized</th>
-        <th>dbt_node_original_file_path</th>
-        <th>total_elapsed_time_seg</th>
-        <th>query_id</th>
-        <th>database_id</th>
-        <th>database_name</th>
-        <th>schema_id</th>
-        <th>schema_name</th>
-        <th>query_type</th>
-        <th>session_id</th>
-        <th>user_name</th>
-        <th>role_name</th>
-        <th>warehouse_id</th>
-        <th>warehouse_name</th>
-        <th>warehouse_size</th>
-        <th>warehouse_type</th>
-        <th>cluster_number</th>
-        <th>query_tag</th>
-        <th>execution_status</th>
-        <th>error_code</th>
-        <th>error_message</th>
-        <th>bytes_scanned</th>
-        <th>percentage_scanned_from_cache</th>
-        <th>bytes_written</th>
-        <th>bytes_written_to_result</th>
-        <th>bytes_read_from_result</th>
-        <th>rows_produced</th>
-        <th>rows_inserted</th>
-        <th>rows_updated</th>
-        <th>rows_deleted</th>
-        <th>rows_unloaded</th>
-        <th>bytes_deleted</th>
-        <th>partitions_scanned</th>
-        <th>partitions_total</th>
-        <th>bytes_spilled_to_local_storage</th>
-        <th>bytes_spilled_to_remote_storage</th>
-        <th>bytes_sent_over_the_network</th>
-        <th>compilation_time</th>
-        <th>execution_time</th>
-        <th>queued_provisioning_time</th>
-        <th>queued_repair_time</th>
-        <th>queued_overload_time</th>
-        <th>transaction_blocked_time</th>
-        <th>outbound_data_transfer_cloud</th>
-        <th>outbound_data_transfer_region</th>
-        <th>outbound_data_transfer_bytes</th>
-        <th>inbound_data_transfer_cloud</th>
-        <th>inbound_data_transfer_region</th>
-        <th>inbound_data_transfer_bytes</th>
-        <th>list_external_files_time</th>
-        <th>credits_used_cloud_services</th>
-        <th>external_function_total_invocations</th>
-        <th>external_function_total_sent_rows</th>
-        <th>external_function_total_received_rows</th>
-        <th>external_function_total_sent_bytes</th>
-        <th>external_function_total_received_bytes</th>
-        <th>query_load_percent</th>
-        <th>is_client_generated_statement</th>
-        <th>query_acceleration_bytes_scanned</th>
-        <th>query_acceleration_partitions_scanned</th>
-        <th>query_acceleration_upper_limit_scale_factor</th>
-        <th>transaction_id</th>
-        <th>child_queries_wait_time</th>
-        <th>role_type</th>
-        <th>query_hash</th>
-        <th>query_hash_version</th>
-        <th>secondary_role_stats</th>
-        <th>rows_written_to_result</th>
-        <th>query_retry_time</th>
-        <th>query_retry_cause</th>
-        <th>fault_handling_time</th>  
-        </tr>  
-        """
-    
-        if int(cur.rowcount)!=0:
-            for ( TOP_N, RDATE, QUERY_PARAMETERIZED_HASH, DBT_CLOUD_RUN_ID, DBT_VERSION, DBT_PROJECT_NAME, DBT_CLOUD_PROJECT_ID, DBT_TARGET_NAME, DBT_TARGET_DATABASE, DBT_TARGET_SCHEMA, DBT_NODE_NAME, DBT_NODE_ID, DBT_MATERIALIZED, DBT_NODE_ORIGINAL_FILE_PATH, TOTAL_ELAPSED_TIME_SEG, QUERY_ID, DATABASE_ID, DATABASE_NAME, SCHEMA_ID, SCHEMA_NAME, QUERY_TYPE, SESSION_ID, USER_NAME, ROLE_NAME, WAREHOUSE_ID, WAREHOUSE_NAME, WAREHOUSE_SIZE, WAREHOUSE_TYPE, CLUSTER_NUMBER, QUERY_TAG, EXECUTION_STATUS, ERROR_CODE, ERROR_MESSAGE, BYTES_SCANNED, PERCENTAGE_SCANNED_FROM_CACHE, BYTES_WRITTEN, BYTES_WRITTEN_TO_RESULT, BYTES_READ_FROM_RESULT, ROWS_PRODUCED, ROWS_INSERTED, ROWS_UPDATED, ROWS_DELETED, ROWS_UNLOADED, BYTES_DELETED, PARTITIONS_SCANNED, PARTITIONS_TOTAL, BYTES_SPILLED_TO_LOCAL_STORAGE, BYTES_SPILLED_TO_REMOTE_STORAGE, BYTES_SENT_OVER_THE_NETWORK, COMPILATION_TIME, EXECUTION_TIME, QUEUED_PROVISIONING_TIME, QUEUED_REPAIR_TIME, QUEUED_OVERLOAD_TIME, TRANSACTION_BLOCKED_TIME, OUTBOUND_DATA_TRANSFER_CLOUD, OUTBOUND_DATA_TRANSFER_REGION, OUTBOUND_DATA_TRANSFER_BYTES, INBOUND_DATA_TRANSFER_CLOUD, INBOUND_DATA_TRANSFER_REGION, INBOUND_DATA_TRANSFER_BYTES, LIST_EXTERNAL_FILES_TIME, CREDITS_USED_CLOUD_SERVICES, EXTERNAL_FUNCTION_TOTAL_INVOCATIONS, EXTERNAL_FUNCTION_TOTAL_SENT_ROWS, EXTERNAL_FUNCTION_TOTAL_RECEIVED_ROWS, EXTERNAL_FUNCTION_TOTAL_SENT_BYTES, EXTERNAL_FUNCTION_TOTAL_RECEIVED_BYTES, QUERY_LOAD_PERCENT, IS_CLIENT_GENERATED_STATEMENT, QUERY_ACCELERATION_BYTES_SCANNED, QUERY_ACCELERATION_PARTITIONS_SCANNED, QUERY_ACCELERATION_UPPER_LIMIT_SCALE_FACTOR, TRANSACTION_ID, CHILD_QUERIES_WAIT_TIME, ROLE_TYPE, QUERY_HASH, QUERY_HASH_VERSION, SECONDARY_ROLE_STATS, ROWS_WRITTEN_TO_RESULT, QUERY_RETRY_TIME, QUERY_RETRY_CAUSE, FAULT_HANDLING_TIME ) in cur:
-                html_file=html_file+""" <tr> 
-                 <td>"""+str(TOP_N)+"""</td> 
-                 <td>"""+str(RDATE)+"""</td> 
-                 <td>"""+str(QUERY_PARAMETERIZED_HASH)+"""</td> 
-                 <td>"""+str(DBT_CLOUD_RUN_ID)+"""</td> 
-                 <td>"""+str(DBT_VERSION)+"""</td> 
-                 <td>"""+str(DBT_PROJECT_NAME)+"""</td> 
-                 <td>"""+str(DBT_CLOUD_PROJECT_ID)+"""</td> 
-                 <td>"""+str(DBT_TARGET_NAME)+"""</td> 
-                 <td>"""+str(DBT_TARGET_DATABASE)+"""</td> 
-                 <td>"""+str(DBT_TARGET_SCHEMA)+"""</td> 
-                 <td>"""+str(DBT_NODE_NAME)+"""</td> 
-                 <td>"""+str(DBT_NODE_ID)+"""</td> 
-                 <td>"""+str(DBT_MATERIALIZED)+"""</td> 
-                 <td>"""+str(DBT_NODE_ORIGINAL_FILE_PATH)+"""</td> 
-                 <td>"""+str(TOTAL_ELAPSED_TIME_SEG)+"""</td> 
-                 <td>"""+str(QUERY_ID)+"""</td> 
-                 <td>"""+str(DATABASE_ID)+"""</td> 
-                 <td>"""+str(DATABASE_NAME)+"""</td> 
-                 <td>"""+str(SCHEMA_ID)+"""</td> 
-                 <td>"""+str(SCHEMA_NAME)+"""</td> 
-                 <td>"""+str(QUERY_TYPE)+"""</td> 
-                 <td>"""+str(SESSION_ID)+"""</td> 
-                 <td>"""+str(USER_NAME)+"""</td> 
-                 <td>"""+str(ROLE_NAME)+"""</td> 
-                 <td>"""+str(WAREHOUSE_ID)+"""</td> 
-                 <td>"""+str(WAREHOUSE_NAME)+"""</td> 
-                 <td>"""+str(WAREHOUSE_SIZE)+"""</td> 
-                 <td>"""+str(WAREHOUSE_TYPE)+"""</td> 
-                 <td>"""+str(CLUSTER_NUMBER)+"""</td> 
-                 <td>"""+str(QUERY_TAG)+"""</td> 
-                 <td>"""+str(EXECUTION_STATUS)+"""</td> 
-                 <td>"""+str(ERROR_CODE)+"""</td> 
-                 <td>"""+str(ERROR_MESSAGE)+"""</td> 
-                 <td>"""+str(BYTES_SCANNED)+"""</td> 
-                 <td>"""+str(PERCENTAGE_SCANNED_FROM_CACHE)+"""</td> 
-                 <td>"""+str(BYTES_WRITTEN)+"""</td> 
-                 <td>"""+str(BYTES_WRITTEN_TO_RESULT)+"""</td>  
-                 <td>"""+str(BYTES_READ_FROM_RESULT)+"""</td> 
-                 <td>"""+str(ROWS_PRODUCED)+"""</td> 
-                 <td>"""+str(ROWS_INSERTED)+"""</td> 
-                 <td>"""+str(ROWS_UPDATED)+"""</td> 
-                 <td>"""+str(ROWS_DELETED)+"""</td> 
-                 <td>"""+str(ROWS_UNLOADED)+"""</td> 
-                 <td>"""+str(BYTES_DELETED)+"""</td> 
-                 <td>"""+str(PARTITIONS_SCANNED)+"""</td> 
-                 <td>"""+str(PARTITIONS_TOTAL)+"""</td> 
-                 <td>"""+str(BYTES_SPILLED_TO_LOCAL_STORAGE)+"""</td> 
-                 <td>"""+str(BYTES_SPILLED_TO_REMOTE_STORAGE)+"""</td> 
-                 <td>"""+str(BYTES_SENT_OVER_THE_NETWORK)+"""</td> 
-                 <td>"""+str(COMPILATION_TIME)+"""</td> 
-                 <td>"""+str(EXECUTION_TIME)+"""</td> 
-                 <td>"""+str(QUEUED_PROVISIONING_TIME)+"""</td> 
-                 <td>"""+str(QUEUED_REPAIR_TIME)+"""</td> 
-                 <td>"""+str(QUEUED_OVERLOAD_TIME)+"""</td> 
-                 <td>"""+str(TRANSACTION_BLOCKED_TIME)+"""</td> 
-                 <td>"""+str(OUTBOUND_DATA_TRANSFER_CLOUD)+"""</td> 
-                 <td>"""+str(OUTBOUND_DATA_TRANSFER_REGION)+"""</td> 
-                 <td>"""+str(OUTBOUND_DATA_TRANSFER_BYTES)+"""</td> 
-                 <td>"""+str(INBOUND_DATA_TRANSFER_CLOUD)+"""</td> 
-                 <td>"""+str(INBOUND_DATA_TRANSFER_REGION)+"""</td> 
-                 <td>"""+str(INBOUND_DATA_TRANSFER_BYTES)+"""</td> 
-                 <td>"""+str(LIST_EXTERNAL_FILES_TIME)+"""</td> 
-                 <td>"""+str(CREDITS_USED_CLOUD_SERVICES)+"""</td> 
-                 <td>"""+str(EXTERNAL_FUNCTION_TOTAL_INVOCATIONS)+"""</td> 
-                 <td>"""+str(EXTERNAL_FUNCTION_TOTAL_SENT_ROWS)+"""</td> 
-                 <td>"""+str(EXTERNAL_FUNCTION_TOTAL_RECEIVED_ROWS)+"""</td> 
-                 <td>"""+str(EXTERNAL_FUNCTION_TOTAL_SENT_BYTES)+"""</td> 
-                 <td>"""+str(EXTERNAL_FUNCTION_TOTAL_RECEIVED_BYTES)+"""</td> 
-                 <td>"""+str(QUERY_LOAD_PERCENT)+"""</td> 
-                 <td>"""+str(IS_CLIENT_GENERATED_STATEMENT)+"""</td> 
-                 <td>"""+str(QUERY_ACCELERATION_BYTES_SCANNED)+"""</td> 
-                 <td>"""+str(QUERY_ACCELERATION_PARTITIONS_SCANNED)+"""</td> 
-                 <td>"""+str(QUERY_ACCELERATION_UPPER_LIMIT_SCALE_FACTOR)+"""</td> 
-                 <td>"""+str(TRANSACTION_ID)+"""</td> 
-                 <td>"""+str(CHILD_QUERIES_WAIT_TIME)+"""</td> 
-                 <td>"""+str(ROLE_TYPE)+"""</td> 
-                 <td>"""+str(QUERY_HASH)+"""</td> 
-                 <td>"""+str(QUERY_HASH_VERSION)+"""</td> 
-                 <td>"""+str(SECONDARY_ROLE_STATS)+"""</td>  
-                 <td>"""+str(ROWS_WRITTEN_TO_RESULT)+"""</td> 
-                 <td>"""+str(QUERY_RETRY_TIME)+"""</td> 
-                 <td>"""+str(QUERY_RETRY_CAUSE)+"""</td> 
-                 <td class="cell_grow">"""+str(FAULT_HANDLING_TIME)+"""</td> 
-                </tr> """
-            
-            html_file=html_file+html_table_tail
-    
-        create_output_file('history_top_dbt_models.html',html_file)
-        report_sections["H - DBT"].update({'history_top_dbt_models.html':'table'})
-
-    except Exception as error:
-        print("[table_history_top_dbt_models]: An exception occurred:", error)
-
-def line_history_sql_operations(conn):
-    try:
-        
-        global snowflake_conn
-        global report_sections
-        conn =snowflake_conn
-            
-        html_file=html_header
-
-        sql_query=sql_header+"""
-        WITH DATA AS (
-            SELECT 
-                query_type                                                  AS QUERY_TYPE
-            FROM snowflake.account_usage.query_history Q
-            WHERE  TO_DATE(Q.start_time) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-            AND DATABASE_NAME !='SNOWFLAKE'
-        )
-        SELECT DISTINCT QUERY_TYPE
-        FROM DATA  
-        """
-        cur = conn.cursor()
-        cur.execute(sql_query)
-
-        column_count=cur.rowcount        
-        headers =[i[0] for i in cur]  
-        headers.insert(0,'DATE')  
-        html_file=html_file+str(headers).replace('"','')+", \n"      
-
-
-        sql_query=sql_header+"""
-        WITH DATA AS (
-            SELECT DATE_TRUNC('HOUR',START_TIME::TIMESTAMP_NTZ)         AS DATE , 
-            query_type                                                  AS QUERY_TYPE,
-            COUNT(*)                                                    AS EXECUTIONS
-            FROM snowflake.account_usage.query_history Q
-            WHERE  TO_DATE(Q.start_time) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-            AND DATABASE_NAME !='SNOWFLAKE'
-            AND DATABASE_NAME IS NOT NULL
-            GROUP BY 1,2
-            ORDER BY 1  
-        )
-        , PIVOT_DATA AS (
-            SELECT *
-            FROM DATA
-                PIVOT(  sum (EXECUTIONS) FOR query_type IN ( """+str(headers).replace('"','').replace("[","").replace("]","").replace("'DATE',","")+""") DEFAULT ON NULL (0) ) 
-        )
-        SELECT ARRAY_CONSTRUCT(*) FROM PIVOT_DATA ORDER BY DATE
-        """
-
-        cur = conn.cursor()
-        cur.execute(sql_query)
-        
-        if int(cur.rowcount)!=0:
-            for row  in cur:
-                html_file=html_file+str(row[0])+""","""
-            
-            
-            html_file=html_file+html_body1
-                
-            for i in range(1, column_count):
-                if i==column_count-1:
-                    html_file=html_file+"""row["""+str(i)+"""]"""
-                else:
-                    html_file=html_file+"""row["""+str(i)+"""],"""
-            
-            html_file=html_file+html_body2+"""
-            title: `Prismafy v1.0 - https://github.com/prismafy/prismafy
-            Chart Creation Date: """+report_formatted_time+"""
-            SQL Operations in the history`,"""+html_line_hour_tail
-
-            create_output_file('history_sql_operations.html',html_file)
-            report_sections["G - Maintenance"].update({'history_sql_operations.html':'line'})
-        
-    except Exception as error:
-        print("[line_history_sql_operations]: An exception occurred:", error)
-
-def line_history_sql_operations_by_database(conn):
-    try:            
-        global snowflake_conn
-        global report_sections
-        conn =snowflake_conn
-
-        sql_query_dbs=sql_header+"""
-        WITH DATA AS (
-            SELECT 
-                DATABASE_NAME
-            FROM SNOWFLAKE.ACCOUNT_USAGE.QUERY_HISTORY Q
-            WHERE  TO_DATE(Q.start_time) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-            AND DATABASE_NAME IS NOT NULL
-            AND DATABASE_NAME !='SNOWFLAKE'
-        )
-        SELECT DISTINCT DATABASE_NAME
-        FROM DATA  
-        """
-        cur_db = conn.cursor()
-        cur_db.execute(sql_query_dbs)
-
-        if int(cur_db.rowcount)!=0:
-            for database_name  in cur_db:
-
-                html_file=html_header
-
-                sql_query=sql_header+"""
-                WITH DATA AS (
-                    SELECT 
-                        query_type                                                  AS QUERY_TYPE
-                    FROM snowflake.account_usage.query_history Q
-                    WHERE  TO_DATE(Q.start_time) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-                    AND DATABASE_NAME='"""+database_name[0]+"""'
-                )
-                SELECT DISTINCT QUERY_TYPE
-                FROM DATA  
-                """
-                cur = conn.cursor()
-                cur.execute(sql_query)
-
-                column_count=cur.rowcount        
-                headers =[i[0] for i in cur]  
-                headers.insert(0,'DATE')  
-                html_file=html_file+str(headers).replace('"','')+", \n"      
-
-
-                sql_query=sql_header+"""
-                WITH DATA AS (
-                    SELECT DATE_TRUNC('HOUR',START_TIME::TIMESTAMP_NTZ)         AS DATE , 
-                    query_type                                                  AS QUERY_TYPE,
-                    COUNT(*)                                                    AS EXECUTIONS
-                    FROM snowflake.account_usage.query_history Q
-                    WHERE  TO_DATE(Q.start_time) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-                    AND DATABASE_NAME='"""+database_name[0]+"""'
-                    GROUP BY 1,2
-                    ORDER BY 1  
-                )
-                , PIVOT_DATA AS (
-                    SELECT *
-                    FROM DATA
-                        PIVOT(  sum (EXECUTIONS) FOR query_type IN ( """+str(headers).replace('"','').replace("[","").replace("]","").replace("'DATE',","")+""") DEFAULT ON NULL (0) ) 
-                )
-                SELECT ARRAY_CONSTRUCT(*) FROM PIVOT_DATA ORDER BY DATE
-                """
-
-                cur = conn.cursor()
-                cur.execute(sql_query)
-                
-                if int(cur.rowcount)!=0:
-                    for row  in cur:
-                        html_file=html_file+str(row[0])+""","""
-                    
-                    
-                html_file=html_file+html_body1
-                    
-                for i in range(1, column_count):
-                    if i==column_count-1:
-                        html_file=html_file+"""row["""+str(i)+"""]"""
-                    else:
-                        html_file=html_file+"""row["""+str(i)+"""],"""
-                
-                html_file=html_file+html_body2+"""
-                title: `Prismafy v1.0 - https://github.com/prismafy/prismafy
-                Chart Creation Date: """+report_formatted_time+"""
-                SQL Operations for database """+database_name[0]+"""`,"""+html_line_hour_tail
-
-                create_output_file('history_sql_operations_for_db_'+database_name[0].lower()+'.html',html_file)
-                report_sections["G - Maintenance"].update({'history_sql_operations_for_db_'+database_name[0].lower()+'.html':'line'})
-                
-    except Exception as error:
-        print("[line_history_sql_operations_by_database]: An exception occurred:", error)
-
-def table_history_warehouse_events(conn,warehouse_name):
-
-    try:    
-        global snowflake_conn
-        global html_table_header
-        global html_table_tail  
-        global report_sections     
-        conn =snowflake_conn            
-        
-        html_file=html_table_header+"""
-        <h3>Warehouse events</h3>
-        <table class="tabla2">
-        <tr>
-        <th>TIMESTAMP</th>
-        <th>WAREHOUSE_ID</th>
-        <th>WAREHOUSE_NAME</th>
-        <th>CLUSTER_NUMBER</th>
-        <th>EVENT_NAME</th>
-        <th>EVENT_REASON</th>
-        <th>EVENT_STATE</th>
-        <th>USER_NAME</th>
-        <th>ROLE_NAME</th>
-        <th>QUERY_ID</th>
-        <th>SIZE</th>
-        <th>CLUSTER_COUNT</th>
-        """
-
-        sql_query_details=sql_header+"""
-        SELECT 
-            TIMESTAMP,
-            WAREHOUSE_ID,
-            WAREHOUSE_NAME,
-            CLUSTER_NUMBER,
-            EVENT_NAME,
-            EVENT_REASON,
-            EVENT_STATE,
-            USER_NAME,
-            ROLE_NAME,
-            QUERY_ID,
-            SIZE,
-            CLUSTER_COUNT
-        FROM SNOWFLAKE.ACCOUNT_USAGE.WAREHOUSE_EVENTS_HISTORY  
-        WHERE  WAREHOUSE_NAME='"""+str(warehouse_name)+"""'
-        ORDER BY TIMESTAMP DESC
-        LIMIT 100;
-        """
-        
-        cur_details = conn.cursor()
-        cur_details.execute(sql_query_details)
-    
-        if int(cur_details.rowcount)!=0:
-            for ( TIMESTAMP, WAREHOUSE_ID, WAREHOUSE_NAME, CLUSTER_NUMBER, EVENT_NAME, EVENT_REASON, EVENT_STATE, USER_NAME, ROLE_NAME, QUERY_ID, SIZE, CLUSTER_COUNT) in cur_details:
-                html_file=html_file+""" <tr> 
-                <td>"""+str(TIMESTAMP)+"""</td> 
-                <td>"""+str(WAREHOUSE_ID)+"""</td> 
-                <td>"""+str(WAREHOUSE_NAME)+"""</td> 
-                <td>"""+str(CLUSTER_NUMBER)+"""</td> 
-                <td>"""+str(EVENT_NAME)+"""</td> 
-                <td>"""+str(EVENT_REASON)+"""</td> 
-                <td>"""+str(EVENT_STATE)+"""</td> 
-                <td>"""+str(USER_NAME)+"""</td> 
-                <td>"""+str(ROLE_NAME)+"""</td> 
-                <td>"""+str(QUERY_ID)+"""</td> 
-                <td>"""+str(SIZE)+"""</td> 
-                <td class="cell_grow">"""+str(CLUSTER_COUNT)+"""</td> 
-                </tr> """
-    
-        html_file=html_file+html_table_tail
-    
-        create_output_file('warehouse_events_for_'+str(warehouse_name.lower())+'.html',html_file)
-        report_sections["A - Computing"].update({'warehouse_events_for_'+str(warehouse_name.lower())+'.html':'table'})
-
-    except Exception as error:
-        print("[table_history_warehouse_events]: An exception occurred:", error)
-
-def line_history_warehouse_enable_vs_querycount(conn,warehouse_name):
-    try:            
-        global snowflake_conn
-        global report_sections
-        conn =snowflake_conn
-        html_file=html_header
-
-        sql_query="""
-        WITH RECURSIVE CALENDAR_MINUTES AS (
-        SELECT DATE_TRUNC('MINUTE',DATEADD (MONTH,"""+months_history+""",CURRENT_TIMESTAMP(0)::TIMESTAMP_NTZ)) AS calendar_date
-        UNION ALL
-        SELECT DATE_TRUNC('MINUTE', DATEADD(HOUR, 3, calendar_date))
-        FROM CALENDAR_MINUTES
-        WHERE calendar_date < CURRENT_TIMESTAMP(0)::TIMESTAMP_NTZ
-        )
-        ,QUERY_HIST AS (
-            SELECT
-            DATE_TRUNC('MINUTE',INTERVAL_START_TIME::TIMESTAMP_NTZ)  AS DATE,
-            COUNT(*)                                        AS QUERY_COUNT
-            FROM SNOWFLAKE.ACCOUNT_USAGE.AGGREGATE_QUERY_HISTORY 
-            WHERE  TO_DATE(INTERVAL_START_TIME) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-            AND WAREHOUSE_NAME='"""+warehouse_name+"""'
-            GROUP BY 1
-        )    
-        , MAX_QUERY_COUNT AS (
-            SELECT 
-                MAX(QUERY_COUNT) MAX_QUERY_COUNT 
-            FROM QUERY_HIST
-        )
-        , WAREHOUSE_EVENTS AS (
-            SELECT 
-            DATE_TRUNC('MINUTE',TIMESTAMP::TIMESTAMP_NTZ)   AS DATE,                                                    
-            CASE WHEN E.EVENT_NAME='RESUME_WAREHOUSE' THEN 
-                MAX_QUERY_COUNT.MAX_QUERY_COUNT 
-            ELSE 0 
-            END     ACTIVE_WAREHOUSE
-            FROM SNOWFLAKE.ACCOUNT_USAGE.WAREHOUSE_EVENTS_HISTORY  E, MAX_QUERY_COUNT
-            WHERE E.EVENT_NAME IN ('RESUME_WAREHOUSE','SUSPEND_WAREHOUSE')
-            AND  TO_DATE(TIMESTAMP) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-            AND WAREHOUSE_NAME='"""+warehouse_name+"""'                                                                           
-        )    
-        , DATA_JOIN AS (
-            SELECT 
-                COALESCE (E.DATE,H.DATE,CM.calendar_date) AS DATE, 
-                E.ACTIVE_WAREHOUSE,
-                H.QUERY_COUNT
-            FROM WAREHOUSE_EVENTS E FULL OUTER  JOIN QUERY_HIST H
-            ON (E.DATE=H.DATE)
-            FULL OUTER  JOIN CALENDAR_MINUTES CM
-            ON (CM.calendar_date=COALESCE (E.DATE,H.DATE))
-        )   
-       , WH_NO_GAPS AS (
-            SELECT 
-                DATE, 
-                NVL(ACTIVE_WAREHOUSE , LAG (ACTIVE_WAREHOUSE,1,NULL)  IGNORE NULLS OVER (ORDER BY DATE) )  ACTIVE_WAREHOUSE,
-                QUERY_COUNT 
-            FROM DATA_JOIN 
-        )
-        , DATA_NO_GAPS AS (
-            SELECT 
-                DATE, 
-               ACTIVE_WAREHOUSE, 
-               CASE WHEN ACTIVE_WAREHOUSE>0 AND ACTIVE_WAREHOUSE IS NOT NULL THEN 
-                   NVL(QUERY_COUNT , LAG (QUERY_COUNT,1,NULL)  IGNORE NULLS OVER (ORDER BY DATE) )  
-               ELSE 0
-               END QUERY_COUNT, 
-            FROM WH_NO_GAPS
-        )
-        , SUMMARY_DATA AS (
-        SELECT
-            DATE,
-            NVL(ACTIVE_WAREHOUSE,0) ACTIVE_WAREHOUSE,
-            NVL(QUERY_COUNT,0) QUERY_COUNT,
-            CASE WHEN ACTIVE_WAREHOUSE>0 AND QUERY_COUNT=0 THEN 
-                ACTIVE_WAREHOUSE
-            ELSE 0
-            END ACTIVE_WH_WITHOUT_LOAD
-        FROM 
-            DATA_NO_GAPS
-        )
-        SELECT ARRAY_CONSTRUCT(*) AS DATA 
-        FROM SUMMARY_DATA
-        ORDER BY DATE;
-        """        
-        cur = conn.cursor()
-        cur.execute(sql_query)
-
-        headers ="['DATE', 'ACTIVE_WAREHOUSE', 'QUERY_COUNT','ACTIVE_WH_WITHOUT_LOAD']"+", \n"      
-        html_file=html_file+headers
-        
-        if int(cur.rowcount)!=0:
-            for row  in cur:
-                html_file=html_file+str(row[0]).replace("undefined","null")+""","""
-            
-            
-            html_file=html_file+html_body1+"""
-                    row[1],row[2],row[3]
-                    """+html_body2+"""
-            title: `Prismafy v1.0 - https://github.com/prismafy/prismafy
-            Chart Creation Date: """+report_formatted_time+"""
-            Warehouse Active vs Query Count for """+warehouse_name+"""
-            Detect those periods when your warehouse is active and it does not have load`,"""+html_stepped_area_minute_tail
-
-            create_output_file('enable_vs_querycount_for_warehouse_'+warehouse_name.lower()+'.html',html_file)
-            report_sections["A - Computing"].update({'enable_vs_querycount_for_warehouse_'+warehouse_name.lower()+'.html':'line'})
-                
-    except Exception as error:
-        print("[line_history_warehouse_enable_vs_querycount]: An exception occurred:", error)
-
-def table_last_executions_of_query(conn,sql_query_id):
-
-    try:    
-        global snowflake_conn
-        global html_table_header
-        global html_table_tail  
-        global report_sections     
-        conn =snowflake_conn            
-        html_file=html_table_header    
-        table_explain_by_query(conn,sql_query_id)
-
-        sql_query=sql_header+"""
-        WITH DATA AS (                
-               SELECT 
-                START_TIME::TIMESTAMP_NTZ         AS DATE, 
-                query_parameterized_hash,                 
-                ROUND(total_elapsed_time/1000,2)                AS total_elapsed_time_seg,
-                nvl( round( 100 * ( total_elapsed_time - lag(total_elapsed_time, 1) over ( partition by query_parameterized_hash ORDER BY START_TIME ) )/ lag(total_elapsed_time, 1) over ( partition by query_parameterized_hash ORDER BY START_TIME ), 2), 0 ) as growth,
-                query_id,
-                database_id,
-                database_name,
-                schema_id,
-                schema_name,
-                query_type,
-                session_id,
-                user_name,
-                role_name,
-                warehouse_id,
-                warehouse_name,
-                warehouse_size,
-                warehouse_type,
-                cluster_number,
-                query_tag,
-                execution_status,
-                error_code,
-                error_message,
-                bytes_scanned,
-                percentage_scanned_from_cache,
-                bytes_written,
-                bytes_written_to_result,
-                bytes_read_from_result,
-                rows_produced,
-                rows_inserted,
-                rows_updated,
-                rows_deleted,
-                rows_unloaded,
-                bytes_deleted,
-                partitions_scanned,
-                partitions_total,
-                bytes_spilled_to_local_storage,
-                bytes_spilled_to_remote_storage,
-                bytes_sent_over_the_network,
-                compilation_time,
-                execution_time,
-                queued_provisioning_time,
-                queued_repair_time,
-                queued_overload_time,
-                transaction_blocked_time,
-                outbound_data_transfer_cloud,
-                outbound_data_transfer_region,
-                outbound_data_transfer_bytes,
-                inbound_data_transfer_cloud,
-                inbound_data_transfer_region,
-                inbound_data_transfer_bytes,
-                list_external_files_time,
-                credits_used_cloud_services,
-                external_function_total_invocations,
-                external_function_total_sent_rows,
-                external_function_total_received_rows,
-                external_function_total_sent_bytes,
-                external_function_total_received_bytes,
-                query_load_percent,
-                is_client_generated_statement,
-                query_acceleration_bytes_scanned,
-                query_acceleration_partitions_scanned,
-                query_acceleration_upper_limit_scale_factor,
-                transaction_id,
-                child_queries_wait_time,
-                role_type,
-                query_hash,
-                query_hash_version,
-                secondary_role_stats,
-                rows_written_to_result,
-                query_retry_time,
-                query_retry_cause,
-                fault_handling_time ,
-                REPLACE(REPLACE(QUERY_TEXT,'\n',' '),'<td>')  QUERY_TEXT,
-                FROM snowflake.account_usage.query_history
-                WHERE TO_DATE(START_TIME) > DATEADD(MONTH,"""+months_history+""",TO_DATE("""+report_formatted_time+"""))
-                AND query_parameterized_hash='"""+sql_query_id+"""'
-        )
-        SELECT * 
-        FROM DATA        
-        ORDER BY DATE DESC        
-        LIMIT 100
-        ;
-        """
-        
-        cur = conn.cursor()
-        cur.execute(sql_query)
-    
-        html_file=html_file+"""
-        <h3>Last executions for query """+sql_query_id+"""</h3>
-        <table class="tabla2">
-        <tr>
-        <th>date</th>
-        <th>query_parameterized_hash</th>
-        <th>total_elapsed_time_seg</th>
-        <th>growth%</th>        
-        <th>query_id</th>
-        <th>execution_plan_hash</th>
-        <th>database_id</th>
-        <th>database_name</th>
-        <th>schema_id</th>
-        <th>schema_name</th>
-        <th>query_type</th>
-        <th>session_id</th>
-        <th>user_name</th>
-        <th>role_name</th>
-        <th>warehouse_id</th>
-        <th>warehouse_name</th>
-        <th>warehouse_size</th>
-        <th>warehouse_type</th>
-        <th>cluster_number</th>
-        <th>query_tag</th>
-        <th>execution_status</th>
-        <th>error_code</th>
-        <th>error_message</th>
-        <th>bytes_scanned</th>
-        <th>percentage_scanned_from_cache</th>
-        <th>bytes_written</th>
-        <th>bytes_written_to_result</th>
-        <th>bytes_read_from_result</th>
-        <th>rows_produced</th>
-        <th>rows_inserted</th>
-        <th>rows_updated</th>
-        <th>rows_deleted</th>
-        <th>rows_unloaded</th>
-        <th>bytes_deleted</th>
-        <th>partitions_scanned</th>
-        <th>partitions_total</th>
-        <th>bytes_spilled_to_local_storage</th>
-        <th>bytes_spilled_to_remote_storage</th>
-        <th>bytes_sent_over_the_network</th>
-        <th>compilation_time</th>
-        <th>execution_time</th>
-        <th>queued_provisioning_time</th>
-        <th>queued_repair_time</th>
-        <th>queued_overload_time</th>
-        <th>transaction_blocked_time</th>
-        <th>outbound_data_transfer_cloud</th>
-        <th>outbound_data_transfer_region</th>
-        <th>outbound_data_transfer_bytes</th>
-        <th>inbound_data_transfer_cloud</th>
-        <th>inbound_data_transfer_region</th>
-        <th>inbound_data_transfer_bytes</th>
-        <th>list_external_files_time</th>
-        <th>credits_used_cloud_services</th>
-        <th>external_function_total_invocations</th>
-        <th>external_function_total_sent_rows</th>
-        <th>external_function_total_received_rows</th>
-        <th>external_function_total_sent_bytes</th>
-        <th>external_function_total_received_bytes</th>
-        <th>query_load_percent</th>
-        <th>is_client_generated_statement</th>
-        <th>query_acceleration_bytes_scanned</th>
-        <th>query_acceleration_partitions_scanned</th>
-        <th>query_acceleration_upper_limit_scale_factor</th>
-        <th>transaction_id</th>
-        <th>child_queries_wait_time</th>
-        <th>role_type</th>
-        <th>query_hash</th>
-        <th>query_hash_version</th>
-        <th>secondary_role_stats</th>
-        <th>rows_written_to_result</th>
-        <th>query_retry_time</th>
-        <th>query_retry_cause</th>
-        <th>fault_handling_time</th>  
-        <th>query_text</th>  
-        </tr>  
-        """
-        
-        if int(cur.rowcount)!=0:
-            for (  RDATE, QUERY_PARAMETERIZED_HASH, TOTAL_ELAPSED_TIME_SEG, GROWTH, QUERY_ID, DATABASE_ID, DATABASE_NAME, SCHEMA_ID, SCHEMA_NAME, QUERY_TYPE, SESSION_ID, USER_NAME, ROLE_NAME, WAREHOUSE_ID, WAREHOUSE_NAME, WAREHOUSE_SIZE, WAREHOUSE_TYPE, CLUSTER_NUMBER, QUERY_TAG, EXECUTION_STATUS, ERROR_CODE, ERROR_MESSAGE, BYTES_SCANNED, PERCENTAGE_SCANNED_FROM_CACHE, BYTES_WRITTEN, BYTES_WRITTEN_TO_RESULT, BYTES_READ_FROM_RESULT, ROWS_PRODUCED, ROWS_INSERTED, ROWS_UPDATED, ROWS_DELETED, ROWS_UNLOADED, BYTES_DELETED, PARTITIONS_SCANNED, PARTITIONS_TOTAL, BYTES_SPILLED_TO_LOCAL_STORAGE, BYTES_SPILLED_TO_REMOTE_STORAGE, BYTES_SENT_OVER_THE_NETWORK, COMPILATION_TIME, EXECUTION_TIME, QUEUED_PROVISIONING_TIME, QUEUED_REPAIR_TIME, QUEUED_OVERLOAD_TIME, TRANSACTION_BLOCKED_TIME, OUTBOUND_DATA_TRANSFER_CLOUD, OUTBOUND_DATA_TRANSFER_REGION, OUTBOUND_DATA_TRANSFER_BYTES, INBOUND_DATA_TRANSFER_CLOUD, INBOUND_DATA_TRANSFER_REGION, INBOUND_DATA_TRANSFER_BYTES, LIST_EXTERNAL_FILES_TIME, CREDITS_USED_CLOUD_SERVICES, EXTERNAL_FUNCTION_TOTAL_INVOCATIONS, EXTERNAL_FUNCTION_TOTAL_SENT_ROWS, EXTERNAL_FUNCTION_TOTAL_RECEIVED_ROWS, EXTERNAL_FUNCTION_TOTAL_SENT_BYTES, EXTERNAL_FUNCTION_TOTAL_RECEIVED_BYTES, QUERY_LOAD_PERCENT, IS_CLIENT_GENERATED_STATEMENT, QUERY_ACCELERATION_BYTES_SCANNED, QUERY_ACCELERATION_PARTITIONS_SCANNED, QUERY_ACCELERATION_UPPER_LIMIT_SCALE_FACTOR, TRANSACTION_ID, CHILD_QUERIES_WAIT_TIME, ROLE_TYPE, QUERY_HASH, QUERY_HASH_VERSION, SECONDARY_ROLE_STATS, ROWS_WRITTEN_TO_RESULT, QUERY_RETRY_TIME, QUERY_RETRY_CAUSE, FAULT_HANDLING_TIME, QUERY_TEXT ) in cur:
-                
-                html_file=html_file+""" <tr> 
-                 <td>"""+str(RDATE)+"""</td> 
-                 <td>"""+str(QUERY_PARAMETERIZED_HASH)+"""</td> 
-                 <td>"""+str(TOTAL_ELAPSED_TIME_SEG)+"""</td> 
-                 <td>"""+str(GROWTH)+"""</td> 
-                 <td>"""+str(QUERY_ID)+"""</td> """
-
-                hash_plan=hash_plans.get(str(QUERY_ID),'Execution plan expired')
-                if hash_plan=='Execution plan expired':
-                    html_file=html_file+"""<td>Execution plan expired</td> """
-                else:
-                    html_file=html_file+"""<td><a href="./execution_plan_"""+str(QUERY_ID)+"""_"""+str(hash_plan)+""".html">"""+str(hash_plan)+"""</td> """
-
-                html_file=html_file+"""<td>"""+str(DATABASE_ID)+"""</td> 
-                 <td>"""+str(DATABASE_NAME)+"""</td> 
-                 <td>"""+str(SCHEMA_ID)+"""</td> 
-                 <td>"""+str(SCHEMA_NAME)+"""</td> 
-                 <td>"""+str(QUERY_TYPE)+"""</td> 
-                 <td>"""+str(SESSION_ID)+"""</td> 
-                 <td>"""+str(USER_NAME)+"""</td> 
-                 <td>"""+str(ROLE_NAME)+"""</td> 
-                 <td>"""+str(WAREHOUSE_ID)+"""</td> 
-                 <td>"""+str(WAREHOUSE_NAME)+"""</td> 
-                 <td>"""+str(WAREHOUSE_SIZE)+"""</td> 
-                 <td>"""+str(WAREHOUSE_TYPE)+"""</td> 
-                 <td>"""+str(CLUSTER_NUMBER)+"""</td> 
-                 <td>"""+str(QUERY_TAG)+"""</td> 
-                 <td>"""+str(EXECUTION_STATUS)+"""</td> 
-                 <td>"""+str(ERROR_CODE)+"""</td> 
-                 <td>"""+str(ERROR_MESSAGE)+"""</td> 
-                 <td>"""+str(BYTES_SCANNED)+"""</td> 
-                 <td>"""+str(PERCENTAGE_SCANNED_FROM_CACHE)+"""</td> 
-                 <td>"""+str(BYTES_WRITTEN)+"""</td> 
-                 <td>"""+str(BYTES_WRITTEN_TO_RESULT)+"""</td>  
-                 <td>"""+str(BYTES_READ_FROM_RESULT)+"""</td> 
-                 <td>"""+str(ROWS_PRODUCED)+"""</td> 
-                 <td>"""+str(ROWS_INSERTED)+"""</td> 
-                 <td>"""+str(ROWS_UPDATED)+"""</td> 
-                 <td>"""+str(ROWS_DELETED)+"""</td> 
-                 <td>"""+str(ROWS_UNLOADED)+"""</td> 
-                 <td>"""+str(BYTES_DELETED)+"""</td> 
-                 <td>"""+str(PARTITIONS_SCANNED)+"""</td> 
-                 <td>"""+str(PARTITIONS_TOTAL)+"""</td> 
-                 <td>"""+str(BYTES_SPILLED_TO_LOCAL_STORAGE)+"""</td> 
-                 <td>"""+str(BYTES_SPILLED_TO_REMOTE_STORAGE)+"""</td> 
-                 <td>"""+str(BYTES_SENT_OVER_THE_NETWORK)+"""</td> 
-                 <td>"""+str(COMPILATION_TIME)+"""</td> 
-                 <td>"""+str(EXECUTION_TIME)+"""</td> 
-                 <td>"""+str(QUEUED_PROVISIONING_TIME)+"""</td> 
-                 <td>"""+str(QUEUED_REPAIR_TIME)+"""</td> 
-                 <td>"""+str(QUEUED_OVERLOAD_TIME)+"""</td> 
-                 <td>"""+str(TRANSACTION_BLOCKED_TIME)+"""</td> 
-                 <td>"""+str(OUTBOUND_DATA_TRANSFER_CLOUD)+"""</td> 
-                 <td>"""+str(OUTBOUND_DATA_TRANSFER_REGION)+"""</td> 
-                 <td>"""+str(OUTBOUND_DATA_TRANSFER_BYTES)+"""</td> 
-                 <td>"""+str(INBOUND_DATA_TRANSFER_CLOUD)+"""</td> 
-                 <td>"""+str(INBOUND_DATA_TRANSFER_REGION)+"""</td> 
-                 <td>"""+str(INBOUND_DATA_TRANSFER_BYTES)+"""</td> 
-                 <td>"""+str(LIST_EXTERNAL_FILES_TIME)+"""</td> 
-                 <td>"""+str(CREDITS_USED_CLOUD_SERVICES)+"""</td> 
-                 <td>"""+str(EXTERNAL_FUNCTION_TOTAL_INVOCATIONS)+"""</td> 
-                 <td>"""+str(EXTERNAL_FUNCTION_TOTAL_SENT_ROWS)+"""</td> 
-                 <td>"""+str(EXTERNAL_FUNCTION_TOTAL_RECEIVED_ROWS)+"""</td> 
-                 <td>"""+str(EXTERNAL_FUNCTION_TOTAL_SENT_BYTES)+"""</td> 
-                 <td>"""+str(EXTERNAL_FUNCTION_TOTAL_RECEIVED_BYTES)+"""</td> 
-                 <td>"""+str(QUERY_LOAD_PERCENT)+"""</td> 
-                 <td>"""+str(IS_CLIENT_GENERATED_STATEMENT)+"""</td> 
-                 <td>"""+str(QUERY_ACCELERATION_BYTES_SCANNED)+"""</td> 
-                 <td>"""+str(QUERY_ACCELERATION_PARTITIONS_SCANNED)+"""</td> 
-                 <td>"""+str(QUERY_ACCELERATION_UPPER_LIMIT_SCALE_FACTOR)+"""</td> 
-                 <td>"""+str(TRANSACTION_ID)+"""</td> 
-                 <td>"""+str(CHILD_QUERIES_WAIT_TIME)+"""</td> 
-                 <td>"""+str(ROLE_TYPE)+"""</td> 
-                 <td>"""+str(QUERY_HASH)+"""</td> 
-                 <td>"""+str(QUERY_HASH_VERSION)+"""</td> 
-                 <td>"""+str(SECONDARY_ROLE_STATS)+"""</td>  
-                 <td>"""+str(ROWS_WRITTEN_TO_RESULT)+"""</td> 
-                 <td>"""+str(QUERY_RETRY_TIME)+"""</td> 
-                 <td>"""+str(QUERY_RETRY_CAUSE)+"""</td> 
-                 <td>"""+str(FAULT_HANDLING_TIME)+"""</td> 
-                 <td class="cell_grow">"""+str(QUERY_TEXT)+"""</td> 
-                </tr> """
-            
-            html_file=html_file+html_table_tail
-    
-        create_output_file('last_executions_for_query_'+sql_query_id+'.html',html_file)
-        report_sections["D - Performance"].update({'last_executions_for_query_'+sql_query_id+'.html':'table'})
-
-    except Exception as error:
-        print("[table_last_executions_of_query]: An exception occurred:", error)
-
-def line_history_wh_changes_by_query(conn,sql_query_id):
-    try:            
-        global snowflake_conn
-        global report_sections
-        conn =snowflake_conn
-
-        sql_query=sql_header+"""
-        SELECT 
-            DISTINCT WAREHOUSE_NAME
-        FROM SNOWFLAKE.ACCOUNT_USAGE.QUERY_HISTORY Q
-        WHERE  TO_DATE(Q.START_TIME) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-        AND QUERY_PARAMETERIZED_HASH='"""+sql_query_id+"""'
+        SELECT 
+            DISTINCT WAREHOUSE_NAME
+        FROM SNOWFLAKE.ACCOUNT_USAGE.QUERY_HISTORY Q
+        WHERE  """+since_predicate("Q.START_TIME")+"""
+        AND QUERY_PARAMETERIZED_HASH='"""+sql_query_id+"""'
         """
         cur = conn.cursor()
         cur.execute(sql_query)
@@ -6398,7 +4760,7 @@ def line_history_wh_changes_by_query(conn,sql_query_id):
                     WAREHOUSE_NAME,
                     1   WH_ACTIVE
                 FROM SNOWFLAKE.ACCOUNT_USAGE.QUERY_HISTORY Q
-                WHERE  TO_DATE(Q.START_TIME) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
+                WHERE  """+since_predicate("Q.START_TIME")+"""
                 AND DATABASE_NAME IS NOT NULL
                 AND QUERY_PARAMETERIZED_HASH='"""+sql_query_id+"""'
             )
@@ -6446,7 +4808,7 @@ def line_history_size_changes_by_warehouse(conn,warehouse_name):
         SELECT 
             DISTINCT WAREHOUSE_SIZE
         FROM SNOWFLAKE.ACCOUNT_USAGE.QUERY_HISTORY Q
-        WHERE  TO_DATE(Q.START_TIME) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
+        WHERE  """+since_predicate("Q.START_TIME")+"""
         AND WAREHOUSE_NAME='"""+warehouse_name+"""'
         AND WAREHOUSE_SIZE IS NOT NULL
         """
@@ -6467,7 +4829,7 @@ def line_history_size_changes_by_warehouse(conn,warehouse_name):
                     warehouse_size,
                     1   ACTIVE_SIZE
                 FROM SNOWFLAKE.ACCOUNT_USAGE.QUERY_HISTORY Q
-                WHERE  TO_DATE(Q.START_TIME) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
+                WHERE  """+since_predicate("Q.START_TIME")+"""
                 AND DATABASE_NAME IS NOT NULL
                 AND WAREHOUSE_NAME='"""+warehouse_name+"""'
             )
@@ -6521,7 +4883,7 @@ def table_history_accessed_objects_by_query(conn,sql_query_id):
             query_id
         FROM SNOWFLAKE.ACCOUNT_USAGE.QUERY_HISTORY 
         WHERE query_parameterized_hash='"""+sql_query_id+"""'
-        AND  TO_DATE(START_TIME) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
+        AND  """+since_predicate("START_TIME")+"""
         """
 
         cur_q = conn.cursor()
@@ -6544,37 +4906,14 @@ def table_history_accessed_objects_by_query(conn,sql_query_id):
         if int(cur_q.rowcount)!=0:
             list_query_id =[i[0] for i in cur_q]  
         
-            sql_query=sql_header+"""
+            sql_query="""
             WITH HIST_DATA AS (
                 SELECT
-                    T.query_id  AS QUERY_ID,
-                    R.VALUE:"objectName" AS OBJECT_NAME,
-                    R.VALUE:"objectDomain" AS OBJECT_TYPE,
-                FROM
-                    (SELECT * FROM SNOWFLAKE.ACCOUNT_USAGE.ACCESS_HISTORY) T,
-                    LATERAL FLATTEN(INPUT => T.BASE_OBJECTS_ACCESSED) R
-                WHERE query_id IN ( """+str(list_query_id).replace('"','').replace("[","").replace("]","")+""") 
-                AND  TO_DATE(query_start_time) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-                UNION ALL
-                SELECT
-                    T.query_id  AS QUERY_ID,
-                    W.VALUE:"objectName" AS OBJECT_NAME,
-                    W.VALUE:"objectDomain" AS OBJECT_TYPE
-                FROM
-                    (SELECT * FROM SNOWFLAKE.ACCOUNT_USAGE.ACCESS_HISTORY) T,
-                    LATERAL FLATTEN(INPUT => T.OBJECTS_MODIFIED) W
-                WHERE query_id IN ( """+str(list_query_id).replace('"','').replace("[","").replace("]","")+""")
-                AND  TO_DATE(query_start_time) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-                UNION ALL
-                SELECT
-                    T.query_id  AS QUERY_ID,
-                    D.VALUE:"objectName" AS OBJECT_NAME,
-                    D.VALUE:"objectDomain" AS OBJECT_TYPE
-                FROM
-                    (SELECT * FROM SNOWFLAKE.ACCOUNT_USAGE.ACCESS_HISTORY) T,
-                    LATERAL FLATTEN(INPUT => T.direct_objects_accessed) D
-                WHERE query_id IN ( """+str(list_query_id).replace('"','').replace("[","").replace("]","")+""")
-                AND  TO_DATE(query_start_time) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
+                    QUERY_ID,
+                    OBJECT_NAME,
+                    OBJECT_TYPE
+                FROM {result}
+                WHERE QUERY_ID IN ( """+str(list_query_id).replace('"','').replace("[","").replace("]","")+""")
             )
             , DATA AS (
             SELECT DISTINCT
@@ -6602,8 +4941,7 @@ def table_history_accessed_objects_by_query(conn,sql_query_id):
             ORDER BY 5 DESC,1,2,3
             ;
             """
-            cur = conn.cursor()
-            cur.execute(sql_query)
+            cur = result_scan(conn, "table_history_accessed_objects_by_query", "ACCESSED_OBJECTS", accessed_objects_sql(), sql_query)
         
             if int(cur.rowcount)!=0:
                 for ( ROW_DATABASE_NAME,ROW_SCHEMA_NAME, ROW_OBJECT_NAME, ROW_OBJECT_TYPE, ROW_ACTIVE_GB, ROW_TIME_TRAVEL_GB, ROW_FAILSAFE_GB) in cur:
@@ -6643,7 +4981,7 @@ def table_explain_by_query(conn,query_parameterized_hash):
         SELECT DISTINCT '"""+query_parameterized_hash+"""' query_parameterized_hash,QUERY_ID 
         FROM SNOWFLAKE.ACCOUNT_USAGE.QUERY_HISTORY 
         WHERE query_parameterized_hash='"""+query_parameterized_hash+"""'    
-        AND START_TIME > DATEADD('DAY',-13,CURRENT_DATE())
+        AND START_TIME > DATEADD('DAY',-13,TO_DATE("""+report_formatted_time+"""))
         AND QUERY_ID IS NOT NULL
         )
         SELECT 'select '''||query_parameterized_hash||''' query_parameterized_hash,* from table(get_query_operator_stats( '''||QUERY_ID||''')) UNION ALL ' AS DATA FROM LIST_QUERY_ID
@@ -6697,264 +5035,864 @@ def table_explain_by_query(conn,query_parameterized_hash):
         FROM PIVOT_STATISTIC
         PIVOT(MAX(TIME_STAT_VALUE) FOR TIME_STAT_NAME IN (SELECT DISTINCT TIME_STAT_NAME FROM PIVOT_STATISTIC WHERE TIME_STAT_NAME IS NOT NULL)  DEFAULT ON NULL (0) ),
         )
-        , DATA AS (
-        SELECT * FROM PIVOT_TIME_STAT
+        , DATA AS (
+        SELECT * FROM PIVOT_TIME_STAT
+        )
+        SELECT * FROM DATA 
+        ORDER BY EXECUTION_PLAN_HASH,QUERY_ID,STEP_ID,OPERATOR_ID,    PARENT_OPERATORS
+        ;
+        """
+
+        cur = conn.cursor()
+        cur.execute(sql_query)
+        current_query=''
+        execution_plan_hash=''
+        if int(cur.rowcount)!=0:
+
+            reset_bit=0
+            
+            for row in cur:    
+
+                if current_query!=str(row[1]):
+                    if current_query!='':
+                        html_file=html_file+"""</tr> """            
+                        html_file=html_file+html_table_tail
+                        create_output_file('execution_plan_'+current_query+'_'+execution_plan_hash+'.html',html_file)
+                        hash_plans[current_query]= execution_plan_hash
+                    current_query=str(row[1])
+                    execution_plan_hash=str(row[0])
+                    html_file=html_table_header      
+                    column_count=len(cur.description)
+                    headers =[] 
+                    for i in cur.description:
+                        headers.append(i[0])
+                    html_file=html_file+"""
+                    <table class="tabla1">
+                    """+str(headers).upper().replace('"','').replace(",","</th><th>").replace("[","<tr><th>").replace("]","</th></tr>")
+                
+
+                    html_file=html_file+"""<tr>"""
+                      
+
+                for i in range(0, column_count):
+                    if i==column_count-1:
+                        html_file=html_file+"""<td class="cell_grow">"""+str(row[i]).replace("None","")+"""</td> """                        
+                    else:
+
+                        if reset_bit==1:
+                            html_file=html_file+"""</td> """
+                            reset_bit=0
+                        html_file=html_file+"""<td>"""+str(row[i]).replace("None","")+"""</td> """
+
+
+                html_file=html_file+"""</tr> """            
+            html_file=html_file+html_table_tail
+            create_output_file('execution_plan_'+row[1]+'_'+execution_plan_hash+'.html',html_file)
+            hash_plans[row[1]]= execution_plan_hash
+
+    except Exception as error:
+        print (error)
+
+def line_history_bytes_replication_by_database(conn):
+    try:
+        
+        global snowflake_conn
+        global report_sections
+        conn =snowflake_conn
+            
+        html_file=html_header
+
+        sql_query=sql_header+"""
+        SELECT 
+            DISTINCT DATABASE_NAME
+        FROM snowflake.account_usage.DATABASE_REPLICATION_USAGE_HISTORY  Q
+        WHERE  """+since_predicate("Q.start_time")+"""
+        AND DATABASE_NAME !='SNOWFLAKE'
+        """
+        cur = conn.cursor()
+        cur.execute(sql_query)
+
+        column_count=cur.rowcount        
+        headers =[i[0] for i in cur]  
+        headers.insert(0,'DATE')  
+        html_file=html_file+str(headers).replace('"','')+", \n"      
+
+
+        sql_query=sql_header+"""
+        WITH DATA AS (
+            SELECT DATE_TRUNC('HOUR',START_TIME::TIMESTAMP_NTZ)         AS DATE , 
+            DATABASE_NAME                                               AS DATABASE_NAME,
+            ROUND(SUM(BYTES_TRANSFERRED/1024/1024/1024),2)              AS GB_TRANSFERRED
+            FROM snowflake.account_usage.DATABASE_REPLICATION_USAGE_HISTORY  Q
+            WHERE  """+since_predicate("Q.start_time")+"""
+            AND DATABASE_NAME IN ( """+str(headers).replace('"','').replace("[","").replace("]","").replace("'DATE',","")+""")            
+            GROUP BY 1,2
+            ORDER BY 1  
+        )
+        , PIVOT_DATA AS (
+            SELECT *
+            FROM DATA
+                PIVOT(  sum (GB_TRANSFERRED) FOR DATABASE_NAME IN ( """+str(headers).replace('"','').replace("[","").replace("]","").replace("'DATE',","")+""") DEFAULT ON NULL (0) ) 
+        )
+        SELECT ARRAY_CONSTRUCT(*) FROM PIVOT_DATA ORDER BY DATE
+        """
+
+        cur = conn.cursor()
+        cur.execute(sql_query)
+        
+        if int(cur.rowcount)!=0:
+            for row  in cur:
+                html_file=html_file+str(row[0])+""","""
+            
+            
+            html_file=html_file+html_body1
+                
+            for i in range(1, column_count):
+                if i==column_count-1:
+                    html_file=html_file+"""row["""+str(i)+"""]"""
+                else:
+                    html_file=html_file+"""row["""+str(i)+"""],"""
+            
+            html_file=html_file+html_body2+"""
+            title: `Prismafy v1.0 - https://github.com/prismafy/prismafy
+            Chart Creation Date: """+report_formatted_time+"""
+            Replication usage in bytes by database`,"""+html_line_hour_tail
+
+            create_output_file('bytes_replication_by_database.html',html_file)
+            report_sections["F - Data Transfer"].update({'bytes_replication_by_database.html':'line'})
+        
+    except Exception as error:
+        print("[line_history_bytes_replication_by_database]: An exception occurred:", error)
+
+def line_history_credits_replication_by_database(conn):
+    try:
+        
+        global snowflake_conn
+        global report_sections
+        conn =snowflake_conn
+            
+        html_file=html_header
+
+        sql_query=sql_header+"""
+        SELECT 
+            DISTINCT DATABASE_NAME
+        FROM snowflake.account_usage.DATABASE_REPLICATION_USAGE_HISTORY  Q
+        WHERE  """+since_predicate("Q.start_time")+"""
+        AND DATABASE_NAME !='SNOWFLAKE'
+        """
+        cur = conn.cursor()
+        cur.execute(sql_query)
+
+        column_count=cur.rowcount        
+        headers =[i[0] for i in cur]  
+        headers.insert(0,'DATE')  
+        html_file=html_file+str(headers).replace('"','')+", \n"      
+
+
+        sql_query=sql_header+"""
+        WITH DATA AS (
+            SELECT DATE_TRUNC('HOUR',START_TIME::TIMESTAMP_NTZ)         AS DATE , 
+            DATABASE_NAME                                               AS DATABASE_NAME,
+            ROUND(SUM(CREDITS_USED),2)                                  AS CREDITS_USED
+            FROM snowflake.account_usage.DATABASE_REPLICATION_USAGE_HISTORY  Q
+            WHERE  """+since_predicate("Q.start_time")+"""
+            AND DATABASE_NAME IN ( """+str(headers).replace('"','').replace("[","").replace("]","").replace("'DATE',","")+""")            
+            GROUP BY 1,2
+            ORDER BY 1  
+        )
+        , PIVOT_DATA AS (
+            SELECT *
+            FROM DATA
+                PIVOT(  sum (CREDITS_USED) FOR DATABASE_NAME IN ( """+str(headers).replace('"','').replace("[","").replace("]","").replace("'DATE',","")+""") DEFAULT ON NULL (0) ) 
         )
-        SELECT * FROM DATA 
-        ORDER BY EXECUTION_PLAN_HASH,QUERY_ID,STEP_ID,OPERATOR_ID,    PARENT_OPERATORS
-        ;
+        SELECT ARRAY_CONSTRUCT(*) FROM PIVOT_DATA ORDER BY DATE
         """
 
         cur = conn.cursor()
         cur.execute(sql_query)
-        current_query=''
-        execution_plan_hash=''
+        
         if int(cur.rowcount)!=0:
-
-            reset_bit=0
+            for row  in cur:
+                html_file=html_file+str(row[0])+""","""
+                        
+            html_file=html_file+html_body1
+                
+            for i in range(1, column_count):
+                if i==column_count-1:
+                    html_file=html_file+"""row["""+str(i)+"""]"""
+                else:
+                    html_file=html_file+"""row["""+str(i)+"""],"""
             
-            for row in cur:    
+            html_file=html_file+html_body2+"""
+            title: `Prismafy v1.0 - https://github.com/prismafy/prismafy
+            Chart Creation Date: """+report_formatted_time+"""
+            Credits Used for Replication by database`,"""+html_line_hour_tail
 
-                if current_query!=str(row[1]):
-                    if current_query!='':
-                        html_file=html_file+"""</tr> """            
-                        html_file=html_file+html_table_tail
-                        create_output_file('execution_plan_'+current_query+'_'+execution_plan_hash+'.html',html_file)
-                        hash_plans[current_query]= execution_plan_hash
-                    current_query=str(row[1])
-                    execution_plan_hash=str(row[0])
-                    html_file=html_table_header      
-                    column_count=len(cur.description)
-                    headers =[] 
-                    for i in cur.description:
-                        headers.append(i[0])
-                    html_file=html_file+"""
-                    <table class="tabla1">
-                    """+str(headers).upper().replace('"','').replace(",","</th><th>").replace("[","<tr><th>").replace("]","</th></tr>")
-                
+            create_output_file('credits_replication_by_database.html',html_file)
+            report_sections["C - Credits"].update({'credits_replication_by_database.html':'line'})
+        
+    except Exception as error:
+        print("[line_history_credits_replication_by_database]: An exception occurred:", error)
 
-                    html_file=html_file+"""<tr>"""
-                      
+def report_builder():
+    global report_sections
+    global html_table_tail
+    global html_table_header_index
+    move_icon()
+    report_html_index=html_table_header_index   
 
-                for i in range(0, column_count):
-                    if i==column_count-1:
-                        html_file=html_file+"""<td class="cell_grow">"""+str(row[i]).replace("None","")+"""</td> """                        
-                    else:
+    change_table=0
+    for section, report_list in report_sections.items():
+        
+        if str(section)=='D - Performance' or str(section)=='E - Security':
+            report_html_index=report_html_index+"""</div><div class="column">"""
+        if change_table==0:
+            report_html_index=report_html_index+"""
+            <h2>Section """+str(section)+"""</h2>
+            <table class="tabla1">
+            <th >Type</th>
+            <th >HTML File Name</th>
+            """    
+            change_table=1
+        else:
+            report_html_index=report_html_index+"""            
+            <h2>Section """+str(section)+"""</h2>            
+            <table class="tabla2">
+            <th >Type</th>
+            <th >HTML File Name</th>
+            """ 
+            change_table=0
 
-                        if reset_bit==1:
-                            html_file=html_file+"""</td> """
-                            reset_bit=0
-                        html_file=html_file+"""<td>"""+str(row[i]).replace("None","")+"""</td> """
+        for html_page_name, html_page_type in report_list.items():
+            report_html_index=report_html_index+""" <tr> 
+            <td><a href="./"""+str(html_page_name)+"""">"""+str(html_page_type)+"""</td> 
+            <td>"""+str(html_page_name)+"""</td> 
+            </tr> """
+        report_html_index=report_html_index+""" </table> """
 
 
-                html_file=html_file+"""</tr> """            
-            html_file=html_file+html_table_tail
-            create_output_file('execution_plan_'+row[1]+'_'+execution_plan_hash+'.html',html_file)
-            hash_plans[row[1]]= execution_plan_hash
+    if len(failed_statements)>0:
+        report_html_index=report_html_index+"""
+            <h2>Failed statements</h2>
+            <table class="tabla2">
+            <th >Report</th>
+            <th >Class</th>
+            <th >Error</th>
+            <th >Attempts</th>
+            """
+        for failed_statement in failed_statements:
+            report_html_index=report_html_index+""" <tr> 
+            <td>"""+failed_statement["report"]+"""</td> 
+            <td>"""+failed_statement["error_class"]+"""</td> 
+            <td>"""+failed_statement["error"].replace('<','&lt;')+"""</td> 
+            <td>"""+str(failed_statement["attempts"])+"""</td> 
+            </tr> """
+        report_html_index=report_html_index+""" </table> """
 
-    except Exception as error:
-        print (error)
+    if len(skipped_reports)>0:
+        report_html_index=report_html_index+"""
+            <h2>Skipped reports</h2>
+            <table class="tabla2">
+            <th >Report</th>
+            <th >Reason</th>
+            <th >Seconds</th>
+            """
+        for skipped_report in skipped_reports:
+            report_html_index=report_html_index+""" <tr> 
+            <td>"""+skipped_report["report"]+"""</td> 
+            <td>"""+skipped_report["reason"]+"""</td> 
+            <td>"""+str(skipped_report["seconds"])+"""</td> 
+            </tr> """
+        report_html_index=report_html_index+""" </table> """
 
-def line_history_storage_stages(conn):
-    try:
-        global snowflake_conn
-        global report_sections
-        conn =snowflake_conn
-        
-        html_file=html_header+"""
-            ['DATE','AVERAGE_STAGE_GB'],
-        """
-        
-        sql_query=sql_header+"""
+    report_html_index=report_html_index+"""</div></div>"""
+    report_html_index=report_html_index+"""</body> </html>"""
+    create_output_file('prismafy_index.html',report_html_index)
+
+def print_failure_summary():
+    if len(failed_statements)>0:
+        print ("Failed statements: "+str(len(failed_statements))+" ("+str(len([failed_statement for failed_statement in failed_statements if failed_statement["error_class"]=='transient']))+" transient after retries). Listed in the main page.")
+        for failed_statement in failed_statements:
+            print ("  ["+failed_statement["report"]+"] "+failed_statement["error_class"]+" after "+str(failed_statement["attempts"])+" attempt(s): "+failed_statement["error"])
+    if len(skipped_reports)>0:
+        print ("Skipped reports: "+", ".join([skipped_report["report"] for skipped_report in skipped_reports]))
+
+def sections_builder():
+    print ("Copyright (C) 2024 - prismafy\n ")
+
+    if args.analyzequery is not None and args.analyzewarehouse is not None:
+        print ("Arguments 'analyzequery' and 'analyzewarehouse' cannot be set at the same time. ")
+        return
+    
+    global snowflake_conn 
+    #The connection is opened with the query tag of the claimed folder, a resumed run keeps its folder
+    if args.resume is None:
+        claim_report_folder()
+    if args.databasetype=='standin':
+        snowflake_conn=create_standin_db_connection()
+    else:
+        snowflake_conn=create_snowflake_db_connection(args.authenticator)
+
+    if snowflake_conn==-1:
+        if args.resume is None:
+            os.rmdir(reports_folder+'/'+report_root_folder)
+        return -1    
+
+    report_start_time = datetime.now()
+
+    build_sections(snowflake_conn)
+
+    create_run_profile(snowflake_conn)
+    close_snowflake_db_connection(snowflake_conn)
+    report_builder()
+    print ("\nCompleted. Open the main page: "+report_root_folder+"/prismafy_index.html\n")
+    print ("Cost of each report: "+report_root_folder+"/prismafy_run_profile.html\n")
+    print_failure_summary()
+    print ("Duration Prismafy report: "+ str(round(  (datetime.now()- report_start_time).total_seconds()/60 ,2) )+" minutes." )
+
+#Declarative reports: SQL, columns, chart type, section, output file and an optional fan-out, either a query returning one entity
+#per page (fanout_sql) or a fixed list of entities. The SQL placeholders {months_history}, {report_formatted_time}, {since_months},
+#{since_months_inclusive}, {since_last_month}, {since_last_week} (see since_bound), {subset:NAME} (see shared_subset) and {entity}
+#are resolved when the report runs. {entity} is also replaced in the title and, lower case, in the file name.
+#Line charts take the tail of their page (hour, day or month axis) and optional chart options such as trendlines.
+report_specs={
+    "table_history_recent_changed_network_policies":{
+        "section":"E - Security", "chart":"table", "file":"recent_changes_on_network_policies.html", "title":"Recent changes on network policies",
+        "batch":"policy_audit", "batch_label":"NETWORK POLICY", "timeline_columns":["LAST_ALTERED","NAME","OWNER","CREATED",None],
+        "columns":["TOP_N","LAST_ALTERED","ID","NAME","OWNER","OWNER_ROLE_TYPE","CREATED","COMMENT"],
+        "sql":"""
+        WITH DATA AS (
+              SELECT 
+                ROW_NUMBER() OVER (ORDER BY LAST_ALTERED  DESC)       AS TOP_N,
+                LAST_ALTERED              AS LAST_ALTERED,
+                ID                        AS ID,
+                NAME                      AS NAME,
+                OWNER                     AS OWNER,
+                OWNER_ROLE_TYPE           AS OWNER_ROLE_TYPE,
+                CREATED                   AS CREATED,
+                COMMENT                   AS COMMENT
+              FROM SNOWFLAKE.ACCOUNT_USAGE.NETWORK_POLICIES 
+              WHERE LAST_ALTERED > DATEADD(MONTH,{months_history},TO_TIMESTAMP({report_formatted_time}))
+                OR CREATED > DATEADD(MONTH,{months_history},TO_TIMESTAMP({report_formatted_time}))
+              ORDER BY LAST_ALTERED DESC
+        )
+        SELECT 
+            *
+        FROM DATA
+        WHERE TOP_N<=100
+        ORDER BY TOP_N;
+        """},
+    "table_history_recent_changed_network_rules":{
+        "section":"E - Security", "chart":"table", "file":"recent_changes_on_network_rules.html", "title":"Recent changes on network rules",
+        "batch":"policy_audit", "batch_label":"NETWORK RULE", "timeline_columns":["LAST_ALTERED","NAME","OWNER","CREATED","DELETED"],
+        "columns":["TOP_N","LAST_ALTERED","ID","NAME","SCHEMA_ID","SCHEMA_NAME","DATABASE_ID","DATABASE_NAME","OWNER","OWNER_ROLE_TYPE","CREATED","DELETED","COMMENT"],
+        "grow_last_column":True, "write_empty":True,
+        "sql":"""
+        WITH DATA AS (
+              SELECT 
+                ROW_NUMBER() OVER (ORDER BY LAST_ALTERED  DESC)       AS TOP_N,
+                LAST_ALTERED        AS LAST_ALTERED,
+                ID                  AS ID,
+                NAME                AS NAME,
+                SCHEMA_ID           AS SCHEMA_ID,
+                SCHEMA              AS SCHEMA_NAME,
+                DATABASE_ID         AS DATABASE_ID,
+                DATABASE            AS DATABASE_NAME,
+                OWNER               AS OWNER,
+                OWNER_ROLE_TYPE     AS OWNER_ROLE_TYPE,            
+                CREATED             AS CREATED,           
+                DELETED             AS DELETED,
+                COMMENT             AS COMMENT
+              FROM SNOWFLAKE.ACCOUNT_USAGE.NETWORK_RULES    
+              WHERE LAST_ALTERED > DATEADD(MONTH,{months_history},TO_TIMESTAMP({report_formatted_time}))
+                OR CREATED > DATEADD(MONTH,{months_history},TO_TIMESTAMP({report_formatted_time}))
+              ORDER BY LAST_ALTERED DESC
+        )
+        SELECT 
+            *
+        FROM DATA
+        WHERE TOP_N<=100
+        ORDER BY TOP_N;
+        """},
+    "table_history_recent_changed_password_policies":{
+        "section":"E - Security", "chart":"table", "file":"recent_changes_on_password_policies.html", "title":"Recent changes on password policies",
+        "batch":"policy_audit", "batch_label":"PASSWORD POLICY", "timeline_columns":["LAST_ALTERED","NAME","OWNER","CREATED","DELETED"],
+        "columns":["TOP_N","LAST_ALTERED","NAME","ID","SCHEMA_ID","SCHEMA","DATABASE_ID","DATABASE","OWNER","OWNER_ROLE_TYPE","PASSWORD_MIN_LENGTH","PASSWORD_MAX_LENGTH",
+                   "PASSWORD_MIN_UPPER_CASE_CHARS","PASSWORD_MIN_LOWER_CASE_CHARS","PASSWORD_MIN_NUMERIC_CHARS","PASSWORD_MIN_SPECIAL_CHARS","PASSWORD_MIN_AGE_DAYS",
+                   "PASSWORD_MAX_AGE_DAYS","PASSWORD_MAX_RETRIES","PASSWORD_LOCKOUT_TIME_MINS","CREATED","DELETED","PASSWORD_HISTORY","COMMENT"],
+        "grow_last_column":True, "write_empty":True,
+        "sql":"""
+        WITH DATA AS (
+              SELECT 
+                ROW_NUMBER() OVER (ORDER BY LAST_ALTERED  DESC)       AS TOP_N,
+                LAST_ALTERED                    AS LAST_ALTERED,
+                NAME                            AS NAME,
+                ID                              AS ID,
+                SCHEMA_ID                       AS SCHEMA_ID,
+                SCHEMA                          AS SCHEMA,
+                DATABASE_ID                     AS DATABASE_ID,
+                DATABASE                        AS DATABASE,
+                OWNER                           AS OWNER,
+                OWNER_ROLE_TYPE                 AS OWNER_ROLE_TYPE,
+                PASSWORD_MIN_LENGTH             AS PASSWORD_MIN_LENGTH,
+                PASSWORD_MAX_LENGTH             AS PASSWORD_MAX_LENGTH,
+                PASSWORD_MIN_UPPER_CASE_CHARS   AS PASSWORD_MIN_UPPER_CASE_CHARS,
+                PASSWORD_MIN_LOWER_CASE_CHARS   AS PASSWORD_MIN_LOWER_CASE_CHARS,
+                PASSWORD_MIN_NUMERIC_CHARS      AS PASSWORD_MIN_NUMERIC_CHARS,
+                PASSWORD_MIN_SPECIAL_CHARS      AS PASSWORD_MIN_SPECIAL_CHARS,
+                PASSWORD_MIN_AGE_DAYS           AS PASSWORD_MIN_AGE_DAYS,
+                PASSWORD_MAX_AGE_DAYS           AS PASSWORD_MAX_AGE_DAYS,
+                PASSWORD_MAX_RETRIES            AS PASSWORD_MAX_RETRIES,
+                PASSWORD_LOCKOUT_TIME_MINS      AS PASSWORD_LOCKOUT_TIME_MINS,
+                CREATED                         AS CREATED,
+                DELETED                         AS DELETED,
+                PASSWORD_HISTORY                AS PASSWORD_HISTORY,
+                COMMENT                         AS COMMENT
+              FROM SNOWFLAKE.ACCOUNT_USAGE.PASSWORD_POLICIES   
+              WHERE LAST_ALTERED > DATEADD(MONTH,{months_history},TO_TIMESTAMP({report_formatted_time}))
+                OR CREATED > DATEADD(MONTH,{months_history},TO_TIMESTAMP({report_formatted_time}))
+              ORDER BY LAST_ALTERED DESC
+        )
+        SELECT 
+            *
+        FROM DATA
+        WHERE TOP_N<=100
+        ORDER BY TOP_N;
+        """},
+    "table_history_recent_changed_masking_policies":{
+        "section":"E - Security", "chart":"table", "file":"recent_changes_on_masking_policies.html", "title":"Recent changes on masking policies",
+        "batch":"policy_audit", "batch_label":"MASKING POLICY", "timeline_columns":["LAST_ALTERED","POLICY_NAME","POLICY_OWNER","CREATED","DELETED"],
+        "columns":["TOP_N","LAST_ALTERED","POLICY_NAME","POLICY_ID","POLICY_SCHEMA_ID","POLICY_SCHEMA","POLICY_CATALOG_ID","POLICY_CATALOG","POLICY_OWNER",
+                   "POLICY_SIGNATURE","POLICY_RETURN_TYPE","POLICY_BODY","CREATED","DELETED","OWNER_ROLE_TYPE","OPTIONS","POLICY_COMMENT"],
+        "grow_last_column":True, "write_empty":True,
+        "sql":"""
+        WITH DATA AS (
+              SELECT 
+                ROW_NUMBER() OVER (ORDER BY LAST_ALTERED  DESC)       AS TOP_N,
+                LAST_ALTERED        AS LAST_ALTERED,
+                POLICY_NAME         AS POLICY_NAME,
+                POLICY_ID           AS POLICY_ID,
+                POLICY_SCHEMA_ID    AS POLICY_SCHEMA_ID,
+                POLICY_SCHEMA       AS POLICY_SCHEMA,
+                POLICY_CATALOG_ID   AS POLICY_CATALOG_ID,
+                POLICY_CATALOG      AS POLICY_CATALOG,
+                POLICY_OWNER        AS POLICY_OWNER,
+                POLICY_SIGNATURE    AS POLICY_SIGNATURE,
+                POLICY_RETURN_TYPE  AS POLICY_RETURN_TYPE,
+                POLICY_BODY         AS POLICY_BODY,
+                CREATED             AS CREATED,
+                DELETED             AS DELETED,
+                OWNER_ROLE_TYPE     AS OWNER_ROLE_TYPE,
+                OPTIONS             AS OPTIONS,
+                POLICY_COMMENT      AS POLICY_COMMENT
+              FROM SNOWFLAKE.ACCOUNT_USAGE.MASKING_POLICIES   
+              WHERE LAST_ALTERED > DATEADD(MONTH,{months_history},TO_TIMESTAMP({report_formatted_time}))
+                OR CREATED > DATEADD(MONTH,{months_history},TO_TIMESTAMP({report_formatted_time}))
+              ORDER BY LAST_ALTERED DESC
+        )
+        SELECT 
+            *
+        FROM DATA
+        WHERE TOP_N<=100
+        ORDER BY TOP_N;
+        """},
+    "table_history_recent_changed_row_access_policies":{
+        "section":"E - Security", "chart":"table", "file":"recent_changes_on_row_access_policies.html", "title":"Recent changes on row access policies",
+        "batch":"policy_audit", "batch_label":"ROW ACCESS POLICY", "timeline_columns":["LAST_ALTERED","POLICY_NAME","POLICY_OWNER","CREATED","DELETED"],
+        "columns":["TOP_N","LAST_ALTERED","POLICY_NAME","POLICY_ID","POLICY_SCHEMA_ID","POLICY_SCHEMA","POLICY_CATALOG_ID","POLICY_CATALOG","POLICY_OWNER",
+                   "POLICY_SIGNATURE","POLICY_RETURN_TYPE","POLICY_BODY","CREATED","DELETED","OWNER_ROLE_TYPE","OPTIONS","POLICY_COMMENT"],
+        "write_empty":True,
+        "sql":"""
+        WITH DATA AS (
+              SELECT 
+                ROW_NUMBER() OVER (ORDER BY LAST_ALTERED  DESC)       AS TOP_N,
+                LAST_ALTERED,
+                POLICY_NAME,
+                POLICY_ID,
+                POLICY_SCHEMA_ID,
+                POLICY_SCHEMA,
+                POLICY_CATALOG_ID,
+                POLICY_CATALOG,
+                POLICY_OWNER,
+                POLICY_SIGNATURE,
+                POLICY_RETURN_TYPE,
+                POLICY_BODY,
+                CREATED,
+                DELETED,
+                OWNER_ROLE_TYPE,
+                OPTIONS,
+                POLICY_COMMENT
+              FROM SNOWFLAKE.ACCOUNT_USAGE.ROW_ACCESS_POLICIES   
+              WHERE LAST_ALTERED > DATEADD(MONTH,{months_history},TO_TIMESTAMP({report_formatted_time}))
+                OR CREATED > DATEADD(MONTH,{months_history},TO_TIMESTAMP({report_formatted_time})) 
+              ORDER BY LAST_ALTERED DESC
+        )
+        SELECT 
+            *
+        FROM DATA
+        WHERE TOP_N<=100
+        ORDER BY TOP_N;
+        """},
+    "table_history_recent_changed_policies":{
+        "section":"E - Security", "chart":"table", "file":"recent_changes_on_policies.html", "title":"Recent changes on policies",
+        "batch":"policy_audit", "timeline":True,
+        "columns":["TOP_N","LAST_ALTERED","POLICY_TYPE","NAME","OWNER","CREATED","DELETED"],
+        "write_empty":True},
+    "table_history_warehouse_events":{
+        "section":"A - Computing", "chart":"table", "file":"warehouse_events_for_{entity}.html", "title":"Warehouse events", "table_class":"tabla2",
+        "columns":["TIMESTAMP","WAREHOUSE_ID","WAREHOUSE_NAME","CLUSTER_NUMBER","EVENT_NAME","EVENT_REASON","EVENT_STATE","USER_NAME","ROLE_NAME","QUERY_ID","SIZE","CLUSTER_COUNT"],
+        "grow_last_column":True, "write_empty":True,
+        "fanout_sql":"""
+        SELECT DISTINCT 
+            WAREHOUSE_NAME
+        FROM  SNOWFLAKE.ACCOUNT_USAGE.WAREHOUSE_METERING_HISTORY 
+        WHERE
+            Start_time >= {since_months}
+            AND WAREHOUSE_NAME IS NOT NULL;
+        """,
+        "sql":"""
+        SELECT 
+            TIMESTAMP,
+            WAREHOUSE_ID,
+            WAREHOUSE_NAME,
+            CLUSTER_NUMBER,
+            EVENT_NAME,
+            EVENT_REASON,
+            EVENT_STATE,
+            USER_NAME,
+            ROLE_NAME,
+            QUERY_ID,
+            SIZE,
+            CLUSTER_COUNT
+        FROM SNOWFLAKE.ACCOUNT_USAGE.WAREHOUSE_EVENTS_HISTORY  
+        WHERE  WAREHOUSE_NAME='{entity}'
+        ORDER BY TIMESTAMP DESC
+        LIMIT 100;
+        """},
+    "line_history_storage_stages":{
+        "section":"B - Storage", "chart":"line", "file":"storage_stages.html", "title":"Storage Usage for Stages", "tail":html_line_hour_tail,
+        "columns":["DATE","AVERAGE_STAGE_GB"],
+        "sql":"""
         WITH DATA AS (
             SELECT 
                 DATE_TRUNC('DAY',USAGE_DATE::TIMESTAMP_NTZ)         AS DATE, 
                 ROUND(SUM(AVERAGE_STAGE_BYTES/1024/1024/1024),2)    AS AVERAGE_STAGE_GB
             FROM  snowflake.account_usage.STAGE_STORAGE_USAGE_HISTORY  
             WHERE
-                TO_DATE(USAGE_DATE) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
+                USAGE_DATE >= TO_DATE({since_months})
             GROUP BY 1
             ORDER BY 1 
         )
         SELECT ARRAY_CONSTRUCT(*) AS DATA FROM DATA;
-        """
-        cur_details = conn.cursor()
-        cur_details.execute(sql_query)
-    
-        if int(cur_details.rowcount)!=0:
-            counter=0
-            for (row_data) in cur_details:
-                counter=counter+1
-                if counter==cur_details.rowcount:
-                    html_file=html_file+str(row_data[0])
-                else:
-                    html_file=html_file+str(row_data[0])+""","""
-    
-            html_file=html_file+html_body1+"""
-            row[1]
-            """+html_body2+"""
-            title: `Prismafy v1.0 - https://github.com/prismafy/prismafy
-            Chart Creation Date: """+report_formatted_time+"""
-            Storage Usage for Stages`,"""+html_line_hour_tail
-                
-            create_output_file('storage_stages.html',html_file)
-            report_sections["B - Storage"].update({'storage_stages.html':'line'})
-            
-    except Exception as error:
-        print("[line_history_storage_stages]: An exception occurred:", error)
-
-def line_history_bytes_replication_by_database(conn):
-    try:
-        
-        global snowflake_conn
-        global report_sections
-        conn =snowflake_conn
-            
-        html_file=html_header
-
-        sql_query=sql_header+"""
+        """},
+    "table_history_top_tables_by_storage":{
+        "section":"B - Storage", "chart":"table", "file":"history_top_tables_by_{entity}.html", "title":"Top tables by {entity}",
+        "entities":["active_bytes","time_travel_bytes","failsafe_bytes","retained_for_clone_bytes"],
+        "columns":["TOP_N","TABLE_CATALOG","TABLE_SCHEMA","TABLE_NAME","IS_TRANSIENT","ACTIVE_GB","TIME_TRAVEL_GB","FAILSAFE_GB","RETAINED_FOR_CLONE_GB","TABLE_CREATED"],
+        "grow_last_column":True, "write_empty":True,
+        "sql":"""
         SELECT 
-            DISTINCT DATABASE_NAME
-        FROM snowflake.account_usage.DATABASE_REPLICATION_USAGE_HISTORY  Q
-        WHERE  TO_DATE(Q.start_time) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-        AND DATABASE_NAME !='SNOWFLAKE'
-        """
-        cur = conn.cursor()
-        cur.execute(sql_query)
-
-        column_count=cur.rowcount        
-        headers =[i[0] for i in cur]  
-        headers.insert(0,'DATE')  
-        html_file=html_file+str(headers).replace('"','')+", \n"      
-
-
-        sql_query=sql_header+"""
+            ROW_NUMBER() over (order by {entity}  DESC)  AS TOP_N,
+            TABLE_CATALOG                                           AS TABLE_CATALOG,
+            TABLE_SCHEMA                                            AS TABLE_SCHEMA,
+            TABLE_NAME                                              AS TABLE_NAME,
+            IS_TRANSIENT                                            AS IS_TRANSIENT,
+            ROUND(NVL(ACTIVE_BYTES,0)/1024/1024/1024,2)             AS ACTIVE_GB,
+            ROUND(NVL(TIME_TRAVEL_BYTES,0)/1024/1024/1024,2)        AS TIME_TRAVEL_GB,
+            ROUND(NVL(FAILSAFE_BYTES,0)/1024/1024/1024,2)           AS FAILSAFE_GB,
+            ROUND(NVL(RETAINED_FOR_CLONE_BYTES,0)/1024/1024/1024,2) AS RETAINED_FOR_CLONE_GB,
+            TABLE_CREATED::TIMESTAMP_NTZ                            AS TABLE_CREATED
+        FROM SNOWFLAKE.ACCOUNT_USAGE.TABLE_STORAGE_METRICS    T
+        WHERE DELETED=FALSE
+        ORDER BY TOP_N
+        LIMIT 100
+        """},
+    "table_history_top_database_by_storage":{
+        "section":"B - Storage", "chart":"table", "file":"top_database_by_storage.html", "title":"Top database by storage",
+        "columns":["TOP_N","DATABASE_NAME","AVERAGE_DATABASE_GB","AVERAGE_FAILSAFE_GB","AVERAGE_HYBRID_TABLE_STORAGE_GB"],
+        "grow_last_column":True, "write_empty":True,
+        "sql":"""
+        WITH MAX_DATE AS (
+            SELECT MAX (USAGE_DATE) USAGE_DATE, DATABASE_NAME 
+            FROM snowflake.account_usage.DATABASE_STORAGE_USAGE_HISTORY
+            WHERE USAGE_DATE > DATEADD(MONTH,-1,TO_TIMESTAMP({report_formatted_time}))
+            GROUP BY 2
+        )
+        ,DATA AS (
+          SELECT 
+          Q.DATABASE_NAME                                              AS DATABASE_NAME,
+          ROUND(AVERAGE_DATABASE_BYTES/1024/1024/1024,2)               AS AVERAGE_DATABASE_GB,
+          ROUND(AVERAGE_FAILSAFE_BYTES/1024/1024/1024,2)               AS AVERAGE_FAILSAFE_GB,
+          ROUND(AVERAGE_HYBRID_TABLE_STORAGE_BYTES/1024/1024/1024  ,2) AS AVERAGE_HYBRID_TABLE_STORAGE_GB
+        FROM snowflake.account_usage.DATABASE_STORAGE_USAGE_HISTORY  Q
+        INNER JOIN MAX_DATE
+            ON (
+                MAX_DATE.DATABASE_NAME=Q.DATABASE_NAME 
+                AND Q.USAGE_DATE=MAX_DATE.USAGE_DATE
+                )
+        ORDER BY AVERAGE_DATABASE_GB desc
+        LIMIT 25
+        )
+        SELECT 
+            ROW_NUMBER() over (order by AVERAGE_DATABASE_GB  DESC)       AS TOP_N
+            ,DATABASE_NAME
+            ,AVERAGE_DATABASE_GB
+            ,AVERAGE_FAILSAFE_GB
+            ,AVERAGE_HYBRID_TABLE_STORAGE_GB
+        FROM DATA
+        ORDER BY TOP_N;
+        """},
+    "line_history_account_consumption_credits":{
+        "section":"C - Credits", "chart":"line", "file":"warehouse_consumption.html", "title":"Credits Consumption for all warehouses", "tail":html_line_hour_tail,
+        "columns":["DATE","CREDITS_USED"],
+        "sql":"""
         WITH DATA AS (
-            SELECT DATE_TRUNC('HOUR',START_TIME::TIMESTAMP_NTZ)         AS DATE , 
-            DATABASE_NAME                                               AS DATABASE_NAME,
-            ROUND(SUM(BYTES_TRANSFERRED/1024/1024/1024),2)              AS GB_TRANSFERRED
-            FROM snowflake.account_usage.DATABASE_REPLICATION_USAGE_HISTORY  Q
-            WHERE  TO_DATE(Q.start_time) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-            AND DATABASE_NAME IN ( """+str(headers).replace('"','').replace("[","").replace("]","").replace("'DATE',","")+""")            
-            GROUP BY 1,2
-            ORDER BY 1  
+            SELECT 
+                DATE_TRUNC('DAY',START_TIME::TIMESTAMP_NTZ)  AS DATE, 
+                ROUND(SUM(CREDITS_USED),2)                   AS CREDITS_USED,
+            FROM  snowflake.account_usage.WAREHOUSE_METERING_HISTORY 
+            WHERE
+                START_TIME >= {since_months}
+            GROUP BY 1
+            ORDER BY 1 
         )
-        , PIVOT_DATA AS (
-            SELECT *
-            FROM DATA
-                PIVOT(  sum (GB_TRANSFERRED) FOR DATABASE_NAME IN ( """+str(headers).replace('"','').replace("[","").replace("]","").replace("'DATE',","")+""") DEFAULT ON NULL (0) ) 
+        SELECT ARRAY_CONSTRUCT(*) AS DATA FROM DATA;
+        """},
+    "table_month_top_query":{
+        "section":"D - Performance", "chart":"table", "file":"last_month_top_query_for_{entity}.html", "title":"Top query for {entity} for last month", "table_class":"tabla2",
+        "entities":["query_execution_time_seconds","partitions_scanned","percentage_scanned_from_cache","rows_produced","gb_spilled_to_local_storage","gb_spilled_to_remote_storage","gb_sent_over_the_network","compilation_time_seconds","queued_provisioning_time_seconds","queued_overload_time_seconds","query_load_percent"],
+        "columns":["TOP_N","DATE","QUERY_PARAMETERIZED_HASH","QUERY_EXECUTION_TIME_SECONDS","PARTITIONS_SCANNED","PARTITIONS_TOTAL","PERCENTAGE_SCANNED_FROM_CACHE","GB_READ_FROM_RESULT","ROWS_PRODUCED","GB_SPILLED_TO_LOCAL_STORAGE","GB_SPILLED_TO_REMOTE_STORAGE","GB_SENT_OVER_THE_NETWORK","COMPILATION_TIME_SECONDS","EXECUTION_TIME_SECONDS","QUEUED_PROVISIONING_TIME_SECONDS","QUEUED_OVERLOAD_TIME_SECONDS","TRANSACTION_BLOCKED_TIME_SECONDS","QUERY_LOAD_PERCENT","QUERY_TEXT"],
+        "grow_last_column":True,
+        "sql":"""
+        WITH DATA AS (
+        SELECT DATE_TRUNC('HOUR',START_TIME)                        AS START_TIME , 
+          QUERY_PARAMETERIZED_HASH                                  AS QUERY_PARAMETERIZED_HASH,
+          REPLACE(REPLACE(QUERY_TEXT,'\n',' '),'<td>')              AS QUERY_TEXT,
+          ROUND(TOTAL_ELAPSED_TIME/1000,2)                          AS QUERY_EXECUTION_TIME_SECONDS,
+          ROUND(PARTITIONS_SCANNED,2)                               AS PARTITIONS_SCANNED,
+          ROUND(PARTITIONS_TOTAL,2)                                 AS PARTITIONS_TOTAL,
+          ROUND(TO_NUMBER(PERCENTAGE_SCANNED_FROM_CACHE,10,2),2)    AS PERCENTAGE_SCANNED_FROM_CACHE,
+          ROUND(BYTES_READ_FROM_RESULT/1024/1024/1024,2)            AS GB_READ_FROM_RESULT,
+          ROUND(ROWS_PRODUCED,2)                                    AS ROWS_PRODUCED,
+          ROUND(BYTES_SPILLED_TO_LOCAL_STORAGE/1024/1024/1024,2)    AS GB_SPILLED_TO_LOCAL_STORAGE,
+          ROUND(BYTES_SPILLED_TO_REMOTE_STORAGE/1024/1024/1024,2)   AS GB_SPILLED_TO_REMOTE_STORAGE,
+          ROUND(BYTES_SENT_OVER_THE_NETWORK/1024/1024/1024  ,2)     AS GB_SENT_OVER_THE_NETWORK,
+          ROUND(COMPILATION_TIME/1000,2)                            AS COMPILATION_TIME_SECONDS,
+          ROUND(EXECUTION_TIME/1000 ,2)                             AS EXECUTION_TIME_SECONDS,
+          ROUND(QUEUED_PROVISIONING_TIME/1000 ,2)                   AS QUEUED_PROVISIONING_TIME_SECONDS,
+          ROUND(QUEUED_OVERLOAD_TIME/1000   ,2)                     AS QUEUED_OVERLOAD_TIME_SECONDS,
+          ROUND(TRANSACTION_BLOCKED_TIME/1000  ,2)                  AS TRANSACTION_BLOCKED_TIME_SECONDS,
+          ROUND(QUERY_LOAD_PERCENT,2)                               AS QUERY_LOAD_PERCENT
+        FROM {subset:QUERY_HISTORY_LAST_MONTH} Q
+        WHERE  Q.START_TIME >= {since_last_month}
+          AND TOTAL_ELAPSED_TIME > 0
+          AND ERROR_CODE IS NULL
+          AND {entity} IS NOT NULL
+        ORDER BY {entity} DESC
+        LIMIT 50
         )
-        SELECT ARRAY_CONSTRUCT(*) FROM PIVOT_DATA ORDER BY DATE
-        """
-
-        cur = conn.cursor()
-        cur.execute(sql_query)
-        
-        if int(cur.rowcount)!=0:
-            for row  in cur:
-                html_file=html_file+str(row[0])+""","""
-            
-            
-            html_file=html_file+html_body1
-                
-            for i in range(1, column_count):
-                if i==column_count-1:
-                    html_file=html_file+"""row["""+str(i)+"""]"""
-                else:
-                    html_file=html_file+"""row["""+str(i)+"""],"""
-            
-            html_file=html_file+html_body2+"""
-            title: `Prismafy v1.0 - https://github.com/prismafy/prismafy
-            Chart Creation Date: """+report_formatted_time+"""
-            Replication usage in bytes by database`,"""+html_line_hour_tail
-
-            create_output_file('bytes_replication_by_database.html',html_file)
-            report_sections["F - Data Transfer"].update({'bytes_replication_by_database.html':'line'})
-        
-    except Exception as error:
-        print("[line_history_bytes_replication_by_database]: An exception occurred:", error)
-
-def line_history_credits_replication_by_database(conn):
-    try:
-        
-        global snowflake_conn
-        global report_sections
-        conn =snowflake_conn
-            
-        html_file=html_header
-
-        sql_query=sql_header+"""
         SELECT 
-            DISTINCT DATABASE_NAME
-        FROM snowflake.account_usage.DATABASE_REPLICATION_USAGE_HISTORY  Q
-        WHERE  TO_DATE(Q.start_time) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-        AND DATABASE_NAME !='SNOWFLAKE'
-        """
-        cur = conn.cursor()
-        cur.execute(sql_query)
-
-        column_count=cur.rowcount        
-        headers =[i[0] for i in cur]  
-        headers.insert(0,'DATE')  
-        html_file=html_file+str(headers).replace('"','')+", \n"      
-
-
-        sql_query=sql_header+"""
+            ROW_NUMBER() over (order by {entity}  DESC)       AS TOP_N
+            ,START_TIME
+            ,QUERY_PARAMETERIZED_HASH
+            ,QUERY_EXECUTION_TIME_SECONDS
+            ,PARTITIONS_SCANNED
+            ,PARTITIONS_TOTAL
+            ,PERCENTAGE_SCANNED_FROM_CACHE
+            ,GB_READ_FROM_RESULT
+            ,ROWS_PRODUCED
+            ,GB_SPILLED_TO_LOCAL_STORAGE
+            ,GB_SPILLED_TO_REMOTE_STORAGE
+            ,GB_SENT_OVER_THE_NETWORK
+            ,COMPILATION_TIME_SECONDS
+            ,EXECUTION_TIME_SECONDS
+            ,QUEUED_PROVISIONING_TIME_SECONDS
+            ,QUEUED_OVERLOAD_TIME_SECONDS
+            ,TRANSACTION_BLOCKED_TIME_SECONDS
+            ,QUERY_LOAD_PERCENT
+            ,REPLACE(QUERY_TEXT,'\\\\n',' ')                 AS QUERY_TEXT
+        FROM DATA
+        ORDER BY TOP_N;
+        """},
+    "table_week_top_query":{
+        "section":"D - Performance", "chart":"table", "file":"last_week_top_query_for_{entity}.html", "title":"Top query for {entity} for last week", "table_class":"tabla2",
+        "entities":["query_execution_time_seconds","partitions_scanned","percentage_scanned_from_cache","rows_produced","gb_spilled_to_local_storage","gb_spilled_to_remote_storage","gb_sent_over_the_network","compilation_time_seconds","queued_provisioning_time_seconds","queued_overload_time_seconds","query_load_percent"],
+        "columns":["TOP_N","DATE","QUERY_PARAMETERIZED_HASH","QUERY_EXECUTION_TIME_SECONDS","PARTITIONS_SCANNED","PARTITIONS_TOTAL","PERCENTAGE_SCANNED_FROM_CACHE","GB_READ_FROM_RESULT","ROWS_PRODUCED","GB_SPILLED_TO_LOCAL_STORAGE","GB_SPILLED_TO_REMOTE_STORAGE","GB_SENT_OVER_THE_NETWORK","COMPILATION_TIME_SECONDS","EXECUTION_TIME_SECONDS","QUEUED_PROVISIONING_TIME_SECONDS","QUEUED_OVERLOAD_TIME_SECONDS","TRANSACTION_BLOCKED_TIME_SECONDS","QUERY_LOAD_PERCENT","QUERY_TEXT"],
+        "grow_last_column":True,
+        "sql":"""
         WITH DATA AS (
-            SELECT DATE_TRUNC('HOUR',START_TIME::TIMESTAMP_NTZ)         AS DATE , 
-            DATABASE_NAME                                               AS DATABASE_NAME,
-            ROUND(SUM(CREDITS_USED),2)                                  AS CREDITS_USED
-            FROM snowflake.account_usage.DATABASE_REPLICATION_USAGE_HISTORY  Q
-            WHERE  TO_DATE(Q.start_time) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP("""+report_formatted_time+"""))
-            AND DATABASE_NAME IN ( """+str(headers).replace('"','').replace("[","").replace("]","").replace("'DATE',","")+""")            
-            GROUP BY 1,2
-            ORDER BY 1  
+        SELECT DATE_TRUNC('HOUR',START_TIME)                        AS START_TIME , 
+          QUERY_PARAMETERIZED_HASH                                  AS QUERY_PARAMETERIZED_HASH,
+          REPLACE(REPLACE(query_text,'\n',' '),'<td>')              AS QUERY_TEXT,
+          ROUND(TOTAL_ELAPSED_TIME/1000,2)                          AS QUERY_EXECUTION_TIME_SECONDS,
+          ROUND(PARTITIONS_SCANNED,2)                               AS PARTITIONS_SCANNED,
+          ROUND(PARTITIONS_TOTAL,2)                                 AS PARTITIONS_TOTAL,
+          ROUND(TO_NUMBER(PERCENTAGE_SCANNED_FROM_CACHE,10,2),2)    AS PERCENTAGE_SCANNED_FROM_CACHE,
+          ROUND(BYTES_READ_FROM_RESULT/1024/1024/1024,2)            AS GB_READ_FROM_RESULT,
+          ROUND(ROWS_PRODUCED,2)                                    AS ROWS_PRODUCED,
+          ROUND(BYTES_SPILLED_TO_LOCAL_STORAGE/1024/1024/1024,2)    AS GB_SPILLED_TO_LOCAL_STORAGE,
+          ROUND(BYTES_SPILLED_TO_REMOTE_STORAGE/1024/1024/1024,2)   AS GB_SPILLED_TO_REMOTE_STORAGE,
+          ROUND(BYTES_SENT_OVER_THE_NETWORK/1024/1024/1024  ,2)     AS GB_SENT_OVER_THE_NETWORK,
+          ROUND(COMPILATION_TIME/1000,2)                            AS COMPILATION_TIME_SECONDS,
+          ROUND(EXECUTION_TIME/1000 ,2)                             AS EXECUTION_TIME_SECONDS,
+          ROUND(QUEUED_PROVISIONING_TIME/1000 ,2)                   AS QUEUED_PROVISIONING_TIME_SECONDS,
+          ROUND(QUEUED_OVERLOAD_TIME/1000   ,2)                     AS QUEUED_OVERLOAD_TIME_SECONDS,
+          ROUND(TRANSACTION_BLOCKED_TIME/1000  ,2)                  AS TRANSACTION_BLOCKED_TIME_SECONDS,
+          ROUND(QUERY_LOAD_PERCENT,2)                               AS QUERY_LOAD_PERCENT
+        FROM {subset:QUERY_HISTORY_LAST_MONTH} Q
+        WHERE  Q.START_TIME >= {since_last_week}
+          AND TOTAL_ELAPSED_TIME > 0 
+          AND ERROR_CODE IS NULL
+          AND {entity} IS NOT NULL
+        ORDER BY {entity} DESC
+        LIMIT 50
         )
-        , PIVOT_DATA AS (
-            SELECT *
-            FROM DATA
-                PIVOT(  sum (CREDITS_USED) FOR DATABASE_NAME IN ( """+str(headers).replace('"','').replace("[","").replace("]","").replace("'DATE',","")+""") DEFAULT ON NULL (0) ) 
+        SELECT 
+            ROW_NUMBER() OVER (ORDER BY {entity}  DESC)       AS TOP_N
+            ,START_TIME
+            ,QUERY_PARAMETERIZED_HASH
+            ,NVL(QUERY_EXECUTION_TIME_SECONDS,0)
+            ,NVL(PARTITIONS_SCANNED,0)
+            ,NVL(PARTITIONS_TOTAL,0)
+            ,NVL(PERCENTAGE_SCANNED_FROM_CACHE,0)
+            ,NVL(GB_READ_FROM_RESULT,0)
+            ,NVL(ROWS_PRODUCED,0)
+            ,NVL(GB_SPILLED_TO_LOCAL_STORAGE,0)
+            ,NVL(GB_SPILLED_TO_REMOTE_STORAGE,0)
+            ,NVL(GB_SENT_OVER_THE_NETWORK,0)
+            ,NVL(COMPILATION_TIME_SECONDS,0)
+            ,NVL(EXECUTION_TIME_SECONDS,0)
+            ,NVL(QUEUED_PROVISIONING_TIME_SECONDS,0)
+            ,NVL(QUEUED_OVERLOAD_TIME_SECONDS,0)
+            ,NVL(TRANSACTION_BLOCKED_TIME_SECONDS,0)
+            ,NVL(QUERY_LOAD_PERCENT,0)
+            ,QUERY_TEXT
+        FROM DATA
+        ORDER BY TOP_N;
+        """},
+    "table_history_top_table_by_pruning_efficiency":{
+        "section":"D - Performance", "chart":"table", "file":"top_tables_by_pruning_efficiency.html", "title":"Top tables by pruning efficiency", "table_class":"tabla2",
+        "columns":["TOP_N","DATE","DATABASE_NAME","SCHEMA_NAME","TABLE_NAME","NUM_SCANS","PARTITIONS_SCANNED","PARTITIONS_PRUNED","ROWS_SCANNED","ROWS_PRUNED","PRUNING_EFFICIENCY_PERCENTAGE"],
+        "grow_last_column":True, "write_empty":True,
+        "sql":"""
+        SELECT 
+            ROW_NUMBER() over (order by ((PARTITIONS_PRUNED/(PARTITIONS_SCANNED+PARTITIONS_PRUNED))*100)  ASC, (ROWS_SCANNED+ROWS_PRUNED) DESC ) AS TOP_N,
+            START_TIME::TIMESTAMP_NTZ                               AS DATE,
+            DATABASE_NAME                                           AS DATABASE_NAME,
+            SCHEMA_NAME                                             AS SCHEMA_NAME,
+            TABLE_NAME                                              AS TABLE_NAME,
+            NUM_SCANS                                               AS NUM_SCANS,
+            ROUND(NVL(PARTITIONS_SCANNED,0),2)                      AS PARTITIONS_SCANNED,
+            ROUND(NVL(PARTITIONS_PRUNED,0),2)                       AS PARTITIONS_PRUNED,
+            ROUND(NVL(ROWS_SCANNED,0),2)                            AS ROWS_SCANNED,
+            ROUND(NVL(ROWS_PRUNED,0),2)                             AS ROWS_PRUNED,
+            ROUND(((PARTITIONS_PRUNED/(PARTITIONS_SCANNED+PARTITIONS_PRUNED))*100),2)     AS PRUNING_EFFICIENCY_PERCENTAGE
+        FROM SNOWFLAKE.ACCOUNT_USAGE.TABLE_PRUNING_HISTORY     T
+        WHERE  T.start_time >= {since_last_month}
+        AND PARTITIONS_SCANNED>0
+        AND ROWS_SCANNED>5000
+        ORDER BY TOP_N
+        LIMIT 200
+        """},
+    "table_history_top_table_by_reclustering":{
+        "section":"D - Performance", "chart":"table", "file":"history_top_table_by_reclustering.html", "title":"Top table by reclustering", "table_class":"tabla2",
+        "columns":["TOP_N","DATE","DATABASE_NAME","SCHEMA_NAME","TABLE_NAME","CREDITS_USED","NUM_BYTES_RECLUSTERED","NUM_ROWS_RECLUSTERED"],
+        "grow_last_column":True,
+        "sql":"""
+        SELECT 
+            ROW_NUMBER() over (order by NUM_ROWS_RECLUSTERED DESC ) AS TOP_N,
+            START_TIME::TIMESTAMP_NTZ                               AS DATE,
+            DATABASE_NAME                                           AS DATABASE_NAME,
+            SCHEMA_NAME                                             AS SCHEMA_NAME,
+            TABLE_NAME                                              AS TABLE_NAME,
+            ROUND(NVL(CREDITS_USED,0),2)                            AS CREDITS_USED,
+            ROUND(NVL(NUM_BYTES_RECLUSTERED,0),2)                   AS NUM_BYTES_RECLUSTERED,
+            ROUND(NVL(NUM_ROWS_RECLUSTERED,0),2)                    AS NUM_ROWS_RECLUSTERED,
+        FROM SNOWFLAKE.ACCOUNT_USAGE.AUTOMATIC_CLUSTERING_HISTORY T
+        WHERE  T.START_TIME >= {since_months}
+        AND NUM_ROWS_RECLUSTERED>0
+        ORDER BY TOP_N
+        LIMIT 100
+        """},
+    "table_history_users_with_recent_password_changes":{
+        "section":"E - Security", "chart":"table", "file":"users_with_recent_password_changes.html", "title":"Users with recent password changes",
+        "columns":["TOP_N","PASSWORD_LAST_SET_TIME","USER_ID","NAME","CREATED_ON","DELETED_ON","LOGIN_NAME","DISPLAY_NAME","FIRST_NAME","LAST_NAME","EMAIL","MUST_CHANGE_PASSWORD","HAS_PASSWORD","COMMENT","DISABLED","SNOWFLAKE_LOCK","DEFAULT_WAREHOUSE","DEFAULT_NAMESPACE","DEFAULT_ROLE","EXT_AUTHN_DUO","EXT_AUTHN_UID","BYPASS_MFA_UNTIL","LAST_SUCCESS_LOGIN","EXPIRES_AT","LOCKED_UNTIL_TIME","HAS_RSA_PUBLIC_KEY","OWNER","DEFAULT_SECONDARY_ROLE"],
+        "grow_last_column":True, "write_empty":True,
+        "sql":"""
+        WITH DATA AS (
+              SELECT 
+                ROW_NUMBER() OVER (ORDER BY PASSWORD_LAST_SET_TIME  DESC)       AS TOP_N,
+                PASSWORD_LAST_SET_TIME      AS PASSWORD_LAST_SET_TIME,
+                USER_ID                     AS USER_ID,
+                NAME                        AS NAME,
+                CREATED_ON                  AS CREATED_ON,
+                DELETED_ON                  AS DELETED_ON,
+                LOGIN_NAME                  AS LOGIN_NAME,
+                DISPLAY_NAME                AS DISPLAY_NAME,
+                FIRST_NAME                  AS FIRST_NAME,
+                LAST_NAME                   AS LAST_NAME,
+                EMAIL                       AS EMAIL,
+                MUST_CHANGE_PASSWORD        AS MUST_CHANGE_PASSWORD,
+                HAS_PASSWORD                AS HAS_PASSWORD,
+                COMMENT                     AS COMMENT,
+                DISABLED                    AS DISABLED,
+                SNOWFLAKE_LOCK              AS SNOWFLAKE_LOCK,
+                DEFAULT_WAREHOUSE           AS DEFAULT_WAREHOUSE,
+                DEFAULT_NAMESPACE           AS DEFAULT_NAMESPACE,
+                DEFAULT_ROLE                AS DEFAULT_ROLE,
+                EXT_AUTHN_DUO               AS EXT_AUTHN_DUO,
+                EXT_AUTHN_UID               AS EXT_AUTHN_UID,
+                BYPASS_MFA_UNTIL            AS BYPASS_MFA_UNTIL,
+                LAST_SUCCESS_LOGIN          AS LAST_SUCCESS_LOGIN,
+                EXPIRES_AT                  AS EXPIRES_AT,
+                LOCKED_UNTIL_TIME           AS LOCKED_UNTIL_TIME,
+                HAS_RSA_PUBLIC_KEY          AS HAS_RSA_PUBLIC_KEY,
+                OWNER                       AS OWNER,
+                DEFAULT_SECONDARY_ROLE      AS DEFAULT_SECONDARY_ROLE,
+              FROM SNOWFLAKE.ACCOUNT_USAGE.USERS    
+              WHERE PASSWORD_LAST_SET_TIME > DATEADD(MONTH,{months_history},TO_TIMESTAMP({report_formatted_time}))
+              ORDER BY PASSWORD_LAST_SET_TIME DESC
+        )
+        SELECT 
+            *
+        FROM DATA
+        WHERE TOP_N<=100
+        ORDER BY TOP_N;
+        """},
+    "table_history_ip_changes":{
+        "section":"E - Security", "chart":"table", "file":"changes_on_ip_used_for_logins.html", "title":"Users with changes on IP used for login",
+        "columns":["Num","DATE","USER_NAME","CLIENT_IP","REPORTED_CLIENT_TYPE","REPORTED_CLIENT_VERSION","FIRST_AUTHENTICATION_FACTOR","SECOND_AUTHENTICATION_FACTOR","ERROR_CODE","ERROR_MESSAGE"],
+        "grow_last_column":True, "write_empty":True,
+        "sql":"""
+        WITH DATA AS (
+            SELECT
+                DATE_TRUNC('HOUR',EVENT_TIMESTAMP::TIMESTAMP_NTZ)   AS DATE, 
+                USER_NAME                                           AS USER_NAME ,
+                CLIENT_IP                                           AS CLIENT_IP,
+                REPORTED_CLIENT_TYPE                                AS REPORTED_CLIENT_TYPE,
+                REPORTED_CLIENT_VERSION                             AS REPORTED_CLIENT_VERSION,
+                FIRST_AUTHENTICATION_FACTOR                         AS FIRST_AUTHENTICATION_FACTOR,
+                SECOND_AUTHENTICATION_FACTOR                        AS SECOND_AUTHENTICATION_FACTOR,
+                ERROR_CODE                                          AS ERROR_CODE,
+                ERROR_MESSAGE                                       AS ERROR_MESSAGE
+            FROM {subset:LOGIN_HISTORY_WINDOW}   Q
+            WHERE  EVENT_TIMESTAMP >= {since_months}
+            QUALIFY   CLIENT_IP!=
+            LAG (CLIENT_IP,1,NULL)  OVER (PARTITION BY USER_NAME ORDER BY EVENT_TIMESTAMP)            
         )
-        SELECT ARRAY_CONSTRUCT(*) FROM PIVOT_DATA ORDER BY DATE
-        """
-
-        cur = conn.cursor()
-        cur.execute(sql_query)
-        
-        if int(cur.rowcount)!=0:
-            for row  in cur:
-                html_file=html_file+str(row[0])+""","""
-                        
-            html_file=html_file+html_body1
-                
-            for i in range(1, column_count):
-                if i==column_count-1:
-                    html_file=html_file+"""row["""+str(i)+"""]"""
-                else:
-                    html_file=html_file+"""row["""+str(i)+"""],"""
-            
-            html_file=html_file+html_body2+"""
-            title: `Prismafy v1.0 - https://github.com/prismafy/prismafy
-            Chart Creation Date: """+report_formatted_time+"""
-            Credits Used for Replication by database`,"""+html_line_hour_tail
-
-            create_output_file('credits_replication_by_database.html',html_file)
-            report_sections["C - Credits"].update({'credits_replication_by_database.html':'line'})
-        
-    except Exception as error:
-        print("[line_history_credits_replication_by_database]: An exception occurred:", error)
-
-def table_history_client_driver_changes(conn):
-
-    try:    
-        global snowflake_conn
-        global html_table_header
-        global html_table_tail
-        global report_sections
-        conn =snowflake_conn        
-        html_file=html_table_header
-        
-        sql_query=sql_header+"""
+        SELECT 
+            ROW_NUMBER() OVER (PARTITION BY USER_NAME ORDER BY DATE DESC)       AS row_num,
+            *
+        FROM DATA
+        QUALIFY row_num<=50 
+        ORDER BY USER_NAME,1
+        LIMIT 1000
+        """},
+    "table_history_client_driver_changes":{
+        "section":"E - Security", "chart":"table", "file":"changes_on_client_driver_used_for_logins.html", "title":"Users with changes on client driver used for login",
+        "columns":["Num","DATE","USER_NAME","CLIENT_IP","REPORTED_CLIENT_TYPE","REPORTED_CLIENT_VERSION","FIRST_AUTHENTICATION_FACTOR","SECOND_AUTHENTICATION_FACTOR","ERROR_CODE","ERROR_MESSAGE"],
+        "grow_last_column":True, "write_empty":True,
+        "sql":"""
         WITH DATA AS (
             SELECT                 
                 DATE_TRUNC('HOUR',EVENT_TIMESTAMP::TIMESTAMP_NTZ)   AS DATE, 
@@ -6966,8 +5904,8 @@ def table_history_client_driver_changes(conn):
                 SECOND_AUTHENTICATION_FACTOR                        AS SECOND_AUTHENTICATION_FACTOR,
                 ERROR_CODE                                          AS ERROR_CODE,
                 ERROR_MESSAGE                                       AS ERROR_MESSAGE
-            FROM snowflake.account_usage.LOGIN_HISTORY   Q
-            WHERE  TO_DATE(EVENT_TIMESTAMP) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP(CURRENT_DATE()))
+            FROM {subset:LOGIN_HISTORY_WINDOW}   Q
+            WHERE  EVENT_TIMESTAMP >= {since_months}
             QUALIFY   REPORTED_CLIENT_TYPE!=
             LAG (REPORTED_CLIENT_TYPE,1,NULL)  OVER (PARTITION BY USER_NAME ORDER BY EVENT_TIMESTAMP)
         )
@@ -6978,431 +5916,590 @@ def table_history_client_driver_changes(conn):
         QUALIFY row_num<=50 
         ORDER BY USER_NAME,1
         LIMIT 1000
-        """
-        
-        cur = conn.cursor()
-        cur.execute(sql_query)
-    
-        html_file=html_file+"""
-        <h3>Users with changes on client driver used for login</h3>
-        <table class="tabla1">
-        <tr>
-        <th >Num</th>
-        <th >DATE</th>
-        <th >USER_NAME</th>
-        <th >CLIENT_IP</th>
-        <th >REPORTED_CLIENT_TYPE</th>
-        <th >REPORTED_CLIENT_VERSION</th>
-        <th >FIRST_AUTHENTICATION_FACTOR</th>
-        <th >SECOND_AUTHENTICATION_FACTOR</th>
-        <th >ERROR_CODE</th>
-        <th >ERROR_MESSAGE</th>
-        """
-    
-        if int(cur.rowcount)!=0:
-            for (ROW_NUM,ROW_DATE, ROW_COUNT_LOGINS, ROW_CLIENT_IP, ROW_REPORTED_CLIENT_TYPE, ROW_REPORTED_CLIENT_VERSION, ROW_FIRST_AUTHENTICATION_FACTOR, ROW_SECOND_AUTHENTICATION_FACTOR, ROW_ERROR_CODE, ROW_ERROR_MESSAGE) in cur:
-                html_file=html_file+""" <tr> 
-                <td>"""+str(ROW_NUM)+"""</td>
-                <td>"""+str(ROW_DATE)+"""</td> 
-                <td>"""+str(ROW_COUNT_LOGINS)+"""</td> 
-                 <td>"""+str(ROW_CLIENT_IP)+"""</td> 
-                 <td>"""+str(ROW_REPORTED_CLIENT_TYPE)+"""</td> 
-                 <td>"""+str(ROW_REPORTED_CLIENT_VERSION)+"""</td> 
-                 <td>"""+str(ROW_FIRST_AUTHENTICATION_FACTOR)+"""</td> 
-                 <td>"""+str(ROW_SECOND_AUTHENTICATION_FACTOR)+"""</td> 
-                 <td>"""+str(ROW_ERROR_CODE)+"""</td> 
-                 <td class="cell_grow">"""+str(ROW_ERROR_MESSAGE)+"""</td> 
-                </tr> """
-            
-            html_file=html_file+html_table_tail
-        
-        create_output_file('changes_on_client_driver_used_for_logins.html',html_file)
-        report_sections["E - Security"].update({'changes_on_client_driver_used_for_logins.html':'table'})
-    
-    except Exception as error:
-        print("[table_history_client_driver_changes]: An exception occurred:", error)
-
-def table_history_ip_changes(conn):
-
-    try:    
-        global snowflake_conn
-        global html_table_header
-        global html_table_tail
-        global report_sections
-        conn =snowflake_conn        
-        html_file=html_table_header
-        
-        sql_query=sql_header+"""
+        """},
+    "table_history_top_cloud_data_transfer":{
+        "section":"F - Data Transfer", "chart":"table", "file":"history_top_clouds_by_data_transfer.html", "title":"Top clouds by data transfer",
+        "columns":["TOP_N","DATE","SOURCE_CLOUD","SOURCE_REGION","TARGET_CLOUD","TARGET_REGION","GB_TRANSFERRED","TRANSFER_TYPE"],
+        "write_empty":True,
+        "sql":"""
+        SELECT 
+            ROW_NUMBER() over (order by BYTES_TRANSFERRED DESC )    AS TOP_N,
+            START_TIME::TIMESTAMP_NTZ                               AS DATE,
+            SOURCE_CLOUD                                            AS SOURCE_CLOUD,
+            SOURCE_REGION                                           AS SOURCE_REGION,
+            TARGET_CLOUD                                            AS TARGET_CLOUD,
+            TARGET_REGION                                           AS TARGET_REGION,
+            ROUND(BYTES_TRANSFERRED/1024/1024/1024,2)               AS GB_TRANSFERRED,
+            TRANSFER_TYPE                                           AS TRANSFER_TYPE,
+        FROM SNOWFLAKE.ACCOUNT_USAGE.DATA_TRANSFER_HISTORY T
+        WHERE T.START_TIME >= {since_months}
+        ORDER BY TOP_N ASC
+        LIMIT 100
+        ;
+        """},
+    "table_history_external_functions":{
+        "section":"F - Data Transfer", "chart":"table", "file":"external_functions.html", "title":"Users with changes on client driver used for login",
+        "columns":["FUNCTION_NAME","FUNCTION_SCHEMA","FUNCTION_DATABASE","FUNCTION_OWNER","CREATED","LAST_ALTERED","API_INTEGRATION ","EXTERNAL_ACCESS_INTEGRATIONS","DATA_TYPE","ARGUMENT_SIGNATURE","CHARACTER_MAXIMUM_LENGTH","CHARACTER_OCTET_LENGTH","NUMERIC_PRECISION","NUMERIC_PRECISION_RADIX","NUMERIC_SCALE","FUNCTION_LANGUAGE","VOLATILITY","IS_NULL_CALL","CONTEXT_HEADERS ","MAX_BATCH_ROWS ","COMPRESSION ","PACKAGES","RUNTIME_VERSION","INSTALLED_PACKAGES","OWNER_ROLE_TYPE","IS_MEMOIZABLE","IS_DATA_METRIC","FUNCTION_DEFINITION"],
+        "grow_last_column":True, "write_empty":True,
+        "sql":"""
+        SELECT                 
+            FUNCTION_NAME, 
+            FUNCTION_SCHEMA,
+            FUNCTION_CATALOG FUNCTION_DATABASE,
+            FUNCTION_OWNER,
+            CREATED,
+            LAST_ALTERED,
+            API_INTEGRATION ,
+            EXTERNAL_ACCESS_INTEGRATIONS,
+            DATA_TYPE,
+            ARGUMENT_SIGNATURE,
+            CHARACTER_MAXIMUM_LENGTH,
+            CHARACTER_OCTET_LENGTH,
+            NUMERIC_PRECISION,
+            NUMERIC_PRECISION_RADIX,
+            NUMERIC_SCALE,
+            FUNCTION_LANGUAGE,                
+            VOLATILITY,
+            IS_NULL_CALL,
+            CONTEXT_HEADERS ,
+            MAX_BATCH_ROWS ,
+            COMPRESSION ,
+            PACKAGES,
+            RUNTIME_VERSION,
+            INSTALLED_PACKAGES,
+            OWNER_ROLE_TYPE,
+            IS_MEMOIZABLE,
+            IS_DATA_METRIC,
+            FUNCTION_DEFINITION
+        FROM snowflake.account_usage.FUNCTIONS 
+        WHERE DELETED IS NULL 
+        AND IS_EXTERNAL ='YES'
+        ORDER BY CREATED DESC
+        """},
+    "table_history_need_attention_tasks":{
+        "section":"G - Maintenance", "chart":"table", "file":"need_attention_tasks.html", "title":"Tasks that need attention", "table_class":"tabla2",
+        "columns":["TOP_N","TASK_NAME","CONDITION_TEXT","SCHEMA_NAME","TASK_SCHEMA_ID","DATABASE_NAME","TASK_DATABASE_ID","SCHEDULED_TIME","COMPLETED_TIME","STATE","RETURN_VALUE","QUERY_ID","QUERY_START_TIME","ERROR_CODE","ERROR_MESSAGE","GRAPH_VERSION","RUN_ID","ROOT_TASK_ID","SCHEDULED_FROM","ATTEMPT_NUMBER","INSTANCE_ID","CONFIG","QUERY_HASH","QUERY_HASH_VERSION","QUERY_PARAMETERIZED_HASH","QUERY_PARAMETERIZED_HASH_VERSION","GRAPH_RUN_GROUP_ID","QUERY_TEXT"],
+        "grow_last_column":True, "write_empty":True,
+        "sql":"""
+        WITH HIST AS (
+              SELECT 
+                ROW_NUMBER() OVER (PARTITION  BY DATABASE_NAME, SCHEMA_NAME, NAME ORDER BY SCHEDULED_TIME  DESC)       AS TOP_N,
+                NAME,
+                CONDITION_TEXT,
+                SCHEMA_NAME,
+                TASK_SCHEMA_ID,
+                DATABASE_NAME,
+                TASK_DATABASE_ID,
+                SCHEDULED_TIME,
+                COMPLETED_TIME,
+                STATE,
+                RETURN_VALUE,
+                QUERY_ID,
+                QUERY_START_TIME,
+                ERROR_CODE,
+                ERROR_MESSAGE,
+                GRAPH_VERSION,
+                RUN_ID,
+                ROOT_TASK_ID,
+                SCHEDULED_FROM,
+                ATTEMPT_NUMBER,
+                INSTANCE_ID,
+                CONFIG,
+                QUERY_HASH,
+                QUERY_HASH_VERSION,
+                QUERY_PARAMETERIZED_HASH,
+                QUERY_PARAMETERIZED_HASH_VERSION,
+                GRAPH_RUN_GROUP_ID,     
+                QUERY_TEXT 
+              FROM SNOWFLAKE.ACCOUNT_USAGE.TASK_HISTORY       
+              WHERE SCHEDULED_TIME > DATEADD(MONTH,{months_history},TO_TIMESTAMP({report_formatted_time})) 
+        )
+        , DATA AS (
+              SELECT 
+                *
+              FROM HIST     
+              WHERE TOP_N<=5
+        )
+        , WARNING_TASKS AS (
+            SELECT 
+                DATABASE_NAME, SCHEMA_NAME, NAME
+            FROM DATA
+            WHERE    STATE!='SUCCEEDED'
+        )
+        SELECT * 
+        FROM DATA 
+        WHERE (DATABASE_NAME, SCHEMA_NAME, NAME) IN (SELECT DATABASE_NAME, SCHEMA_NAME, NAME FROM WARNING_TASKS)
+        ORDER BY DATABASE_NAME, SCHEMA_NAME, NAME, TOP_N
+        ;
+        """},
+    "table_history_need_attention_snowpipes":{
+        "section":"G - Maintenance", "chart":"table", "file":"need_attention_snowpipes.html", "title":"Snowpipes that need attention", "table_class":"tabla2",
+        "columns":["TOP_N","FILE_NAME","STAGE_LOCATION","LAST_LOAD_TIME","ROW_COUNT","ROW_PARSED","FILE_SIZE","FIRST_ERROR_MESSAGE","FIRST_ERROR_LINE_NUMBER","FIRST_ERROR_CHARACTER_POS","FIRST_ERROR_COLUMN_NAME","ERROR_COUNT","ERROR_LIMIT","STATUS","TABLE_ID","TABLE_NAME","TABLE_SCHEMA_ID","TABLE_SCHEMA_NAME","TABLE_CATALOG_ID","TABLE_CATALOG_NAME","PIPE_CATALOG_NAME","PIPE_SCHEMA_NAME","PIPE_NAME","PIPE_RECEIVED_TIME","FIRST_COMMIT_TIME"],
+        "grow_last_column":True, "write_empty":True,
+        "sql":"""
+        WITH HIST AS (
+              SELECT 
+                ROW_NUMBER() OVER (PARTITION BY PIPE_CATALOG_NAME, PIPE_SCHEMA_NAME, PIPE_NAME ORDER BY LAST_LOAD_TIME  DESC)       AS TOP_N,
+                FILE_NAME,
+                STAGE_LOCATION,
+                LAST_LOAD_TIME,
+                ROW_COUNT,
+                ROW_PARSED,
+                FILE_SIZE,
+                FIRST_ERROR_MESSAGE,
+                FIRST_ERROR_LINE_NUMBER,
+                FIRST_ERROR_CHARACTER_POS,
+                FIRST_ERROR_COLUMN_NAME,
+                ERROR_COUNT,
+                ERROR_LIMIT,
+                STATUS,
+                TABLE_ID,
+                TABLE_NAME,
+                TABLE_SCHEMA_ID,
+                TABLE_SCHEMA_NAME,
+                TABLE_CATALOG_ID,
+                TABLE_CATALOG_NAME,
+                PIPE_CATALOG_NAME,
+                PIPE_SCHEMA_NAME,
+                PIPE_NAME,
+                PIPE_RECEIVED_TIME,
+                FIRST_COMMIT_TIME
+              FROM SNOWFLAKE.ACCOUNT_USAGE.COPY_HISTORY        
+              WHERE LAST_LOAD_TIME > DATEADD(MONTH,{months_history},TO_TIMESTAMP({report_formatted_time})) 
+              AND PIPE_NAME IS NOT NULL
+        )
+        , DATA AS (
+              SELECT 
+                *
+              FROM HIST     
+              WHERE TOP_N<=5
+        )
+        , WARNING_SNOWPIPES AS (
+            SELECT 
+                PIPE_CATALOG_NAME, PIPE_SCHEMA_NAME, PIPE_NAME 
+            FROM DATA
+            WHERE    STATUS!='Loaded'
+        )
+        SELECT * 
+        FROM DATA 
+        WHERE (PIPE_CATALOG_NAME, PIPE_SCHEMA_NAME, PIPE_NAME ) IN (SELECT PIPE_CATALOG_NAME, PIPE_SCHEMA_NAME, PIPE_NAME  FROM WARNING_SNOWPIPES)
+        ORDER BY PIPE_CATALOG_NAME, PIPE_SCHEMA_NAME, PIPE_NAME, TOP_N
+        ;
+        """},
+    "line_history_bytes_details_by_query_parameterized_hash":{
+        "section":"D - Performance", "chart":"line", "file":"history_bytes_details_for_{entity}.html", "title":"Bytes Details for query {entity} in the last month", "tail":html_line_hour_tail,
+        "columns":["DATE","GB_READ_FROM_RESULT","GB_SPILLED_TO_LOCAL_STORAGE","GB_SPILLED_TO_REMOTE_STORAGE","GB_SENT_OVER_THE_NETWORK","GB_WRITTEN","GB_WRITTEN_TO_RESULT","GB_SCANNED","GB_DELETED","OUTBOUND_DATA_TRANSFER_GB","INBOUND_DATA_TRANSFER_GB","EXTERNAL_FUNCTION_TOTAL_SENT_GB","EXTERNAL_FUNCTION_TOTAL_RECEIVED_GB","QUERY_ACCELERATION_GB_SCANNED"],
+        "options":"trendlines: {6:{type: 'linear', color: '#16F529', labelInLegend: 'Trend for gb_scanned', visibleInLegend: true, opacity: 0.6, pointsVisible: false, lineWidth:2}},",
+        "sql":"""
+        WITH DATA AS (
+        SELECT DATE_TRUNC('HOUR',START_TIME::TIMESTAMP_NTZ)                          AS START_TIME , 
+        ROUND(MAX(NVL(BYTES_READ_FROM_RESULT,0)/1024/1024/1024),2)                   AS GB_READ_FROM_RESULT,
+        ROUND(MAX(NVL(BYTES_SPILLED_TO_LOCAL_STORAGE,0)/1024/1024/1024),2)           AS GB_SPILLED_TO_LOCAL_STORAGE,
+        ROUND(MAX(NVL(BYTES_SPILLED_TO_REMOTE_STORAGE,0)/1024/1024/1024),2)          AS GB_SPILLED_TO_REMOTE_STORAGE,
+        ROUND(MAX(NVL(BYTES_SENT_OVER_THE_NETWORK,0)/1024/1024/1024 ),2)             AS GB_SENT_OVER_THE_NETWORK,
+        ROUND(MAX(NVL(BYTES_WRITTEN,0)/1024/1024/1024),2)                            AS GB_WRITTEN,
+        ROUND(MAX(NVL(BYTES_WRITTEN_TO_RESULT,0)/1024/1024/1024),2)                  AS GB_WRITTEN_TO_RESULT,
+        ROUND(MAX(NVL(BYTES_SCANNED,0)/1024/1024/1024),2)                            AS GB_SCANNED   ,
+        ROUND(MAX(NVL(BYTES_DELETED,0)/1024/1024/1024),2)                            AS GB_DELETED,
+        ROUND(MAX(NVL(OUTBOUND_DATA_TRANSFER_BYTES,0)/1024/1024/1024),2)             AS OUTBOUND_DATA_TRANSFER_GB,
+        ROUND(MAX(NVL(INBOUND_DATA_TRANSFER_BYTES,0)/1024/1024/1024),2)              AS INBOUND_DATA_TRANSFER_GB,
+        ROUND(MAX(NVL(EXTERNAL_FUNCTION_TOTAL_SENT_BYTES,0)/1024/1024/1024),2)       AS EXTERNAL_FUNCTION_TOTAL_SENT_GB,
+        ROUND(MAX(NVL(EXTERNAL_FUNCTION_TOTAL_RECEIVED_BYTES,0)/1024/1024/1024),2)   AS EXTERNAL_FUNCTION_TOTAL_RECEIVED_GB,
+        ROUND(MAX(NVL(QUERY_ACCELERATION_BYTES_SCANNED,0)/1024/1024/1024),2)         AS QUERY_ACCELERATION_GB_SCANNED
+        FROM SNOWFLAKE.ACCOUNT_USAGE.QUERY_HISTORY Q
+        WHERE  Q.START_TIME >= {since_months}
+        AND TOTAL_ELAPSED_TIME > 0 
+        AND QUERY_PARAMETERIZED_HASH='{entity}'
+        GROUP BY 1
+        ORDER BY START_TIME  
+        )
+        SELECT ARRAY_CONSTRUCT(*) AS DATA FROM DATA;
+        """},
+    "line_history_calls_details_by_query_parameterized_hash":{
+        "section":"D - Performance", "chart":"line", "file":"calls_details_for_{entity}.html", "title":"Calls Detail for query {entity}", "tail":html_line_hour_tail,
+        "columns":["START_TIME","CALLS"],
+        "options":"trendlines: {0:{type: 'linear', color: '#16F529', labelInLegend: 'Trend for calls', visibleInLegend: true, opacity: 0.6, pointsVisible: false, lineWidth:2}},",
+        "sql":"""
         WITH DATA AS (
-            SELECT
-                DATE_TRUNC('HOUR',EVENT_TIMESTAMP::TIMESTAMP_NTZ)   AS DATE, 
-                USER_NAME                                           AS USER_NAME ,
-                CLIENT_IP                                           AS CLIENT_IP,
-                REPORTED_CLIENT_TYPE                                AS REPORTED_CLIENT_TYPE,
-                REPORTED_CLIENT_VERSION                             AS REPORTED_CLIENT_VERSION,
-                FIRST_AUTHENTICATION_FACTOR                         AS FIRST_AUTHENTICATION_FACTOR,
-                SECOND_AUTHENTICATION_FACTOR                        AS SECOND_AUTHENTICATION_FACTOR,
-                ERROR_CODE                                          AS ERROR_CODE,
-                ERROR_MESSAGE                                       AS ERROR_MESSAGE
-            FROM snowflake.account_usage.LOGIN_HISTORY   Q
-            WHERE  TO_DATE(EVENT_TIMESTAMP) > DATEADD(MONTH,"""+months_history+""",TO_TIMESTAMP(CURRENT_DATE()))
-            QUALIFY   CLIENT_IP!=
-            LAG (CLIENT_IP,1,NULL)  OVER (PARTITION BY USER_NAME ORDER BY EVENT_TIMESTAMP)            
+            SELECT DATE_TRUNC('HOUR',INTERVAL_START_TIME::TIMESTAMP_NTZ)    AS START_TIME , 
+                SUM(NVL(CALLS,0))                                           AS CALLS
+            FROM SNOWFLAKE.ACCOUNT_USAGE.AGGREGATE_QUERY_HISTORY  Q
+            WHERE  Q.INTERVAL_START_TIME >= {since_months}
+            AND QUERY_PARAMETERIZED_HASH='{entity}'
+            GROUP BY 1
+            ORDER BY START_TIME  
         )
-        SELECT 
-            ROW_NUMBER() OVER (PARTITION BY USER_NAME ORDER BY DATE DESC)       AS row_num,
-            *
-        FROM DATA
-        QUALIFY row_num<=50 
-        ORDER BY USER_NAME,1
-        LIMIT 1000
-        """
-        
-        cur = conn.cursor()
-        cur.execute(sql_query)
-    
-        html_file=html_file+"""
-        <h3>Users with changes on IP used for login</h3>
-        <table class="tabla1">
-        <tr>
-        <th >Num</th>
-        <th >DATE</th>
-        <th >USER_NAME</th>
-        <th >CLIENT_IP</th>
-        <th >REPORTED_CLIENT_TYPE</th>
-        <th >REPORTED_CLIENT_VERSION</th>
-        <th >FIRST_AUTHENTICATION_FACTOR</th>
-        <th >SECOND_AUTHENTICATION_FACTOR</th>
-        <th >ERROR_CODE</th>
-        <th >ERROR_MESSAGE</th>
-        """
-    
-        if int(cur.rowcount)!=0:
-            for (ROW_NUM,ROW_DATE, ROW_COUNT_LOGINS, ROW_CLIENT_IP, ROW_REPORTED_CLIENT_TYPE, ROW_REPORTED_CLIENT_VERSION, ROW_FIRST_AUTHENTICATION_FACTOR, ROW_SECOND_AUTHENTICATION_FACTOR, ROW_ERROR_CODE, ROW_ERROR_MESSAGE) in cur:
-                html_file=html_file+""" <tr> 
-                <td>"""+str(ROW_NUM)+"""</td> 
-                <td>"""+str(ROW_DATE)+"""</td> 
-                <td>"""+str(ROW_COUNT_LOGINS)+"""</td> 
-                 <td>"""+str(ROW_CLIENT_IP)+"""</td> 
-                 <td>"""+str(ROW_REPORTED_CLIENT_TYPE)+"""</td> 
-                 <td>"""+str(ROW_REPORTED_CLIENT_VERSION)+"""</td> 
-                 <td>"""+str(ROW_FIRST_AUTHENTICATION_FACTOR)+"""</td> 
-                 <td>"""+str(ROW_SECOND_AUTHENTICATION_FACTOR)+"""</td> 
-                 <td>"""+str(ROW_ERROR_CODE)+"""</td> 
-                 <td class="cell_grow">"""+str(ROW_ERROR_MESSAGE)+"""</td> 
-                </tr> """
-            
-            html_file=html_file+html_table_tail
-        
-        create_output_file('changes_on_ip_used_for_logins.html',html_file)
-        report_sections["E - Security"].update({'changes_on_ip_used_for_logins.html':'table'})
-
-    
-    except Exception as error:
-        print("[table_history_ip_changes]: An exception occurred:", error)
-
-def table_history_external_functions(conn):
+        SELECT ARRAY_CONSTRUCT(*) AS DATA FROM DATA;
+        """},
+    "line_history_time_details_by_query_parameterized_hash":{
+        "section":"D - Performance", "chart":"line", "file":"time_details_for_{entity}.html", "title":"Time Details for query {entity}", "tail":html_line_hour_tail,
+        "columns":["DATE","QUERY_EXECUTION_TIME_SECONDS","COMPILATION_TIME_SECONDS","EXECUTION_TIME_SECONDS","QUEUED_PROVISIONING_TIME_SECONDS","QUEUED_OVERLOAD_TIME_SECONDS","TRANSACTION_BLOCKED_TIME_SECONDS","QUEUED_REPAIR_TIME_SECONDS","LIST_EXTERNAL_FILES_TIME_SECONDS","CHILD_QUERIES_WAIT_TIME_SECONDS","QUERY_RETRY_TIME_SECONDS","FAULT_HANDLING_TIME_SECONDS"],
+        "options":"trendlines: {0:{type: 'linear', color: '#16F529', labelInLegend: 'Trend for query_execution_time_seconds', visibleInLegend: true, opacity: 0.6, pointsVisible: false, lineWidth:2}},",
+        "sql":"""
+        WITH DATA AS (
+        SELECT DATE_TRUNC('HOUR',START_TIME::TIMESTAMP_NTZ)            AS START_TIME , 
+            ROUND(MAX(NVL(total_elapsed_time,0))/1000,2)                 AS QUERY_EXECUTION_TIME_SECONDS,
+            ROUND(MAX(NVL(COMPILATION_TIME,0))/1000,2)                   AS COMPILATION_TIME_SECONDS,
+            ROUND(MAX(NVL(EXECUTION_TIME,0))/1000,2)                     AS EXECUTION_TIME_SECONDS,
+            ROUND(MAX(NVL(QUEUED_PROVISIONING_TIME,0) )/1000,2)          AS QUEUED_PROVISIONING_TIME_SECONDS,
+            ROUND(MAX(NVL(QUEUED_OVERLOAD_TIME,0))/1000,2)               AS QUEUED_OVERLOAD_TIME_SECONDS,
+            ROUND(MAX(NVL(TRANSACTION_BLOCKED_TIME,0))/1000,2)           AS TRANSACTION_BLOCKED_TIME_SECONDS,
+            ROUND(MAX(NVL(QUEUED_REPAIR_TIME,0))/1000,2)                 AS QUEUED_REPAIR_TIME_SECONDS   ,
+            ROUND(MAX(NVL(LIST_EXTERNAL_FILES_TIME,0))/1000,2)           AS LIST_EXTERNAL_FILES_TIME_SECONDS,
+            ROUND(MAX(NVL(CHILD_QUERIES_WAIT_TIME,0))/1000,2)            AS CHILD_QUERIES_WAIT_TIME_SECONDS,
+            ROUND(MAX(NVL(QUERY_RETRY_TIME,0))/1000,2)                   AS QUERY_RETRY_TIME_SECONDS,
+            ROUND(MAX(NVL(FAULT_HANDLING_TIME,0))/1000,2)                AS FAULT_HANDLING_TIME_SECONDS,
+        FROM snowflake.account_usage.query_history Q
+        WHERE  Q.start_time >= {since_months}
+            AND total_elapsed_time > 0 
+            and query_parameterized_hash='{entity}'
+        GROUP BY 1
+        ORDER BY START_TIME  
+        )
+        SELECT ARRAY_CONSTRUCT(*) AS DATA FROM DATA;
+        """},
+    "line_history_rows_details_by_query_parameterized_hash":{
+        "section":"D - Performance", "chart":"line", "file":"rows_details_for_{entity}.html", "title":"Rows Details for query {entity}", "tail":html_line_hour_tail,
+        "columns":["DATE","ROWS_PRODUCED","ROWS_INSERTED","ROWS_UPDATED","ROWS_DELETED","ROWS_UNLOADED","EXTERNAL_FUNCTION_TOTAL_SENT_ROWS","EXTERNAL_FUNCTION_TOTAL_RECEIVED_ROWS","ROWS_WRITTEN_TO_RESULT"],
+        "options":"trendlines: {0:{type: 'linear', color: '#16F529', labelInLegend: 'Trend for rows_produced', visibleInLegend: true, opacity: 0.6, pointsVisible: false, lineWidth:2}},",
+        "sql":"""
+        WITH DATA AS (
+        SELECT DATE_TRUNC('HOUR',START_TIME::TIMESTAMP_NTZ)            AS START_TIME , 
+            ROUND(MAX(NVL(ROWS_PRODUCED,0)),2)                           AS ROWS_PRODUCED,
+            ROUND(MAX(NVL(ROWS_INSERTED,0)),2)                           AS ROWS_INSERTED,
+            ROUND(MAX(NVL(ROWS_UPDATED,0)),2)                            AS ROWS_UPDATED,
+            ROUND(MAX(NVL(ROWS_DELETED,0) ),2)                           AS ROWS_DELETED,
+            ROUND(MAX(NVL(ROWS_UNLOADED,0)),2)                           AS ROWS_UNLOADED,
+            ROUND(MAX(NVL(EXTERNAL_FUNCTION_TOTAL_SENT_ROWS,0)),2)       AS EXTERNAL_FUNCTION_TOTAL_SENT_ROWS,
+            ROUND(MAX(NVL(EXTERNAL_FUNCTION_TOTAL_RECEIVED_ROWS,0)),2)   AS EXTERNAL_FUNCTION_TOTAL_RECEIVED_ROWS   ,
+            ROUND(MAX(NVL(ROWS_WRITTEN_TO_RESULT,0)),2)                  AS ROWS_WRITTEN_TO_RESULT,
+        FROM snowflake.account_usage.query_history Q
+        WHERE  Q.start_time >= {since_months}
+            AND total_elapsed_time > 0 --only get queries that actually used compute
+            and query_parameterized_hash='{entity}'
+        GROUP BY 1
+        ORDER BY START_TIME  
+        )
+        SELECT ARRAY_CONSTRUCT(*) AS DATA FROM DATA;
+        """},
+    "line_history_load_details_by_warehouse":{
+        "section":"A - Computing", "chart":"line", "file":"history_load_details_for_warehouse_{entity}.html", "title":"Load Details for warehouse {entity}", "tail":html_line_hour_tail,
+        "columns":["DATE","RUNNING_LOAD","QUEUED_LOAD","QUEUED_PROVISIONING_LOAD","BLOCKED_LOAD"],
+        "sql":"""
+        WITH DATA AS (
+            SELECT DATE_TRUNC('HOUR',start_time::TIMESTAMP_NTZ) AS START_TIME 
+                ,ROUND(AVG(NVL(AVG_RUNNING,0)),2)                 AS RUNNING_LOAD
+                ,ROUND(MAX(NVL(AVG_QUEUED_LOAD,0)),2)             AS QUEUED_LOAD
+                ,ROUND(MAX(NVL(AVG_QUEUED_PROVISIONING,0)),2)     AS QUEUED_PROVISIONING_LOAD
+                ,ROUND(MAX(NVL(AVG_BLOCKED,0)),2)                 AS BLOCKED_LOAD
+            FROM SNOWFLAKE.ACCOUNT_USAGE.WAREHOUSE_LOAD_HISTORY
+            WHERE START_TIME >= {since_months_inclusive}    
+            AND WAREHOUSE_NAME='{entity}'
+            GROUP BY 1
+            ORDER BY 1
+        )
+        SELECT ARRAY_CONSTRUCT(*) AS DATA  FROM DATA;
+        """}
+}
 
-    try:    
-        global snowflake_conn
-        global html_table_header
-        global html_table_tail
-        global report_sections
-        conn =snowflake_conn        
-        html_file=html_table_header
-        
-        sql_query=sql_header+"""
-        SELECT                 
-            FUNCTION_NAME, 
-            FUNCTION_SCHEMA,
-            FUNCTION_CATALOG FUNCTION_DATABASE,
-            FUNCTION_OWNER,
-            CREATED,
-            LAST_ALTERED,
-            API_INTEGRATION ,
-            EXTERNAL_ACCESS_INTEGRATIONS,
-            DATA_TYPE,
-            ARGUMENT_SIGNATURE,
-            CHARACTER_MAXIMUM_LENGTH,
-            CHARACTER_OCTET_LENGTH,
-            NUMERIC_PRECISION,
-            NUMERIC_PRECISION_RADIX,
-            NUMERIC_SCALE,
-            FUNCTION_LANGUAGE,                
-            VOLATILITY,
-            IS_NULL_CALL,
-            CONTEXT_HEADERS ,
-            MAX_BATCH_ROWS ,
-            COMPRESSION ,
-            PACKAGES,
-            RUNTIME_VERSION,
-            INSTALLED_PACKAGES,
-            OWNER_ROLE_TYPE,
-            IS_MEMOIZABLE,
-            IS_DATA_METRIC,
-            FUNCTION_DEFINITION
-        FROM snowflake.account_usage.FUNCTIONS 
-        WHERE DELETED IS NULL 
-        AND IS_EXTERNAL ='YES'
-        ORDER BY CREATED DESC
-        """
-        
+#Rows fetched per round trip by the report spec engine
+spec_fetch_rows=10000
+
+def spec_sql(sql_template, entity=None, header=True):
+    sql_query=sql_template.replace('{since_months}',since_bound()).replace('{since_months_inclusive}',since_bound('MONTH',months_history,True))
+    sql_query=sql_query.replace('{since_last_month}',since_bound('MONTH',-1)).replace('{since_last_week}',since_bound('DAY',-7))
+    sql_query=sql_query.replace('{months_history}',months_history).replace('{report_formatted_time}',report_formatted_time)
+    for subset_name in shared_subsets:
+        if '{subset:'+subset_name+'}' in sql_query:
+            sql_query=sql_query.replace('{subset:'+subset_name+'}',shared_subset(subset_name))
+    if entity is not None:
+        sql_query=sql_query.replace('{entity}',str(entity))
+    return (sql_header if header else "")+sql_query
+
+def fetch_spec_batch(conn, report_name, batch_name):
+    #The specs of a batch run as one UNION ALL. Every spec fills its own block of columns and leaves the others NULL,
+    #so each block keeps the column types of its spec, and the rows are split back by spec name.
+    #If the batch query fails, every spec runs its own query and keeps its own error. The failure of the batch is not kept
+    #in failed_statements when every spec query succeeds
+    batch_specs=[(spec_name, spec) for spec_name, spec in report_specs.items() if spec.get("batch")==batch_name and spec.get("sql") is not None]
+    width=sum([len(spec["columns"]) for spec_name, spec in batch_specs])
+    batch_rows=dict([(spec_name, []) for spec_name, spec in batch_specs])
+    failures_before=len(failed_statements)
+    try:
+        selects=[]
+        position=0
+        for spec_name, spec in batch_specs:
+            columns=["'"+spec_name+"' AS REPORT_NAME"]
+            columns.extend(["NULL AS COLUMN_"+str(column) for column in range(position)])
+            columns.append("S.*")
+            columns.extend(["NULL AS COLUMN_"+str(column) for column in range(position+len(spec["columns"]), width)])
+            selects.append("""
+        SELECT """+", ".join(columns)+"""
+        FROM ("""+spec_sql(spec["sql"], header=False).strip().rstrip(';')+"""
+        ) S""")
+            position=position+len(spec["columns"])
         cur = conn.cursor()
-        cur.execute(sql_query)
-    
-        html_file=html_file+"""
-        <h3>Users with changes on client driver used for login</h3>
-        <table class="tabla1">
-        <tr>
-        <th >FUNCTION_NAME</th>
-        <th >FUNCTION_SCHEMA</th>
-        <th >FUNCTION_DATABASE</th>
-        <th >FUNCTION_OWNER</th>
-        <th >CREATED</th>
-        <th >LAST_ALTERED</th>
-        <th >API_INTEGRATION </th>
-        <th >EXTERNAL_ACCESS_INTEGRATIONS</th>
-        <th >DATA_TYPE</th>
-        <th >ARGUMENT_SIGNATURE</th>
-        <th >CHARACTER_MAXIMUM_LENGTH</th>
-        <th >CHARACTER_OCTET_LENGTH</th>
-        <th >NUMERIC_PRECISION</th>
-        <th >NUMERIC_PRECISION_RADIX</th>
-        <th >NUMERIC_SCALE</th>
-        <th >FUNCTION_LANGUAGE</th>
-        <th >VOLATILITY</th>
-        <th >IS_NULL_CALL</th>
-        <th >CONTEXT_HEADERS </th>
-        <th >MAX_BATCH_ROWS </th>
-        <th >COMPRESSION </th>
-        <th >PACKAGES</th>
-        <th >RUNTIME_VERSION</th>
-        <th >INSTALLED_PACKAGES</th>
-        <th >OWNER_ROLE_TYPE</th>
-        <th >IS_MEMOIZABLE</th>
-        <th >IS_DATA_METRIC</th>
-        <th >FUNCTION_DEFINITION</th>
-        """
-    
-        if int(cur.rowcount)!=0:
-            for (FUNCTION_NAME, FUNCTION_SCHEMA, FUNCTION_DATABASE, FUNCTION_OWNER, CREATED, LAST_ALTERED, API_INTEGRATION , EXTERNAL_ACCESS_INTEGRATIONS, DATA_TYPE, ARGUMENT_SIGNATURE, CHARACTER_MAXIMUM_LENGTH, CHARACTER_OCTET_LENGTH, NUMERIC_PRECISION, NUMERIC_PRECISION_RADIX, NUMERIC_SCALE, FUNCTION_LANGUAGE, VOLATILITY, IS_NULL_CALL, CONTEXT_HEADERS , MAX_BATCH_ROWS , COMPRESSION , PACKAGES, RUNTIME_VERSION, INSTALLED_PACKAGES, OWNER_ROLE_TYPE, IS_MEMOIZABLE, IS_DATA_METRIC, FUNCTION_DEFINITION) in cur:
-                html_file=html_file+""" <tr> 
-                <td>"""+str(FUNCTION_NAME)+"""</td>
-                <td>"""+str(FUNCTION_SCHEMA)+"""</td> 
-                <td>"""+str(FUNCTION_DATABASE)+"""</td> 
-                <td>"""+str(FUNCTION_OWNER)+"""</td> 
-                <td>"""+str(CREATED)+"""</td> 
-                 <td>"""+str(LAST_ALTERED)+"""</td> 
-                 <td>"""+str(API_INTEGRATION)+"""</td> 
-                 <td>"""+str(EXTERNAL_ACCESS_INTEGRATIONS)+"""</td> 
-                 <td>"""+str(DATA_TYPE)+"""</td> 
-                 <td>"""+str(ARGUMENT_SIGNATURE)+"""</td> 
-                 <td>"""+str(CHARACTER_MAXIMUM_LENGTH)+"""</td> 
-                 <td>"""+str(CHARACTER_OCTET_LENGTH)+"""</td> 
-                 <td>"""+str(NUMERIC_PRECISION)+"""</td> 
-                 <td>"""+str(NUMERIC_PRECISION_RADIX)+"""</td> 
-                 <td>"""+str(NUMERIC_SCALE)+"""</td> 
-                 <td>"""+str(FUNCTION_LANGUAGE)+"""</td> 
-                 <td>"""+str(VOLATILITY)+"""</td> 
-                 <td>"""+str(IS_NULL_CALL)+"""</td> 
-                 <td>"""+str(CONTEXT_HEADERS)+"""</td> 
-                 <td>"""+str(MAX_BATCH_ROWS)+"""</td> 
-                 <td>"""+str(COMPRESSION)+"""</td> 
-                 <td>"""+str(PACKAGES)+"""</td> 
-                 <td>"""+str(RUNTIME_VERSION)+"""</td> 
-                 <td>"""+str(INSTALLED_PACKAGES)+"""</td> 
-                 <td>"""+str(OWNER_ROLE_TYPE)+"""</td> 
-                 <td>"""+str(IS_MEMOIZABLE)+"""</td> 
-                 <td>"""+str(IS_DATA_METRIC)+"""</td> 
-                 <td class="cell_grow">"""+str(FUNCTION_DEFINITION)+"""</td> 
-                </tr> """
-            
-            html_file=html_file+html_table_tail
-        
-        create_output_file('external_functions.html',html_file)
-        report_sections["F - Data Transfer"].update({'external_functions.html':'table'})
-    
+        cur.report_name=report_name
+        cur.execute(sql_header+"""
+        UNION ALL""".join(selects)+";")
+        blocks={}
+        position=1
+        for spec_name, spec in batch_specs:
+            blocks[spec_name]=(position, position+len(spec["columns"]))
+            position=position+len(spec["columns"])
+        for row in cur.fetchall():
+            (start, end)=blocks[row[0]]
+            batch_rows[row[0]].append(row[start:end])
+        for spec_name in batch_rows:
+            batch_rows[spec_name].sort(key=lambda row: row[0])
     except Exception as error:
-        print("[table_history_external_functions]: An exception occurred:", error)
-
-def report_builder():
-    global report_sections
-    global html_table_tail
-    global html_table_header_index
-    move_icon()
-    report_html_index=html_table_header_index   
-
-    change_table=0
-    for section, report_list in report_sections.items():
-        
-        if str(section)=='D - Performance' or str(section)=='E - Security':
-            report_html_index=report_html_index+"""</div><div class="column">"""
-        if change_table==0:
-            report_html_index=report_html_index+"""
-            <h2>Section """+str(section)+"""</h2>
-            <table class="tabla1">
-            <th >Type</th>
-            <th >HTML File Name</th>
-            """    
-            change_table=1
+        print("[fetch_spec_batch]: An exception occurred:", error)
+        batch_failures=len(failed_statements)
+        for spec_name, spec in batch_specs:
+            try:
+                cur = conn.cursor()
+                cur.report_name=spec_name
+                cur.execute(spec_sql(spec["sql"]))
+                batch_rows[spec_name]=cur.fetchall()
+            except Exception as spec_error:
+                batch_rows[spec_name]=spec_error
+        if len([rows for rows in batch_rows.values() if isinstance(rows, Exception)])==0:
+            del failed_statements[failures_before:batch_failures]
+    spec_batch_rows[batch_name]=batch_rows
+
+def spec_timeline_rows(batch_name):
+    #The timeline_columns of every spec of a batch in one list, most recent change first
+    timeline_rows=[]
+    for spec_name, spec in report_specs.items():
+        if spec.get("batch")!=batch_name or spec.get("timeline_columns") is None or isinstance(spec_batch_rows[batch_name][spec_name], Exception):
+            continue
+        positions=[spec["columns"].index(column) if column is not None else None for column in spec["timeline_columns"]]
+        for row in spec_batch_rows[batch_name][spec_name]:
+            timeline_rows.append((row[positions[0]], spec["batch_label"])+tuple([row[position] if position is not None else None for position in positions[1:]]))
+    timeline_rows.sort(key=lambda row: (row[0] is not None, row[0]), reverse=True)
+    return [(top_n,)+row for top_n, row in enumerate(timeline_rows, 1)]
+
+def spec_row_batches(conn, report_name, spec, entity=None):
+    #Rows of a spec in batches of spec_fetch_rows. The specs of a batch share the rows of one query
+    if spec.get("batch") is not None:
+        if spec["batch"] not in spec_batch_rows:
+            fetch_spec_batch(conn, report_name, spec["batch"])
+        if spec.get("timeline"):
+            yield spec_timeline_rows(spec["batch"])
         else:
-            report_html_index=report_html_index+"""            
-            <h2>Section """+str(section)+"""</h2>            
-            <table class="tabla2">
-            <th >Type</th>
-            <th >HTML File Name</th>
-            """ 
-            change_table=0
-
-        for html_page_name, html_page_type in report_list.items():
-            report_html_index=report_html_index+""" <tr> 
-            <td><a href="./"""+str(html_page_name)+"""">"""+str(html_page_type)+"""</td> 
-            <td>"""+str(html_page_name)+"""</td> 
-            </tr> """
-        report_html_index=report_html_index+""" </table> """
-
-
-    report_html_index=report_html_index+"""</div></div>"""
-    report_html_index=report_html_index+"""</body> </html>"""
-    create_output_file('prismafy_index.html',report_html_index)
-
-def sections_builder():
-    print ("Copyright (C) 2024 - prismafy\n ")
-
-    if args.analyzequery is not None and args.analyzewarehouse is not None:
-        print ("Arguments 'analyzequery' and 'analyzewarehouse' cannot be set at the same time. ")
+            rows=spec_batch_rows[spec["batch"]][report_name]
+            if isinstance(rows, Exception):
+                raise rows
+            yield rows
         return
-    
-    global snowflake_conn 
-    snowflake_conn=create_snowflake_db_connection(args.authenticator)
+    cur = conn.cursor()
+    cur.report_name=report_name
+    cur.execute(spec_sql(spec["sql"], entity))
+    rows=cur.fetchmany(spec_fetch_rows)
+    while rows:
+        yield rows
+        rows=cur.fetchmany(spec_fetch_rows)
+
+def render_report_spec(conn, report_name, spec, entity=None):
+    #Rows are streamed in batches and the page is built from a list of parts joined once
+    html_parts=[]
+    row_count=0
+    if spec["chart"]=='table':
+        table_class='class="'+spec.get("table_class","tabla1")+'"'
+        html_parts.append(html_table_header+"""
+        <h3>"""+spec["title"].replace('{entity}', str(entity))+"""</h3>
+        <table """+table_class+""">
+        <tr>
+        """+"".join(["<th >"+column+"</th>\n        " for column in spec["columns"]]))
+        last_cell='<td class="cell_grow">' if spec.get("grow_last_column") else '<td>'
+        for rows in spec_row_batches(conn, report_name, spec, entity):
+            row_count=row_count+len(rows)
+            for row in rows:
+                html_parts.append(""" <tr> 
+                <td>"""+"""</td> 
+                <td>""".join([str(value) for value in row[:-1]])+"""</td> 
+                """+last_cell+str(row[-1])+"""</td> 
+                </tr> """)
+        html_parts.append(html_table_tail)
+    else:
+        html_parts.append(html_header+"""
+            """+str(spec["columns"])+""",
+        """)
+        data_rows=[]
+        for rows in spec_row_batches(conn, report_name, spec, entity):
+            row_count=row_count+len(rows)
+            data_rows.extend([str(row[0]) for row in rows])
+        html_parts.append(",".join(data_rows))
+        html_parts.append(html_body1+"""
+            """+",".join(["row["+str(column)+"]" for column in range(1, len(spec["columns"]))])+"""
+            """+html_body2+"""
+            """+spec.get("options","")+"""
+            title: `Prismafy v1.0 - https://github.com/prismafy/prismafy
+            Chart Creation Date: """+report_formatted_time+"""
+            """+spec["title"].replace('{entity}', str(entity))+"""`,"""+spec["tail"])
 
-    if snowflake_conn==-1:
-        return -1    
+    if row_count==0 and not spec.get("write_empty"):
+        return
+    file_name=spec["file"].replace('{entity}', str(entity).lower())
+    create_output_file(file_name, "".join(html_parts))
+    report_sections[spec["section"]].update({file_name:spec["chart"]})
 
-    report_start_time = datetime.now()
+def run_report_spec(conn, report_name, entity=None):
+    #Without an entity, a spec with a fan-out query or a list of entities builds one page per entity on the same connection
+    try:
+        spec=report_specs[report_name]
+        if entity is None and spec.get("fanout_sql") is not None:
+            cur = conn.cursor()
+            cur.report_name=report_name
+            cur.execute(spec_sql(spec["fanout_sql"]))
+            for (entity_value,) in cur.fetchall():
+                render_report_spec(conn, report_name, spec, entity_value)
+        elif entity is None and spec.get("entities") is not None:
+            for entity_value in spec["entities"]:
+                render_report_spec(conn, report_name, spec, entity_value)
+        else:
+            render_report_spec(conn, report_name, spec, entity)
+    except Exception as error:
+        print("["+report_name+"]: An exception occurred:", error)
+
+def spec_report(report_name):
+    #Report function of a spec, called like the hand written reports: report(conn) or report(conn, entity)
+    def report_function(conn, *report_arguments):
+        run_report_spec(conn, report_name, *report_arguments)
+    report_function.__name__=report_name
+    return report_function
+
+for report_name in report_specs:
+    globals()[report_name]=spec_report(report_name)
+
+#Every report by section, in the order they are built. aq and aw are the reports of -aq (query_parameterized_hash) and -aw (warehouse name)
+report_registry={
+    "A":[generate_warehouse_info],
+    "B":[table_history_top_tables_by_storage, table_history_top_database_by_storage, line_history_top_storage_by_database, line_history_storage_stages],
+    "C":[line_history_account_consumption_credits_by_warehouse, line_history_account_consumption_credits, bar_month_consumption_credits_by_warehouse,
+         bar_week_consumption_credits_by_warehouse, line_history_daily_credits_used_by_service, bar_month_credits_used_by_service,
+         bar_week_credits_used_by_service, line_history_credits_replication_by_database],
+    "D":[table_month_top_query, table_week_top_query, table_history_top_table_by_pruning_efficiency, table_history_top_table_by_reclustering, generate_top_query_info],
+    "E":[table_history_failed_login, table_month_new_login, table_week_new_login, table_day_new_login, table_less_frequent_logins,
+         table_history_users_with_highest_privileges, table_history_recent_changed_network_policies, table_history_recent_changed_network_rules,
+         table_history_recent_changed_password_policies, table_history_recent_changed_masking_policies, table_history_recent_changed_row_access_policies,
+         table_history_recent_changed_policies, table_history_users_with_recent_password_changes, bar_month_sessions_by_authentication_method,
+         bar_week_sessions_by_authentication_method, line_history_sessions_by_authentication_method, line_month_top_logins_by_users, table_history_ip_changes,
+         table_history_client_driver_changes],
+    "F":[table_history_top_cloud_data_transfer, line_history_data_transfer_by_cloud, line_history_bytes_replication_by_database, table_history_external_functions],
+    "G":[table_history_less_accessed_objects, update_object_access_index, table_history_least_accessed_objects_from_index, table_history_objects_not_accessed_since,
+         table_history_users_without_sessions_last_6_months, table_history_users_without_sessions_last_3_months, table_history_users_without_sessions_by_months,
+         table_history_need_attention_tasks, table_history_need_attention_snowpipes, table_account_non_default_parameters, table_warehouse_non_default_parameters,
+         table_database_non_default_parameters, table_warehouse_without_activity_in_last_3_months, table_warehouse_without_activity_in_last_month,
+         table_warehouse_without_activity_by_months, line_history_sql_operations, line_history_sql_operations_by_database],
+    "H":[table_history_top_dbt_models, table_month_top_dbt_models, table_week_top_dbt_models, table_history_slowing_dbt_models],
+    "aq":[line_history_bytes_details_by_query_parameterized_hash, line_history_calls_details_by_query_parameterized_hash, line_history_time_details_by_query_parameterized_hash,
+          line_history_rows_details_by_query_parameterized_hash, table_last_executions_of_query, line_history_wh_changes_by_query, table_history_accessed_objects_by_query],
+    "aw":[line_history_load_details_by_warehouse, bar_month_load_details_by_warehouse, bar_week_load_details_by_warehouse, table_history_warehouse_events,
+          line_history_warehouse_enable_vs_querycount, line_history_size_changes_by_warehouse]
+}
+section_names={"A":"A - Computing","B":"B - Storage","C":"C - Credits","D":"D - Performance","E":"E - Security","F":"F - Data Transfer","G":"G - Maintenance","H":"H - DBT"}
+
+def selected_sections(reportsections):
+    #Comma separated section letters or globs (A,C,E or [A-C]), Z is every section
+    patterns=[pattern.strip().upper() for pattern in str(reportsections or 'Z').split(',') if pattern.strip()!='']
+    return [section for section in section_names if len([pattern for pattern in patterns if pattern=='Z' or fnmatch.fnmatchcase(section, pattern)])>0]
+
+def selected_reports(section):
+    #Reports of the section matching --reports, every report of the section when --reports is not set
+    if getattr(args, 'reports', None) is None:
+        return report_registry[section]
+    patterns=[pattern.strip().lower() for pattern in args.reports.split(',') if pattern.strip()!='']
+    return [report_function for report_function in report_registry[section] if len([pattern for pattern in patterns if fnmatch.fnmatchcase(report_function.__name__, pattern)])>0]
+
+def check_report_selection():
+    #Returns the error message of a section or report pattern that matches nothing
+    for pattern in str(args.reportsections or 'Z').split(','):
+        if pattern.strip()!='' and len(selected_sections(pattern))==0:
+            return "Wrong section "+pattern.strip()+". Valid sections: A, B, C, D, E, F, G, H, Z or globs of them."
+    if args.reports is not None:
+        report_names=[report_function.__name__ for section in report_registry for report_function in report_registry[section]]
+        for pattern in args.reports.split(','):
+            if pattern.strip()!='' and len(fnmatch.filter(report_names, pattern.strip().lower()))==0:
+                return "No report matches "+pattern.strip()+". List the reports with --listreports."
+    return None
+
+def list_reports():
+    for section in report_registry:
+        print (section_names.get(section) or section+" - "+{"aq":"Query analysis (-aq)","aw":"Warehouse analysis (-aw)"}[section])
+        for report_function in report_registry[section]:
+            print ("    "+report_function.__name__)
+
+#Filtered subsets of ACCOUNT_USAGE views read by several reports of a section. The widest window of the reports, with the columns
+#they read, runs once as a registered result and the reports keep their own predicates on its RESULT_SCAN
+shared_subsets={
+    "QUERY_HISTORY_LAST_MONTH":{"view":"QUERY_HISTORY",
+                                "columns":["START_TIME","QUERY_PARAMETERIZED_HASH","QUERY_TEXT","TOTAL_ELAPSED_TIME","ERROR_CODE","PARTITIONS_SCANNED",
+                                           "PARTITIONS_TOTAL","PERCENTAGE_SCANNED_FROM_CACHE","BYTES_READ_FROM_RESULT","ROWS_PRODUCED",
+                                           "BYTES_SPILLED_TO_LOCAL_STORAGE","BYTES_SPILLED_TO_REMOTE_STORAGE","BYTES_SENT_OVER_THE_NETWORK",
+                                           "COMPILATION_TIME","EXECUTION_TIME","QUEUED_PROVISIONING_TIME","QUEUED_OVERLOAD_TIME",
+                                           "TRANSACTION_BLOCKED_TIME","QUERY_LOAD_PERCENT"],
+                                "filter":lambda: since_predicate("START_TIME","MONTH",-1)+" AND TOTAL_ELAPSED_TIME > 0 AND ERROR_CODE IS NULL",
+                                "reports":["table_month_top_query","table_week_top_query","generate_top_query_info"]},
+    "LOGIN_HISTORY_WINDOW":{"view":"LOGIN_HISTORY",
+                            "columns":["EVENT_TIMESTAMP","USER_NAME","CLIENT_IP","REPORTED_CLIENT_TYPE","REPORTED_CLIENT_VERSION","FIRST_AUTHENTICATION_FACTOR",
+                                       "SECOND_AUTHENTICATION_FACTOR","ERROR_CODE","ERROR_MESSAGE","IS_SUCCESS"],
+                            "filter":lambda: since_predicate("EVENT_TIMESTAMP","MONTH",min(int(months_history),-2)),
+                            "reports":["line_month_top_logins_by_users","table_history_failed_login","table_month_new_login","table_week_new_login",
+                                       "table_day_new_login","table_less_frequent_logins","table_history_client_driver_changes","table_history_ip_changes"]}
+}
 
+def shared_subset(subset_name):
+    #RESULT_SCAN of the subset, the view itself when it was not registered
+    if subset_name in materialized_subsets:
+        return "TABLE(RESULT_SCAN('"+materialized_subsets[subset_name]+"'))"
+    return "SNOWFLAKE.ACCOUNT_USAGE."+shared_subsets[subset_name]["view"]
+
+def materialize_shared_subsets(conn, report_functions):
+    #Nothing is written to the account: the subset is the persisted result of a SELECT, with the same SQL in every run of the same
+    #hour or day (see --alignment) so Snowflake answers it from the result cache
+    global materialized_subsets
+    if args.nosubsets:
+        return
+    report_names=[report_function.__name__ for report_function in report_functions]
+    for subset_name, subset in shared_subsets.items():
+        if len([report_name for report_name in subset["reports"] if report_name in report_names])==0:
+            continue
+        try:
+            query_id, reused = registered_result(conn, subset_name, """
+        SELECT """+", ".join(subset["columns"])+"""
+        FROM SNOWFLAKE.ACCOUNT_USAGE."""+subset["view"]+"""
+        WHERE """+subset["filter"]()+"""
+        """, report_name="materialize_shared_subsets")
+            materialized_subsets[subset_name]=query_id
+        except Exception as error:
+            print("[materialize_shared_subsets]: An exception occurred:", error)
+
+def build_sections(snowflake_conn):
     if args.analyzequery is not None:
         print("Working on report for query "+args.analyzequery.lower())
         section_start_time = datetime.now()
-        line_history_bytes_details_by_query_parameterized_hash(snowflake_conn,args.analyzequery.lower())
-        line_history_calls_details_by_query_parameterized_hash(snowflake_conn,args.analyzequery.lower())
-        line_history_time_details_by_query_parameterized_hash(snowflake_conn,args.analyzequery.lower())
-        line_history_rows_details_by_query_parameterized_hash(snowflake_conn,args.analyzequery.lower())
-        table_last_executions_of_query(snowflake_conn,args.analyzequery.lower())
-        line_history_wh_changes_by_query(snowflake_conn,args.analyzequery.lower())
-        table_history_accessed_objects_by_query(snowflake_conn,args.analyzequery.lower())
+        for report_function in selected_reports("aq"):
+            run_report(report_function, snowflake_conn, args.analyzequery.lower())
         print ("Query Analysis Duration: "+ str(round(  (datetime.now()- section_start_time).total_seconds()/60 ,2) )+" minutes." )
 
     elif args.analyzewarehouse is not None:
         print("Working on report for warehouse "+args.analyzewarehouse.upper())
         section_start_time = datetime.now()
-        line_history_load_details_by_warehouse(snowflake_conn,args.analyzewarehouse.upper() )
-        bar_month_load_details_by_warehouse(snowflake_conn,args.analyzewarehouse.upper() )
-        bar_week_load_details_by_warehouse(snowflake_conn,args.analyzewarehouse.upper() )
-        table_history_warehouse_events(snowflake_conn,args.analyzewarehouse.upper() )
-        line_history_warehouse_enable_vs_querycount(snowflake_conn,args.analyzewarehouse.upper() )
-        line_history_size_changes_by_warehouse(snowflake_conn,args.analyzewarehouse.upper() )
+        for report_function in selected_reports("aw"):
+            run_report(report_function, snowflake_conn, args.analyzewarehouse.upper())
         print ("Warehouse Analysis Duration: "+ str(round(  (datetime.now()- section_start_time).total_seconds()/60 ,2) )+" minutes." )
-    else:   
-        if args.reportsections=='A' or args.reportsections=='Z': #Computing
-            print("Working on section A - Computing")
-            section_start_time = datetime.now()
-            generate_warehouse_info(snowflake_conn)
-            print ("Duration for section A: "+ str(round(  (datetime.now()- section_start_time).total_seconds()/60 ,2) )+" minutes." )
-
-        if args.reportsections=='B' or args.reportsections=='Z': #Storage            
-            print("Working on section B - Storage")
-            section_start_time = datetime.now()
-            table_history_top_tables_by_storage(snowflake_conn)
-            table_history_top_database_by_storage(snowflake_conn)
-            line_history_top_storage_by_database(snowflake_conn)
-            line_history_storage_stages(snowflake_conn)
-            print ("Duration for section B: "+ str(round(  (datetime.now()- section_start_time).total_seconds()/60 ,2) )+" minutes." )
-
-        if args.reportsections=='C' or args.reportsections=='Z': #Credits
-            print("Working on section C - Credits")
-            section_start_time = datetime.now()
-            line_history_account_consumption_credits_by_warehouse(snowflake_conn)
-            line_history_account_consumption_credits(snowflake_conn)
-            bar_month_consumption_credits_by_warehouse(snowflake_conn)
-            bar_week_consumption_credits_by_warehouse(snowflake_conn)   
-            line_history_daily_credits_used_by_service(snowflake_conn) 
-            bar_month_credits_used_by_service(snowflake_conn)
-            bar_week_credits_used_by_service(snowflake_conn)
-            line_history_credits_replication_by_database(snowflake_conn)
-            print ("Duration for section C: "+ str(round(  (datetime.now()- section_start_time).total_seconds()/60 ,2) )+" minutes." )
-
-        if args.reportsections=='D' or args.reportsections=='Z': #Performance
-            print("Working on section D - Performance")
-            section_start_time = datetime.now()
-            table_month_top_query(snowflake_conn)    
-            table_week_top_query(snowflake_conn)
-            table_history_top_table_by_pruning_efficiency(snowflake_conn)
-            table_history_top_table_by_reclustering(snowflake_conn)
-            generate_top_query_info(snowflake_conn)
-            print ("Duration for section D: "+ str(round(  (datetime.now()- section_start_time).total_seconds()/60 ,2) )+" minutes." )
-
-        if args.reportsections=='E' or args.reportsections=='Z': #Security
-            print("Working on section E - Security")
-            section_start_time = datetime.now()
-            table_history_failed_login(snowflake_conn)
-            table_month_new_login(snowflake_conn)
-            table_week_new_login(snowflake_conn)
-            table_day_new_login(snowflake_conn)
-            table_less_frequent_logins(snowflake_conn)
-            table_history_users_with_highest_privileges(snowflake_conn)
-            table_history_recent_changed_network_policies(snowflake_conn)
-            table_history_recent_changed_network_rules(snowflake_conn)
-            table_history_recent_changed_password_policies(snowflake_conn)
-            table_history_recent_changed_masking_policies(snowflake_conn)
-            table_history_recent_changed_row_access_policies(snowflake_conn)
-            table_history_users_with_recent_password_changes(snowflake_conn)
-            bar_month_sessions_by_authentication_method(snowflake_conn)
-            bar_week_sessions_by_authentication_method(snowflake_conn)
-            line_history_sessions_by_authentication_method(snowflake_conn)
-            line_month_top_logins_by_users(snowflake_conn)
-            table_history_ip_changes(snowflake_conn)
-            table_history_client_driver_changes(snowflake_conn)
-            print ("Duration for section E: "+ str(round(  (datetime.now()- section_start_time).total_seconds()/60 ,2) )+" minutes." )
-
-        if args.reportsections=='F' or args.reportsections=='Z': #Data_Transfer
-            print("Working on section F - Data_Transfer")
-            section_start_time = datetime.now()
-            table_history_top_cloud_data_transfer(snowflake_conn)
-            line_history_data_transfer_by_cloud(snowflake_conn)
-            line_history_bytes_replication_by_database(snowflake_conn)
-            table_history_external_functions(snowflake_conn)
-            print ("Duration for section F: "+ str(round(  (datetime.now()- section_start_time).total_seconds()/60 ,2) )+" minutes." )
-
-        if args.reportsections=='G' or args.reportsections=='Z': #Maintenance
-            print("Working on section G - Maintenance")
-            section_start_time = datetime.now()
-            table_history_less_accessed_objects(snowflake_conn)
-            table_history_users_without_sessions_last_6_months(snowflake_conn)
-            table_history_users_without_sessions_last_3_months(snowflake_conn)
-            table_history_need_attention_tasks(snowflake_conn)
-            table_history_need_attention_snowpipes(snowflake_conn)
-            table_account_non_default_parameters(snowflake_conn)
-            table_warehouse_non_default_parameters(snowflake_conn)
-            table_database_non_default_parameters(snowflake_conn)
-            table_warehouse_without_activity_in_last_3_months(snowflake_conn)
-            table_warehouse_without_activity_in_last_month(snowflake_conn)
-            line_history_sql_operations(snowflake_conn)
-            line_history_sql_operations_by_database(snowflake_conn)
-            print ("Duration for section G: "+ str(round(  (datetime.now()- section_start_time).total_seconds()/60 ,2) )+" minutes." )
-
-        if args.reportsections=='H' or args.reportsections=='Z': #DBT
-            print("Working on section H - DBT")
+    else:
+        for section in selected_sections(args.reportsections):
+            if len(selected_reports(section))==0:
+                continue
+            print("Working on section "+section_names[section])
             section_start_time = datetime.now()
-            table_history_top_dbt_models(snowflake_conn)
-            table_month_top_dbt_models(snowflake_conn)
-            table_week_top_dbt_models(snowflake_conn)
-            print ("Duration for section H: "+ str(round(  (datetime.now()- section_start_time).total_seconds()/60 ,2) )+" minutes." )
-
-    close_snowflake_db_connection(snowflake_conn)
-    report_builder()
-    print ("\nCompleted. Open the main page: "+report_root_folder+"/prismafy_index.html\n")
-    print ("Duration Prismafy report: "+ str(round(  (datetime.now()- report_start_time).total_seconds()/60 ,2) )+" minutes." )
+            materialize_shared_subsets(snowflake_conn, selected_reports(section))
+            for report_function in selected_reports(section):
+                run_report(report_function, snowflake_conn)
+            materialized_subsets.clear()
+            print ("Duration for section "+section+": "+ str(round(  (datetime.now()- section_start_time).total_seconds()/60 ,2) )+" minutes." )
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,196 @@
+"""
+*******************************************************************************
+*** prismafy - Tool to analyze metadata for cloud native data platforms.    ***
+*** prismafy_copyright (C) 2024  Deiby Gomez                                ***
+***                                                                         ***
+*** This program is free software: you can redistribute it and/or modify    ***
+*** it under the terms of the GNU General Public License as published by    ***
+*** the Free Software Foundation, either version 3 of the License, or       ***
+*** (at your option) any later version.                                     ***
+***                                                                         ***
+*** This program is distributed in the hope that it will be useful,         ***
+*** but WITHOUT ANY WARRANTY; without even the implied warranty of          ***
+*** MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           ***
+*** GNU General Public License for more details.                            ***
+***                                                                         ***
+*** You should have received a copy of the GNU General Public License       ***
+*** along with this program.  If not, see <http://www.gnu.org/licenses/>.   ***
+*******************************************************************************
+
+*******************************************************************************
+*** Tool:            prismafy benchmark                                     ***
+*** Description:     End-to-end benchmark of every prismafy section on      ***
+***                  synthetic stand-in accounts of several sizes. Records  ***
+***                  wall time, peak RSS, SQL statements and bytes written  ***
+***                  in a JSON file that can be compared between commits.   ***
+*** Project:         https://github.com/prismafy/prismafy                   ***
+*******************************************************************************
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+PRISMAFY_FOLDER = os.path.dirname(os.path.abspath(__file__))
+SECTIONS = ['A','B','C','D','E','F','G','H','aq','aw']
+
+parser = argparse.ArgumentParser(description="End-to-end benchmark of prismafy sections on synthetic stand-in accounts.")
+parser.add_argument('-z',  '--sizes' ,help="Comma separated account sizes as warehouses:queries. Default: 10:100000,100:1000000,1000:10000000", type=str, default="10:100000,100:1000000,1000:10000000")
+parser.add_argument('-s',  '--sections' ,help="Comma separated sections to run: A-H, aq (analyze query), aw (analyze warehouse). Default: all.", type=str, default=",".join(SECTIONS))
+parser.add_argument('-m',  '--months' ,help="Months of history generated and scanned.", type=int, default=6)
+parser.add_argument('-f',  '--folder' ,help="Work folder for stand-in databases and report output.", type=str, default="prismafy-benchmark")
+parser.add_argument('-o',  '--output' ,help="JSON file with the results. Default: prismafy-benchmark/benchmark-{date}.json", type=str)
+parser.add_argument('-c',  '--compare' ,help="JSON file of a previous benchmark to compare against.", type=str)
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git","rev-parse","--short","HEAD"], cwd=PRISMAFY_FOLDER, stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+def peak_rss_mb(resource_usage):
+    #ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    if sys.platform == 'darwin':
+        return round(resource_usage.ru_maxrss/1024/1024, 2)
+    return round(resource_usage.ru_maxrss/1024, 2)
+
+def standin_database(folder, warehouses, queries, months):
+    database_file = os.path.join(folder, "standin_"+str(warehouses)+"_"+str(queries)+"_"+str(months)+".db")
+    if not os.path.isfile(database_file):
+        print (datetime.now().strftime('%Y-%m-%d-%H:%M:%S')+"  Generating "+database_file)
+        #Generated in a child process: a forked child inherits the peak RSS of its parent, so the benchmark process must stay small
+        subprocess.check_call([sys.executable, os.path.join(PRISMAFY_FOLDER, 'prismafy_standin.py'), '-o', database_file+".tmp", '-w', str(warehouses),
+                               '-u', str(warehouses*10), '-q', str(queries), '-m', str(months)])
+        os.replace(database_file+".tmp", database_file)
+    return database_file
+
+def section_arguments(section, database_file):
+    if section == 'aq':
+        database = sqlite3.connect(database_file)
+        (query_hash,) = database.execute("SELECT QUERY_PARAMETERIZED_HASH FROM QUERY_HISTORY GROUP BY 1 ORDER BY COUNT(*) DESC LIMIT 1").fetchone()
+        database.close()
+        return ['-aq', query_hash]
+    if section == 'aw':
+        database = sqlite3.connect(database_file)
+        (warehouse_name,) = database.execute("SELECT WAREHOUSE_NAME FROM WAREHOUSE_METERING_HISTORY GROUP BY 1 ORDER BY SUM(CREDITS_USED) DESC LIMIT 1").fetchone()
+        database.close()
+        return ['-aw', warehouse_name]
+    return ['-s', section]
+
+def folder_size(folder):
+    files_written = 0
+    bytes_written = 0
+    for root, _, files in os.walk(folder):
+        for file_name in files:
+            files_written = files_written + 1
+            bytes_written = bytes_written + os.path.getsize(os.path.join(root, file_name))
+    return files_written, bytes_written
+
+def run_section(folder, database_file, section, months):
+    #Every section runs in its own process and work folder so RSS and output are measured in isolation
+    run_folder = os.path.join(folder, "run_"+os.path.basename(database_file)[:-3]+"_"+section)
+    shutil.rmtree(run_folder, ignore_errors=True)
+    os.makedirs(run_folder)
+    for icon in ['prismafy.png','prismafy_font.png']:
+        shutil.copyfile(os.path.join(PRISMAFY_FOLDER, icon), os.path.join(run_folder, icon))
+
+    command = [sys.executable, os.path.join(PRISMAFY_FOLDER, 'prismafy.py'), '-d', 'standin', '-a', os.path.abspath(database_file), '-m', str(months)] + section_arguments(section, database_file)
+    log_file = open(os.path.join(run_folder, 'prismafy.log'), 'w')
+    run_start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=run_folder, stdout=log_file, stderr=subprocess.STDOUT)
+    _, status, resource_usage = os.wait4(process.pid, 0)
+    wall_seconds = time.perf_counter() - run_start
+    log_file.close()
+
+    sql_statements = 0
+    report_runs = []
+    reports_folder = os.path.join(run_folder, 'prismafy-reports')
+    for root, _, files in os.walk(reports_folder):
+        if 'prismafy_run_profile.json' in files:
+            with open(os.path.join(root, 'prismafy_run_profile.json')) as profile_file:
+                run_profile = json.load(profile_file)
+            sql_statements = len(run_profile["statements"])
+            report_runs = run_profile.get("report_runs", [])
+    files_written, bytes_written = folder_size(reports_folder)
+
+    log_file = open(os.path.join(run_folder, 'prismafy.log'))
+    exceptions = sum([1 for line in log_file if 'An exception occurred' in line])
+    log_file.close()
+
+    #A report with failed statements is timed on its exception path: its seconds are kept apart and not compared
+    failed_runs = [report_run for report_run in report_runs if report_run["failed_statements"] > 0 or report_run["timed_out"]]
+
+    return {"section":section,
+            "exit_code":os.waitstatus_to_exitcode(status),
+            "wall_seconds":round(wall_seconds,3),
+            "peak_rss_mb":peak_rss_mb(resource_usage),
+            "sql_statements":sql_statements,
+            "files_written":files_written,
+            "bytes_written":bytes_written,
+            "report_seconds":round(sum([report_run["seconds"] for report_run in report_runs if report_run not in failed_runs]),3),
+            "failed_reports":len(failed_runs),
+            "failed_report_seconds":round(sum([report_run["seconds"] for report_run in failed_runs]),3),
+            "exceptions":exceptions,
+            "reports":report_runs}
+
+def compare_results(previous_file, results):
+    with open(previous_file) as previous:
+        previous_results = json.load(previous)
+    baseline = dict([((result["warehouses"], result["queries"], result["section"]), result) for result in previous_results["results"]])
+    print ("\nComparison against "+previous_file+" (commit "+str(previous_results.get("commit"))+")")
+    print ("%-10s %-10s %-8s %14s %14s %14s %14s %14s %14s" % ("WAREHOUSES","QUERIES","SECTION","WALL_SECONDS","REPORT_SECONDS","PEAK_RSS_MB","SQL_STATEMENTS","BYTES_WRITTEN","FAILED_REPORTS"))
+    for result in results:
+        before = baseline.get((result["warehouses"], result["queries"], result["section"]))
+        if before is None:
+            continue
+        changes = []
+        for metric in ["wall_seconds","report_seconds","peak_rss_mb","sql_statements","bytes_written"]:
+            if before.get(metric):
+                changes.append("%+13.1f%%" % ((result[metric]-before[metric])*100.0/before[metric]))
+            else:
+                changes.append("%14s" % "-")
+        #Failed reports of both runs: report seconds are only comparable when they did not change
+        failed_reports = "%14s" % (str(before.get("failed_reports","-"))+" -> "+str(result["failed_reports"]))
+        print ("%-10s %-10s %-8s %s %s" % (result["warehouses"], result["queries"], result["section"], " ".join(changes), failed_reports))
+
+def main():
+    args = parser.parse_args()
+    os.makedirs(args.folder, exist_ok=True)
+    output_file = args.output or os.path.join(args.folder, "benchmark-"+datetime.now().strftime('%Y-%m-%d-%H-%M-%S')+".json")
+    sections = [section.strip() for section in args.sections.split(',')]
+    for section in sections:
+        if section not in SECTIONS:
+            print ("Wrong section "+section+". Valid sections: "+",".join(SECTIONS))
+            return
+
+    results = []
+    for size in args.sizes.split(','):
+        warehouses, queries = [int(value) for value in size.split(':')]
+        database_file = standin_database(args.folder, warehouses, queries, args.months)
+        for section in sections:
+            result = run_section(args.folder, database_file, section, args.months)
+            result.update({"warehouses":warehouses,"queries":queries})
+            results.append(result)
+            print ("%s  warehouses=%s queries=%s section=%s wall_seconds=%s report_seconds=%s failed_reports=%s failed_report_seconds=%s peak_rss_mb=%s sql_statements=%s bytes_written=%s exit_code=%s" % (datetime.now().strftime('%Y-%m-%d-%H:%M:%S'),
+                warehouses, queries, section, result["wall_seconds"], result["report_seconds"], result["failed_reports"], result["failed_report_seconds"], result["peak_rss_mb"],
+                result["sql_statements"], result["bytes_written"], result["exit_code"]))
+            for report_run in result["reports"]:
+                if report_run["failed_statements"] > 0 or report_run["timed_out"]:
+                    print ("    failed report %s seconds=%s failed_statements=%s timed_out=%s" % (report_run["report"], report_run["seconds"], report_run["failed_statements"], report_run["timed_out"]))
+
+            with open(output_file, 'w') as output:
+                json.dump({"commit":git_commit(),"date":datetime.now().strftime('%Y-%m-%d %H:%M:%S'),"python":sys.version.split()[0],
+                           "months":args.months,"results":results}, output, indent=2)
+
+    print ("\nBenchmark results: "+output_file)
+    if args.compare is not None:
+        compare_results(args.compare, results)
+
+if __name__ == "__main__":
+    main()
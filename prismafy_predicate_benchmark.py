@@ -0,0 +1,121 @@
+"""
+*******************************************************************************
+*** prismafy - Tool to analyze metadata for cloud native data platforms.    ***
+*** prismafy_copyright (C) 2024  Deiby Gomez                                ***
+***                                                                         ***
+*** This program is free software: you can redistribute it and/or modify    ***
+*** it under the terms of the GNU General Public License as published by    ***
+*** the Free Software Foundation, either version 3 of the License, or       ***
+*** (at your option) any later version.                                     ***
+***                                                                         ***
+*** This program is distributed in the hope that it will be useful,         ***
+*** but WITHOUT ANY WARRANTY; without even the implied warranty of          ***
+*** MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           ***
+*** GNU General Public License for more details.                            ***
+***                                                                         ***
+*** You should have received a copy of the GNU General Public License       ***
+*** along with this program.  If not, see <http://www.gnu.org/licenses/>.   ***
+*******************************************************************************
+
+*******************************************************************************
+*** Tool:            prismafy predicate benchmark                           ***
+*** Description:     Compares the time window filter TO_DATE(column) >      ***
+***                  DATEADD(...) with the range on the raw column built by ***
+***                  since_predicate: same rows, time and partitions        ***
+***                  scanned (Snowflake) or query plan (stand-in).          ***
+*** Project:         https://github.com/prismafy/prismafy                   ***
+*******************************************************************************
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+
+import prismafy
+
+#View, time column and whether the column is a DATE
+CASES = [
+    ("QUERY_HISTORY", "START_TIME", False),
+    ("AGGREGATE_QUERY_HISTORY", "INTERVAL_START_TIME", False),
+    ("ACCESS_HISTORY", "QUERY_START_TIME", False),
+    ("LOGIN_HISTORY", "EVENT_TIMESTAMP", False),
+    ("WAREHOUSE_METERING_HISTORY", "START_TIME", False),
+    ("WAREHOUSE_LOAD_HISTORY", "START_TIME", False),
+    ("METERING_DAILY_HISTORY", "USAGE_DATE", True),
+]
+
+parser = argparse.ArgumentParser(parents=[prismafy.parser], add_help=False,
+                                 description="Compares TO_DATE(column) > DATEADD(...) with the sargable range of since_predicate. Takes the connection arguments of prismafy.py.")
+parser.add_argument('-e',  '--repeat' ,help="Executions per predicate, the best time is reported.", type=int, default=3)
+parser.add_argument('-j',  '--jsonoutput' ,help="JSON file with the results.", type=str)
+
+def execute(conn, sql_query):
+    cur = conn.cursor()
+    execute_start = time.perf_counter()
+    cur.execute(prismafy.sql_header+sql_query)
+    (rows,) = cur.fetchone()
+    return rows, time.perf_counter()-execute_start, cur.sfqid
+
+def partitions(conn, query_ids):
+    #Snowflake only: partitions scanned and total of each statement of the session
+    cur = conn.connection.cursor()
+    cur.execute("""SELECT QUERY_ID, PARTITIONS_SCANNED, PARTITIONS_TOTAL
+        FROM TABLE(SNOWFLAKE.INFORMATION_SCHEMA.QUERY_HISTORY_BY_SESSION(RESULT_LIMIT => 10000))
+        WHERE QUERY_ID IN ('"""+"','".join(query_ids)+"""')""")
+    return dict([(query_id, (scanned, total)) for (query_id, scanned, total) in cur])
+
+def standin_plan(conn, sql_query):
+    import prismafy_standin
+    plan = conn.connection.database.execute("EXPLAIN QUERY PLAN "+prismafy_standin.translate_sql(sql_query)).fetchall()
+    return " | ".join([str(row[-1]) for row in plan])
+
+def main():
+    args = parser.parse_args()
+    reports = prismafy.Prismafy(vars(args))
+    conn = reports.connect()
+    if conn == -1:
+        return
+    prismafy.reset_report_state()
+    conn.cursor().execute("ALTER SESSION SET USE_CACHED_RESULT=FALSE")
+
+    results = []
+    for view_name, column, date_column in CASES:
+        select = "SELECT COUNT(*) FROM SNOWFLAKE.ACCOUNT_USAGE."+view_name+" WHERE "
+        predicates = {"to_date": "TO_DATE("+column+") > DATEADD(MONTH,"+prismafy.months_history+",TO_TIMESTAMP("+prismafy.report_formatted_time+"))",
+                      "range": prismafy.since_predicate(column, date_column=date_column)}
+        result = {"view":view_name, "column":column}
+        try:
+            for name, predicate in predicates.items():
+                best_seconds = None
+                for _ in range(args.repeat):
+                    rows, seconds, query_id = execute(conn, select+predicate)
+                    best_seconds = seconds if best_seconds is None else min(best_seconds, seconds)
+                result[name] = {"predicate":predicate, "rows":rows, "seconds":round(best_seconds,4), "query_id":query_id}
+                if args.databasetype == 'standin':
+                    result[name]["plan"] = standin_plan(conn, select+predicate)
+            if args.databasetype != 'standin':
+                query_partitions = partitions(conn, [result[name]["query_id"] for name in predicates])
+                for name in predicates:
+                    result[name]["partitions_scanned"], result[name]["partitions_total"] = query_partitions.get(result[name]["query_id"], (None, None))
+        except Exception as error:
+            print("["+view_name+"]: An exception occurred:", error)
+            continue
+        results.append(result)
+
+        print ("%-28s %-20s rows %s/%s  seconds %s -> %s  %s" % (view_name, column, result["to_date"]["rows"], result["range"]["rows"],
+            result["to_date"]["seconds"], result["range"]["seconds"],
+            "plan: "+result["to_date"]["plan"]+" -> "+result["range"]["plan"] if args.databasetype == 'standin' else
+            "partitions: "+str(result["to_date"]["partitions_scanned"])+" -> "+str(result["range"]["partitions_scanned"])+" of "+str(result["range"]["partitions_total"])))
+        if result["to_date"]["rows"] != result["range"]["rows"]:
+            print ("  Different number of rows for "+view_name)
+
+    reports.close()
+    if args.jsonoutput is not None:
+        with open(args.jsonoutput, 'w') as output:
+            json.dump({"date":datetime.now().strftime('%Y-%m-%d %H:%M:%S'),"databasetype":args.databasetype,"alignment":args.alignment,"results":results}, output, indent=2)
+        print ("\nPredicate benchmark results: "+args.jsonoutput)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+*******************************************************************************
+*** prismafy - Tool to analyze metadata for cloud native data platforms.    ***
+*** prismafy_copyright (C) 2024  Deiby Gomez                                ***
+***                                                                         ***
+*** This program is free software: you can redistribute it and/or modify    ***
+*** it under the terms of the GNU General Public License as published by    ***
+*** the Free Software Foundation, either version 3 of the License, or       ***
+*** (at your option) any later version.                                     ***
+***                                                                         ***
+*** This program is distributed in the hope that it will be useful,         ***
+*** but WITHOUT ANY WARRANTY; without even the implied warranty of          ***
+*** MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           ***
+*** GNU General Public License for more details.                            ***
+***                                                                         ***
+*** You should have received a copy of the GNU General Public License       ***
+*** along with this program.  If not, see <http://www.gnu.org/licenses/>.   ***
+*******************************************************************************
+
+*******************************************************************************
+*** Tool:            prismafy render benchmark                              ***
+*** Description:     Microbenchmark of the row to HTML loops of prismafy    ***
+***                  reports. Synthetic cursor results are fed to each      ***
+***                  renderer with no database and no file output, and     ***
+***                  rows per second and peak allocations are reported.   ***
+*** Project:         https://github.com/prismafy/prismafy                   ***
+*******************************************************************************
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+parser = argparse.ArgumentParser(description="Microbenchmark of the prismafy HTML renderers with synthetic cursor results.")
+parser.add_argument('-n',  '--rows' ,help="Comma separated numbers of rows fed to each renderer. Default: 10,100,1000.", type=str, default="10,100,1000")
+parser.add_argument('-w',  '--widths' ,help="Comma separated widths. Columns of the execution plan for table_explain_by_query, characters per text cell for the fixed-column renderers.", type=str, default="10,50,200")
+parser.add_argument('-r',  '--renderers' ,help="Comma separated renderers to run. Default: all.", type=str)
+parser.add_argument('-e',  '--repeat' ,help="Timed repetitions per case, the best one is reported.", type=int, default=3)
+parser.add_argument('-o',  '--output' ,help="JSON file with the results.", type=str)
+
+class RenderCursor:
+    #Replays prepared results, one per execute, with the attributes prismafy reads from a Snowflake cursor
+    def __init__(self, results):
+        self.results = results
+        self.description = None
+        self.rowcount = 0
+        self.sfqid = None
+        self.rows = iter([])
+
+    def execute(self, sql_query, *args, **kwargs):
+        description, rows = self.results.pop(0)
+        self.description = description
+        self.rowcount = len(rows)
+        self.sfqid = 'render-benchmark'
+        self.rows = iter(rows)
+        return self
+
+    def __iter__(self):
+        return self.rows
+
+    def fetchone(self):
+        return next(self.rows, None)
+
+    def fetchall(self):
+        return list(self.rows)
+
+    def close(self):
+        pass
+
+class RenderConnection:
+    def __init__(self, results):
+        self.results = results
+
+    def cursor(self, *args, **kwargs):
+        return RenderCursor(self.results)
+
+def text_value(rng, width):
+    return ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz ') for _ in range(width))
+
+def last_executions_results(rng, rows, width):
+    #table_explain_by_query runs first: no query ids in the last 13 days, so no plan is rendered
+    start_time = datetime(2024, 8, 1)
+    data = []
+    for number in range(rows):
+        #73 columns: date, hash, elapsed, growth, query id, 67 metrics and names, query text
+        data.append((start_time + timedelta(minutes=number), 'f'*32, round(rng.random()*100, 2), round(rng.random()*10, 2), 'query-'+str(number))
+                    + tuple([text_value(rng, width) if column % 3 == 0 else rng.randint(0, 10**9) for column in range(67)]) + (text_value(rng, width)*4,))
+    return [([('DATA',)], []), ([('DATA',)], []), ([('C'+str(column),) for column in range(len(data[0]))], data)]
+
+def explain_results(rng, rows, width):
+    #One plan of rows operators per query, ten queries
+    plan_rows = []
+    for query in range(10):
+        for operator in range(max(1, rows//10)):
+            plan_rows.append(('plan-hash', 'query-'+str(query), 1, operator, '['+str(operator-1)+']', 'TableScan')
+                             + tuple([rng.choice([None, rng.randint(0, 10**6), text_value(rng, 12)]) for _ in range(max(0, width-6))]))
+    description = [('COLUMN_'+str(column),) for column in range(len(plan_rows[0]))]
+    return [([('DATA',)], [("select 'hash' query_parameterized_hash,* from table(get_query_operator_stats('query-"+str(query)+"')) UNION ALL ",) for query in range(10)]),
+            (description, plan_rows)]
+
+def failed_login_results(rng, rows, width):
+    #Hourly login rows of generate_login_history_info: one failed login per hour inside the history window
+    start_time = datetime(2024, 8, 1)
+    data = [(start_time + timedelta(hours=number), text_value(rng, width), '10.0.0.'+str(number % 255), 'PYTHON_DRIVER', '3.12.0', 'PASSWORD', None,
+             390100, text_value(rng, width), datetime(2024, 8, 1), start_time + timedelta(days=number//24), 'NO', 1, 0, 1, 0, 1, 0, 1, 1) for number in range(rows)]
+    return [([('C'+str(column),) for column in range(20)], data)]
+
+RENDERERS = {
+    "table_last_executions_of_query": (last_executions_results, lambda prismafy, conn: prismafy.table_last_executions_of_query(conn, 'f'*32)),
+    "table_explain_by_query": (explain_results, lambda prismafy, conn: prismafy.table_explain_by_query(conn, 'f'*32)),
+    "table_history_failed_login": (failed_login_results, lambda prismafy, conn: prismafy.table_history_failed_login(conn)),
+}
+
+def run_renderer(prismafy, renderer, results):
+    written = []
+    prismafy.create_output_file = lambda file_name, file_content: written.append(len(file_content))
+    #Every repetition fetches the login rows again
+    prismafy.login_history_rows = None
+    prismafy.snowflake_conn = RenderConnection(list(results))
+    RENDERERS[renderer][1](prismafy, prismafy.snowflake_conn)
+    return sum(written)
+
+def main():
+    args = parser.parse_args()
+    import prismafy
+    renderers = args.renderers.split(',') if args.renderers else list(RENDERERS.keys())
+    for renderer in renderers:
+        if renderer not in RENDERERS:
+            print ("Wrong renderer "+renderer+". Valid renderers: "+",".join(RENDERERS.keys()))
+            return
+
+    benchmark_results = []
+    print ("%-32s %8s %6s %12s %14s %16s %16s" % ("RENDERER","ROWS","WIDTH","SECONDS","ROWS_PER_SEC","PEAK_ALLOC_MB","ALLOC_PER_ROW"))
+    for renderer in renderers:
+        for rows in [int(value) for value in args.rows.split(',')]:
+            for width in [int(value) for value in args.widths.split(',')]:
+                results = RENDERERS[renderer][0](random.Random(1), rows, width)
+
+                best_seconds = None
+                for _ in range(args.repeat):
+                    render_start = time.perf_counter()
+                    bytes_rendered = run_renderer(prismafy, renderer, results)
+                    seconds = time.perf_counter() - render_start
+                    best_seconds = seconds if best_seconds is None else min(best_seconds, seconds)
+
+                #Allocations are measured in a separate run, tracing slows down the renderer
+                tracemalloc.start()
+                run_renderer(prismafy, renderer, results)
+                _, peak_bytes = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                result = {"renderer":renderer,"rows":rows,"width":width,"seconds":round(best_seconds,6),
+                          "rows_per_second":round(rows/best_seconds,1) if best_seconds else None,
+                          "bytes_rendered":bytes_rendered,"peak_allocated_mb":round(peak_bytes/1024/1024,3),
+                          "allocated_bytes_per_row":round(peak_bytes/rows,1)}
+                benchmark_results.append(result)
+                print ("%-32s %8s %6s %12s %14s %16s %16s" % (renderer, rows, width, result["seconds"], result["rows_per_second"], result["peak_allocated_mb"], result["allocated_bytes_per_row"]))
+
+    if args.output is not None:
+        with open(args.output, 'w') as output:
+            json.dump({"date":datetime.now().strftime('%Y-%m-%d %H:%M:%S'),"python":sys.version.split()[0],"results":benchmark_results}, output, indent=2)
+        print ("\nRender benchmark results: "+args.output)
+
+if __name__ == "__main__":
+    main()
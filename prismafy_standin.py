@@ -0,0 +1,723 @@
+"""
+*******************************************************************************
+*** prismafy - Tool to analyze metadata for cloud native data platforms.    ***
+*** prismafy_copyright (C) 2024  Deiby Gomez                                ***
+***                                                                         ***
+*** This program is free software: you can redistribute it and/or modify    ***
+*** it under the terms of the GNU General Public License as published by    ***
+*** the Free Software Foundation, either version 3 of the License, or       ***
+*** (at your option) any later version.                                     ***
+***                                                                         ***
+*** This program is distributed in the hope that it will be useful,         ***
+*** but WITHOUT ANY WARRANTY; without even the implied warranty of          ***
+*** MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           ***
+*** GNU General Public License for more details.                            ***
+***                                                                         ***
+*** You should have received a copy of the GNU General Public License       ***
+*** along with this program.  If not, see <http://www.gnu.org/licenses/>.   ***
+*******************************************************************************
+
+*******************************************************************************
+*** Tool:            prismafy stand-in                                      ***
+*** Description:     Local SQLite emulation of the SNOWFLAKE.ACCOUNT_USAGE  ***
+***                  views read by prismafy, with a synthetic data          ***
+***                  generator. Used to run and benchmark prismafy without  ***
+***                  a Snowflake account: python prismafy.py -d standin     ***
+***                  -a standin.db                                          ***
+*** Project:         https://github.com/prismafy/prismafy                   ***
+*******************************************************************************
+"""
+
+import argparse
+import json
+import random
+import re
+import sqlite3
+import time
+import uuid
+from datetime import datetime, date, timedelta
+
+standin_views = {
+    "QUERY_HISTORY": """QUERY_ID TEXT, QUERY_TEXT TEXT, DATABASE_ID INTEGER, DATABASE_NAME TEXT, SCHEMA_ID INTEGER, SCHEMA_NAME TEXT,
+        QUERY_TYPE TEXT, SESSION_ID INTEGER, USER_NAME TEXT, ROLE_NAME TEXT, WAREHOUSE_ID INTEGER, WAREHOUSE_NAME TEXT, WAREHOUSE_SIZE TEXT,
+        WAREHOUSE_TYPE TEXT, CLUSTER_NUMBER INTEGER, QUERY_TAG TEXT, EXECUTION_STATUS TEXT, ERROR_CODE TEXT, ERROR_MESSAGE TEXT,
+        START_TIME TEXT, END_TIME TEXT, TOTAL_ELAPSED_TIME INTEGER, BYTES_SCANNED INTEGER, PERCENTAGE_SCANNED_FROM_CACHE REAL,
+        BYTES_WRITTEN INTEGER, BYTES_WRITTEN_TO_RESULT INTEGER, BYTES_READ_FROM_RESULT INTEGER, ROWS_PRODUCED INTEGER, ROWS_INSERTED INTEGER,
+        ROWS_UPDATED INTEGER, ROWS_DELETED INTEGER, ROWS_UNLOADED INTEGER, BYTES_DELETED INTEGER, PARTITIONS_SCANNED INTEGER,
+        PARTITIONS_TOTAL INTEGER, BYTES_SPILLED_TO_LOCAL_STORAGE INTEGER, BYTES_SPILLED_TO_REMOTE_STORAGE INTEGER,
+        BYTES_SENT_OVER_THE_NETWORK INTEGER, COMPILATION_TIME INTEGER, EXECUTION_TIME INTEGER, QUEUED_PROVISIONING_TIME INTEGER,
+        QUEUED_REPAIR_TIME INTEGER, QUEUED_OVERLOAD_TIME INTEGER, TRANSACTION_BLOCKED_TIME INTEGER, OUTBOUND_DATA_TRANSFER_CLOUD TEXT,
+        OUTBOUND_DATA_TRANSFER_REGION TEXT, OUTBOUND_DATA_TRANSFER_BYTES INTEGER, INBOUND_DATA_TRANSFER_CLOUD TEXT,
+        INBOUND_DATA_TRANSFER_REGION TEXT, INBOUND_DATA_TRANSFER_BYTES INTEGER, LIST_EXTERNAL_FILES_TIME INTEGER,
+        CREDITS_USED_CLOUD_SERVICES REAL, EXTERNAL_FUNCTION_TOTAL_INVOCATIONS INTEGER, EXTERNAL_FUNCTION_TOTAL_SENT_ROWS INTEGER,
+        EXTERNAL_FUNCTION_TOTAL_RECEIVED_ROWS INTEGER, EXTERNAL_FUNCTION_TOTAL_SENT_BYTES INTEGER, EXTERNAL_FUNCTION_TOTAL_RECEIVED_BYTES INTEGER,
+        QUERY_LOAD_PERCENT INTEGER, IS_CLIENT_GENERATED_STATEMENT INTEGER, QUERY_ACCELERATION_BYTES_SCANNED INTEGER,
+        QUERY_ACCELERATION_PARTITIONS_SCANNED INTEGER, QUERY_ACCELERATION_UPPER_LIMIT_SCALE_FACTOR INTEGER, TRANSACTION_ID INTEGER,
+        CHILD_QUERIES_WAIT_TIME INTEGER, ROLE_TYPE TEXT, QUERY_HASH TEXT, QUERY_HASH_VERSION INTEGER, QUERY_PARAMETERIZED_HASH TEXT,
+        QUERY_PARAMETERIZED_HASH_VERSION INTEGER, SECONDARY_ROLE_STATS TEXT, ROWS_WRITTEN_TO_RESULT INTEGER, QUERY_RETRY_TIME INTEGER,
+        QUERY_RETRY_CAUSE TEXT, FAULT_HANDLING_TIME INTEGER""",
+    "QUERY_ATTRIBUTION_HISTORY": """QUERY_ID TEXT, PARENT_QUERY_ID TEXT, ROOT_QUERY_ID TEXT, WAREHOUSE_ID INTEGER, WAREHOUSE_NAME TEXT,
+        QUERY_HASH TEXT, QUERY_PARAMETERIZED_HASH TEXT, QUERY_TAG TEXT, USER_NAME TEXT, START_TIME TEXT, END_TIME TEXT,
+        CREDITS_ATTRIBUTED_COMPUTE REAL, CREDITS_USED_QUERY_ACCELERATION REAL""",
+    "AGGREGATE_QUERY_HISTORY": """INTERVAL_START_TIME TEXT, INTERVAL_END_TIME TEXT, QUERY_PARAMETERIZED_HASH TEXT, WAREHOUSE_NAME TEXT,
+        USER_NAME TEXT, CALLS INTEGER""",
+    "ACCESS_HISTORY": """QUERY_ID TEXT, QUERY_START_TIME TEXT, USER_NAME TEXT, DIRECT_OBJECTS_ACCESSED TEXT, BASE_OBJECTS_ACCESSED TEXT,
+        OBJECTS_MODIFIED TEXT, OBJECT_MODIFIED_BY_DDL TEXT, POLICIES_REFERENCED TEXT, PARENT_QUERY_ID TEXT, ROOT_QUERY_ID TEXT""",
+    "WAREHOUSE_METERING_HISTORY": """START_TIME TEXT, END_TIME TEXT, WAREHOUSE_ID INTEGER, WAREHOUSE_NAME TEXT, CREDITS_USED REAL,
+        CREDITS_USED_COMPUTE REAL, CREDITS_USED_CLOUD_SERVICES REAL, CREDITS_ATTRIBUTED_COMPUTE_QUERIES REAL""",
+    "WAREHOUSE_LOAD_HISTORY": """START_TIME TEXT, END_TIME TEXT, WAREHOUSE_ID INTEGER, WAREHOUSE_NAME TEXT, AVG_RUNNING REAL,
+        AVG_QUEUED_LOAD REAL, AVG_QUEUED_PROVISIONING REAL, AVG_BLOCKED REAL""",
+    "WAREHOUSE_EVENTS_HISTORY": """TIMESTAMP TEXT, WAREHOUSE_ID INTEGER, WAREHOUSE_NAME TEXT, CLUSTER_NUMBER INTEGER, EVENT_NAME TEXT,
+        EVENT_REASON TEXT, EVENT_STATE TEXT, USER_NAME TEXT, ROLE_NAME TEXT, QUERY_ID TEXT, SIZE TEXT, CLUSTER_COUNT INTEGER""",
+    "METERING_DAILY_HISTORY": """SERVICE_TYPE TEXT, USAGE_DATE TEXT, CREDITS_USED_COMPUTE REAL, CREDITS_USED_CLOUD_SERVICES REAL,
+        CREDITS_USED REAL, CREDITS_ADJUSTMENT_CLOUD_SERVICES REAL, CREDITS_BILLED REAL""",
+    "LOGIN_HISTORY": """EVENT_ID INTEGER, EVENT_TIMESTAMP TEXT, EVENT_TYPE TEXT, USER_NAME TEXT, CLIENT_IP TEXT, REPORTED_CLIENT_TYPE TEXT,
+        REPORTED_CLIENT_VERSION TEXT, FIRST_AUTHENTICATION_FACTOR TEXT, SECOND_AUTHENTICATION_FACTOR TEXT, IS_SUCCESS TEXT,
+        ERROR_CODE INTEGER, ERROR_MESSAGE TEXT, RELATED_EVENT_ID INTEGER, CONNECTION TEXT""",
+    "SESSIONS": """SESSION_ID INTEGER, CREATED_ON TEXT, USER_NAME TEXT, AUTHENTICATION_METHOD TEXT, LOGIN_EVENT_ID INTEGER,
+        CLIENT_APPLICATION_VERSION TEXT, CLIENT_APPLICATION_ID TEXT, CLIENT_ENVIRONMENT TEXT, CLIENT_BUILD_ID TEXT, CLIENT_VERSION TEXT""",
+    "USERS": """USER_ID INTEGER, NAME TEXT, CREATED_ON TEXT, DELETED_ON TEXT, LOGIN_NAME TEXT, DISPLAY_NAME TEXT, FIRST_NAME TEXT,
+        LAST_NAME TEXT, EMAIL TEXT, DEFAULT_WAREHOUSE TEXT, DEFAULT_ROLE TEXT, DISABLED TEXT, HAS_PASSWORD TEXT, HAS_RSA_PUBLIC_KEY TEXT,
+        PASSWORD_LAST_SET_TIME TEXT, LAST_SUCCESS_LOGIN TEXT, OWNER TEXT, TYPE TEXT, MUST_CHANGE_PASSWORD TEXT, COMMENT TEXT, SNOWFLAKE_LOCK TEXT,
+        DEFAULT_NAMESPACE TEXT, EXT_AUTHN_DUO TEXT, EXT_AUTHN_UID TEXT, BYPASS_MFA_UNTIL TEXT, EXPIRES_AT TEXT, LOCKED_UNTIL_TIME TEXT,
+        DEFAULT_SECONDARY_ROLE TEXT""",
+    "DATABASES": """DATABASE_ID INTEGER, DATABASE_NAME TEXT, DATABASE_OWNER TEXT, IS_TRANSIENT TEXT, COMMENT TEXT, CREATED TEXT,
+        LAST_ALTERED TEXT, DELETED TEXT, RETENTION_TIME INTEGER, TYPE TEXT, OWNER_ROLE_TYPE TEXT""",
+    "DATABASE_STORAGE_USAGE_HISTORY": """USAGE_DATE TEXT, DATABASE_ID INTEGER, DATABASE_NAME TEXT, DELETED TEXT, AVERAGE_DATABASE_BYTES REAL,
+        AVERAGE_FAILSAFE_BYTES REAL, AVERAGE_HYBRID_TABLE_STORAGE_BYTES REAL""",
+    "STAGE_STORAGE_USAGE_HISTORY": """USAGE_DATE TEXT, AVERAGE_STAGE_BYTES REAL""",
+    "TABLE_STORAGE_METRICS": """ID INTEGER, TABLE_NAME TEXT, TABLE_SCHEMA_ID INTEGER, TABLE_SCHEMA TEXT, TABLE_CATALOG_ID INTEGER,
+        TABLE_CATALOG TEXT, CLONE_GROUP_ID INTEGER, IS_TRANSIENT TEXT, ACTIVE_BYTES INTEGER, TIME_TRAVEL_BYTES INTEGER, FAILSAFE_BYTES INTEGER,
+        RETAINED_FOR_CLONE_BYTES INTEGER, DELETED INTEGER, TABLE_CREATED TEXT, TABLE_DROPPED TEXT, TABLE_ENTERED_FAILSAFE TEXT,
+        CATALOG_CREATED TEXT, CATALOG_DROPPED TEXT, SCHEMA_CREATED TEXT, SCHEMA_DROPPED TEXT, COMMENT TEXT, INSTANCE_ID INTEGER""",
+    "TABLE_PRUNING_HISTORY": """START_TIME TEXT, END_TIME TEXT, TABLE_ID INTEGER, TABLE_NAME TEXT, SCHEMA_ID INTEGER, SCHEMA_NAME TEXT,
+        DATABASE_ID INTEGER, DATABASE_NAME TEXT, NUM_SCANS INTEGER, PARTITIONS_SCANNED INTEGER, PARTITIONS_PRUNED INTEGER,
+        ROWS_SCANNED INTEGER, ROWS_PRUNED INTEGER""",
+    "AUTOMATIC_CLUSTERING_HISTORY": """START_TIME TEXT, END_TIME TEXT, CREDITS_USED REAL, NUM_BYTES_RECLUSTERED INTEGER,
+        NUM_ROWS_RECLUSTERED INTEGER, TABLE_ID INTEGER, TABLE_NAME TEXT, SCHEMA_ID INTEGER, SCHEMA_NAME TEXT, DATABASE_ID INTEGER,
+        DATABASE_NAME TEXT, INSTANCE_ID INTEGER""",
+    "DATA_TRANSFER_HISTORY": """START_TIME TEXT, END_TIME TEXT, SOURCE_CLOUD TEXT, SOURCE_REGION TEXT, TARGET_CLOUD TEXT,
+        TARGET_REGION TEXT, BYTES_TRANSFERRED REAL, TRANSFER_TYPE TEXT""",
+    "DATABASE_REPLICATION_USAGE_HISTORY": """START_TIME TEXT, END_TIME TEXT, DATABASE_NAME TEXT, DATABASE_ID INTEGER, CREDITS_USED REAL,
+        BYTES_TRANSFERRED REAL""",
+    "TASK_HISTORY": """QUERY_ID TEXT, NAME TEXT, DATABASE_ID INTEGER, DATABASE_NAME TEXT, SCHEMA_ID INTEGER, SCHEMA_NAME TEXT,
+        QUERY_TEXT TEXT, CONDITION_TEXT TEXT, STATE TEXT, ERROR_CODE TEXT, ERROR_MESSAGE TEXT, SCHEDULED_TIME TEXT, QUERY_START_TIME TEXT,
+        NEXT_SCHEDULED_TIME TEXT, COMPLETED_TIME TEXT, ROOT_TASK_ID TEXT, GRAPH_VERSION INTEGER, RUN_ID INTEGER, RETURN_VALUE TEXT,
+        SCHEDULED_FROM TEXT, ATTEMPT_NUMBER INTEGER, CONFIG TEXT, QUERY_HASH TEXT, QUERY_HASH_VERSION INTEGER,
+        QUERY_PARAMETERIZED_HASH TEXT, QUERY_PARAMETERIZED_HASH_VERSION INTEGER, GRAPH_RUN_GROUP_ID TEXT, BACKFILL_INFO TEXT,
+        TASK_SCHEMA_ID INTEGER, TASK_DATABASE_ID INTEGER, INSTANCE_ID INTEGER""",
+    "COPY_HISTORY": """FILE_NAME TEXT, STAGE_LOCATION TEXT, LAST_LOAD_TIME TEXT, ROW_COUNT INTEGER, ROW_PARSED INTEGER, FILE_SIZE INTEGER,
+        FIRST_ERROR_MESSAGE TEXT, FIRST_ERROR_LINE_NUMBER INTEGER, FIRST_ERROR_CHARACTER_POS INTEGER, FIRST_ERROR_COLUMN_NAME TEXT,
+        ERROR_COUNT INTEGER, ERROR_LIMIT INTEGER, STATUS TEXT, TABLE_ID INTEGER, TABLE_NAME TEXT, TABLE_SCHEMA_ID INTEGER,
+        TABLE_SCHEMA_NAME TEXT, TABLE_CATALOG_ID INTEGER, TABLE_CATALOG_NAME TEXT, PIPE_CATALOG_NAME TEXT, PIPE_SCHEMA_NAME TEXT,
+        PIPE_NAME TEXT, PIPE_RECEIVED_TIME TEXT, FIRST_COMMIT_TIME TEXT""",
+    "FUNCTIONS": """FUNCTION_ID INTEGER, FUNCTION_NAME TEXT, FUNCTION_SCHEMA_ID INTEGER, FUNCTION_SCHEMA TEXT, FUNCTION_CATALOG_ID INTEGER,
+        FUNCTION_CATALOG TEXT, FUNCTION_OWNER TEXT, CREATED TEXT, LAST_ALTERED TEXT, DELETED TEXT, EXTERNAL_ACCESS_INTEGRATIONS TEXT,
+        DATA_TYPE TEXT, ARGUMENT_SIGNATURE TEXT, CHARACTER_MAXIMUM_LENGTH INTEGER, CHARACTER_OCTET_LENGTH INTEGER,
+        NUMERIC_PRECISION INTEGER, NUMERIC_PRECISION_RADIX INTEGER, NUMERIC_SCALE INTEGER, FUNCTION_LANGUAGE TEXT, VOLATILITY TEXT,
+        IS_NULL_CALL TEXT, IS_EXTERNAL TEXT, API_INTEGRATION TEXT, CONTEXT_HEADERS TEXT, MAX_BATCH_ROWS INTEGER, COMPRESSION TEXT,
+        PACKAGES TEXT, RUNTIME_VERSION TEXT, INSTALLED_PACKAGES TEXT, OWNER_ROLE_TYPE TEXT, IS_MEMOIZABLE TEXT, IS_DATA_METRIC TEXT,
+        COMMENT TEXT, IS_SECURE TEXT, HANDLER TEXT, TARGET_PATH TEXT, SECRETS TEXT, FUNCTION_DEFINITION TEXT""",
+    "GRANTS_TO_ROLES": """CREATED_ON TEXT, MODIFIED_ON TEXT, PRIVILEGE TEXT, GRANTED_ON TEXT, NAME TEXT, TABLE_CATALOG TEXT,
+        TABLE_SCHEMA TEXT, GRANTED_TO TEXT, GRANTEE_NAME TEXT, GRANT_OPTION TEXT, GRANTED_BY TEXT, DELETED_ON TEXT""",
+    "GRANTS_TO_USERS": """CREATED_ON TEXT, DELETED_ON TEXT, ROLE TEXT, GRANTED_TO TEXT, GRANTEE_NAME TEXT, GRANTED_BY TEXT""",
+    "NETWORK_POLICIES": """ID INTEGER, NAME TEXT, OWNER TEXT, OWNER_ROLE_TYPE TEXT, CREATED TEXT, LAST_ALTERED TEXT, DELETED TEXT,
+        COMMENT TEXT""",
+    "NETWORK_RULES": """ID INTEGER, NAME TEXT, SCHEMA_ID INTEGER, SCHEMA TEXT, DATABASE_ID INTEGER, DATABASE TEXT, OWNER TEXT,
+        OWNER_ROLE_TYPE TEXT, CREATED TEXT, LAST_ALTERED TEXT, DELETED TEXT, COMMENT TEXT, TYPE TEXT, MODE TEXT, VALUE_LIST TEXT""",
+    "PASSWORD_POLICIES": """ID INTEGER, NAME TEXT, SCHEMA_ID INTEGER, SCHEMA TEXT, DATABASE_ID INTEGER, DATABASE TEXT, OWNER TEXT,
+        OWNER_ROLE_TYPE TEXT, PASSWORD_MIN_LENGTH INTEGER, PASSWORD_MAX_LENGTH INTEGER, PASSWORD_MIN_UPPER_CASE_CHARS INTEGER,
+        PASSWORD_MIN_LOWER_CASE_CHARS INTEGER, PASSWORD_MIN_NUMERIC_CHARS INTEGER, PASSWORD_MIN_SPECIAL_CHARS INTEGER,
+        PASSWORD_MIN_AGE_DAYS INTEGER, PASSWORD_MAX_AGE_DAYS INTEGER, PASSWORD_MAX_RETRIES INTEGER, PASSWORD_LOCKOUT_TIME_MINS INTEGER,
+        PASSWORD_HISTORY INTEGER, COMMENT TEXT, CREATED TEXT, LAST_ALTERED TEXT, DELETED TEXT""",
+    "MASKING_POLICIES": """POLICY_ID INTEGER, POLICY_NAME TEXT, POLICY_SCHEMA_ID INTEGER, POLICY_SCHEMA TEXT, POLICY_CATALOG_ID INTEGER,
+        POLICY_CATALOG TEXT, POLICY_OWNER TEXT, POLICY_SIGNATURE TEXT, POLICY_RETURN_TYPE TEXT, POLICY_BODY TEXT, POLICY_COMMENT TEXT,
+        CREATED TEXT, LAST_ALTERED TEXT, DELETED TEXT, OWNER_ROLE_TYPE TEXT, OPTIONS TEXT""",
+    "ROW_ACCESS_POLICIES": """POLICY_ID INTEGER, POLICY_NAME TEXT, POLICY_SCHEMA_ID INTEGER, POLICY_SCHEMA TEXT, POLICY_CATALOG_ID INTEGER,
+        POLICY_CATALOG TEXT, POLICY_OWNER TEXT, POLICY_SIGNATURE TEXT, POLICY_RETURN_TYPE TEXT, POLICY_BODY TEXT, POLICY_COMMENT TEXT,
+        CREATED TEXT, LAST_ALTERED TEXT, DELETED TEXT, OWNER_ROLE_TYPE TEXT, OPTIONS TEXT""",
+}
+
+#Reports using Snowflake constructs that translate_sql does not emulate. Prismafy skips them on the stand-in and lists them
+#with this reason in the skipped reports of the main page
+unsupported_reports = {
+    "line_history_account_consumption_credits_by_warehouse": "PIVOT",
+    "bar_month_consumption_credits_by_warehouse": "PIVOT",
+    "bar_week_consumption_credits_by_warehouse": "PIVOT",
+    "line_history_daily_credits_used_by_service": "PIVOT",
+    "bar_month_credits_used_by_service": "PIVOT",
+    "bar_week_credits_used_by_service": "PIVOT",
+    "line_history_credits_replication_by_database": "PIVOT",
+    "line_history_bytes_replication_by_database": "PIVOT",
+    "line_history_sql_operations": "PIVOT",
+    "line_history_sql_operations_by_database": "PIVOT",
+    "bar_month_load_details_by_warehouse": "PIVOT",
+    "bar_week_load_details_by_warehouse": "PIVOT",
+    "line_history_size_changes_by_warehouse": "PIVOT",
+    "line_history_wh_changes_by_query": "PIVOT",
+    "line_history_warehouse_enable_vs_querycount": "IGNORE NULLS",
+    "table_history_ip_changes": "QUALIFY",
+    "table_history_client_driver_changes": "QUALIFY",
+    "table_history_users_with_highest_privileges": "CONNECT BY",
+    "table_last_executions_of_query": "GET_QUERY_OPERATOR_STATS"
+}
+
+standin_timestamp_format = '%Y-%m-%d %H:%M:%S.%f'
+standin_template_queries = 100000
+warehouse_sizes = ["X-Small","Small","Medium","Large","X-Large"]
+
+def standin_timestamp(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    value = str(value).strip().strip("'")
+    for timestamp_format in ('%Y-%m-%d %H:%M:%S.%f', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(value[:26], timestamp_format)
+        except ValueError:
+            pass
+    return None
+
+def standin_format(value):
+    if value is None:
+        return None
+    return value.strftime(standin_timestamp_format)
+
+def standin_dateadd(unit, amount, value):
+    timestamp = standin_timestamp(value)
+    if timestamp is None:
+        return None
+    unit = str(unit).upper().strip("'")
+    amount = int(amount)
+    if unit in ('MONTH','MONTHS','MM'):
+        month = timestamp.month - 1 + amount
+        year = timestamp.year + month // 12
+        month = month % 12 + 1
+        day = min(timestamp.day, [31,29 if year % 4 == 0 and (year % 100 != 0 or year % 400 == 0) else 28,31,30,31,30,31,31,30,31,30,31][month-1])
+        return standin_format(timestamp.replace(year=year, month=month, day=day))
+    if unit in ('YEAR','YEARS'):
+        return standin_dateadd('MONTH', amount*12, value)
+    seconds = {'WEEK':604800,'DAY':86400,'DAYS':86400,'HOUR':3600,'HOURS':3600,'MINUTE':60,'MINUTES':60,'SECOND':1,'SECONDS':1}[unit]
+    return standin_format(timestamp + timedelta(seconds=seconds*amount))
+
+def standin_datediff(unit, start, end):
+    start = standin_timestamp(start)
+    end = standin_timestamp(end)
+    if start is None or end is None:
+        return None
+    unit = str(unit).upper().strip("'")
+    if unit in ('MONTH','MONTHS'):
+        return (end.year - start.year) * 12 + end.month - start.month
+    if unit in ('DAY','DAYS'):
+        return (end.date() - start.date()).days
+    seconds = {'WEEK':604800,'HOUR':3600,'MINUTE':60,'SECOND':1}[unit]
+    return int((end - start).total_seconds() // seconds)
+
+def standin_date_trunc(unit, value):
+    timestamp = standin_timestamp(value)
+    if timestamp is None:
+        return None
+    unit = str(unit).upper()
+    if unit == 'MONTH':
+        timestamp = timestamp.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    elif unit == 'WEEK':
+        timestamp = (timestamp - timedelta(days=timestamp.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+    elif unit == 'DAY':
+        timestamp = timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    elif unit == 'HOUR':
+        timestamp = timestamp.replace(minute=0, second=0, microsecond=0)
+    elif unit == 'MINUTE':
+        timestamp = timestamp.replace(second=0, microsecond=0)
+    return timestamp.strftime('%Y-%m-%d %H:%M:%S')
+
+def standin_to_date(value):
+    timestamp = standin_timestamp(value)
+    return timestamp.strftime('%Y-%m-%d') if timestamp is not None else None
+
+def standin_to_timestamp(value):
+    #Same text format as the generated columns, so comparisons keep the fractions of a second
+    return standin_format(standin_timestamp(value))
+
+def standin_to_number(value, *precision):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def standin_strtok(value, delimiter, position):
+    if value is None:
+        return None
+    parts = [part for part in str(value).split(delimiter) if part != '']
+    return parts[position-1] if len(parts) >= position else None
+
+def standin_position(needle, haystack, start=1):
+    if needle is None or haystack is None:
+        return None
+    return str(haystack).find(str(needle), int(start)-1) + 1
+
+def standin_array_cat(first, second):
+    if first is None or second is None:
+        return None
+    return json.dumps(json.loads(first) + json.loads(second))
+
+def standin_try_parse_json(value):
+    try:
+        json.loads(value)
+        return value
+    except (TypeError, ValueError):
+        return None
+
+class standin_max_by:
+    def __init__(self):
+        self.value = None
+        self.key = None
+
+    def step(self, value, key):
+        if key is not None and (self.key is None or key > self.key):
+            self.key = key
+            self.value = value
+
+    def finalize(self):
+        return self.value
+
+def find_closing_parenthesis(sql_query, position):
+    depth = 0
+    for index in range(position, len(sql_query)):
+        if sql_query[index] == '(':
+            depth = depth + 1
+        elif sql_query[index] == ')':
+            depth = depth - 1
+            if depth == 0:
+                return index
+    return -1
+
+def translate_sql(sql_query):
+    #Rewrites the Snowflake constructs used by prismafy into SQLite, anything else is left as is and fails in SQLite
+    sql_query = re.sub(r'(?i)SNOWFLAKE\.ACCOUNT_USAGE\.', '', sql_query)
+    sql_query = re.sub(r'(?i)TABLE\s*\(\s*SNOWFLAKE\.INFORMATION_SCHEMA\.QUERY_HISTORY_BY_SESSION\s*\([^)]*\)\s*\)', 'STANDIN_QUERY_HISTORY_BY_SESSION', sql_query)
+    sql_query = re.sub(r"(?i)TABLE\s*\(\s*RESULT_SCAN\s*\(\s*'([^']+)'\s*\)\s*\)", lambda match: '"STANDIN_RESULT_'+re.sub(r'\W','_',match.group(1))+'"', sql_query)
+    sql_query = re.sub(r'::\s*[A-Za-z_]+(\(\d+(,\d+)?\))?', '', sql_query)
+    sql_query = re.sub(r'(?i)\b(\w+(?:\.\w+)?):"(\w+)"', r"json_extract(\1,'$.\2')", sql_query)
+    sql_query = re.sub(r"(?i)\bDATEADD\s*\(\s*'?(\w+)'?\s*,", r"DATEADD('\1',", sql_query)
+    sql_query = re.sub(r"(?i)\bDATEDIFF\s*\(\s*'?(\w+)'?\s*,", r"DATEDIFF('\1',", sql_query)
+    sql_query = re.sub(r'(?i)\bCURRENT_DATE\s*\(\s*\)', 'CURRENT_DATE', sql_query)
+    sql_query = re.sub(r'(?i)\bCURRENT_TIMESTAMP\s*\(\s*\)', 'CURRENT_TIMESTAMP', sql_query)
+    sql_query = re.sub(r'(?i)\bARRAY_CONSTRUCT\s*\(\s*\)', "'[]'", sql_query)
+    sql_query = re.sub(r',(\s*)(FROM)\b', r'\1\2', sql_query, flags=re.IGNORECASE)
+    sql_query = re.sub(r',(\s*)\)', r'\1)', sql_query)
+
+    flatten = re.search(r'(?i)LATERAL\s+FLATTEN\s*\(\s*INPUT\s*=>', sql_query)
+    while flatten is not None:
+        closing = find_closing_parenthesis(sql_query, sql_query.index('(', flatten.start()))
+        sql_query = sql_query[:flatten.start()]+'json_each('+sql_query[flatten.end():closing]+')'+sql_query[closing+1:]
+        flatten = re.search(r'(?i)LATERAL\s+FLATTEN\s*\(\s*INPUT\s*=>', sql_query)
+
+    return sql_query
+
+class StandinCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.description = None
+        self.rowcount = -1
+        self.sfqid = None
+        self.rows = []
+        self.position = 0
+
+    def execute(self, sql_query, *args, **kwargs):
+        start_time = datetime.now()
+        execute_start = time.perf_counter()
+        self.sfqid = str(uuid.uuid4())
+        self.rows = []
+        self.position = 0
+        self.description = None
+
+        statement = sql_query.strip().upper()
+        statement = re.sub(r'^(\s*--[^\n]*\n)*', '', statement).strip()
+        query_tag = re.match(r"(?i)ALTER\s+SESSION\s+SET\s+QUERY_TAG\s*=\s*'([^']*)'", sql_query.strip())
+        if query_tag is not None:
+            self.connection.query_tag = query_tag.group(1)
+        statement_timeout = re.match(r"(?i)ALTER\s+SESSION\s+SET\s+STATEMENT_TIMEOUT_IN_SECONDS\s*=\s*(\d+)", sql_query.strip())
+        if statement_timeout is not None:
+            self.connection.statement_timeout = int(statement_timeout.group(1))
+        if re.match(r"(?i)ALTER\s+SESSION\s+UNSET\s+STATEMENT_TIMEOUT_IN_SECONDS", sql_query.strip()) is not None:
+            self.connection.statement_timeout = 0
+        if statement.startswith(('USE ','ALTER SESSION','SHOW ')):
+            self.rowcount = 0
+            self.connection.record_statement(self.sfqid, sql_query, start_time, execute_start, 0)
+            return self
+
+        pack_array = re.search(r'(?i)SELECT\s+ARRAY_CONSTRUCT\s*\(\s*\*\s*\)\s+AS\s+\w+\s+FROM', sql_query) is not None
+        translated_query = translate_sql(re.sub(r'(?i)SELECT\s+ARRAY_CONSTRUCT\s*\(\s*\*\s*\)\s+AS\s+\w+\s+FROM', 'SELECT * FROM', sql_query))
+        for result_id in re.findall(r'"STANDIN_RESULT_(\w+)"', translated_query):
+            self.connection.materialize_result(result_id)
+
+        #Like Snowflake, a statement running longer than STATEMENT_TIMEOUT_IN_SECONDS is canceled
+        if self.connection.statement_timeout > 0:
+            statement_deadline = time.perf_counter() + self.connection.statement_timeout
+            self.connection.database.set_progress_handler(lambda: int(time.perf_counter() > statement_deadline), 10000)
+        try:
+            cursor = self.connection.database.execute(translated_query)
+            raw_rows = cursor.fetchall() if cursor.description is not None else None
+        except sqlite3.OperationalError as error:
+            if str(error) == 'interrupted':
+                #Same error number as Snowflake: 000630
+                timeout_error = sqlite3.OperationalError("Statement reached its statement or warehouse timeout of "+str(self.connection.statement_timeout)+" second(s) and was canceled.")
+                timeout_error.errno = 630
+                raise timeout_error
+            if str(error) == 'database is locked':
+                #Another process writes to the database file: retried like an unavailable Snowflake service
+                raise sqlite3.OperationalError("Stand-in service temporarily unavailable: database is locked.")
+            raise
+        finally:
+            self.connection.database.set_progress_handler(None, 0)
+        if cursor.description is not None:
+            self.connection.results[re.sub(r'\W','_',self.sfqid)] = (cursor.description, raw_rows)
+            if pack_array:
+                self.description = [('DATA', None, None, None, None, None, None)]
+                self.rows = [(json.dumps(list(row), default=str, indent=2),) for row in raw_rows]
+            else:
+                self.description = [(column[0].upper(),)+tuple(column[1:]) for column in cursor.description]
+                self.rows = [tuple(convert_standin_value(value) for value in row) for row in raw_rows]
+            self.rowcount = len(self.rows)
+        else:
+            self.rowcount = cursor.rowcount
+        self.connection.record_statement(self.sfqid, sql_query, start_time, execute_start, self.rowcount)
+        return self
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        row = self.fetchone()
+        if row is None:
+            raise StopIteration
+        return row
+
+    def fetchone(self):
+        if self.position >= len(self.rows):
+            return None
+        self.position = self.position + 1
+        return self.rows[self.position-1]
+
+    def fetchall(self):
+        rows = self.rows[self.position:]
+        self.position = len(self.rows)
+        return rows
+
+    def fetchmany(self, size):
+        rows = self.rows[self.position:self.position+size]
+        self.position = self.position + len(rows)
+        return rows
+
+    def close(self):
+        self.rows = []
+
+timestamp_pattern = re.compile(r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(\.\d{1,6})?$')
+date_pattern = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+def convert_standin_value(value):
+    #The Snowflake connector returns datetime and date objects, not strings
+    if isinstance(value, str):
+        if timestamp_pattern.match(value):
+            return standin_timestamp(value)
+        if date_pattern.match(value):
+            return standin_timestamp(value).date()
+    return value
+
+class StandinConnection:
+    def __init__(self, database_file, session_parameters=None):
+        #Autocommit: the session log must not hold a lock on the database file between statements
+        self.database = sqlite3.connect(database_file, isolation_level=None)
+        self.session_id = random.randint(1, 10**12)
+        self.query_tag = (session_parameters or {}).get('QUERY_TAG')
+        self.statement_timeout = 0
+        self.results = {}
+        self.materialized_results = set()
+        for name, function, arguments in [("NVL", lambda value, default: default if value is None else value, 2),
+                                          ("IFF", lambda condition, first, second: first if condition else second, 3),
+                                          ("CONTAINS", lambda value, text: None if value is None else int(str(text) in str(value)), 2),
+                                          ("STRTOK", standin_strtok, 3),
+                                          ("POSITION", standin_position, 2),
+                                          ("POSITION", standin_position, 3),
+                                          ("REPLACE", lambda value, text: None if value is None else str(value).replace(text, ''), 2),
+                                          ("TO_DATE", standin_to_date, 1),
+                                          ("TO_TIMESTAMP", standin_to_timestamp, 1),
+                                          ("TO_NUMBER", standin_to_number, -1),
+                                          ("DATEADD", standin_dateadd, 3),
+                                          ("DATEDIFF", standin_datediff, 3),
+                                          ("DATE_TRUNC", standin_date_trunc, 2),
+                                          ("ARRAY_CAT", standin_array_cat, 2),
+                                          ("TRY_PARSE_JSON", standin_try_parse_json, 1),
+                                          ("PARSE_JSON", standin_try_parse_json, 1),
+                                          ("DIV0", lambda dividend, divisor: 0 if not divisor else dividend/divisor, 2)]:
+            self.database.create_function(name, arguments, function, deterministic=True)
+        self.database.create_aggregate("MAX_BY", 2, standin_max_by)
+        self.database.execute("""CREATE TEMP TABLE STANDIN_QUERY_HISTORY_BY_SESSION (QUERY_ID TEXT, QUERY_TEXT TEXT, QUERY_TAG TEXT,
+            START_TIME TEXT, EXECUTION_TIME INTEGER, ROWS_PRODUCED INTEGER, BYTES_SCANNED INTEGER, WAREHOUSE_SIZE TEXT,
+            CREDITS_USED_CLOUD_SERVICES REAL, QUERY_TYPE TEXT)""")
+
+    def cursor(self, *args, **kwargs):
+        return StandinCursor(self)
+
+    def record_statement(self, query_id, sql_query, start_time, execute_start, rows):
+        #The stand-in has no result cache, every statement runs on a warehouse
+        self.database.execute("INSERT INTO STANDIN_QUERY_HISTORY_BY_SESSION VALUES (?,?,?,?,?,?,?,?,?,?)",
+            (query_id, sql_query, self.query_tag, standin_format(start_time), int((time.perf_counter()-execute_start)*1000), rows, 0, 'X-Small', 0.0,
+             (re.sub(r'^(\s*--[^\n]*)*\s*', '', sql_query).split() or [''])[0].upper()))
+
+    def materialize_result(self, result_id):
+        if result_id in self.materialized_results or result_id not in self.results:
+            return
+        description, rows = self.results[result_id]
+        columns = ','.join(['"'+column[0].upper()+'"' for column in description])
+        self.database.execute('CREATE TEMP TABLE "STANDIN_RESULT_'+result_id+'" ('+columns+')')
+        self.database.executemany('INSERT INTO "STANDIN_RESULT_'+result_id+'" VALUES ('+','.join(['?']*len(description))+')', rows)
+        self.materialized_results.add(result_id)
+
+    def close(self):
+        self.database.close()
+
+def connect(database_file, session_parameters=None):
+    return StandinConnection(database_file, session_parameters)
+
+#Time column of the large views. ACCOUNT_USAGE views are stored in time order, so a range on this column prunes micro-partitions,
+#the stand-in emulates it with an index
+standin_time_columns = {
+    "QUERY_HISTORY": "START_TIME",
+    "AGGREGATE_QUERY_HISTORY": "INTERVAL_START_TIME",
+    "ACCESS_HISTORY": "QUERY_START_TIME",
+    "WAREHOUSE_METERING_HISTORY": "START_TIME",
+    "WAREHOUSE_LOAD_HISTORY": "START_TIME",
+    "WAREHOUSE_EVENTS_HISTORY": "TIMESTAMP",
+    "METERING_DAILY_HISTORY": "USAGE_DATE",
+    "LOGIN_HISTORY": "EVENT_TIMESTAMP",
+    "SESSIONS": "CREATED_ON",
+}
+
+def create_standin_time_indexes(database):
+    for view_name, column in standin_time_columns.items():
+        database.execute("CREATE INDEX IF NOT EXISTS "+view_name+"_"+column+" ON "+view_name+" ("+column+")")
+
+def copy_standin_queries(database, template_queries, queries, start_time, history_seconds):
+    #Copy n of a template query gets a new QUERY_ID (its last 12 hex digits are n) and starts n*86413 seconds later, wrapped around the
+    #history: QUERY_HISTORY, QUERY_ATTRIBUTION_HISTORY and ACCESS_HISTORY rows of the same copy stay consistent
+    start_epoch = str(int((start_time - datetime(1970, 1, 1)).total_seconds()))
+
+    def shifted(start_column, end_column=None):
+        epoch = start_epoch+"+(CAST(STRFTIME('%s',"+start_column+") AS INTEGER)-"+start_epoch+"+:copy*86413)%"+str(history_seconds)
+        if end_column is not None:
+            epoch = epoch+"+CAST(STRFTIME('%s',"+end_column+") AS INTEGER)-CAST(STRFTIME('%s',"+start_column+") AS INTEGER)"
+            return "STRFTIME('%Y-%m-%d %H:%M:%S',"+epoch+",'unixepoch')||SUBSTR("+end_column+",20)"
+        return "STRFTIME('%Y-%m-%d %H:%M:%S',"+epoch+",'unixepoch')||SUBSTR("+start_column+",20)"
+
+    def copy(view_name, replacements, where):
+        columns = [column.split()[0] for column in standin_views[view_name].split(',')]
+        database.execute("INSERT INTO "+view_name+" SELECT "+",".join([replacements.get(column, "T."+column) for column in columns])+" FROM "+view_name+" T WHERE "+where,
+            {"copy": copy_number, "rows": min(template_queries, queries-template_queries*copy_number), "access_rows": access_rows})
+
+    (access_rows,) = database.execute("SELECT COUNT(*) FROM ACCESS_HISTORY").fetchone()
+    query_id = "SUBSTR(T.QUERY_ID,1,24)||PRINTF('%012x',:copy)"
+    for copy_number in range(1, (queries-1)//template_queries+1):
+        copy("QUERY_HISTORY", {"QUERY_ID": query_id, "START_TIME": shifted("T.START_TIME"), "END_TIME": shifted("T.START_TIME", "T.END_TIME")}, "T.ROWID<=:rows")
+        copy("QUERY_ATTRIBUTION_HISTORY", {"QUERY_ID": query_id, "START_TIME": shifted("T.START_TIME"), "END_TIME": shifted("T.START_TIME", "T.END_TIME")}, "T.ROWID<=:rows")
+        copy("ACCESS_HISTORY", {"QUERY_ID": query_id, "QUERY_START_TIME": shifted("T.QUERY_START_TIME")},
+            "T.ROWID<=:access_rows AND T.QUERY_ID IN (SELECT QUERY_ID FROM QUERY_HISTORY WHERE ROWID<=:rows)")
+
+def generate_standin_database(database_file, warehouses=10, users=100, queries=100000, months=6, seed=1):
+    #Synthetic ACCOUNT_USAGE data ending now: volume of every view follows the number of warehouses, users and queries
+    rng = random.Random(seed)
+    database = sqlite3.connect(database_file)
+    for view_name, columns in standin_views.items():
+        database.execute("DROP TABLE IF EXISTS "+view_name)
+        database.execute("CREATE TABLE "+view_name+" ("+columns+")")
+
+    end_time = datetime.now().replace(microsecond=0)
+    start_time = end_time - timedelta(days=31*months)
+    history_seconds = int((end_time - start_time).total_seconds())
+    days = (end_time.date() - start_time.date()).days
+
+    def random_time():
+        return start_time + timedelta(seconds=rng.randint(0, history_seconds))
+
+    def insert(view_name, rows):
+        #Columns not generated are left as NULL
+        columns = len(standin_views[view_name].split(','))
+        database.executemany("INSERT INTO "+view_name+" VALUES ("+','.join(['?']*columns)+")", [tuple(row)+(None,)*(columns-len(row)) for row in rows])
+
+    warehouse_names = ["WH_"+str(number).zfill(4) for number in range(1, warehouses+1)]
+    warehouse_size = dict([(name, rng.choice(warehouse_sizes)) for name in warehouse_names])
+    user_names = ["USER_"+str(number).zfill(5) for number in range(1, users+1)]
+    database_names = ["DB_"+str(number).zfill(3) for number in range(1, max(3, warehouses//2)+1)]
+    tables = [(database_name, "SCHEMA_"+str(schema), "TABLE_"+str(table)) for database_name in database_names for schema in range(1, 4) for table in range(1, 11)]
+    hashes = [uuid.UUID(int=rng.getrandbits(128)).hex for _ in range(max(10, min(5000, queries//100)))]
+    dbt_nodes = ["model.analytics.model_"+str(number) for number in range(1, 51)]
+
+    insert("USERS", [(number, name, standin_format(start_time - timedelta(days=rng.randint(0, 365))), None, name, name, None, None, name.lower()+"@example.com",
+        rng.choice(warehouse_names), "PUBLIC", "false", "true", "false", standin_format(random_time()), standin_format(random_time()), "ACCOUNTADMIN",
+        rng.choice(["PERSON","SERVICE"])) for number, name in enumerate(user_names, 1)])
+    insert("DATABASES", [(number, name, "SYSADMIN", "NO", None, standin_format(start_time), standin_format(random_time()), None, 1, "STANDARD", "ROLE")
+        for number, name in enumerate(database_names, 1)])
+
+    rows = []
+    access_rows = []
+    attribution_rows = []
+    #At most template_queries rows are generated one by one, the rest are copies of them made by SQLite
+    template_queries = min(queries, standin_template_queries)
+    for number in range(1, template_queries+1):
+        query_start = random_time()
+        query_hash = rng.choice(hashes)
+        warehouse_name = rng.choice(warehouse_names)
+        user_name = rng.choice(user_names)
+        database_name, schema_name, table_name = rng.choice(tables)
+        elapsed = int(rng.expovariate(1/5000.0)) + 1
+        failed = rng.random() < 0.02
+        query_text = "select * from "+database_name+"."+schema_name+"."+table_name+" where id = "+str(number % 97)
+        if rng.random() < 0.1:
+            node = rng.choice(dbt_nodes)
+            query_text = query_text+' /* {"app": "dbt", "dbt_version": "1.8.0", "project_name": "analytics", "target_name": "prod", "target_database": "'+database_name+'", "target_schema": "'+schema_name+'", "node_name": "'+node.split('.')[-1]+'", "node_id": "'+node+'", "materialized": "table", "node_original_file_path": "models/'+node.split('.')[-1]+'.sql"} */'
+        query_id = str(uuid.UUID(int=rng.getrandbits(128)))
+        rows.append((query_id, query_text, 1, database_name, 1, schema_name, rng.choice(["SELECT","INSERT","UPDATE","MERGE","CREATE_TABLE_AS_SELECT"]),
+            rng.randint(1, 10**6), user_name, "SYSADMIN", warehouse_names.index(warehouse_name)+1, warehouse_name, warehouse_size[warehouse_name], "STANDARD", 1, "",
+            "FAIL" if failed else "SUCCESS", "100038" if failed else None, "Numeric value is not recognized" if failed else None,
+            standin_format(query_start), standin_format(query_start + timedelta(milliseconds=elapsed)), elapsed, rng.randint(0, 10**10), round(rng.random()*100, 2),
+            rng.randint(0, 10**8), rng.randint(0, 10**6), 0, rng.randint(0, 10**6), rng.randint(0, 10**5), rng.randint(0, 10**4), rng.randint(0, 10**3), 0, 0,
+            rng.randint(1, 1000), 1000, rng.randint(0, 10**7) if rng.random() < 0.05 else 0, 0, 0, rng.randint(1, 500), elapsed, rng.randint(0, 200), 0,
+            rng.randint(0, 100), 0, None, None, 0, None, None, 0, 0, round(rng.random()/1000, 6), 0, 0, 0, 0, 0, rng.randint(1, 100), 0, 0, 0, None,
+            rng.randint(1, 10**9), 0, "ROLE", query_hash, 2, query_hash, 1, None, rng.randint(0, 10**5), 0, None, 0))
+        attribution_rows.append((query_id, None, None, warehouse_names.index(warehouse_name)+1, warehouse_name, query_hash, query_hash, "", user_name,
+            standin_format(query_start), standin_format(query_start + timedelta(milliseconds=elapsed)), round(elapsed/3600000.0, 6), 0.0))
+        if rng.random() < 0.5:
+            accessed = json.dumps([{"objectName": database_name+"."+schema_name+"."+table_name, "objectDomain": "Table", "objectId": 1, "columns": []}])
+            access_rows.append((query_id, standin_format(query_start), user_name, accessed, accessed, "[]", None, "[]", None, None))
+        if len(rows) >= 50000:
+            insert("QUERY_HISTORY", rows)
+            insert("QUERY_ATTRIBUTION_HISTORY", attribution_rows)
+            insert("ACCESS_HISTORY", access_rows)
+            rows, access_rows, attribution_rows = [], [], []
+    insert("QUERY_HISTORY", rows)
+    insert("QUERY_ATTRIBUTION_HISTORY", attribution_rows)
+    insert("ACCESS_HISTORY", access_rows)
+    copy_standin_queries(database, template_queries, queries, start_time, history_seconds)
+
+    database.execute("""INSERT INTO AGGREGATE_QUERY_HISTORY
+        SELECT STRFTIME('%Y-%m-%d %H:00:00.000000',START_TIME), STRFTIME('%Y-%m-%d %H:59:59.000000',START_TIME), QUERY_PARAMETERIZED_HASH, WAREHOUSE_NAME, USER_NAME, COUNT(*)
+        FROM QUERY_HISTORY GROUP BY 1,2,3,4,5""")
+
+    metering_rows = []
+    load_rows = []
+    event_rows = []
+    for warehouse_id, warehouse_name in enumerate(warehouse_names, 1):
+        for day in range(days):
+            if rng.random() < 0.3:
+                continue
+            first_hour = rng.randint(0, 16)
+            active_hours = rng.randint(1, 8)
+            day_start = datetime.combine(start_time.date() + timedelta(days=day+1), datetime.min.time())
+            event_rows.append((standin_format(day_start + timedelta(hours=first_hour)), warehouse_id, warehouse_name, None, "RESUME_WAREHOUSE", "WAREHOUSE_RESUME",
+                "COMPLETED", "SYSTEM", None, None, warehouse_size[warehouse_name], 1))
+            for hour in range(first_hour, first_hour+active_hours):
+                hour_start = day_start + timedelta(hours=hour)
+                if hour_start + timedelta(hours=1) > end_time:
+                    break
+                credits = round(rng.random()*2**warehouse_sizes.index(warehouse_size[warehouse_name]), 4)
+                metering_rows.append((standin_format(hour_start), standin_format(hour_start + timedelta(hours=1)), warehouse_id, warehouse_name, credits, credits*0.9, credits*0.1, credits*0.8))
+                load_rows.append((standin_format(hour_start), standin_format(hour_start + timedelta(hours=1)), warehouse_id, warehouse_name, round(rng.random()*4, 2),
+                    round(rng.random(), 2), round(rng.random()/10, 2), round(rng.random()/20, 2)))
+            event_rows.append((standin_format(day_start + timedelta(hours=first_hour+active_hours)), warehouse_id, warehouse_name, None, "SUSPEND_WAREHOUSE",
+                "WAREHOUSE_AUTOSUSPEND", "COMPLETED", "SYSTEM", None, None, warehouse_size[warehouse_name], 1))
+        if len(metering_rows) >= 50000:
+            insert("WAREHOUSE_METERING_HISTORY", metering_rows)
+            insert("WAREHOUSE_LOAD_HISTORY", load_rows)
+            insert("WAREHOUSE_EVENTS_HISTORY", event_rows)
+            metering_rows, load_rows, event_rows = [], [], []
+    insert("WAREHOUSE_METERING_HISTORY", metering_rows)
+    insert("WAREHOUSE_LOAD_HISTORY", load_rows)
+    insert("WAREHOUSE_EVENTS_HISTORY", event_rows)
+
+    insert("METERING_DAILY_HISTORY", [(service, (start_time.date() + timedelta(days=day)).strftime('%Y-%m-%d'), credits, credits*0.1, credits, 0.0, credits)
+        for day in range(days+1) for service in ["WAREHOUSE_METERING","AUTO_CLUSTERING","PIPE","SERVERLESS_TASK"] for credits in [round(rng.random()*warehouses, 4)]])
+
+    login_rows = []
+    session_rows = []
+    event_id = 0
+    for user_name in user_names:
+        client_ip = "10.0."+str(rng.randint(0, 255))+"."+str(rng.randint(1, 254))
+        for day in range(days):
+            for _ in range(rng.randint(0, 3)):
+                event_id = event_id + 1
+                login_time = datetime.combine(start_time.date() + timedelta(days=day+1), datetime.min.time()) + timedelta(seconds=rng.randint(0, 86399))
+                if login_time > end_time:
+                    continue
+                success = rng.random() > 0.05
+                authentication = rng.choice(["PASSWORD","SAML2_ASSERTION","RSA_KEYPAIR","OAUTH_ACCESS_TOKEN"])
+                login_rows.append((event_id, standin_format(login_time), "LOGIN", user_name, client_ip, rng.choice(["SNOWFLAKE_UI","PYTHON_DRIVER","JDBC_DRIVER"]),
+                    rng.choice(["3.12.0","3.13.1","3.14.0"]), authentication, None, "YES" if success else "NO", None if success else 390100,
+                    None if success else "INCORRECT_USERNAME_PASSWORD", None, None))
+                if success:
+                    session_rows.append((event_id, standin_format(login_time), user_name, authentication, event_id, "PythonConnector 3.12.0", "PythonConnector",
+                        "{}", None, "3.12.0"))
+        if len(login_rows) >= 50000:
+            insert("LOGIN_HISTORY", login_rows)
+            insert("SESSIONS", session_rows)
+            login_rows, session_rows = [], []
+    insert("LOGIN_HISTORY", login_rows)
+    insert("SESSIONS", session_rows)
+
+    insert("TABLE_STORAGE_METRICS", [(number, table_name, 1, schema_name, 1, database_name, number, "NO", rng.randint(0, 10**12), rng.randint(0, 10**10),
+        rng.randint(0, 10**10), rng.randint(0, 10**9), 0, standin_format(start_time), None, None, None, None, None, None, None, None)
+        for number, (database_name, schema_name, table_name) in enumerate(tables, 1)])
+    insert("TABLE_PRUNING_HISTORY", [(standin_format(day_start), standin_format(day_start + timedelta(hours=1)), number, table_name, 1, schema_name, 1, database_name,
+        rng.randint(1, 100), rng.randint(1, 1000), rng.randint(0, 1000), rng.randint(1, 10**6), rng.randint(0, 10**6))
+        for number, (database_name, schema_name, table_name) in enumerate(tables, 1) for day_start in [random_time() for _ in range(10)]])
+    insert("AUTOMATIC_CLUSTERING_HISTORY", [(standin_format(day_start), standin_format(day_start + timedelta(hours=1)), round(rng.random(), 4), rng.randint(1, 10**9),
+        rng.randint(1, 10**7), number, table_name, 1, schema_name, 1, database_name, None)
+        for number, (database_name, schema_name, table_name) in enumerate(tables[:20], 1) for day_start in [random_time() for _ in range(5)]])
+    insert("DATABASE_STORAGE_USAGE_HISTORY", [((start_time.date() + timedelta(days=day)).strftime('%Y-%m-%d'), number, database_name, None,
+        float(rng.randint(10**9, 10**12)), float(rng.randint(0, 10**10)), 0.0) for number, database_name in enumerate(database_names, 1) for day in range(days+1)])
+    insert("STAGE_STORAGE_USAGE_HISTORY", [((start_time.date() + timedelta(days=day)).strftime('%Y-%m-%d'), float(rng.randint(10**6, 10**9))) for day in range(days+1)])
+    insert("DATA_TRANSFER_HISTORY", [(standin_format(transfer_time), standin_format(transfer_time + timedelta(hours=1)), "AWS", "us-east-2", target_cloud, target_region,
+        float(rng.randint(10**6, 10**10)), "COPY") for transfer_time in [random_time() for _ in range(days)] for (target_cloud, target_region) in [rng.choice([("AWS","us-west-2"),("AZURE","eastus2")])]])
+    insert("DATABASE_REPLICATION_USAGE_HISTORY", [(standin_format(replication_time), standin_format(replication_time + timedelta(hours=1)), database_names[0], 1,
+        round(rng.random(), 4), float(rng.randint(10**6, 10**9))) for replication_time in [random_time() for _ in range(days)]])
+    insert("TASK_HISTORY", [(str(uuid.UUID(int=rng.getrandbits(128))), "TASK_"+str(number % 20), 1, database_names[0], 1, "SCHEMA_1", "call refresh()", None,
+        state, None if state == "SUCCEEDED" else "100132", None if state == "SUCCEEDED" else "Task failed", standin_format(task_time), standin_format(task_time),
+        None, standin_format(task_time + timedelta(minutes=1)), None, 1, number, None, "SCHEDULE", 1, None, None, 1, None, 1, None, None)
+        for number in range(1, days*20) for task_time in [random_time()] for state in [rng.choice(["SUCCEEDED","SUCCEEDED","SUCCEEDED","FAILED","CANCELLED"])]])
+    insert("COPY_HISTORY", [("file_"+str(number)+".csv", "s3://bucket/path/", standin_format(load_time), 1000, 1000, 10**6, None if status == "Loaded" else "Bad record",
+        None, None, None, 0 if status == "Loaded" else 1, 1, status, 1, "TABLE_1", 1, "SCHEMA_1", 1, database_names[0], database_names[0], "SCHEMA_1",
+        "PIPE_"+str(number % 5), standin_format(load_time), standin_format(load_time)) for number in range(1, days*10) for load_time in [random_time()]
+        for status in [rng.choice(["Loaded","Loaded","Load failed","Partially loaded"])]])
+    insert("GRANTS_TO_USERS", [(standin_format(start_time), None, rng.choice(["ACCOUNTADMIN","SECURITYADMIN","SYSADMIN","PUBLIC"]), "USER", user_name, "ACCOUNTADMIN")
+        for user_name in user_names])
+    insert("GRANTS_TO_ROLES", [(standin_format(start_time), standin_format(start_time), "USAGE", "ROLE", "SYSADMIN", None, None, "ROLE", "ACCOUNTADMIN", "false",
+        "ACCOUNTADMIN", None)])
+    insert("NETWORK_POLICIES", [(1, "CORPORATE_POLICY", "SECURITYADMIN", "ROLE", standin_format(random_time()), standin_format(random_time()), None, None)])
+    insert("NETWORK_RULES", [(1, "CORPORATE_RULE", 1, "SCHEMA_1", 1, database_names[0], "SECURITYADMIN", "ROLE", standin_format(random_time()), standin_format(random_time()),
+        None, None, "IPV4", "INGRESS", "10.0.0.0/8")])
+    insert("PASSWORD_POLICIES", [(1, "DEFAULT_PASSWORD_POLICY", 1, "SCHEMA_1", 1, database_names[0], "SECURITYADMIN", "ROLE", 14, 256, 1, 1, 1, 1, 0, 90, 5, 15, 5,
+        None, standin_format(random_time()), standin_format(random_time()), None)])
+    insert("MASKING_POLICIES", [(1, "EMAIL_MASK", 1, "SCHEMA_1", 1, database_names[0], "SECURITYADMIN", "(VAL VARCHAR)", "VARCHAR", "'***'", None,
+        standin_format(random_time()), standin_format(random_time()), None, "ROLE", None)])
+    insert("ROW_ACCESS_POLICIES", [(1, "REGION_POLICY", 1, "SCHEMA_1", 1, database_names[0], "SECURITYADMIN", "(REGION VARCHAR)", "BOOLEAN", "TRUE", None,
+        standin_format(random_time()), standin_format(random_time()), None, "ROLE", None)])
+
+    create_standin_time_indexes(database)
+    database.commit()
+    database.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generates a local SQLite stand-in of the SNOWFLAKE.ACCOUNT_USAGE views read by prismafy.")
+    parser.add_argument('-o',  '--output' ,help="SQLite file to create.", type=str, default="standin.db")
+    parser.add_argument('-w',  '--warehouses' ,help="Number of warehouses.", type=int, default=10)
+    parser.add_argument('-u',  '--users' ,help="Number of users.", type=int, default=100)
+    parser.add_argument('-q',  '--queries' ,help="Number of QUERY_HISTORY rows.", type=int, default=100000)
+    parser.add_argument('-m',  '--months' ,help="Months of history.", type=int, default=6)
+    parser.add_argument('-s',  '--seed' ,help="Random seed.", type=int, default=1)
+    args = parser.parse_args()
+
+    generation_start = datetime.now()
+    generate_standin_database(args.output, args.warehouses, args.users, args.queries, args.months, args.seed)
+    print ("Stand-in database "+args.output+" generated in "+str(round((datetime.now()-generation_start).total_seconds(),2))+" seconds.")
@@ -0,0 +1,69 @@
+"""
+*******************************************************************************
+*** prismafy - Tool to analyze metadata for cloud native data platforms.    ***
+*** prismafy_copyright (C) 2024  Deiby Gomez                                ***
+***                                                                         ***
+*** This program is free software: you can redistribute it and/or modify    ***
+*** it under the terms of the GNU General Public License as published by    ***
+*** the Free Software Foundation, either version 3 of the License, or       ***
+*** (at your option) any later version.                                     ***
+***                                                                         ***
+*** This program is distributed in the hope that it will be useful,         ***
+*** but WITHOUT ANY WARRANTY; without even the implied warranty of          ***
+*** MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           ***
+*** GNU General Public License for more details.                            ***
+***                                                                         ***
+*** You should have received a copy of the GNU General Public License       ***
+*** along with this program.  If not, see <http://www.gnu.org/licenses/>.   ***
+*******************************************************************************
+
+*******************************************************************************
+*** Tool:            prismafy startup benchmark                             ***
+*** Description:     Measures the startup time of prismafy.py --help and    ***
+***                  --version and exits with an error when the median is   ***
+***                  above the target, so wrapper scripts stay fast.        ***
+*** Project:         https://github.com/prismafy/prismafy                   ***
+*******************************************************************************
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PRISMAFY_FOLDER = os.path.dirname(os.path.abspath(__file__))
+
+parser = argparse.ArgumentParser(description="Startup time benchmark of prismafy.py --help and --version.")
+parser.add_argument('-n',  '--runs' ,help="Runs per command.", type=int, default=10)
+parser.add_argument('-t',  '--target' ,help="Maximum median startup time in milliseconds. Default: 300.", type=float, default=300)
+
+def startup_times(command, runs):
+    times = []
+    for _ in range(runs):
+        run_start = time.perf_counter()
+        subprocess.run(command, cwd=PRISMAFY_FOLDER, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        times.append((time.perf_counter() - run_start)*1000)
+    return times
+
+def main():
+    args = parser.parse_args()
+    baseline = statistics.median(startup_times([sys.executable, '-c', 'pass'], args.runs))
+    print ("%-12s %12s %12s %12s" % ("COMMAND","MEDIAN_MS","BEST_MS","TARGET_MS"))
+    print ("%-12s %12s %12s %12s" % ("python", round(baseline,1), "", ""))
+
+    too_slow = []
+    for option in ['--help','--version']:
+        times = startup_times([sys.executable, os.path.join(PRISMAFY_FOLDER, 'prismafy.py'), option], args.runs)
+        median = statistics.median(times)
+        print ("%-12s %12s %12s %12s" % (option, round(median,1), round(min(times),1), args.target))
+        if median > args.target:
+            too_slow.append(option)
+
+    if too_slow:
+        print ("\nStartup above target for "+", ".join(too_slow)+". Check the imports with: python -X importtime prismafy.py --help")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()